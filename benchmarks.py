@@ -0,0 +1,1067 @@
+"""
+Micro-benchmarks for IBKR Options Trader hot paths
+
+These benchmarks exercise the same data shapes the GUI uses (option chain
+tables, market_data dicts, contract keys) without connecting to IBKR.
+They exist to keep per-tick and per-frame costs measurable as the chain,
+order and chart code evolves.
+
+USAGE:
+    python benchmarks.py              # Run all benchmarks
+    python benchmarks.py list         # List available benchmarks
+    python benchmarks.py chain_rows   # Run a single benchmark
+
+Qt benchmarks run with the offscreen platform plugin so no display is needed.
+
+Author: Van Gothreaux
+Date: November 2025
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _timeit(func, iterations: int) -> float:
+    """Return average microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _print_header(title: str):
+    print("=" * 70)
+    print(title)
+    print("=" * 70)
+
+
+_QT_APP = None
+
+
+def _qt_app():
+    """Create (or reuse) the QApplication required by QTableWidget"""
+    global _QT_APP
+    from PyQt6.QtWidgets import QApplication
+    if _QT_APP is None:
+        _QT_APP = QApplication.instance() or QApplication(sys.argv)
+    return _QT_APP
+
+
+# ============================================================================
+# CHAIN ROW LOOKUP (per-tick cost of locating the strike row)
+# ============================================================================
+
+def bench_chain_rows():
+    """Per-tick cost: scanning strike cells vs (expiry, strike) -> row index"""
+    from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem
+
+    _qt_app()
+    _print_header("Chain row lookup - per-tick cost (main chain layout, 21 columns)")
+
+    expiry = "20251112"
+    for num_strikes in (40, 100):
+        strikes = [600.0 + i for i in range(num_strikes)]
+        table = QTableWidget(num_strikes, 21)
+        for row, strike in enumerate(strikes):
+            table.setItem(row, 10, QTableWidgetItem(f"{strike:.0f}"))
+            table.setItem(row, 8, QTableWidgetItem("0.00"))
+        row_index = {(expiry, round(strike, 2)): row for row, strike in enumerate(strikes)}
+
+        # Ticks spread uniformly across the chain (average scan depth = N/2)
+        tick_strikes = [strikes[i % num_strikes] for i in range(997)]
+        position = [0]
+
+        def next_strike():
+            position[0] = (position[0] + 1) % len(tick_strikes)
+            return tick_strikes[position[0]]
+
+        def scan_tick():
+            strike = next_strike()
+            for row in range(table.rowCount()):
+                strike_item = table.item(row, 10)
+                if strike_item and abs(float(strike_item.text()) - strike) < 0.01:
+                    table.item(row, 8).setText("1.25")
+                    break
+
+        def indexed_tick():
+            strike = next_strike()
+            row = row_index.get((expiry, round(strike, 2)))
+            if row is not None:
+                table.item(row, 8).setText("1.25")
+
+        iterations = 5000
+        scan_us = _timeit(scan_tick, iterations)
+        indexed_us = _timeit(indexed_tick, iterations)
+        print(f"  {num_strikes:>3} strikes: row scan {scan_us:8.2f} us/tick | "
+              f"row index {indexed_us:6.2f} us/tick | speedup {scan_us / indexed_us:5.1f}x")
+    print()
+
+
+# ============================================================================
+# LOCAL GREEKS ENGINE (full-chain IV + greeks recompute)
+# ============================================================================
+
+def bench_local_greeks():
+    """Full-chain IV + greeks recompute: vectorized Black-76 vs per-contract scalar loop"""
+    import math
+    import numpy as np
+    from main import ChainArray, compute_chain_greeks, black76_price
+
+    _print_header("Local greeks engine - full chain recompute (IV solve + delta/gamma/vega/theta)")
+
+    forward = 680.0
+    t = 1.0 / 365
+    expiry = "20251112"
+
+    def scalar_chain(strikes, mids, is_call):
+        """Reference: per-contract bisection IV + closed-form greeks with math.erf"""
+        def cdf(x):
+            return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+        results = []
+        for strike, mid in zip(strikes, mids):
+            lo, hi = 0.005, 5.0
+            for _ in range(60):
+                sigma = 0.5 * (lo + hi)
+                d1 = (math.log(forward / strike) + 0.5 * sigma * sigma * t) / (sigma * math.sqrt(t))
+                d2 = d1 - sigma * math.sqrt(t)
+                if is_call:
+                    price = forward * cdf(d1) - strike * cdf(d2)
+                else:
+                    price = strike * cdf(-d2) - forward * cdf(-d1)
+                if price > mid:
+                    hi = sigma
+                else:
+                    lo = sigma
+            pdf = math.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi)
+            results.append((sigma, cdf(d1) if is_call else cdf(d1) - 1,
+                            pdf / (forward * sigma * math.sqrt(t)), forward * pdf * math.sqrt(t) / 100))
+        return results
+
+    for num_strikes in (40, 100):
+        strikes = np.array([forward - num_strikes / 2 + i for i in range(num_strikes)])
+        chains = []
+        for right in ('C', 'P'):
+            chain = ChainArray(expiry, right)
+            for strike in strikes:
+                chain.slot_for(float(strike), f"XSP_{strike}_{right}_{expiry}")
+            rows = chain.view()
+            sigma = 0.12 + 0.0004 * (strikes - forward) ** 2
+            mids = black76_price(forward, strikes, t, sigma, right == 'C')
+            rows['bid'] = np.maximum(mids - 0.01, 0.01)
+            rows['ask'] = mids + 0.01
+            rows['active'] = True
+            chains.append(chain)
+
+        def vectorized():
+            for chain in chains:
+                compute_chain_greeks(chain, forward, t, only_missing=False)
+
+        def scalar():
+            for chain in chains:
+                rows = chain.view()
+                scalar_chain(rows['strike'], 0.5 * (rows['bid'] + rows['ask']), chain.right == 'C')
+
+        vector_us = _timeit(vectorized, 200)
+        scalar_us = _timeit(scalar, 10)
+        contracts = 2 * num_strikes
+        print(f"  {num_strikes:>3} strikes ({contracts} contracts): vectorized {vector_us / 1000:7.3f} ms/chain "
+              f"({vector_us / contracts:5.2f} us/contract) | scalar loop {scalar_us / 1000:7.2f} ms/chain | "
+              f"speedup {scalar_us / vector_us:5.1f}x")
+    print()
+
+
+# ============================================================================
+# STRIKE SELECTION (signal -> contract selection latency)
+# ============================================================================
+
+def bench_strike_selection():
+    """Signal-to-selection latency: dict scan vs vectorized scan vs sorted delta/ask indexes"""
+    import random
+    import numpy as np
+    from main import ContractRegistry, MarketDataStore
+
+    _print_header("Strike selection on signal - target delta 30 / max risk $250 (3 expiries loaded)")
+
+    random.seed(7)
+    expiries = ("20251112", "20251113", "20251114")
+    expiry = expiries[0]
+    for num_strikes in (40, 100):
+        registry = ContractRegistry()
+        store = MarketDataStore(registry)
+        legacy = {}  # Baseline dict-of-dicts market_data
+        for exp in expiries:
+            for i in range(num_strikes):
+                strike = 680.0 - num_strikes / 2 + i
+                for right in ('C', 'P'):
+                    key = f"XSP_{strike}_{right}_{exp}"
+                    call_delta = 1.0 / (1.0 + np.exp((strike - 680.0) / 4.0))
+                    delta = call_delta if right == 'C' else call_delta - 1.0
+                    ask = max(round(abs(delta) * 6.0, 2), 0.05)
+                    values = {'bid': ask - 0.05, 'ask': ask, 'delta': delta}
+                    store[key] = values
+                    legacy[key] = dict(values)
+
+        def dict_scan():
+            best_diff, best_key = float('inf'), None
+            for contract_key, data in legacy.items():
+                if '_C_' not in contract_key or expiry not in contract_key:
+                    continue
+                delta = data.get('delta')
+                if delta is None or delta == 0:
+                    continue
+                diff = abs(abs(delta) - 0.30)
+                if diff < best_diff and data.get('ask', 0) > 0:
+                    best_diff, best_key = diff, contract_key
+            return best_key
+
+        chain = store.chain(expiry, 'C')
+
+        def vectorized_scan():
+            rows = chain.view()
+            delta = rows['delta']
+            mask = rows['active'] & (delta != 0) & (rows['ask'] > 0)
+            diff = np.where(mask, np.abs(np.abs(delta) - 0.30), np.inf)
+            return chain.keys[int(np.argmin(diff))]
+
+        def bisect_index():
+            return chain.keys[chain.closest_delta_slot(0.30, strict=False, require_ask=True)[0]]
+
+        def max_risk_vectorized():
+            rows = chain.view()
+            ask = rows['ask']
+            valid = rows['active'] & (ask > 0) & (ask <= 2.50)
+            return chain.keys[int(np.argmax(np.where(valid, ask, -np.inf)))]
+
+        def max_risk_bisect():
+            return chain.keys[chain.max_ask_slot(2.50)]
+
+        assert dict_scan() == vectorized_scan() == bisect_index()
+        assert max_risk_vectorized() == max_risk_bisect()
+
+        dict_us = _timeit(dict_scan, 2000)
+        vector_us = _timeit(vectorized_scan, 20000)
+        bisect_us = _timeit(bisect_index, 20000)
+        risk_vector_us = _timeit(max_risk_vectorized, 20000)
+        risk_bisect_us = _timeit(max_risk_bisect, 20000)
+        print(f"  {num_strikes:>3} strikes | delta: dict scan {dict_us:7.2f} us, vectorized {vector_us:6.2f} us, "
+              f"bisect {bisect_us:5.2f} us ({dict_us / bisect_us:5.1f}x vs dict) | "
+              f"max risk: vectorized {risk_vector_us:6.2f} us, bisect {risk_bisect_us:5.2f} us")
+
+        # Index maintenance is paid per delta/ask tick instead of per signal
+        keys = [key for key in legacy if key.endswith(expiry)]
+        updates = [(random.choice(keys), random.choice(('delta', 'ask')), random.uniform(0.05, 0.95))
+                   for _ in range(1000)]
+        position = [0]
+
+        def indexed_tick():
+            position[0] = (position[0] + 1) % len(updates)
+            key, field, value = updates[position[0]]
+            store.set_value(key, field, value)
+
+        tick_us = _timeit(indexed_tick, 20000)
+        print(f"      index upkeep: {tick_us:5.2f} us per delta/ask tick")
+    print()
+
+
+# ============================================================================
+# UNDERLYING CHART RENDERING (per-update frame time)
+# ============================================================================
+
+def bench_underlying_chart():
+    """Candlestick chart frame time: full redraw vs same-bar blit vs new-bar append"""
+    import random
+    from datetime import datetime, timedelta
+    from main import BarSeries, ProfessionalUnderlyingChart
+
+    app = _qt_app()
+    _print_header("Underlying chart - frame time per historicalDataUpdate (EMA 9, Z 30)")
+
+    random.seed(3)
+    start = datetime(2025, 11, 12, 8, 30)
+    for num_bars in (400, 2000):
+        chart = ProfessionalUnderlyingChart("Confirmation Chart")
+        chart.resize(1000, 700)
+        chart.show()
+        app.processEvents()
+
+        series, price = BarSeries(), 6800.0
+        for i in range(num_bars):
+            close = price + random.gauss(0, 1)
+            series.append({'date': (start + timedelta(minutes=i)).strftime('%Y%m%d %H:%M:%S'),
+                           'open': price, 'high': max(price, close) + 0.5, 'low': min(price, close) - 0.5,
+                           'close': close, 'volume': 1})
+            price = close
+        chart.update_chart(series.view())
+
+        def same_bar():
+            last = series.view()[-1]
+            series.tick(min(max(last['close'] + random.gauss(0, 0.2), last['low']), last['high']))
+            chart.update_chart(series.view())
+
+        def new_bar():
+            close = float(series.view()[-1]['close'])
+            series.append({'date': (start + timedelta(minutes=len(series))).strftime('%Y%m%d %H:%M:%S'),
+                           'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1})
+            chart.update_chart(series.view())
+
+        def full_redraw():
+            # Every update rebuilt the figure before (figure.clear + all artists + draw)
+            chart.needs_full_redraw = True
+            chart.update_chart(series.view())
+
+        tick_us = _timeit(same_bar, 200)
+        bar_us = _timeit(new_bar, 20)
+        full_us = _timeit(full_redraw, 5)
+        print(f"  {num_bars:>5} bars: full redraw {full_us / 1000:7.1f} ms | same-bar blit {tick_us / 1000:6.2f} ms "
+              f"({full_us / tick_us:5.1f}x) | new bar {bar_us / 1000:6.2f} ms")
+        chart.close()
+    print()
+
+
+# ============================================================================
+# BAR STORE (per-update cost of handing the bar history to a chart)
+# ============================================================================
+
+def bench_bar_store():
+    """Per historicalDataUpdate: list-of-dicts copies vs BarSeries upsert + zero-copy view"""
+    import random
+    from datetime import datetime, timedelta
+    import pandas as pd
+    from main import BarSeries, bar_frame
+
+    _print_header("Bar store - update forming bar + hand history to chart (per historicalDataUpdate)")
+
+    random.seed(5)
+    start = datetime(2025, 11, 12, 8, 30)
+    for num_bars in (400, 2000, 10000):
+        bars, price = [], 6800.0
+        for i in range(num_bars):
+            close = price + random.gauss(0, 1)
+            bars.append({'date': (start + timedelta(minutes=i)).strftime('%Y%m%d %H:%M:%S'),
+                         'open': price, 'high': max(price, close) + 0.5, 'low': min(price, close) - 0.5,
+                         'close': close, 'volume': 1})
+            price = close
+        legacy = list(bars)
+        series = BarSeries.from_bars(bars)
+        trade_ring = BarSeries.from_bars(bars, max_len=200)
+
+        def next_update():
+            bar = dict(bars[-1])
+            bar['close'] += random.gauss(0, 0.2)
+            return bar
+
+        def list_of_dicts():
+            # Previous path: replace last dict, rebuild chart_bars, chart copies the list
+            bar = next_update()
+            if str(legacy[-1]['date']).strip() == str(bar['date']).strip():
+                legacy[-1] = bar
+            chart_bars = [{'time': str(b['date']).strip().replace('  ', ' '), 'open': b['open'], 'high': b['high'],
+                           'low': b['low'], 'close': b['close'], 'volume': b['volume']} for b in legacy]
+            chart_data = chart_bars.copy()
+            return chart_data[-200:]
+
+        def bar_series():
+            series.upsert(next_update())
+            trade_ring.upsert(next_update())
+            series.view()
+            return trade_ring.view()
+
+        legacy_us = _timeit(list_of_dicts, 50)
+        series_us = _timeit(bar_series, 2000)
+        legacy_df_us = _timeit(lambda: pd.DataFrame(legacy), 10)
+        frame_us = _timeit(lambda: bar_frame(series.view()), 50)
+        print(f"  {num_bars:>5} bars: lists {legacy_us / 1000:7.3f} ms | BarSeries {series_us:6.1f} us "
+              f"({legacy_us / series_us:6.0f}x) | full-redraw DataFrame {legacy_df_us / 1000:6.2f} -> "
+              f"{frame_us / 1000:5.2f} ms")
+    print()
+
+
+# ============================================================================
+# STREAMING INDICATORS (EMA + Z-Score per bar update)
+# ============================================================================
+
+def bench_indicators():
+    """EMA(9) + Z-Score(30) per bar update: pandas full recompute vs window tail vs streaming engine"""
+    import numpy as np
+    import pandas as pd
+    from main import IndicatorEngine
+
+    _print_header("Indicators - EMA 9 / Z-Score 30 per historicalDataUpdate")
+
+    rng = np.random.default_rng(11)
+    ema_period, z_period = 9, 30
+    alpha = 2.0 / (ema_period + 1)
+    for num_bars in (400, 2000, 10000):
+        closes = 6800.0 + np.cumsum(rng.normal(0, 1, num_bars))
+        ema = pd.Series(closes).ewm(span=ema_period, adjust=False).mean().to_numpy().copy()
+        engine = IndicatorEngine(ema_period, z_period)
+        engine.reset(closes)
+
+        def pandas_full():
+            series = pd.Series(closes)
+            series.ewm(span=ema_period, adjust=False).mean()
+            rolling = series.rolling(z_period)
+            return (series - rolling.mean()) / rolling.std()
+
+        def window_tail():
+            # Previous incremental path: EMA from bar i-1, Z-Score from a z_period window std
+            i = num_bars - 1
+            closes[i] += rng.normal(0, 0.1)
+            ema[i] = alpha * closes[i] + (1 - alpha) * ema[i - 1]
+            window = closes[i + 1 - z_period:i + 1]
+            return (closes[i] - window.mean()) / window.std(ddof=1)
+
+        def streaming():
+            engine.update_last(closes[-1] + rng.normal(0, 0.1))
+            return engine.zscore
+
+        full_us = _timeit(pandas_full, 50)
+        tail_us = _timeit(window_tail, 5000)
+        stream_us = _timeit(streaming, 5000)
+        print(f"  {num_bars:>5} bars: pandas recompute {full_us:8.1f} us | window tail {tail_us:5.1f} us | "
+              f"streaming {stream_us:4.1f} us ({full_us / stream_us:6.0f}x vs recompute)")
+    print()
+
+
+# ============================================================================
+# CANDLE GEOMETRY (full-redraw cost of building the candlestick collections)
+# ============================================================================
+
+def bench_candle_geometry():
+    """Full-redraw candles: per-bar iterrows + Rectangle vs vectorized NumPy geometry"""
+    import numpy as np
+    import pandas as pd
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+    from matplotlib.dates import date2num
+    from matplotlib.patches import Rectangle
+    from main import candlestick_geometry
+
+    _print_header("Candle geometry - build collections + Agg draw (1-minute bars)")
+
+    rng = np.random.default_rng(7)
+    for num_bars in (2000, 10000, 50000):
+        close = 6800.0 + np.cumsum(rng.normal(0, 1, num_bars))
+        open_ = np.concatenate([[6800.0], close[:-1]])
+        df = pd.DataFrame({'open': open_, 'high': np.maximum(open_, close) + 0.5,
+                           'low': np.minimum(open_, close) - 0.5, 'close': close},
+                          index=pd.date_range('2025-11-12 08:30', periods=num_bars, freq='1min'))
+        x_dates = date2num(df.index)
+        bar_width = (x_dates[1] - x_dates[0]) * 0.6
+
+        def new_axes():
+            figure = Figure(figsize=(10, 7))
+            FigureCanvasAgg(figure)
+            ax = figure.add_subplot(111)
+            ax.set_xlim(x_dates[0], x_dates[-1])
+            ax.set_ylim(df['low'].min(), df['high'].max())
+            return figure, ax
+
+        def per_bar():
+            # Previous full-redraw path: one Rectangle per bar from df.iterrows()
+            figure, ax = new_axes()
+            wick_segments, wick_colors, body_patches = [], [], []
+            for i, (timestamp, row) in enumerate(df.iterrows()):
+                x = x_dates[i]
+                color = '#00ff00' if row['close'] >= row['open'] else '#ff0000'
+                wick_segments.append([(x, row['low']), (x, row['high'])])
+                wick_colors.append(color)
+                body_height = abs(row['close'] - row['open'])
+                body_patches.append(Rectangle((x - bar_width / 2, min(row['open'], row['close'])), bar_width,
+                                              body_height if body_height > 0 else 0.01,
+                                              facecolor=color, edgecolor=color, alpha=0.9))
+            ax.add_collection(LineCollection(wick_segments, colors=wick_colors, linewidths=1, alpha=0.8))
+            ax.add_collection(PatchCollection(body_patches, match_original=True))
+            figure.canvas.draw()
+
+        def vectorized():
+            figure, ax = new_axes()
+            segments, verts, colors = candlestick_geometry(
+                x_dates, df['open'].to_numpy(), df['high'].to_numpy(), df['low'].to_numpy(),
+                df['close'].to_numpy(), bar_width)
+            ax.add_collection(LineCollection(segments, colors=colors, linewidths=1, alpha=0.8))
+            ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors=colors, alpha=0.9))
+            figure.canvas.draw()
+
+        iterations = 3 if num_bars < 50000 else 1
+        per_bar_us = _timeit(per_bar, iterations)
+        vector_us = _timeit(vectorized, iterations)
+        print(f"  {num_bars:>6} bars: per-bar {per_bar_us / 1000:8.1f} ms | vectorized {vector_us / 1000:7.1f} ms | "
+              f"speedup {per_bar_us / vector_us:5.1f}x")
+    print()
+
+
+# ============================================================================
+# CHART DOWNSAMPLING (stride slicing vs M4 per-pixel buckets)
+# ============================================================================
+
+def bench_downsampling():
+    """Zoomed-out chart: stride slicing vs M4 buckets (fresh, cached scroll) and whether a spike survives"""
+    import numpy as np
+    from main import ChartDownsampler
+
+    _print_header("Chart downsampling - whole history in a 900 px wide view")
+
+    rng = np.random.default_rng(5)
+    pixels, max_bars = 900, 2000
+    for num_bars in (10000, 50000, 200000):
+        x = 20000.0 + np.arange(num_bars) / 1440.0  # 1-minute bars as matplotlib date numbers
+        close = 6800.0 + np.cumsum(rng.normal(0, 1, num_bars))
+        high, low = close + 0.5, close - 0.5
+        spike = num_bars // 2 + 3  # Off the stride grid
+        high[spike] = high.max() + 50.0
+        x_start, x_end = x[0], x[-1]
+        downsampler = ChartDownsampler()
+        step = max(num_bars // max_bars, 1)
+
+        def stride():
+            return high[::step]
+
+        def m4_fresh():
+            downsampler.invalidate()
+            return downsampler.select(x, high, low, x_start, x_end, pixels)
+
+        shift = [0.0]
+
+        def m4_scroll():
+            # Pan by one bar per call at the same zoom level - served from the level cache
+            shift[0] = -shift[0] or -1.0 / 1440.0
+            return downsampler.select(x, high, low, x_start + shift[0], x_end + shift[0], pixels)
+
+        stride_us = _timeit(stride, 1000)
+        fresh_us = _timeit(m4_fresh, 20)
+        m4_scroll()
+        scroll_us = _timeit(m4_scroll, 200)
+        first, last, imin, imax, _ = downsampler.select(x, high, low, x_start, x_end, pixels)
+        stride_kept = bool(np.isclose(high[::step].max(), high[spike]))
+        m4_kept = bool(np.isclose(high[imax].max(), high[spike]))
+        print(f"  {num_bars:>6} bars: stride {stride_us:6.1f} us ({num_bars // step} pts, spike kept {stride_kept!s:<5}) | "
+              f"M4 fresh {fresh_us / 1000:6.2f} ms | M4 cached scroll {scroll_us:7.1f} us "
+              f"({len(first)} buckets, spike kept {m4_kept})")
+    print()
+
+
+# ============================================================================
+# HISTORICAL BAR CACHE (disk cost of serving bars instead of re-downloading)
+# ============================================================================
+
+def bench_bar_cache():
+    """Bar cache: write / cold load / gap plan per series size and on-disk bytes per bar"""
+    import tempfile
+    import numpy as np
+    from main import BAR_DTYPE, BAR_CACHE_WIRE_BYTES, HistoricalBarCache
+
+    _print_header("Historical bar cache - compressed columnar .npz per series")
+
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as directory:
+        for num_bars in (1380, 10000, 50000):
+            rows = np.zeros(num_bars, dtype=BAR_DTYPE)
+            rows['time'] = 1_762_936_200_000_000_000 + np.arange(num_bars, dtype=np.int64) * 60_000_000_000
+            rows['close'] = 6800.0 + np.round(np.cumsum(rng.normal(0, 1, num_bars)) * 4) / 4
+            rows['open'] = np.concatenate([[6800.0], rows['close'][:-1]])
+            rows['high'] = np.maximum(rows['open'], rows['close']) + 0.25
+            rows['low'] = np.minimum(rows['open'], rows['close']) - 0.25
+            rows['volume'] = rng.integers(0, 5000, num_bars)
+            start, end = int(rows['time'][0]), int(rows['time'][-1])
+            key = f"bench_{num_bars}"
+            writer = HistoricalBarCache(directory)
+
+            def write():
+                writer._files.pop(key, None)
+                writer.store(key, rows, start, end)
+
+            def cold_plan():
+                reader = HistoricalBarCache(directory)
+                return reader.plan(key, start, end + 300_000_000_000, live=True)
+
+            write_us = _timeit(write, 5)
+            plan_us = _timeit(cold_plan, 5)
+            disk_bytes = (writer.directory / f"{key}.npz").stat().st_size
+            print(f"  {num_bars:>6} bars: write {write_us / 1000:6.1f} ms | cold load + plan {plan_us / 1000:6.1f} ms | "
+                  f"{disk_bytes / num_bars:5.1f} B/bar on disk vs ~{BAR_CACHE_WIRE_BYTES} B/bar from IBKR")
+    print()
+
+
+# ============================================================================
+# OFF-THREAD CHART RENDERING (GUI-thread cost of a full chart draw)
+# ============================================================================
+
+def bench_offthread_render():
+    """Full chart draw: GUI-thread blocked time and longest GUI stall, synchronous Agg vs render process"""
+    import random
+    from datetime import datetime, timedelta
+    from main import BarSeries, ChartRenderWorker, ProfessionalUnderlyingChart
+
+    app = _qt_app()
+    _print_header("Off-thread chart rendering - underlying chart full draw (GUI thread)")
+
+    random.seed(7)
+    start = datetime(2025, 11, 12, 8, 30)
+    series, price = BarSeries(), 6800.0
+    for i in range(2000):
+        close = price + random.gauss(0, 1)
+        series.append({'date': (start + timedelta(minutes=i)).strftime('%Y%m%d %H:%M:%S'),
+                       'open': price, 'high': max(price, close) + 0.5, 'low': min(price, close) - 0.5,
+                       'close': close, 'volume': 1})
+        price = close
+
+    worker = ChartRenderWorker()
+    worker.start()
+    while not worker.ready and worker.isRunning():  # Spawned interpreter imports main once
+        time.sleep(0.05)
+    print(f"  render process ready: {worker.ready}")
+    for label, render_worker in (("synchronous", None), ("render process", worker)):
+        chart = ProfessionalUnderlyingChart("Confirmation Chart", render_worker=render_worker)
+        chart.resize(1000, 700)
+        chart.show()
+        app.processEvents()
+        chart.update_chart(series.view())
+        while chart.canvas.frame_pending:
+            app.processEvents()
+
+        blocked_ms, draw_ms, frame_ms, stall_ms = [], [], [], []
+        for _ in range(10):
+            begin = time.perf_counter()
+            chart.canvas.draw()
+            draw_ms.append((time.perf_counter() - begin) * 1000)
+            # Spin the event loop like the GUI would between ticks until the frame is on screen;
+            # GUI-thread time is the draw call plus every event pass (frame install + blit)
+            busy, longest = draw_ms[-1], draw_ms[-1]
+            while chart.canvas.frame_pending:
+                time.sleep(0.001)  # Idle between events (releases the GIL like the Qt event loop)
+                tick = time.perf_counter()
+                app.processEvents()
+                spent = (time.perf_counter() - tick) * 1000
+                busy += spent
+                longest = max(longest, spent)
+            frame_ms.append((time.perf_counter() - begin) * 1000)
+            blocked_ms.append(busy)
+            stall_ms.append(longest)
+        n = len(blocked_ms)
+        print(f"  {label:<14}: GUI thread blocked {sum(blocked_ms) / n:6.1f} ms/draw "
+              f"(draw() {sum(draw_ms) / n:5.1f} ms) | longest GUI stall {max(stall_ms):6.1f} ms | "
+              f"frame on screen after {sum(frame_ms) / n:6.1f} ms")
+        chart.hide()
+    worker.stop()
+    print(f"  render process: {worker.stats['rendered']} frames, {worker.stats['failed']} failed, "
+          f"{worker.stats['superseded']} superseded, frames dropped {chart.canvas.frames_dropped}")
+    print()
+
+
+# ============================================================================
+# HIDDEN RENDERS (per-tick cost of chart / chain updates on a hidden tab)
+# ============================================================================
+
+def bench_hidden_renders():
+    """Per-tick cost of updating a hidden chart / chain table: render anyway vs RenderGate skip"""
+    import random
+    from datetime import datetime, timedelta
+    from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem, QTabWidget, QWidget
+    from main import BarSeries, ProfessionalUnderlyingChart, RenderGate
+
+    app = _qt_app()
+    _print_header("Hidden renders - widget on a background tab")
+
+    tabs = QTabWidget()
+    chart = ProfessionalUnderlyingChart("Confirmation Chart")
+    table = QTableWidget(100, 21)
+    for row in range(100):
+        for col in (2, 3, 5, 6):
+            table.setItem(row, col, QTableWidgetItem("0.00"))
+    tabs.addTab(QWidget(), "Front")
+    tabs.addTab(chart, "Chart")
+    tabs.addTab(table, "Chain")
+    tabs.resize(1000, 700)
+    tabs.show()
+
+    random.seed(11)
+    start = datetime(2025, 11, 12, 8, 30)
+    series, price = BarSeries(), 6800.0
+    for i in range(2000):
+        close = price + random.gauss(0, 1)
+        series.append({'date': (start + timedelta(minutes=i)).strftime('%Y%m%d %H:%M:%S'),
+                       'open': price, 'high': max(price, close) + 0.5, 'low': min(price, close) - 0.5,
+                       'close': close, 'volume': 1})
+        price = close
+    tabs.setCurrentIndex(1)
+    app.processEvents()
+    chart.update_chart(series.view())
+    tabs.setCurrentIndex(0)
+    app.processEvents()
+
+    def chart_tick():
+        last = series.view()[-1]
+        series.tick(min(max(last['close'] + random.gauss(0, 0.2), last['low']), last['high']))
+        chart.update_chart(series.view())
+
+    gate = RenderGate("Chain", table, lambda keys: None)
+    position = [0]
+
+    def cell_tick(gated):
+        position[0] = (position[0] + 1) % 100
+        if gated and gate.defer(position[0]):
+            return
+        for col in (2, 3, 5, 6):
+            table.item(position[0], col).setText(f"{random.random():.2f}")
+
+    gated_defer = chart.render_gate.defer
+    chart.render_gate.defer = lambda key=None: False  # Render regardless of visibility (old behavior)
+    chart_render_us = _timeit(chart_tick, 200)
+    chart.render_gate.defer = gated_defer
+    chart_skip_us = _timeit(chart_tick, 200)
+    cell_render_us = _timeit(lambda: cell_tick(False), 5000)
+    cell_skip_us = _timeit(lambda: cell_tick(True), 5000)
+
+    start_catch_up = time.perf_counter()
+    tabs.setCurrentIndex(1)
+    while chart.render_gate.dirty:
+        app.processEvents()
+    catch_up_ms = (time.perf_counter() - start_catch_up) * 1000
+    print(f"  Chart (2000 bars): render {chart_render_us / 1000:6.2f} ms/tick | skipped {chart_skip_us:5.1f} us/tick | "
+          f"one catch-up on show {catch_up_ms:6.1f} ms ({chart.render_gate.skipped} skipped)")
+    print(f"  Chain cell (4 cols): render {cell_render_us:6.1f} us/tick | skipped {cell_skip_us:5.1f} us/tick "
+          f"({len(gate.dirty_keys)} dirty cells to catch up)")
+    tabs.close()
+    print()
+
+
+def bench_order_chaser():
+    """Mid-move to reprice latency of the real MainWindow chaser (stub IBKR client, scripted quotes)"""
+    import io
+    import logging
+    import random
+    import tempfile
+    import main
+    from main import ConnectionState, MainWindow
+
+    app = _qt_app()
+    orders, duration = 10, 20.0
+    _print_header(f"Order chaser - {orders} working orders, {duration:.0f} s of scripted quotes (real time)")
+
+    # The window writes settings / bar cache files relative to the working directory
+    cwd, workdir = os.getcwd(), tempfile.TemporaryDirectory()
+    os.chdir(workdir.name)
+    log_level = main.logger.level
+    main.logger.setLevel(logging.WARNING)  # Every reprice logs at INFO...
+    stdout, sys.stdout = sys.stdout, io.StringIO()  # ...and the activity log echoes it to stdout
+    try:
+        window = MainWindow()
+        window.update_ts_orders_display = lambda: None
+        client = window.ibkr_client
+        sends = {}  # order_id -> [monotonic time of each placeOrder]
+        client.placeOrder = lambda order_id, contract, order: sends.setdefault(order_id, []).append(time.monotonic())
+        client.cancelOrder = client.reqMktData = client.cancelMktData = lambda *args, **kwargs: None
+        window.connection_state = ConnectionState.CONNECTED
+        window.app_state['data_server_ok'] = True
+        window.app_state['next_order_id'] = 1
+        min_modify = window.min_order_modification_interval
+
+        random.seed(21)
+        symbol, expiry = window.instrument['options_symbol'], window.current_expiry
+        tick = window.instrument['tick_size_below_3']
+        keys = [f"{symbol}_{6800.0 + 5 * i}_C_{expiry}" for i in range(orders)]
+        bids = {}
+        for key in keys:
+            bids[key] = round(random.uniform(1.0, 2.5) / tick) * tick
+            window.on_market_data_tick(key, 'bid', bids[key])
+            window.on_market_data_tick(key, 'ask', bids[key] + 4 * tick)
+        order_ids = {key: window.place_order(key, "BUY", 1, window.calculate_mid_price(key), enable_chasing=True)
+                     for key in keys}
+
+        # Poisson one-tick mid moves (~1 every 3 s per contract)
+        moves = []
+        for key in keys:
+            t = 0.0
+            while True:
+                t += random.expovariate(1 / 3.0)
+                if t >= duration:
+                    break
+                moves.append((t, key, random.choice((-tick, tick))))
+        moves.sort()
+
+        unserved = {}  # order_id -> (time of its first mid move not yet reflected in the order price, key)
+        lags, overshoots, tick_cost = [], [], []
+
+        def target_price(order_id, key):
+            """Price the chaser should have working for the current quote: mid + give-ins, capped at the ask"""
+            mid = window.calculate_mid_price(key)
+            step = window.instrument['tick_size_above_3'] if mid >= 3.0 else tick
+            price = window.round_to_option_tick(mid + window.chasing_orders[order_id].give_in_count * step)
+            return min(price, window.get_bid_ask(key)[1])
+
+        def collect():
+            """A mid move is served once its order carries the price for the current quote"""
+            for order_id, (first_move, key) in list(unserved.items()):
+                if abs(window.chasing_orders[order_id].last_price - target_price(order_id, key)) > 1e-9:
+                    continue
+                times = sends[order_id]
+                # Served by the latest placeOrder, or already at the right price (nothing to send)
+                served_at = times[-1] if times[-1] >= first_move else first_move
+                previous = [t for t in times if t < served_at]
+                # Earliest the chaser may send: the move itself, or the end of the modify window
+                allowed_at = max(first_move, previous[-1] + min_modify) if previous else first_move
+                lags.append(served_at - first_move)
+                overshoots.append(max(0.0, served_at - allowed_at))
+                del unserved[order_id]
+
+        t0 = time.monotonic()
+        for at, key, step in moves:
+            while time.monotonic() - t0 < at:
+                app.processEvents()  # chase_timer deadlines (give-ins, rate-limit windows)
+                collect()
+                time.sleep(0.0005)
+            bids[key] = max(tick, bids[key] + step)
+            moved_at = time.monotonic()
+            unserved.setdefault(order_ids[key], (moved_at, key))
+            window.on_market_data_tick(key, 'bid', bids[key])
+            window.on_market_data_tick(key, 'ask', bids[key] + 4 * tick)
+            tick_cost.append(time.monotonic() - moved_at)
+            collect()
+        for order_id in list(window.chasing_orders):
+            window._stop_chasing(order_id, "Benchmark done")
+        window.hide()  # close() asks for confirmation
+    finally:
+        main.logger.setLevel(log_level)
+        sys.stdout = stdout
+        os.chdir(cwd)
+        workdir.cleanup()
+
+    lags.sort()
+    overshoots.sort()
+    reprices = sum(len(times) - 1 for times in sends.values())
+    print(f"  Mid move -> placeOrder  mean {sum(lags) / len(lags) * 1000:6.0f} ms | "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1000:6.0f} ms | {len(lags)} moves served "
+          f"(min modify interval {min_modify:.0f} s)")
+    print(f"  Past the rate limit     mean {sum(overshoots) / len(overshoots) * 1000:6.1f} ms | "
+          f"p99 {overshoots[int(len(overshoots) * 0.99)] * 1000:6.1f} ms (send time - earliest allowed send)")
+    print(f"  {reprices} reprices | quote tick incl. chaser {sum(tick_cost) / len(tick_cost) * 1e6:6.0f} us (2 ticks)")
+    print()
+
+
+def bench_order_book():
+    """Working-order lookups: linear scans of a dict of dicts vs the indexed OrderBook"""
+    import random
+    from main import ContractRegistry, OrderBook
+
+    _print_header("Order book - 300 working orders over 60 contracts")
+
+    random.seed(23)
+    registry = ContractRegistry()
+    keys = [f"XSP_{680.0 + i // 2}_{'CP'[i % 2]}_20251212" for i in range(60)]
+    loose, book = {}, OrderBook(registry)
+    for order_id in range(1, 301):
+        fields = {'contract_key': random.choice(keys), 'action': random.choice(('BUY', 'SELL')),
+                  'quantity': 1, 'price': 1.0, 'status': 'Submitted', 'filled': 0,
+                  'is_automated': random.random() < 0.3, 'mid_price': 1.0}
+        loose[order_id] = dict(fields)
+        book[order_id] = fields
+    target = keys[7]
+
+    def scan_last_buy():
+        for order_id, info in sorted(loose.items(), reverse=True):
+            if info.get('contract_key') == target and info.get('action') == 'BUY':
+                return order_id
+
+    def scan_automated_puts():
+        return [order_id for order_id, info in loose.items()
+                if info.get('is_automated') and info.get('action') == 'BUY'
+                and info['contract_key'].split('_')[2] == 'P']
+
+    rows = [
+        ("Last BUY for a contract", scan_last_buy, lambda: book.last_order_for(target, 'BUY')),
+        ("Automated PUT entries", scan_automated_puts,
+         lambda: book.select(right='P', action='BUY', automated=True)),
+    ]
+    for label, scan, indexed in rows:
+        scan_us = _timeit(scan, 2000)
+        indexed_us = _timeit(indexed, 2000)
+        print(f"  {label:<26} scan {scan_us:7.1f} us | indexed {indexed_us:6.1f} us ({scan_us / indexed_us:5.1f}x)")
+    print()
+
+
+def bench_combo_orders():
+    """Chased straddle entries through the real MainWindow: one order per leg vs one BAG combo"""
+    import io
+    import logging
+    import random
+    import tempfile
+    import main
+    from PyQt6.QtCore import QTimer
+    from main import ConnectionState, MainWindow, combo_leg_keys
+
+    app = _qt_app()
+    straddles, timeout, con_id_rtt_ms = 6, 30.0, 40
+    _print_header(f"Combo orders - {straddles} chased straddle entries per mode, fill at the natural side "
+                  f"(real time)")
+
+    cwd, workdir = os.getcwd(), tempfile.TemporaryDirectory()
+    os.chdir(workdir.name)
+    log_level = main.logger.level
+    main.logger.setLevel(logging.WARNING)
+    stdout, sys.stdout = sys.stdout, io.StringIO()
+    results = {}
+    try:
+        window = MainWindow()
+        window.update_ts_orders_display = lambda: None
+        client = window.ibkr_client
+        window.connection_state = ConnectionState.CONNECTED
+        window.app_state['data_server_ok'] = True
+        window.app_state['next_order_id'] = 1
+        symbol, expiry = window.instrument['options_symbol'], window.current_expiry
+        tick = window.instrument['tick_size_below_3']
+
+        for mode in ("One order per leg", "BAG combo"):
+            counts = {'placeOrder': 0, 'cancelOrder': 0, 'reqContractDetails': 0}
+            working = {}  # order_id -> limit price IB is working
+
+            def place(order_id, contract, order):
+                counts['placeOrder'] += 1
+                working[order_id] = order.lmtPrice
+
+            def contract_details(req_id, contract):
+                counts['reqContractDetails'] += 1
+                con_id = 100000 + req_id
+                QTimer.singleShot(con_id_rtt_ms, lambda: (window.on_contract_details(req_id, con_id),
+                                                          window.on_contract_details_end(req_id)))
+
+            client.placeOrder = place
+            client.cancelOrder = lambda *args, **kwargs: counts.__setitem__('cancelOrder', counts['cancelOrder'] + 1)
+            client.reqContractDetails = contract_details
+            client.reqMktData = client.cancelMktData = lambda *args, **kwargs: None
+
+            # Same legs and quote script for both modes (fresh strikes so conIds start unresolved)
+            random.seed(25)
+            base = 6800.0 if mode.startswith("One") else 7000.0
+            pairs = [(f"{symbol}_{base + 5 * i}_C_{expiry}", f"{symbol}_{base + 5 * i}_P_{expiry}")
+                     for i in range(straddles)]
+            bids = {}
+            for pair in pairs:
+                for key in pair:
+                    bids[key] = round(random.uniform(1.0, 2.5) / tick) * tick
+                    window.on_market_data_tick(key, 'bid', bids[key])
+                    window.on_market_data_tick(key, 'ask', bids[key] + 2 * tick)
+            moves = []
+            for key in bids:
+                t = 0.0
+                while t < timeout:
+                    t += random.expovariate(1 / 3.0)
+                    moves.append((t, key, random.choice((-tick, tick))))
+            moves.sort()
+
+            placed_at, leg_fills = {}, {}  # straddle -> placement time / leg key -> fill time
+            t0 = time.monotonic()
+            for pair in pairs:
+                placed_at[pair] = time.monotonic()
+                mids = [window.calculate_mid_price(key) for key in pair]
+                if mode.startswith("One"):
+                    for key, mid in zip(pair, mids):
+                        window.place_order(key, "BUY", 1, mid, enable_chasing=True, mid_price=mid)
+                else:
+                    window.place_combo_order(list(pair), "BUY", 1, window.round_to_option_tick(sum(mids)),
+                                             enable_chasing=True, mid_price=sum(mids))
+
+            def exchange(now):
+                """Fill every working order whose price reached the natural side (ask / sum of leg asks)"""
+                for order_id, price in list(working.items()):
+                    info = window.pending_orders.get(order_id)
+                    if info is None:
+                        continue
+                    keys = combo_leg_keys(info.contract_key) or (info.contract_key,)
+                    if price < sum(window.get_bid_ask(key)[1] for key in keys) - 1e-9:
+                        continue
+                    window._stop_chasing(order_id, "Filled")
+                    del window.pending_orders[order_id]
+                    del working[order_id]
+                    for key in keys:
+                        leg_fills[key] = now
+
+            pending_moves = iter(moves)
+            next_move = next(pending_moves)
+            while len(leg_fills) < 2 * straddles and time.monotonic() - t0 < timeout:
+                app.processEvents()
+                now = time.monotonic()
+                while next_move is not None and now - t0 >= next_move[0]:
+                    _, key, step = next_move
+                    bids[key] = max(tick, bids[key] + step)
+                    window.on_market_data_tick(key, 'bid', bids[key])
+                    window.on_market_data_tick(key, 'ask', bids[key] + 2 * tick)
+                    next_move = next(pending_moves, None)
+                exchange(now)
+                time.sleep(0.0005)
+            for order_id in list(window.chasing_orders):
+                window._stop_chasing(order_id, "Benchmark done")
+            for order_id in list(working):
+                window.pending_orders.pop(order_id, None)
+
+            filled = [pair for pair in pairs if all(key in leg_fills for key in pair)]
+            fill_times = sorted(max(leg_fills[key] for key in pair) - placed_at[pair] for pair in filled)
+            legging = sorted(abs(leg_fills[pair[0]] - leg_fills[pair[1]]) for pair in filled)
+            results[mode] = (counts, fill_times, legging, len(filled))
+        window.hide()  # close() asks for confirmation
+    finally:
+        main.logger.setLevel(log_level)
+        sys.stdout = stdout
+        os.chdir(cwd)
+        workdir.cleanup()
+
+    for mode, (counts, fill_times, legging, filled) in results.items():
+        messages = counts['placeOrder'] + counts['cancelOrder'] + counts['reqContractDetails']
+        print(f"  {mode:<18} placeOrder {counts['placeOrder']:3d} | cancelOrder {counts['cancelOrder']:2d} | "
+              f"reqContractDetails {counts['reqContractDetails']:2d} -> {messages / straddles:4.1f} msgs/straddle")
+        if fill_times:
+            print(f"  {'':<18} {filled}/{straddles} filled | place -> both legs mean {sum(fill_times) / filled:5.2f} s "
+                  f"max {fill_times[-1]:5.2f} s | legged exposure mean {sum(legging) / filled:5.2f} s "
+                  f"max {legging[-1]:5.2f} s")
+        else:
+            print(f"  {'':<18} 0/{straddles} filled within {timeout:.0f} s")
+    print(f"  (conId lookups answered after {con_id_rtt_ms} ms, once per leg - cached for later combos; "
+          f"a BAG fills both legs at once)")
+    print()
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+BENCHMARKS = {
+    'chain_rows': bench_chain_rows,
+    'local_greeks': bench_local_greeks,
+    'strike_selection': bench_strike_selection,
+    'underlying_chart': bench_underlying_chart,
+    'bar_store': bench_bar_store,
+    'indicators': bench_indicators,
+    'candle_geometry': bench_candle_geometry,
+    'downsampling': bench_downsampling,
+    'bar_cache': bench_bar_cache,
+    'offthread_render': bench_offthread_render,
+    'hidden_renders': bench_hidden_renders,
+    'order_chaser': bench_order_chaser,
+    'order_book': bench_order_book,
+    'combo_orders': bench_combo_orders,
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        command = sys.argv[1].lower()
+
+        if command == 'list':
+            for name, func in BENCHMARKS.items():
+                print(f"  {name:<20} {func.__doc__}")
+        elif command in BENCHMARKS:
+            BENCHMARKS[command]()
+        else:
+            print(f"❌ Unknown benchmark '{command}'. Use 'python benchmarks.py list'")
+            sys.exit(1)
+    else:
+        for func in BENCHMARKS.values():
+            func()
@@ -157,6 +157,7 @@ ENV_CONFIG = {
         # File paths (SEPARATED: Environment-specific data files)
         'settings_file': 'settings_dev.json',    # Dev-only settings
         'positions_file': 'positions_dev.json',  # Dev-only positions
+        'bar_cache_dir': 'bar_cache_dev',        # Dev-only historical bar cache
         'log_dir': 'logs_dev',                   # Dev-only logs
         'log_prefix': 'DEV_',
         
@@ -194,6 +195,7 @@ ENV_CONFIG = {
         # File paths (SEPARATED: Environment-specific data files)  
         'settings_file': 'settings_prod.json',   # Prod-only settings
         'positions_file': 'positions_prod.json', # Prod-only positions
+        'bar_cache_dir': 'bar_cache_prod',       # Prod-only historical bar cache
         'log_dir': 'logs_prod',                  # Prod-only logs
         'log_prefix': 'PROD_',
         
@@ -30,17 +30,23 @@ CRITICAL TIMEZONE CONFIGURATION:
 """
 
 import sys
+import copy
 import json
+import pickle
 import math
+import multiprocessing
 import threading
 import time
+import bisect
+import heapq
 import logging
 from logging.handlers import RotatingFileHandler
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
+from collections.abc import MutableMapping
 import csv
 import pytz  # For timezone-aware datetime (CENTRAL TIME - America/Chicago ONLY)
 
@@ -193,7 +199,7 @@ try:
 )
     from PyQt6.QtCore import (  # type: ignore[import-untyped]
         Qt, QTimer, pyqtSignal, QObject, QThread, pyqtSlot, QMargins, QMetaObject, Q_ARG,
-        QDateTime, QTime
+        QDateTime, QTime, QEvent
     )
     from PyQt6.QtGui import QColor, QFont, QPalette, QPainter  # type: ignore[import-untyped]
     logger.info("PyQt6 loaded successfully")
@@ -236,6 +242,8 @@ import mplfinance as mpf
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backend_bases import DrawEvent
 from matplotlib.patches import Rectangle
 import matplotlib.dates as mdates
 logger.info("Chart libraries loaded successfully")
@@ -244,9 +252,9 @@ logger.info("Chart libraries loaded successfully")
 logger.info("Loading IBKR API modules...")
 from ibapi.client import EClient
 from ibapi.wrapper import EWrapper
-from ibapi.contract import Contract
+from ibapi.contract import Contract, ComboLeg
 from ibapi.order import Order
-from ibapi.common import TickerId, TickAttrib
+from ibapi.common import TickerId, TickAttrib, UNSET_DOUBLE
 from ibapi.ticktype import TickType
 logger.info("IBKR API loaded successfully")
 
@@ -397,7 +405,7 @@ INSTRUMENT_CONFIG = {
 # ============================================================================
 # Note: Greeks (delta, gamma, theta, vega, IV) are calculated by IBKR
 # and received via tickOptionComputation callback using mid-price model.
-# No local Black-Scholes calculation needed.
+# The local greeks engine only fills in until IBKR greeks arrive.
 # ============================================================================
 
 class ConnectionState(Enum):
@@ -406,6 +414,1374 @@ class ConnectionState(Enum):
     CONNECTED = "CONNECTED"
 
 
+# ============================================================================
+# CONTRACT REGISTRY (interned contracts with integer IDs)
+# ============================================================================
+# Contract keys ("XSP_686.0_C_20251112") are the human-readable identity used
+# in positions.json, settings and the CSV trade logs. Hot paths (ticks, greeks,
+# chain lookups, delta selection) should not rebuild or split('_') those strings
+# on every update - instead each contract is interned once into a compact
+# ContractRecord with a stable integer id and pre-parsed fields.
+# ============================================================================
+
+class ContractRecord:
+    """Interned option contract: integer id + parsed fields + cached IB Contract"""
+    __slots__ = ('id', 'key', 'symbol', 'strike', 'right', 'expiry', 'contract', 'con_id')
+
+    def __init__(self, contract_id: int, key: str, symbol: str, strike: float,
+                 right: str, expiry: str, contract: Optional[Contract] = None):
+        self.id = contract_id
+        self.key = key  # Canonical "{SYMBOL}_{STRIKE float}_{RIGHT}_{EXPIRY}" string
+        self.symbol = symbol
+        self.strike = strike
+        self.right = right
+        self.expiry = expiry
+        self.contract = contract  # IB Contract built by us (safe to reuse for reqMktData)
+        self.con_id = 0  # IB conId once seen in a callback (needed for combo legs), 0 = unknown
+
+    def __repr__(self):
+        return f"ContractRecord(id={self.id}, key={self.key})"
+
+
+class ContractRegistry:
+    """
+    Interns option contracts into ContractRecords.
+
+    Thread-safe: interning may happen on the IBKR reader thread (position/openOrder
+    callbacks) and on the GUI thread (chain builds). Lookups of already-interned
+    keys are lock-free dict reads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: List[ContractRecord] = []  # contract_id -> record (id is the list index)
+        self._by_key: Dict[str, ContractRecord] = {}  # canonical key AND alias keys -> record
+        self._by_fields: Dict[Tuple[str, float, str, str], ContractRecord] = {}
+
+    @staticmethod
+    def make_key(symbol: str, strike: float, right: str, expiry: str) -> str:
+        """Build canonical contract key - strike is ALWAYS formatted as float (IB convention)"""
+        return f"{symbol}_{float(strike)}_{right}_{expiry}"
+
+    def intern(self, symbol: str, strike: float, right: str, expiry: str,
+               contract: Optional[Contract] = None) -> ContractRecord:
+        """Return the record for these fields, creating it on first sight"""
+        fields = (symbol, float(strike), right, expiry)
+        record = self._by_fields.get(fields)
+        if record is None:
+            with self._lock:
+                record = self._by_fields.get(fields)
+                if record is None:
+                    key = self.make_key(*fields)
+                    record = ContractRecord(len(self._records), key, *fields)
+                    self._records.append(record)
+                    self._by_fields[fields] = record
+                    self._by_key[key] = record
+        if contract is not None and record.contract is None:
+            record.contract = contract
+        return record
+
+    def intern_key(self, contract_key: str) -> Optional[ContractRecord]:
+        """Resolve a contract key string (parsing it only the first time it is seen)"""
+        record = self._by_key.get(contract_key)
+        if record is not None:
+            return record
+        if not contract_key or contract_key.startswith('ATM_SCAN_'):
+            return None
+        parts = contract_key.split('_')
+        if len(parts) != 4:
+            return None
+        try:
+            record = self.intern(parts[0], float(parts[1]), parts[2], parts[3])
+        except ValueError:
+            return None
+        # Remember non-canonical spellings (e.g. "SPX_6740_C_...") as aliases
+        self._by_key[contract_key] = record
+        return record
+
+    def intern_contract(self, contract: Contract) -> ContractRecord:
+        """Resolve an IB Contract from a callback (positions, open orders, executions, details)"""
+        record = self.intern(contract.symbol, contract.strike, contract.right,
+                             contract.lastTradeDateOrContractMonth[:8])
+        if contract.conId and not record.con_id:
+            record.con_id = contract.conId
+        return record
+
+    def get(self, contract_id: int) -> ContractRecord:
+        """Record by integer id"""
+        return self._records[contract_id]
+
+    def lookup(self, contract_key: str) -> Optional[ContractRecord]:
+        """Record for an already-interned key (never parses)"""
+        return self._by_key.get(contract_key)
+
+    def __len__(self):
+        return len(self._records)
+
+
+# ============================================================================
+# SUBSCRIPTION REGISTRY (market data lines)
+# ============================================================================
+# One place that knows, in O(1):
+#   reqId -> contract_key     (app_state['market_data_map'], read by IBKRWrapper)
+#   contract_key -> reqId     (reverse index - "is this contract subscribed?")
+#   reqId -> chain types      (reference counts for lines shared between chains)
+#   chain type -> reqIds      (what to release when a chain is rebuilt)
+#   contract_key -> order ids (open orders that need the line kept alive)
+# Mutations may come from the IBKR reader thread (position callbacks), so all
+# structural changes are made under a lock.
+# ============================================================================
+
+class SubscriptionRegistry:
+    """Bidirectional market data subscription index with live line stats"""
+
+    def __init__(self, market_data_map: dict):
+        self._lock = threading.RLock()
+        self._req_to_key = market_data_map  # Shared dict: reqId -> contract_key
+        self._key_to_req: Dict[str, int] = {}
+        self._chain_refs: Dict[int, set] = {}  # reqId -> {chain_type, ...}
+        self._chain_req_ids: Dict[str, List[int]] = {'main': [], 'ts_0dte': [], 'ts_1dte': []}
+        self._orders_by_key: Dict[str, set] = {}  # contract_key -> {order_id, ...}
+        self._order_key: Dict[int, Tuple[str, ...]] = {}  # order_id -> contract keys (every leg of a combo)
+        self.peak_lines = 0
+
+    # ---- reqId <-> contract -------------------------------------------------
+
+    def add(self, req_id: int, contract_key: str, chain_type: Optional[str] = None):
+        """Register a new market data line (optionally owned by a chain)"""
+        with self._lock:
+            self._req_to_key[req_id] = contract_key
+            self._key_to_req[contract_key] = req_id
+            if chain_type:
+                self._chain_refs.setdefault(req_id, set()).add(chain_type)
+            self.peak_lines = max(self.peak_lines, len(self._req_to_key))
+
+    def remove(self, req_id: int) -> Optional[str]:
+        """Forget a line (caller cancels it with IBKR). Returns its contract key."""
+        with self._lock:
+            contract_key = self._req_to_key.pop(req_id, None)
+            self._chain_refs.pop(req_id, None)
+            if isinstance(contract_key, str) and self._key_to_req.get(contract_key) == req_id:
+                del self._key_to_req[contract_key]
+            return contract_key
+
+    def req_id_for(self, contract_key: str) -> Optional[int]:
+        return self._key_to_req.get(contract_key)
+
+    def contract_for(self, req_id: int) -> Optional[str]:
+        return self._req_to_key.get(req_id)
+
+    def is_subscribed(self, contract_key: str) -> bool:
+        return contract_key in self._key_to_req
+
+    # ---- chain reference counting -------------------------------------------
+
+    def add_chain_ref(self, req_id: int, chain_type: str):
+        with self._lock:
+            self._chain_refs.setdefault(req_id, set()).add(chain_type)
+
+    def release_chain(self, req_id: int, chain_type: str) -> Optional[set]:
+        """Drop a chain's reference. Returns remaining chains, or None if reqId is untracked."""
+        with self._lock:
+            refs = self._chain_refs.get(req_id)
+            if refs is None:
+                return None
+            refs.discard(chain_type)
+            return refs
+
+    def chain_refs(self, req_id: int) -> set:
+        return self._chain_refs.get(req_id, set())
+
+    def in_chain(self, contract_key: str) -> bool:
+        """True if the contract's line is used by any displayed chain"""
+        req_id = self._key_to_req.get(contract_key)
+        return req_id is not None and bool(self._chain_refs.get(req_id))
+
+    def chain_req_ids(self, chain_type: str) -> List[int]:
+        return self._chain_req_ids.get(chain_type, [])
+
+    def set_chain_req_ids(self, chain_type: str, req_ids: List[int]):
+        self._chain_req_ids[chain_type] = req_ids
+
+    # ---- open orders per contract -------------------------------------------
+
+    def add_order(self, order_id: int, contract_key: str):
+        """Register an open order (a combo key registers the order on each of its legs)"""
+        keys = combo_leg_keys(contract_key) or (contract_key,)
+        with self._lock:
+            self._order_key[order_id] = keys
+            for key in keys:
+                self._orders_by_key.setdefault(key, set()).add(order_id)
+
+    def remove_order(self, order_id: int):
+        with self._lock:
+            for contract_key in self._order_key.pop(order_id, ()):
+                orders = self._orders_by_key.get(contract_key)
+                if orders is not None:
+                    orders.discard(order_id)
+                    if not orders:
+                        del self._orders_by_key[contract_key]
+
+    def open_orders_for(self, contract_key: str) -> set:
+        return self._orders_by_key.get(contract_key, set())
+
+    def has_open_orders(self, contract_key: str) -> bool:
+        return contract_key in self._orders_by_key
+
+    def clear_orders(self):
+        with self._lock:
+            self._order_key.clear()
+            self._orders_by_key.clear()
+
+    # ---- housekeeping -------------------------------------------------------
+
+    def clear(self):
+        """Forget all lines (after cancelling everything / on disconnect)"""
+        with self._lock:
+            self._req_to_key.clear()
+            self._key_to_req.clear()
+            self._chain_refs.clear()
+            for chain_type in self._chain_req_ids:
+                self._chain_req_ids[chain_type] = []
+
+    def line_count(self) -> int:
+        return len(self._req_to_key)
+
+    def get_stats(self) -> dict:
+        """Live line usage breakdown"""
+        with self._lock:
+            per_chain = {chain_type: 0 for chain_type in self._chain_req_ids}
+            shared = 0
+            for refs in self._chain_refs.values():
+                for chain_type in refs:
+                    per_chain[chain_type] = per_chain.get(chain_type, 0) + 1
+                if len(refs) > 1:
+                    shared += 1
+            chain_lines = sum(1 for refs in self._chain_refs.values() if refs)
+            return {
+                'live_lines': len(self._req_to_key),
+                'peak_lines': self.peak_lines,
+                'chain_lines': chain_lines,
+                'non_chain_lines': len(self._req_to_key) - chain_lines,
+                'shared_lines': shared,
+                'per_chain': per_chain,
+                'contracts_with_orders': len(self._orders_by_key),
+            }
+
+
+# ============================================================================
+# ORDER BOOK (working orders)
+# ============================================================================
+# Working orders are compact slotted WorkingOrder records (order fields plus the
+# mid-price chase state), held in an OrderBook that indexes them by contract,
+# by side (right + action) and by source (automated/manual). Questions such as
+# "last BUY for this contract" or "automated PUT entries still working" touch
+# only the matching orders instead of scanning every pending order.
+# Records keep dict-style access, so unconverted code reading
+# order_info['action'] / .get('is_automated', False) keeps working.
+# ============================================================================
+
+_WORKING_ORDER_FIELDS = (
+    'order_id', 'contract_key', 'action', 'quantity', 'price', 'status', 'filled',
+    'is_automated', 'mid_price', 'cancel_requested', 'legs', 'stop_price',
+    # Mid-price chase state (set when the order is chased - see MainWindow._chase_order)
+    'contract', 'order', 'initial_mid', 'last_mid', 'last_price', 'give_in_count',
+    'give_in_due', 'attempts', 'placed_at', 'modified_at', 'wake_at',
+)
+_WORKING_ORDER_FIELD_SET = frozenset(_WORKING_ORDER_FIELDS)
+_WORKING_ORDER_INDEXED = frozenset(('contract_key', 'action', 'is_automated'))
+
+
+class WorkingOrder(MutableMapping):
+    """One working order (slotted) with dict-style field access"""
+    __slots__ = _WORKING_ORDER_FIELDS + ('right', '_book')
+
+    def __init__(self, order_id: int, contract_key: str, action: str, quantity: int,
+                 price: float = 0.0, status: str = 'Submitted', filled: float = 0,
+                 is_automated: bool = False, mid_price: float = 0.0, cancel_requested: bool = False,
+                 legs: Optional[Dict[str, float]] = None, stop_price: float = 0.0, **chase_state):
+        object.__setattr__(self, '_book', None)
+        self.order_id = order_id
+        self.contract_key = contract_key
+        self.action = action
+        self.quantity = quantity
+        self.price = price
+        self.status = status
+        self.filled = filled
+        self.is_automated = is_automated
+        self.mid_price = mid_price  # Unrounded mid at placement (slippage tracking)
+        self.cancel_requested = cancel_requested  # cancelOrder sent, waiting for IBKR to confirm
+        self.legs = legs  # Combo (BAG) orders: leg contract_key -> leg mid at placement, else None
+        self.stop_price = stop_price  # STP orders: trigger level (price is 0 - market once triggered)
+        self.right = ''  # Option right, resolved by the OrderBook when indexed
+        self.contract = None  # Stored IB Contract/Order objects - reused for modifications (Error 105)
+        self.order = None
+        self.initial_mid = 0.0
+        self.last_mid = 0.0
+        self.last_price = 0.0  # Actual order price (differs from mid during "give in")
+        self.give_in_count = 0
+        self.give_in_due = 0.0  # Monotonic time of the next give-in tick
+        self.attempts = 1
+        self.placed_at = time.monotonic()  # Monotonic placement time (time-to-fill)
+        self.modified_at = self.placed_at  # Monotonic time of last placeOrder (IB rate limit)
+        self.wake_at = None  # Scheduled chase deadline (None = waiting on quotes)
+        for field, value in chase_state.items():
+            self[field] = value
+
+    def __setattr__(self, name, value):
+        book = self._book
+        if book is not None and name in _WORKING_ORDER_INDEXED:
+            book._reindex(self, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __getitem__(self, field):
+        if field in _WORKING_ORDER_FIELD_SET:
+            return getattr(self, field)
+        raise KeyError(field)
+
+    def get(self, field, default=None):
+        if field in _WORKING_ORDER_FIELD_SET:
+            return getattr(self, field)
+        return default
+
+    def __setitem__(self, field, value):
+        if field not in _WORKING_ORDER_FIELD_SET:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __delitem__(self, field):
+        raise TypeError("WorkingOrder fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(_WORKING_ORDER_FIELDS)
+
+    def __len__(self):
+        return len(_WORKING_ORDER_FIELDS)
+
+    def __repr__(self):
+        return (f"WorkingOrder(#{self.order_id} {self.action} {self.quantity} {self.contract_key} "
+                f"@ {f'STP {self.stop_price:.2f}' if self.stop_price else f'{self.price:.2f}'}, {self.status})")
+
+
+class OrderBook(MutableMapping):
+    """
+    order_id -> WorkingOrder, indexed by contract, side and source.
+
+    Thread-safe: the IBKR reader thread reads it (position callbacks) and corrects
+    is_automated (openOrder), so structural changes and index reads take a lock.
+    """
+
+    def __init__(self, registry: ContractRegistry):
+        self._lock = threading.RLock()
+        self._registry = registry
+        self._orders: Dict[int, WorkingOrder] = {}
+        self._by_contract: Dict[str, set] = {}  # contract_key -> {order_id, ...}
+        self._by_side: Dict[Tuple[str, str], set] = {}  # (right, action) -> {order_id, ...}
+        self._by_source: Dict[bool, set] = {True: set(), False: set()}  # is_automated -> {order_id, ...}
+        self._by_leg: Dict[str, set] = {}  # leg contract_key -> {combo order_id, ...}
+
+    # ---- index maintenance --------------------------------------------------
+
+    def _index(self, working: WorkingOrder):
+        order_id = working.order_id
+        self._by_contract.setdefault(working.contract_key, set()).add(order_id)
+        self._by_side.setdefault((working.right, working.action), set()).add(order_id)
+        self._by_source[bool(working.is_automated)].add(order_id)
+        for leg_key in combo_leg_keys(working.contract_key):
+            self._by_leg.setdefault(leg_key, set()).add(order_id)
+
+    def _unindex(self, working: WorkingOrder):
+        order_id = working.order_id
+        entries = [(self._by_contract, working.contract_key),
+                   (self._by_side, (working.right, working.action))]
+        entries.extend((self._by_leg, leg_key) for leg_key in combo_leg_keys(working.contract_key))
+        for index, key in entries:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(order_id)
+                if not ids:
+                    del index[key]
+        self._by_source[bool(working.is_automated)].discard(order_id)
+
+    def _reindex(self, working: WorkingOrder, field: str, value):
+        """Change an indexed field of a booked order (called by WorkingOrder.__setattr__)"""
+        with self._lock:
+            self._unindex(working)
+            object.__setattr__(working, field, value)
+            if field == 'contract_key':
+                object.__setattr__(working, 'right', self._right_of(value))
+            self._index(working)
+
+    def _right_of(self, contract_key: str) -> str:
+        record = self._registry.intern_key(contract_key)
+        return record.right if record is not None else ''
+
+    # ---- mapping interface --------------------------------------------------
+
+    def __getitem__(self, order_id: int) -> WorkingOrder:
+        return self._orders[order_id]
+
+    def get(self, order_id: int, default=None):
+        return self._orders.get(order_id, default)
+
+    def __contains__(self, order_id) -> bool:
+        return order_id in self._orders
+
+    def __setitem__(self, order_id: int, value):
+        """Book an order (a WorkingOrder, or a dict of its fields)"""
+        if not isinstance(value, WorkingOrder):
+            value = WorkingOrder(order_id, **value)
+        with self._lock:
+            previous = self._orders.get(order_id)
+            if previous is not None:
+                self._unindex(previous)
+                object.__setattr__(previous, '_book', None)
+            object.__setattr__(value, 'order_id', order_id)
+            object.__setattr__(value, 'right', self._right_of(value.contract_key))
+            object.__setattr__(value, '_book', self)
+            self._orders[order_id] = value
+            self._index(value)
+
+    def __delitem__(self, order_id: int):
+        with self._lock:
+            working = self._orders.pop(order_id)
+            self._unindex(working)
+            object.__setattr__(working, '_book', None)
+
+    def __iter__(self):
+        return iter(list(self._orders))
+
+    def __len__(self):
+        return len(self._orders)
+
+    def items(self):
+        return list(self._orders.items())
+
+    def clear(self):
+        with self._lock:
+            for working in self._orders.values():
+                object.__setattr__(working, '_book', None)
+            self._orders.clear()
+            self._by_contract.clear()
+            self._by_side.clear()
+            self._by_leg.clear()
+            for ids in self._by_source.values():
+                ids.clear()
+
+    # ---- indexed queries ----------------------------------------------------
+
+    def has_contract(self, contract_key: str) -> bool:
+        return contract_key in self._by_contract
+
+    def has_leg(self, contract_key: str) -> bool:
+        """True if a working combo order has this contract as one of its legs"""
+        return contract_key in self._by_leg
+
+    def combos_on(self, contract_key: str) -> List[WorkingOrder]:
+        """Working combo orders with this contract as a leg, oldest first"""
+        with self._lock:
+            matches = [self._orders[order_id] for order_id in self._by_leg.get(contract_key, ())]
+        matches.sort(key=lambda working: working.order_id)
+        return matches
+
+    def select(self, contract_key: Optional[str] = None, right: Optional[str] = None,
+               action: Optional[str] = None, automated: Optional[bool] = None) -> List[WorkingOrder]:
+        """Orders matching every given criterion, oldest first (cost ~ smallest matching index)"""
+        with self._lock:
+            candidates = []
+            if contract_key is not None:
+                candidates.append(self._by_contract.get(contract_key, ()))
+            if right is not None or action is not None:
+                candidates.append(set().union(*(
+                    ids for (side_right, side_action), ids in self._by_side.items()
+                    if (right is None or side_right == right) and (action is None or side_action == action)
+                )))
+            if automated is not None:
+                candidates.append(self._by_source[bool(automated)])
+            ids = min(candidates, key=len) if candidates else self._orders
+            matches = []
+            for order_id in ids:
+                working = self._orders[order_id]
+                if ((contract_key is None or working.contract_key == contract_key)
+                        and (right is None or working.right == right)
+                        and (action is None or working.action == action)
+                        and (automated is None or bool(working.is_automated) == automated)):
+                    matches.append(working)
+        matches.sort(key=lambda working: working.order_id)
+        return matches
+
+    def last_order_for(self, contract_key: str, action: str) -> Optional[WorkingOrder]:
+        """Most recent (highest id) order for a contract and action"""
+        matches = self.select(contract_key=contract_key, action=action)
+        return matches[-1] if matches else None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'orders': len(self._orders),
+                'contracts': len(self._by_contract),
+                'automated': len(self._by_source[True]),
+                'manual': len(self._by_source[False]),
+                'combos': len({order_id for ids in self._by_leg.values() for order_id in ids}),
+            }
+
+
+# ============================================================================
+# COMBO (BAG) ORDERS
+# ============================================================================
+# Two-leg strategies (straddles, strangles) go to IB as one BAG contract instead
+# of one order per leg: half the placeOrder/modify traffic, and no leg risk
+# between the two fills. A combo is tracked as a single WorkingOrder whose
+# contract_key joins its legs ("XSP_680.0_C_20251212+XSP_670.0_P_20251212");
+# the chaser prices it from the summed leg quotes and reprices on ticks of
+# either leg. Legs need IB conIds - cached on ContractRecord from callbacks,
+# requested with reqContractDetails when missing.
+# ============================================================================
+
+COMBO_KEY_SEPARATOR = '+'
+COMBO_CON_ID_TIMEOUT_MS = 3000  # Waiting this long for leg conIds -> fall back to one order per leg
+
+
+def make_combo_key(leg_keys) -> str:
+    """Combo identity from its leg contract keys (order preserved)"""
+    return COMBO_KEY_SEPARATOR.join(leg_keys)
+
+
+def combo_leg_keys(contract_key: str) -> Tuple[str, ...]:
+    """Leg contract keys of a combo key, () for a single contract"""
+    if contract_key and COMBO_KEY_SEPARATOR in contract_key:
+        return tuple(contract_key.split(COMBO_KEY_SEPARATOR))
+    return ()
+
+
+# ============================================================================
+# MARKET DATA LINE BUDGET
+# ============================================================================
+# IBKR caps simultaneous streaming market data lines (100 by default, more with
+# quote booster packs). Past the cap reqMktData fails with error 101 and the
+# contract simply never ticks. Every option line is requested through this
+# budget: when it is full, the lowest priority lines are downgraded to rotating
+# snapshots. Downgraded lines keep their reqId, so snapshot ticks still route
+# through market_data_map exactly like streaming ones.
+# ============================================================================
+
+LINE_PRIORITY_POSITION = 0   # Open positions (P&L, exit pricing)
+LINE_PRIORITY_ORDER = 1      # Working orders (chasing needs live bid/ask)
+LINE_PRIORITY_NEAR_ATM = 2   # Chain strikes near the money
+LINE_PRIORITY_WING = 3       # Far OTM/ITM chain strikes
+LINE_PRIORITY_NAMES = {
+    LINE_PRIORITY_POSITION: 'Positions',
+    LINE_PRIORITY_ORDER: 'Orders',
+    LINE_PRIORITY_NEAR_ATM: 'Near ATM',
+    LINE_PRIORITY_WING: 'Wings',
+}
+
+MARKET_DATA_LINE_BUDGET_MIN = 20
+MARKET_DATA_LINE_BUDGET_MAX = 1000
+MARKET_DATA_LINE_BUDGET_DEFAULT = 100  # IBKR default allowance
+MARKET_DATA_CORE_LINES = 3             # Underlying, ES, MES (subscribed outside the budget)
+LINE_BUDGET_SNAPSHOT_LINES = 4         # Lines kept free for in-flight rotating snapshots
+LINE_BUDGET_NEAR_ATM_STRIKES = 5       # Strikes either side of chain center treated as near-ATM
+LINE_BUDGET_ROTATION_MS = 1000         # Snapshot rotation / rebalance period
+LINE_BUDGET_SNAPSHOT_TIMEOUT = 12.0    # IBKR completes a snapshot within ~11 s
+
+
+class MarketDataLineBudget:
+    """Priority-based allocation of streaming market data lines"""
+
+    def __init__(self, subscriptions: 'SubscriptionRegistry', budget: int = MARKET_DATA_LINE_BUDGET_DEFAULT,
+                 is_position_key=None):
+        self._lock = threading.RLock()
+        self._subs = subscriptions
+        self._client = None
+        self._is_position_key = is_position_key or (lambda contract_key: False)
+        self.budget = budget
+        self._observed_limit: Optional[int] = None  # Streaming cap learned from error 101
+        self._contracts: Dict[int, Contract] = {}   # reqId -> IB Contract
+        self._priority: Dict[int, int] = {}         # reqId -> base priority
+        self._streaming: set = set()
+        self._snapshot: set = set()                 # Downgraded reqIds
+        self._snapshot_queue: deque = deque()       # Rotation order
+        self._inflight: Dict[int, float] = {}       # reqId -> snapshot request time
+        self.downgrades = 0
+        self.promotions = 0
+        self.rejections = 0
+        self.snapshots_sent = 0
+
+    def set_client(self, client):
+        self._client = client
+
+    def set_budget(self, budget: int):
+        with self._lock:
+            self.budget = budget
+            self._observed_limit = None
+        self.rebalance()
+
+    @property
+    def capacity(self) -> int:
+        """Streaming lines available to option contracts"""
+        capacity = max(self.budget - MARKET_DATA_CORE_LINES - LINE_BUDGET_SNAPSHOT_LINES, 0)
+        if self._observed_limit is not None:
+            capacity = min(capacity, self._observed_limit)
+        return capacity
+
+    def effective_priority(self, req_id: int) -> int:
+        """Base priority, promoted while the contract has a position or working order"""
+        priority = self._priority.get(req_id, LINE_PRIORITY_WING)
+        contract_key = self._subs.contract_for(req_id)
+        if contract_key is not None:
+            if self._is_position_key(contract_key):
+                return LINE_PRIORITY_POSITION
+            if self._subs.has_open_orders(contract_key):
+                priority = min(priority, LINE_PRIORITY_ORDER)
+        return priority
+
+    # ---- line lifecycle -----------------------------------------------------
+
+    def subscribe(self, req_id: int, contract: Contract, priority: int) -> bool:
+        """
+        Request a line for req_id (already registered in SubscriptionRegistry).
+        Returns True if streaming, False if queued as a rotating snapshot.
+        """
+        with self._lock:
+            self._contracts[req_id] = contract
+            self._priority[req_id] = priority
+            if len(self._streaming) < self.capacity:
+                self._start_stream(req_id)
+                return True
+            victim = self._lowest_streaming(worse_than=self.effective_priority(req_id))
+            if victim is not None:
+                self._downgrade(victim)
+                self._start_stream(req_id)
+                return True
+            self._queue_snapshot(req_id)
+            return False
+
+    def set_priority(self, req_id: int, priority: int):
+        """Chain recentered - the line's distance from the money changed (applied on next rebalance)"""
+        with self._lock:
+            if req_id in self._priority:
+                self._priority[req_id] = priority
+
+    def raise_priority(self, req_id: int, priority: int):
+        """A shared line picked up a more important user (e.g. reused by a near-ATM row)"""
+        with self._lock:
+            if req_id in self._priority and priority < self._priority[req_id]:
+                self._priority[req_id] = priority
+
+    def cancel(self, req_id: int):
+        """Release req_id's line (streaming or snapshot) and promote the best waiting line"""
+        with self._lock:
+            was_streaming = req_id in self._streaming
+            if (was_streaming or req_id in self._inflight) and self._client is not None:
+                self._client.cancelMktData(req_id)
+            self._streaming.discard(req_id)
+            self._snapshot.discard(req_id)
+            self._inflight.pop(req_id, None)
+            self._contracts.pop(req_id, None)
+            self._priority.pop(req_id, None)
+            if was_streaming:
+                self._fill_free_lines()
+
+    def is_tracked(self, req_id: int) -> bool:
+        return req_id in self._contracts
+
+    def is_streaming(self, req_id: int) -> bool:
+        return req_id in self._streaming
+
+    def clear(self):
+        """Forget all lines (connection lost - IBKR dropped them already)"""
+        with self._lock:
+            self._contracts.clear()
+            self._priority.clear()
+            self._streaming.clear()
+            self._snapshot.clear()
+            self._snapshot_queue.clear()
+            self._inflight.clear()
+            self._observed_limit = None
+
+    # ---- IBKR callbacks (reader thread) -------------------------------------
+
+    def on_snapshot_end(self, req_id: int):
+        with self._lock:
+            self._inflight.pop(req_id, None)
+
+    def on_line_rejected(self, req_id: int) -> bool:
+        """Error 101 (max tickers reached): shrink capacity and downgrade the line"""
+        with self._lock:
+            if req_id in self._inflight:
+                self._inflight.pop(req_id, None)
+                return True
+            if req_id not in self._streaming:
+                return False
+            self._streaming.discard(req_id)
+            self._observed_limit = len(self._streaming)
+            self.rejections += 1
+            self._queue_snapshot(req_id)
+            return True
+
+    # ---- periodic work (GUI timer) ------------------------------------------
+
+    def rebalance(self) -> Tuple[int, int]:
+        """Stream the highest priority lines that fit; returns (promoted, downgraded)"""
+        with self._lock:
+            if self._client is None:
+                return 0, 0
+            # Ties keep the current streaming line to avoid churn
+            ranked = sorted(
+                self._contracts,
+                key=lambda req_id: (self.effective_priority(req_id), req_id not in self._streaming, req_id)
+            )
+            wanted = set(ranked[:self.capacity])
+            to_downgrade = [req_id for req_id in self._streaming if req_id not in wanted]
+            to_promote = [req_id for req_id in ranked[:self.capacity] if req_id not in self._streaming]
+            for req_id in to_downgrade:
+                self._downgrade(req_id)
+            for req_id in to_promote:
+                self._start_stream(req_id)
+                self.promotions += 1
+            return len(to_promote), len(to_downgrade)
+
+    def rotate_snapshots(self) -> int:
+        """Refresh the next downgraded lines with one-shot snapshots; returns requests sent"""
+        with self._lock:
+            if self._client is None:
+                return 0
+            now = time.time()
+            for req_id, sent in list(self._inflight.items()):
+                if now - sent > LINE_BUDGET_SNAPSHOT_TIMEOUT:
+                    del self._inflight[req_id]
+            sent_count = 0
+            for _ in range(len(self._snapshot_queue)):
+                if len(self._inflight) >= LINE_BUDGET_SNAPSHOT_LINES:
+                    break
+                req_id = self._snapshot_queue.popleft()
+                if req_id not in self._snapshot:
+                    continue  # Promoted or cancelled since it was queued
+                self._snapshot_queue.append(req_id)
+                if req_id in self._inflight:
+                    continue
+                self._client.reqMktData(req_id, self._contracts[req_id], "", True, False, [])
+                self._inflight[req_id] = now
+                self.snapshots_sent += 1
+                sent_count += 1
+            return sent_count
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            by_priority = {name: [0, 0] for name in LINE_PRIORITY_NAMES.values()}
+            for req_id in self._contracts:
+                name = LINE_PRIORITY_NAMES[self.effective_priority(req_id)]
+                by_priority[name][0 if req_id in self._streaming else 1] += 1
+            return {
+                'budget': self.budget,
+                'capacity': self.capacity,
+                'observed_limit': self._observed_limit,
+                'streaming': len(self._streaming),
+                'used_lines': len(self._streaming) + len(self._inflight) + MARKET_DATA_CORE_LINES,
+                'snapshot': len(self._snapshot),
+                'inflight': len(self._inflight),
+                'by_priority': by_priority,
+                'downgrades': self.downgrades,
+                'promotions': self.promotions,
+                'rejections': self.rejections,
+                'snapshots_sent': self.snapshots_sent,
+            }
+
+    # ---- internals (lock held) ----------------------------------------------
+
+    def _start_stream(self, req_id: int):
+        if req_id in self._inflight:
+            self._client.cancelMktData(req_id)
+            del self._inflight[req_id]
+        self._snapshot.discard(req_id)
+        self._streaming.add(req_id)
+        self._client.reqMktData(req_id, self._contracts[req_id], "", False, False, [])
+
+    def _downgrade(self, req_id: int):
+        self._client.cancelMktData(req_id)
+        self._streaming.discard(req_id)
+        self.downgrades += 1
+        self._queue_snapshot(req_id)
+        logger.info(f"📉 Line budget: reqId={req_id} ({self._subs.contract_for(req_id)}) downgraded to snapshots")
+
+    def _queue_snapshot(self, req_id: int):
+        if req_id not in self._snapshot:
+            self._snapshot.add(req_id)
+            self._snapshot_queue.append(req_id)
+
+    def _lowest_streaming(self, worse_than: int) -> Optional[int]:
+        """Streaming line with the lowest priority strictly worse than worse_than"""
+        victim, victim_priority = None, worse_than
+        for req_id in self._streaming:
+            priority = self.effective_priority(req_id)
+            if priority > victim_priority or (priority == victim_priority and victim is not None and req_id > victim):
+                victim, victim_priority = req_id, priority
+        return victim
+
+    def _fill_free_lines(self):
+        free = self.capacity - len(self._streaming)
+        if free <= 0 or not self._snapshot:
+            return
+        waiting = sorted(self._snapshot, key=lambda req_id: (self.effective_priority(req_id), req_id))
+        for req_id in waiting[:free]:
+            self._start_stream(req_id)
+            self.promotions += 1
+
+
+# ============================================================================
+# COLUMNAR MARKET DATA STORE
+# ============================================================================
+# Market data lives in one NumPy structured array per (expiry, right), one row
+# ("strike slot") per strike. Selection and aggregation code (delta/risk based
+# strike selection, ATM detection, portfolio greeks) runs vectorized over a
+# whole chain. Existing code keeps using market_data[contract_key]['bid'] etc.
+# through MarketDataRow, a thin dict-style view onto a single slot.
+# ============================================================================
+
+MARKET_DATA_FIELDS = ('bid', 'ask', 'last', 'prev_close', 'volume',
+                      'delta', 'gamma', 'theta', 'vega', 'iv')
+MARKET_DATA_DTYPE = np.dtype(
+    [('strike', 'f8')] + [(field, 'f8') for field in MARKET_DATA_FIELDS] +
+    [('timestamp', 'f8'), ('active', '?'), ('greeks_local', '?')]  # greeks_local: greeks from local engine, not IBKR
+)
+_MARKET_DATA_COLUMNS = frozenset(MARKET_DATA_FIELDS) | {'strike', 'timestamp', 'greeks_local'}
+_INDEXED_FIELDS = frozenset(('delta', 'ask'))  # Kept in sorted per-chain indexes for bisect selection
+
+
+class ChainArray:
+    """Market data columns for a single (expiry, right) - rows are strike slots"""
+
+    def __init__(self, expiry: str, right: str, capacity: int = 64):
+        self.expiry = expiry
+        self.right = right
+        self.rows = np.zeros(capacity, dtype=MARKET_DATA_DTYPE)
+        self.keys: List[Optional[str]] = [None] * capacity  # slot -> contract_key
+        self.size = 0
+        self._slot_by_strike: Dict[float, int] = {}
+        # Sorted (value, slot) indexes maintained on every delta/ask write
+        self._delta_index: List[Tuple[float, int]] = []  # by |delta| (delta != 0)
+        self._ask_index: List[Tuple[float, int]] = []    # by ask (ask > 0)
+        self._indexed_value: Dict[str, Dict[int, float]] = {'delta': {}, 'ask': {}}
+
+    def slot_for(self, strike: float, contract_key: str) -> int:
+        """Slot for a strike, allocating one (and growing the array) on first use"""
+        strike_key = round(strike, 2)
+        slot = self._slot_by_strike.get(strike_key)
+        if slot is None:
+            if self.size == len(self.rows):
+                grown = np.zeros(len(self.rows) * 2, dtype=MARKET_DATA_DTYPE)
+                grown[:self.size] = self.rows[:self.size]
+                self.rows = grown
+                self.keys.extend([None] * (len(grown) - len(self.keys)))
+            slot = self.size
+            self.size += 1
+            self._slot_by_strike[strike_key] = slot
+            self.rows['strike'][slot] = strike
+            self.keys[slot] = contract_key
+        return slot
+
+    def view(self) -> np.ndarray:
+        """Used slots (zero-copy slice of the structured array)"""
+        return self.rows[:self.size]
+
+    def reindex(self, slot: int, field: str):
+        """Move a slot to its new position in the |delta| or ask index after a write"""
+        index = self._delta_index if field == 'delta' else self._ask_index
+        indexed = self._indexed_value[field]
+        old = indexed.pop(slot, None)
+        if old is not None:
+            position = bisect.bisect_left(index, (old, slot))
+            del index[position]
+        value = float(self.rows[field][slot])
+        if field == 'delta':
+            if value != 0 and not math.isnan(value):
+                value = abs(value)
+            else:
+                return
+        elif not value > 0:
+            return
+        bisect.insort(index, (value, slot))
+        indexed[slot] = value
+
+    def closest_delta_slot(self, target: float, strict: bool = True,
+                           require_ask: bool = False) -> Optional[Tuple[int, float]]:
+        """
+        Bisect the |delta| index for the slot whose |delta| is closest to target.
+
+        Args:
+            target: Target absolute delta as decimal (e.g. 0.30)
+            strict: Only consider deltas inside (0, 1) for calls / (-1, 0) for puts
+            require_ask: Only consider slots with a valid ask price
+
+        Returns:
+            (slot, |delta| difference) or None if no slot qualifies
+        """
+        index = self._delta_index
+        rows = self.rows
+        is_call = self.right == 'C'
+        left = bisect.bisect_left(index, (target, -1)) - 1
+        right = left + 1
+        # Walk outward from the insertion point, nearest candidate first
+        while left >= 0 or right < len(index):
+            left_diff = target - index[left][0] if left >= 0 else math.inf
+            right_diff = index[right][0] - target if right < len(index) else math.inf
+            if left_diff <= right_diff:
+                slot, diff = index[left][1], left_diff
+                left -= 1
+            else:
+                slot, diff = index[right][1], right_diff
+                right += 1
+            if not rows['active'][slot]:
+                continue
+            if require_ask and not rows['ask'][slot] > 0:
+                continue
+            if strict:
+                delta = rows['delta'][slot]
+                if not ((0 < delta < 1) if is_call else (-1 < delta < 0)):
+                    continue
+            return slot, diff
+        return None
+
+    def max_ask_slot(self, max_price: float) -> Optional[int]:
+        """Bisect the ask index for the highest ask not exceeding max_price"""
+        index = self._ask_index
+        rows = self.rows
+        position = bisect.bisect_right(index, (max_price, math.inf)) - 1
+        while position >= 0:
+            slot = index[position][1]
+            if rows['active'][slot]:
+                return slot
+            position -= 1
+        return None
+
+
+class MarketDataRow(MutableMapping):
+    """Dict-style view of one contract's market data slot (plus any non-numeric extras)"""
+    __slots__ = ('_store', '_chain', '_slot', '_key')
+
+    def __init__(self, store: 'MarketDataStore', chain: ChainArray, slot: int, contract_key: str):
+        self._store = store
+        self._chain = chain
+        self._slot = slot
+        self._key = contract_key
+
+    def __getitem__(self, field):
+        if field in _MARKET_DATA_COLUMNS:
+            return float(self._chain.rows[field][self._slot])
+        return self._store._extras[self._key][field]
+
+    def get(self, field, default=None):
+        if field in _MARKET_DATA_COLUMNS:
+            return float(self._chain.rows[field][self._slot])
+        return self._store._extras.get(self._key, {}).get(field, default)
+
+    def __setitem__(self, field, value):
+        if field in _MARKET_DATA_COLUMNS:
+            rows = self._chain.rows
+            rows[field][self._slot] = 0.0 if value is None else value
+            rows['timestamp'][self._slot] = time.time()
+            if field in _INDEXED_FIELDS:
+                self._chain.reindex(self._slot, field)
+        else:
+            self._store._extras.setdefault(self._key, {})[field] = value
+
+    def __delitem__(self, field):
+        if field in _MARKET_DATA_COLUMNS:
+            self._chain.rows[field][self._slot] = 0.0
+            if field in _INDEXED_FIELDS:
+                self._chain.reindex(self._slot, field)
+        else:
+            del self._store._extras[self._key][field]
+
+    def update(self, other=(), **kwargs):
+        for field, value in dict(other, **kwargs).items():
+            self[field] = value
+
+    def __iter__(self):
+        yield from MARKET_DATA_FIELDS
+        yield from list(self._store._extras.get(self._key, ()))
+
+    def __len__(self):
+        return len(MARKET_DATA_FIELDS) + len(self._store._extras.get(self._key, ()))
+
+    def __repr__(self):
+        return f"MarketDataRow({self._key}: {dict(self)})"
+
+
+class MarketDataStore(MutableMapping):
+    """
+    contract_key -> market data, backed by per-(expiry, right) ChainArrays.
+
+    Behaves like the old dict-of-dicts for unconverted code; keys that are not
+    option contract keys fall back to plain dicts.
+    """
+
+    def __init__(self, registry: ContractRegistry):
+        self._registry = registry
+        self._lock = threading.Lock()  # Guards slot allocation (positions may be added from the IBKR thread)
+        self._chains: Dict[Tuple[str, str], ChainArray] = {}
+        self._locations: Dict[str, Tuple[ChainArray, int]] = {}  # contract_key -> (chain, slot)
+        self._slot_keys: Dict[Tuple[ChainArray, int], set] = {}  # (chain, slot) -> contract_keys (aliases) stored there
+        self._extras: Dict[str, dict] = {}  # contract_key -> non-numeric fields ('contract', 'right', ...)
+        self._misc: Dict[str, dict] = {}  # Keys that are not option contract keys
+
+    def chain(self, expiry: str, right: str) -> Optional[ChainArray]:
+        """ChainArray for (expiry, right), or None if nothing stored yet"""
+        return self._chains.get((expiry, right))
+
+    def chains(self) -> List[ChainArray]:
+        """All chain arrays"""
+        return list(self._chains.values())
+
+    def set_value(self, contract_key: str, field: str, value: float) -> bool:
+        """Fast path for ticks: set one numeric field on an existing entry"""
+        location = self._locations.get(contract_key)
+        if location is None:
+            return False
+        chain, slot = location
+        rows = chain.rows
+        rows[field][slot] = value
+        rows['timestamp'][slot] = time.time()
+        if field in _INDEXED_FIELDS:
+            chain.reindex(slot, field)
+        return True
+
+    def locations(self) -> Dict[str, Tuple[ChainArray, int]]:
+        """contract_key -> (chain, slot) for option contracts stored columnar"""
+        return self._locations
+
+    def gather(self, contract_keys: List[str], field: str) -> np.ndarray:
+        """Values of one field for many contracts (0 for unknown contracts)"""
+        values = np.zeros(len(contract_keys))
+        for i, contract_key in enumerate(contract_keys):
+            location = self._locations.get(contract_key)
+            if location is not None:
+                chain, slot = location
+                values[i] = chain.rows[field][slot]
+        return values
+
+    def __getitem__(self, contract_key):
+        location = self._locations.get(contract_key)
+        if location is None:
+            return self._misc[contract_key]
+        chain, slot = location
+        return MarketDataRow(self, chain, slot, contract_key)
+
+    def get(self, contract_key, default=None):
+        location = self._locations.get(contract_key)
+        if location is None:
+            return self._misc.get(contract_key, default)
+        chain, slot = location
+        return MarketDataRow(self, chain, slot, contract_key)
+
+    def __setitem__(self, contract_key, values):
+        record = self._registry.intern_key(contract_key)
+        if record is None:
+            self._misc[contract_key] = values
+            return
+        with self._lock:
+            chain = self._chains.get((record.expiry, record.right))
+            if chain is None:
+                chain = ChainArray(record.expiry, record.right)
+                self._chains[(record.expiry, record.right)] = chain
+            slot = chain.slot_for(record.strike, contract_key)
+            chain.keys[slot] = contract_key
+            # Reset the slot (strike is kept) - assignment replaces the whole entry
+            for field in MARKET_DATA_FIELDS:
+                chain.rows[field][slot] = 0.0
+            for field in _INDEXED_FIELDS:
+                chain.reindex(slot, field)
+            chain.rows['active'][slot] = True
+            chain.rows['greeks_local'][slot] = False
+            chain.rows['timestamp'][slot] = time.time()
+            self._locations[contract_key] = (chain, slot)
+            self._slot_keys.setdefault((chain, slot), set()).add(contract_key)
+            self._extras.pop(contract_key, None)
+        row = MarketDataRow(self, chain, slot, contract_key)
+        for field, value in values.items():
+            if field != 'strike':
+                row[field] = value
+
+    def __delitem__(self, contract_key):
+        location = self._locations.pop(contract_key, None)
+        if location is None:
+            del self._misc[contract_key]
+            return
+        chain, slot = location
+        # Only deactivate the slot if no alias key still points at it
+        keys = self._slot_keys.get(location)
+        if keys is not None:
+            keys.discard(contract_key)
+        if not keys:
+            self._slot_keys.pop(location, None)
+            chain.rows['active'][slot] = False
+        self._extras.pop(contract_key, None)
+
+    def __contains__(self, contract_key):
+        return contract_key in self._locations or contract_key in self._misc
+
+    def __iter__(self):
+        yield from list(self._locations)
+        yield from list(self._misc)
+
+    def __len__(self):
+        return len(self._locations) + len(self._misc)
+
+
+# ============================================================================
+# LOCAL GREEKS ENGINE (Black-76 / Black-Scholes, vectorized)
+# ============================================================================
+# IBKR's tickOptionComputation often arrives seconds after a subscribe or
+# recenter, or as -1/-2 "not computed" placeholders. Until it does, IV and
+# greeks are computed locally for a whole chain in one NumPy pass from the
+# bid/ask mid, the underlying (or offset-adjusted ES) and time to expiry.
+# Black-76 on the forward covers both futures options and index options
+# (forward = spot when carry is ignored - at 0-2 DTE rates and dividends move
+# prices far less than the bid/ask spread). Units follow IBKR: IV as a
+# decimal, vega per 1 vol point, theta per calendar day.
+# ============================================================================
+
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+LOCAL_GREEKS_MIN_T = 60.0 / SECONDS_PER_YEAR  # Floor time to expiry at one minute
+LOCAL_GREEKS_IV_MIN = 0.005
+LOCAL_GREEKS_IV_MAX = 5.0
+LOCAL_GREEKS_IV_ITERATIONS = 30
+LOCAL_GREEKS_IV_TOLERANCE = 1e-6
+OPTION_EXPIRY_HOUR_CT = 15  # SPX/XSP PM settlement and ES weekly options: 3:00 PM Central
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+# tickOptionComputation "not computed" indicator per field (newer ibapi decoders already turn them into None).
+# Only these are placeholders - a delta of 0 or -1 is a real value
+IB_GREEK_NOT_COMPUTED = {'iv': -1.0, 'delta': -2.0, 'gamma': -2.0, 'vega': -2.0, 'theta': -2.0}
+
+
+def ib_greek_computed(field: str, value) -> bool:
+    """False for None/NaN, unset (Double.MAX_VALUE) and IB's "not computed" indicator of the field"""
+    return (value is not None and not math.isnan(value) and abs(value) < UNSET_DOUBLE
+            and value != IB_GREEK_NOT_COMPUTED.get(field))
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF via Abramowitz-Stegun 7.1.26 erf (abs error < 1.5e-7)"""
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.where(x >= 0, erf, -erf))
+
+
+def time_to_expiry_years(expiry: str, now: Optional[datetime] = None) -> float:
+    """Years from now until 3:00 PM CT on expiry (YYYYMMDD), floored at one minute"""
+    central = pytz.timezone('America/Chicago')
+    now = now or datetime.now(central)
+    expiry_dt = central.localize(datetime.strptime(expiry, '%Y%m%d').replace(hour=OPTION_EXPIRY_HOUR_CT))
+    return max((expiry_dt - now).total_seconds() / SECONDS_PER_YEAR, LOCAL_GREEKS_MIN_T)
+
+
+def black76_price(forward, strike, t, sigma, is_call, rate: float = 0.0) -> np.ndarray:
+    """Black-76 option price (arrays broadcast; is_call is a bool array)"""
+    vol_sqrt_t = sigma * np.sqrt(t)
+    d1 = (np.log(forward / strike) + 0.5 * sigma * sigma * t) / vol_sqrt_t
+    discount = np.exp(-rate * t)
+    call = discount * (forward * _norm_cdf(d1) - strike * _norm_cdf(d1 - vol_sqrt_t))
+    # Put via put-call parity (one pair of CDF evaluations for both rights)
+    return np.where(is_call, call, call - discount * (forward - strike))
+
+
+def black76_implied_vol(price, forward, strike, t, is_call, rate: float = 0.0) -> np.ndarray:
+    """
+    Vectorized implied volatility (safeguarded Newton: bisection when a step leaves the bracket).
+
+    Returns NaN where the price is outside no-arbitrage bounds.
+    """
+    price, forward, strike, t = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, forward, strike, t)))
+    is_call = np.broadcast_to(is_call, price.shape)
+    discount = np.exp(-rate * t)
+    intrinsic = discount * np.where(is_call, np.maximum(forward - strike, 0.0), np.maximum(strike - forward, 0.0))
+    upper = discount * np.where(is_call, forward, strike)
+    valid = (price > intrinsic) & (price < upper) & (forward > 0) & (strike > 0)
+
+    lo = np.full(price.shape, LOCAL_GREEKS_IV_MIN)
+    hi = np.full(price.shape, LOCAL_GREEKS_IV_MAX)
+    # Brenner-Subrahmanyam ATM approximation as the starting point
+    sigma = np.clip(np.sqrt(2.0 * math.pi / t) * price / np.where(forward > 0, forward, 1.0),
+                    LOCAL_GREEKS_IV_MIN, LOCAL_GREEKS_IV_MAX)
+    active = valid.copy()
+    sqrt_t = np.sqrt(t)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_moneyness = np.log(forward / strike)
+        parity = discount * (forward - strike)
+        for _ in range(LOCAL_GREEKS_IV_ITERATIONS):
+            if not active.any():
+                break
+            vol_sqrt_t = sigma * sqrt_t
+            d1 = (log_moneyness + 0.5 * vol_sqrt_t * vol_sqrt_t) / vol_sqrt_t
+            call = discount * (forward * _norm_cdf(d1) - strike * _norm_cdf(d1 - vol_sqrt_t))
+            diff = np.where(is_call, call, call - parity) - price
+            vega = discount * forward * _norm_pdf(d1) * sqrt_t
+            hi = np.where(active & (diff > 0), sigma, hi)
+            lo = np.where(active & (diff <= 0), sigma, lo)
+            newton = sigma - diff / vega
+            in_bracket = (newton > lo) & (newton < hi) & np.isfinite(newton)
+            stepped = np.where(in_bracket, newton, 0.5 * (lo + hi))
+            sigma = np.where(active, stepped, sigma)
+            active &= np.abs(diff) > LOCAL_GREEKS_IV_TOLERANCE
+    return np.where(valid, sigma, np.nan)
+
+
+def black76_greeks(forward, strike, t, sigma, is_call, rate: float = 0.0) -> Dict[str, np.ndarray]:
+    """Delta, gamma, vega (per vol point) and theta (per day) for Black-76"""
+    sqrt_t = np.sqrt(t)
+    vol_sqrt_t = sigma * sqrt_t
+    d1 = (np.log(forward / strike) + 0.5 * sigma * sigma * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    discount = np.exp(-rate * t)
+    pdf_d1 = _norm_pdf(d1)
+    cdf_d1 = _norm_cdf(d1)
+    delta = discount * np.where(is_call, cdf_d1, cdf_d1 - 1.0)
+    gamma = discount * pdf_d1 / (forward * vol_sqrt_t)
+    vega = discount * forward * pdf_d1 * sqrt_t
+    decay = -discount * forward * pdf_d1 * sigma / (2.0 * sqrt_t)
+    call = discount * (forward * cdf_d1 - strike * _norm_cdf(d2))
+    carry = rate * np.where(is_call, call, call - discount * (forward - strike))
+    return {
+        'delta': delta,
+        'gamma': gamma,
+        'vega': vega / 100.0,
+        'theta': (decay + carry) / 365.0,
+    }
+
+
+def compute_chain_greeks(chain: 'ChainArray', underlying: float, t: float,
+                         only_missing: bool = True) -> np.ndarray:
+    """
+    Fill IV/greeks for one chain array in a single pass from the bid/ask mid.
+
+    Args:
+        chain: ChainArray for one (expiry, right)
+        underlying: Forward/underlying price (futures price or cash-equivalent index level)
+        t: Time to expiry in years
+        only_missing: Only touch slots without IBKR greeks (or with local ones)
+
+    Returns:
+        Slot indices that were updated
+    """
+    rows = chain.view()
+    bid, ask = rows['bid'], rows['ask']
+    mask = rows['active'] & (bid > 0) & (ask >= bid) & (rows['strike'] > 0)
+    if only_missing:
+        delta = rows['delta']
+        mask &= (delta == 0) | np.isnan(delta) | rows['greeks_local']
+    slots = np.nonzero(mask)[0]
+    if underlying <= 0 or len(slots) == 0:
+        return slots[:0]
+
+    is_call = chain.right == 'C'
+    strike = rows['strike'][slots]
+    mid = 0.5 * (bid[slots] + ask[slots])
+    iv = black76_implied_vol(mid, underlying, strike, t, is_call)
+    solved = ~np.isnan(iv)
+    slots, strike, iv = slots[solved], strike[solved], iv[solved]
+    if len(slots) == 0:
+        return slots
+    greeks = black76_greeks(underlying, strike, t, iv, is_call)
+
+    target = chain.rows
+    target['iv'][slots] = iv
+    for field, values in greeks.items():
+        target[field][slots] = values
+    target['greeks_local'][slots] = True
+    for slot in slots:
+        chain.reindex(int(slot), 'delta')
+    return slots
+
+
+# ============================================================================
+# TICK CONFLATION (IBKR reader thread -> GUI thread)
+# ============================================================================
+# During fast markets IBKR pushes thousands of option ticks per second across
+# the main and TS chains. Emitting one Qt signal per tick floods the GUI event
+# queue with stale updates. The conflator keeps only the latest value per
+# (contract id, field) and the latest greeks per contract id; the GUI thread
+# drains it once per frame and applies the whole batch in one pass.
+# ============================================================================
+
+TICK_CONFLATION_MIN_MS = 20
+TICK_CONFLATION_MAX_MS = 100
+TICK_CONFLATION_DEFAULT_MS = 50
+
+
+class TickConflator:
+    """Thread-safe latest-value buffer for option ticks and greeks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ticks: Dict[Tuple[int, str], float] = {}  # (contract_id, tick_type) -> latest value
+        self._greeks: Dict[int, dict] = {}  # contract_id -> merged greeks dict
+
+        # Counters (received = from IBKR callbacks, delivered = handed to the GUI)
+        self.ticks_received = 0
+        self.ticks_delivered = 0
+        self.greeks_received = 0
+        self.greeks_delivered = 0
+        self.flush_count = 0
+
+    def put_tick(self, contract_id: int, tick_type: str, value: float):
+        """Store latest price/size tick (called from IBKR reader thread)"""
+        with self._lock:
+            self._ticks[(contract_id, tick_type)] = value
+            self.ticks_received += 1
+
+    def put_greeks(self, contract_id: int, greeks: dict):
+        """Store latest greeks for a contract (called from IBKR reader thread)"""
+        with self._lock:
+            pending = self._greeks.get(contract_id)
+            if pending is None:
+                self._greeks[contract_id] = dict(greeks)
+            else:
+                pending.update(greeks)
+            self.greeks_received += 1
+
+    def drain(self) -> Optional[Tuple[Dict[Tuple[int, str], float], Dict[int, dict]]]:
+        """Swap out pending updates (called from GUI thread). Returns None when idle."""
+        with self._lock:
+            if not self._ticks and not self._greeks:
+                return None
+            ticks, greeks = self._ticks, self._greeks
+            self._ticks, self._greeks = {}, {}
+            self.ticks_delivered += len(ticks)
+            self.greeks_delivered += len(greeks)
+            self.flush_count += 1
+        return ticks, greeks
+
+    def clear(self):
+        """Drop pending updates (e.g. on disconnect)"""
+        with self._lock:
+            self._ticks.clear()
+            self._greeks.clear()
+
+    def get_stats(self) -> dict:
+        """Snapshot of conflation counters"""
+        with self._lock:
+            received = self.ticks_received + self.greeks_received
+            delivered = self.ticks_delivered + self.greeks_delivered
+            return {
+                'ticks_received': self.ticks_received,
+                'ticks_delivered': self.ticks_delivered,
+                'greeks_received': self.greeks_received,
+                'greeks_delivered': self.greeks_delivered,
+                'flushes': self.flush_count,
+                'pending': len(self._ticks) + len(self._greeks),
+                'conflation_ratio': (received / delivered) if delivered else 0.0,
+            }
+
+
 # ============================================================================
 # IBKR API WRAPPER WITH PYQT SIGNALS
 # ============================================================================
@@ -421,7 +1797,8 @@ class IBKRSignals(QObject):  # type: ignore[misc]
     es_price_updated = pyqtSignal(float)  # type: ignore[possibly-unbound]  # ES futures price (23/6 trading)
     market_data_tick = pyqtSignal(str, str, float)  # type: ignore[possibly-unbound]  # contract_key, tick_type, value
     greeks_updated = pyqtSignal(str, dict)  # type: ignore[possibly-unbound]  # contract_key, greeks_dict
-    
+    market_data_batch = pyqtSignal(dict, dict)  # type: ignore[possibly-unbound]  # {(contract_id, tick_type): value}, {contract_id: greeks_dict}
+
     # Position and order signals
     position_update = pyqtSignal(str, dict)  # type: ignore[possibly-unbound]  # contract_key, position_data
     position_closed = pyqtSignal(str)  # type: ignore[possibly-unbound]  # contract_key - position quantity = 0
@@ -446,16 +1823,32 @@ class IBKRWrapper(EWrapper):
         self.app = app_state
         self._main_window = main_window  # Reference for error handling callbacks
         self._client = None  # Will be set after IBKRClient is created
+        self._tick_conflator = None  # Optional TickConflator - when set, option ticks are batched per frame
+        self._contracts: ContractRegistry = app_state.setdefault('contract_registry', ContractRegistry())
     
     def set_client(self, client):
         """Set the client reference after IBKRClient is created"""
         self._client = client
     
+    def set_tick_conflator(self, conflator):
+        """Route option ticks/greeks through a TickConflator instead of per-tick signals"""
+        self._tick_conflator = conflator
+    
     def error(self, reqId: TickerId, errorCode: int, errorString: str):
         """Handle error messages from IBKR API"""
         error_msg = f"Error {errorCode}: {errorString}"
         logger.debug(f"IBKR error callback: reqId={reqId}, code={errorCode}, msg={errorString}")
         
+        # Failed combo-leg conId lookup - IB sends no contractDetailsEnd after an error
+        if self._main_window and reqId in getattr(self._main_window, '_con_id_requests', {}):
+            QMetaObject.invokeMethod(
+                self._main_window,
+                "on_contract_details_error",
+                Qt.ConnectionType.QueuedConnection,
+                Q_ARG(int, reqId),
+                Q_ARG(int, errorCode)
+            )
+        
         # Special handling for Error 200 (No security definition) - ENHANCED
         if errorCode == 200:
             # Try to find which contract failed - check both market data and historical requests
@@ -531,6 +1924,15 @@ class IBKRWrapper(EWrapper):
                 self.signals.connection_status.emit("DISCONNECTED")
             return
         
+        # Max number of tickers reached - downgrade the line to rotating snapshots
+        if errorCode == 101:
+            line_budget = self.app.get('line_budget')
+            if line_budget is not None and line_budget.on_line_rejected(reqId):
+                contract_key = self.app.get('market_data_map', {}).get(reqId, "Unknown")
+                logger.warning(f"⚠️ Market data line limit reached - {contract_key} (reqId={reqId}) "
+                               f"moved to rotating snapshots, budget capped at {line_budget.capacity} lines")
+                return
+        
         # Benign errors - suppress
         if errorCode == 10268:  # EtradeOnly attribute warning
             return
@@ -597,7 +1999,10 @@ class IBKRWrapper(EWrapper):
     
     def tickSnapshotEnd(self, reqId: int):
         """Called when snapshot market data is complete"""
-        if reqId == self.app.get('es_req_id'):
+        line_budget = self.app.get('line_budget')
+        if line_budget is not None and line_budget.is_tracked(reqId):
+            line_budget.on_snapshot_end(reqId)  # Rotating snapshot of a downgraded line
+        elif reqId == self.app.get('es_req_id'):
             logger.info("ES futures snapshot data complete")
             self.signals.connection_message.emit("ES futures snapshot received", "INFO")
         elif reqId == self.app.get('underlying_req_id'):
@@ -648,7 +2053,11 @@ class IBKRWrapper(EWrapper):
             contract_key = mapping
             tick_name = {1: 'bid', 2: 'ask', 4: 'last', 9: 'prev_close'}.get(tickType)
             if tick_name:
-                self.signals.market_data_tick.emit(contract_key, tick_name, price)
+                record = self._contracts.intern_key(contract_key) if self._tick_conflator is not None else None
+                if record is not None:
+                    self._tick_conflator.put_tick(record.id, tick_name, price)
+                else:
+                    self.signals.market_data_tick.emit(contract_key, tick_name, price)
     
     def tickSize(self, reqId: TickerId, tickType: TickType, size: int):
         """Receives real-time size updates"""
@@ -663,7 +2072,11 @@ class IBKRWrapper(EWrapper):
             # Normal option contract
             contract_key = mapping
             if tickType == 8:  # VOLUME
-                self.signals.market_data_tick.emit(contract_key, 'volume', float(size))
+                record = self._contracts.intern_key(contract_key) if self._tick_conflator is not None else None
+                if record is not None:
+                    self._tick_conflator.put_tick(record.id, 'volume', float(size))
+                else:
+                    self.signals.market_data_tick.emit(contract_key, 'volume', float(size))
     
     def tickOptionComputation(self, reqId: TickerId, tickType: TickType,
                              tickAttrib: int, impliedVol: float,
@@ -679,7 +2092,7 @@ class IBKRWrapper(EWrapper):
                 strike = mapping['strike']
                 
                 if scan_key in self.app:
-                    if delta not in [-2, -1]:
+                    if ib_greek_computed('delta', delta):
                         self.app[scan_key]['deltas'][strike] = delta
                         logger.debug(f"[ATM SCAN] Strike {strike}: delta={delta:.3f}")
                 return
@@ -687,14 +2100,17 @@ class IBKRWrapper(EWrapper):
             # Normal greeks update for option chain
             contract_key = mapping if isinstance(mapping, str) else None
             if contract_key:
-                greeks = {
-                    'delta': delta if delta not in [-2, -1] else 0,
-                    'gamma': gamma if gamma not in [-2, -1] else 0,
-                    'theta': theta if theta not in [-2, -1] else 0,
-                    'vega': vega if vega not in [-2, -1] else 0,
-                    'iv': impliedVol if impliedVol not in [-2, -1] else 0
-                }
-                self.signals.greeks_updated.emit(contract_key, greeks)
+                # Only computed fields - a placeholder must not overwrite a value (IBKR or local) already shown
+                greeks = {field: value for field, value in (
+                    ('delta', delta), ('gamma', gamma), ('theta', theta), ('vega', vega), ('iv', impliedVol)
+                ) if ib_greek_computed(field, value)}
+                if not greeks:
+                    return
+                record = self._contracts.intern_key(contract_key) if self._tick_conflator is not None else None
+                if record is not None:
+                    self._tick_conflator.put_greeks(record.id, greeks)
+                else:
+                    self.signals.greeks_updated.emit(contract_key, greeks)
     
     def orderStatus(self, orderId: int, status: str, filled: float,
                    remaining: float, avgFillPrice: float, permId: int,
@@ -723,7 +2139,12 @@ class IBKRWrapper(EWrapper):
     
     def openOrder(self, orderId: int, contract: Contract, order: Order, orderState):
         """Receives open order information"""
-        contract_key = f"{contract.symbol}_{contract.strike}_{contract.right}_{contract.lastTradeDateOrContractMonth[:8]}"
+        if contract.secType == "BAG":
+            # Combo order - identified by our combo key, never interned as an option
+            working = self._main_window.pending_orders.get(orderId) if self._main_window else None
+            contract_key = working.contract_key if working is not None else f"{contract.symbol} combo"
+        else:
+            contract_key = self._contracts.intern_contract(contract).key
         logger.info(f"✓ openOrder callback received for order #{orderId}")
         logger.info(f"   Contract: {contract_key}")
         logger.info(f"   Action: {order.action} {order.totalQuantity}")
@@ -745,6 +2166,23 @@ class IBKRWrapper(EWrapper):
                     self._main_window.pending_orders[orderId]['is_automated'] = is_automated_from_ref
                 else:
                     logger.debug(f"✓ Order #{orderId}: is_automated={is_automated_from_ref} matches orderRef")
+            
+            # IB-side exit child we are not tracking (placed in an earlier session) - adopt it so
+            # local closes cancel it first and its fill is booked
+            elif order.ocaGroup.startswith(f"{NATIVE_EXIT_OCA_PREFIX}_") and orderState.status not in (
+                    'Filled', 'Cancelled', 'Inactive'):
+                price = order.lmtPrice if order.orderType == "LMT" else order.auxPrice
+                QMetaObject.invokeMethod(
+                    self._main_window,
+                    "adopt_native_exit",
+                    Qt.ConnectionType.QueuedConnection,
+                    Q_ARG(int, orderId),
+                    Q_ARG(str, contract_key),
+                    Q_ARG(str, order.ocaGroup),
+                    Q_ARG(str, order.orderType),
+                    Q_ARG(float, float(price)),
+                    Q_ARG(int, int(order.totalQuantity))
+                )
         
         self.signals.connection_message.emit(
             f"✓ TWS received Order #{orderId}: {contract_key} {order.action} {order.totalQuantity} (Status: {orderState.status})",
@@ -758,7 +2196,7 @@ class IBKRWrapper(EWrapper):
         - Real-time P&L updates
         - Bid/ask availability for close order mid-price chasing
         """
-        contract_key = f"{contract.symbol}_{contract.strike}_{contract.right}_{contract.lastTradeDateOrContractMonth[:8]}"
+        contract_key = self._contracts.intern_contract(contract).key
         
         if position != 0:
             # CRITICAL: IBKR reports avgCost as total contract value (price × multiplier)
@@ -789,12 +2227,11 @@ class IBKRWrapper(EWrapper):
             # Fallback 1: Check pending_orders (for in-flight orders not yet deleted)
             if not is_automated and self._main_window and hasattr(self._main_window, 'pending_orders'):
                 # Find the most recent BUY order for this contract
-                for order_id, order_info in sorted(self._main_window.pending_orders.items(), reverse=True):
-                    if order_info.get('contract_key') == contract_key and order_info.get('action') == 'BUY':
-                        # Check if order has orderRef tag from place_order
-                        is_automated = order_info.get('is_automated', False)
-                        logger.debug(f"Position {contract_key}: is_automated={is_automated} from order #{order_id}")
-                        break
+                order_info = self._main_window.pending_orders.last_order_for(contract_key, 'BUY')
+                if order_info is not None:
+                    # Check if order has orderRef tag from place_order
+                    is_automated = order_info.is_automated
+                    logger.debug(f"Position {contract_key}: is_automated={is_automated} from order #{order_info.order_id}")
             
             # Fallback 2: check the tracking set (for backwards compatibility)
             if not is_automated and self._main_window and hasattr(self._main_window, '_automated_entry_contracts'):
@@ -813,8 +2250,9 @@ class IBKRWrapper(EWrapper):
             self.signals.position_update.emit(contract_key, position_data)
             
             # Subscribe to market data for this position if not already subscribed
-            # Check if we have an active subscription (not just market_data entry)
-            is_subscribed = any(contract_key == v for v in self.app.get('market_data_map', {}).values())
+            # Check if we have an active subscription (not just market_data entry) - O(1) reverse lookup
+            subscriptions = self.app.get('subscriptions')
+            is_subscribed = subscriptions.is_subscribed(contract_key) if subscriptions else False
             
             if not is_subscribed and self._client and self._main_window:
                 logger.info(f"Subscribing to market data for position: {contract_key}")
@@ -834,7 +2272,7 @@ class IBKRWrapper(EWrapper):
                 if not contract.currency:
                     contract.currency = "USD"
                 
-                self.app['market_data_map'][req_id] = contract_key
+                subscriptions.add(req_id, contract_key)
                 
                 # Create market_data entry if it doesn't exist
                 if contract_key not in self._main_window.market_data:
@@ -847,13 +2285,13 @@ class IBKRWrapper(EWrapper):
                     }
                     logger.info(f"Created market_data entry for {contract_key}")
                 
-                self._client.reqMktData(req_id, contract, "", False, False, [])
+                self.app['line_budget'].subscribe(req_id, contract, LINE_PRIORITY_POSITION)
                 logger.info(f"Requested market data (reqId={req_id}) for {contract_key}")
             else:
                 logger.info(f"Position {contract_key} already has active market data subscription")
         else:
             # Position closed (quantity = 0) - signal to remove from tracking and unsubscribe
-            contract_key = f"{contract.symbol}_{contract.strike}_{contract.right}_{contract.lastTradeDateOrContractMonth[:8]}"
+            contract_key = self._contracts.intern_contract(contract).key
             logger.info(f"Position closed: {contract_key}")
             self.signals.position_closed.emit(contract_key)
             self.signals.connection_message.emit(f"Position closed: {contract_key}", "INFO")
@@ -943,12 +2381,50 @@ class IBKRWrapper(EWrapper):
     
     def execDetails(self, reqId: int, contract: Contract, execution):
         """Receives execution details"""
-        contract_key = f"{contract.symbol}_{contract.strike}_{contract.right}_{contract.lastTradeDateOrContractMonth[:8]}"
+        if contract.secType == "BAG":
+            return  # Combo summary - its legs arrive as their own executions
+        contract_key = self._contracts.intern_contract(contract).key
+        
+        # Leg execution of one of our combo orders - real leg prices for trade/P&L booking
+        if self._main_window:
+            working = self._main_window.pending_orders.get(execution.orderId)
+            if working is not None and working.legs:
+                QMetaObject.invokeMethod(
+                    self._main_window,
+                    "on_combo_leg_execution",
+                    Qt.ConnectionType.QueuedConnection,
+                    Q_ARG(int, execution.orderId),
+                    Q_ARG(str, contract_key),
+                    Q_ARG(float, float(execution.shares)),
+                    Q_ARG(float, float(execution.price))
+                )
+        
         self.signals.connection_message.emit(
             f"Execution: Order #{execution.orderId} - {contract_key} {execution.side} {execution.shares} @ ${execution.price:.2f}",
             "SUCCESS"
         )
     
+    def contractDetails(self, reqId: int, contractDetails):
+        """Receives contract details (requested to learn combo leg conIds)"""
+        if self._main_window:
+            QMetaObject.invokeMethod(
+                self._main_window,
+                "on_contract_details",
+                Qt.ConnectionType.QueuedConnection,
+                Q_ARG(int, reqId),
+                Q_ARG(int, int(contractDetails.contract.conId))
+            )
+    
+    def contractDetailsEnd(self, reqId: int):
+        """All contract details for a request delivered"""
+        if self._main_window:
+            QMetaObject.invokeMethod(
+                self._main_window,
+                "on_contract_details_end",
+                Qt.ConnectionType.QueuedConnection,
+                Q_ARG(int, reqId)
+            )
+    
     def historicalData(self, reqId: int, bar):
         """Receives historical bar data"""
         # Check for historical close offset calculation requests
@@ -1034,11 +2510,212 @@ class IBKRWrapper(EWrapper):
             self.signals.historical_bar_update.emit(contract_key, bar_data)
 
 
+# ============================================================================
+# OUTBOUND MESSAGE PACING
+# ============================================================================
+# IBKR disconnects clients that send more than 50 messages per second. Every
+# request the app sends after the connect handshake (orders, market data,
+# account/position subscriptions, historical data) goes through a token
+# bucket. Sends happen immediately while tokens are available; overflow is
+# queued per priority class and drained by a background thread, orders
+# always first.
+# Rate + burst stay well under 50 so no one-second window can reach the limit,
+# even with the handshake and the odd unpaced message on top.
+# ============================================================================
+
+IBKR_MSG_RATE_PER_SEC = 35.0  # Sustained outbound messages per second
+IBKR_MSG_BURST = 10           # Bucket size (rate + burst = 45, headroom under 50 per second)
+
+PACER_CLASS_ORDER = 0         # placeOrder / cancelOrder (includes chaser modifications)
+PACER_CLASS_MARKET_DATA = 1   # reqMarketDataType / reqMktData / cancelMktData (FIFO - type and cancel stay ordered
+                              # around their requests), reqContractDetails, account / position subscriptions
+PACER_CLASS_HISTORICAL = 2    # reqHistoricalData / cancelHistoricalData
+PACER_CLASS_NAMES = {
+    PACER_CLASS_ORDER: 'orders',
+    PACER_CLASS_MARKET_DATA: 'market data',
+    PACER_CLASS_HISTORICAL: 'historical',
+}
+
+
 class IBKRClient(EClient):
-    """Client to send requests to IBKR"""
+    """Client to send requests to IBKR (paced by a priority token bucket)"""
     
     def __init__(self, wrapper):
         EClient.__init__(self, wrapper)
+        self._pacer_cond = threading.Condition(threading.RLock())
+        self._pacer_queues = {cls: deque() for cls in PACER_CLASS_NAMES}
+        self._pacer_tokens = float(IBKR_MSG_BURST)
+        self._pacer_last_refill = time.monotonic()
+        self._pacer_stats = {
+            'sent': 0, 'queued': 0, 'coalesced': 0, 'max_depth': 0,
+            'wait_total_ms': 0.0, 'wait_max_ms': 0.0, 'waited': 0,
+        }
+        self._order_send_watch = {}  # order_id -> perf_counter() of first wire send (None until sent)
+        self._pacer_thread = threading.Thread(target=self._pacer_loop, name="IBKRPacer", daemon=True)
+        self._pacer_thread.start()
+    
+    # ---- paced requests -----------------------------------------------------
+    
+    def placeOrder(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_ORDER, EClient.placeOrder, args, kwargs, coalesce_key=('order', args[0]))
+    
+    def cancelOrder(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_ORDER, EClient.cancelOrder, args, kwargs)
+    
+    def reqMktData(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.reqMktData, args, kwargs)
+    
+    def cancelMktData(self, *args, **kwargs):
+        with self._pacer_cond:
+            # A queued subscription cancelled before it was sent: drop both messages
+            if self._pacer_drop_queued(PACER_CLASS_MARKET_DATA, EClient.reqMktData, EClient.cancelMktData, args[0]):
+                return
+            self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.cancelMktData, args, kwargs)
+    
+    def reqMarketDataType(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.reqMarketDataType, args, kwargs)
+    
+    def reqContractDetails(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.reqContractDetails, args, kwargs)
+    
+    def reqAccountUpdates(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.reqAccountUpdates, args, kwargs)
+    
+    def reqAccountSummary(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.reqAccountSummary, args, kwargs)
+    
+    def reqPositions(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.reqPositions, args, kwargs)
+    
+    def cancelPositions(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_MARKET_DATA, EClient.cancelPositions, args, kwargs)
+    
+    def reqHistoricalData(self, *args, **kwargs):
+        self._pacer_submit(PACER_CLASS_HISTORICAL, EClient.reqHistoricalData, args, kwargs)
+    
+    def cancelHistoricalData(self, *args, **kwargs):
+        with self._pacer_cond:
+            if self._pacer_drop_queued(PACER_CLASS_HISTORICAL, EClient.reqHistoricalData, EClient.cancelHistoricalData, args[0]):
+                return
+            self._pacer_submit(PACER_CLASS_HISTORICAL, EClient.cancelHistoricalData, args, kwargs)
+    
+    def disconnect(self) -> List[int]:
+        """Drop queued messages - they belong to the closing session
+        
+        Returns the order ids whose queued placeOrder / cancelOrder never reached IB,
+        so the caller can stop tracking them.
+        """
+        with self._pacer_cond:
+            dropped_orders = sorted({entry[1][0] for entry in self._pacer_queues[PACER_CLASS_ORDER]})
+            for queue in self._pacer_queues.values():
+                queue.clear()
+            self._order_send_watch.clear()
+        EClient.disconnect(self)
+        return dropped_orders
+    
+    def watch_order_send(self, order_id: int):
+        """Record when the first placeOrder for order_id actually reaches the socket"""
+        with self._pacer_cond:
+            self._order_send_watch[order_id] = None
+    
+    def pop_order_sent_at(self, order_id: int) -> Optional[float]:
+        """perf_counter() of the watched order's first send (None while still queued)"""
+        with self._pacer_cond:
+            sent_at = self._order_send_watch.get(order_id)
+            if sent_at is not None:
+                del self._order_send_watch[order_id]
+            return sent_at
+    
+    def forget_order_send(self, order_id: int):
+        with self._pacer_cond:
+            self._order_send_watch.pop(order_id, None)
+    
+    def get_pacer_stats(self) -> dict:
+        """Queue depth / wait time snapshot for the status bar"""
+        with self._pacer_cond:
+            stats = dict(self._pacer_stats)
+            stats['depth'] = {PACER_CLASS_NAMES[cls]: len(queue) for cls, queue in self._pacer_queues.items()}
+            stats['queue_depth'] = sum(stats['depth'].values())
+            oldest = [queue[0][3] for queue in self._pacer_queues.values() if queue]
+            stats['oldest_wait_ms'] = (time.monotonic() - min(oldest)) * 1000 if oldest else 0.0
+            stats['avg_wait_ms'] = stats['wait_total_ms'] / stats['waited'] if stats['waited'] else 0.0
+            return stats
+    
+    # ---- token bucket -------------------------------------------------------
+    
+    def _pacer_refill(self):
+        now = time.monotonic()
+        self._pacer_tokens = min(float(IBKR_MSG_BURST),
+                                 self._pacer_tokens + (now - self._pacer_last_refill) * IBKR_MSG_RATE_PER_SEC)
+        self._pacer_last_refill = now
+    
+    def _pacer_submit(self, pacer_class: int, func, args, kwargs, coalesce_key=None):
+        with self._pacer_cond:
+            self._pacer_refill()
+            if self._pacer_tokens >= 1 and not any(self._pacer_queues.values()):
+                # Fast path: bucket has room and nothing is waiting ahead of us
+                self._pacer_tokens -= 1
+                self._pacer_send(func, args, kwargs)
+                return
+            queue = self._pacer_queues[pacer_class]
+            if coalesce_key is not None:
+                # Order modification superseding one still queued: send only the latest
+                for entry in queue:
+                    if entry[4] == coalesce_key:
+                        entry[1], entry[2] = args, kwargs
+                        self._pacer_stats['coalesced'] += 1
+                        return
+            queue.append([func, args, kwargs, time.monotonic(), coalesce_key])
+            self._pacer_stats['queued'] += 1
+            depth = sum(len(q) for q in self._pacer_queues.values())
+            self._pacer_stats['max_depth'] = max(self._pacer_stats['max_depth'], depth)
+            self._pacer_cond.notify()
+    
+    def _pacer_drop_queued(self, pacer_class: int, func, cancel_func, req_id: int) -> bool:
+        """Remove the newest queued func(req_id, ...) if it is the last queued func/cancel_func for req_id"""
+        queue = self._pacer_queues[pacer_class]
+        for index in range(len(queue) - 1, -1, -1):
+            entry = queue[index]
+            # Other messages share the class (reqMarketDataType(1), reqAccountUpdates(True, ...)) - their
+            # first argument is not a request id
+            if (entry[0] is func or entry[0] is cancel_func) and entry[1][0] == req_id:
+                if entry[0] is func:
+                    del queue[index]
+                    self._pacer_stats['coalesced'] += 2
+                    return True
+                return False
+        return False
+    
+    def _pacer_send(self, func, args, kwargs):
+        try:
+            func(self, *args, **kwargs)
+            self._pacer_stats['sent'] += 1
+            if self._order_send_watch and func is EClient.placeOrder and self._order_send_watch.get(args[0], 0) is None:
+                self._order_send_watch[args[0]] = time.perf_counter()
+        except Exception as e:
+            logger.error(f"Error sending {func.__name__}: {e}", exc_info=True)
+    
+    def _pacer_loop(self):
+        """Drain queued messages as tokens become available (highest priority class first)"""
+        while True:
+            with self._pacer_cond:
+                while not any(self._pacer_queues.values()):
+                    self._pacer_cond.wait()
+                self._pacer_refill()
+                if self._pacer_tokens < 1:
+                    self._pacer_cond.wait((1 - self._pacer_tokens) / IBKR_MSG_RATE_PER_SEC)
+                    continue
+                for pacer_class in sorted(self._pacer_queues):
+                    queue = self._pacer_queues[pacer_class]
+                    if queue:
+                        func, args, kwargs, queued_at, _ = queue.popleft()
+                        break
+                self._pacer_tokens -= 1
+                wait_ms = (time.monotonic() - queued_at) * 1000
+                self._pacer_stats['waited'] += 1
+                self._pacer_stats['wait_total_ms'] += wait_ms
+                self._pacer_stats['wait_max_ms'] = max(self._pacer_stats['wait_max_ms'], wait_ms)
+                self._pacer_send(func, args, kwargs)
 
 
 class IBKRThread(QThread):
@@ -1226,140 +2903,1117 @@ class TradeStationManager(QObject):
             value: The new value (already decoded)
             size: Current size of the dictionary
         """
-        if not self.running:
+        if not self.running:
+            return
+            
+        try:
+            value_str = str(value)[:200] if value else "None"
+            
+            # Filter out repetitive/noisy messages from logs but allow in Activity Log
+            # Note: StrategyDirection is now processed separately, not filtered
+            repetitive_keys = {
+                'StrategyDirection', 'LAST_UPDATE', 'PYTHON_STATUS', 'CurrentTime', 'MarketState', 'HeartBeat'
+            }
+            
+            # Only log important changes to file/console, not repetitive status updates
+            if key not in repetitive_keys:
+                logger.info(f"[TS→PYTHON] CHANGED KEY: '{key}' = {value_str} (dict size: {size})")
+                self.signals.ts_message.emit(f"TS CHANGE: {key} = {value_str}")
+            
+            # Show CHANGE events in Activity Log (conditionally based on settings)
+            show_all = self.main_window.show_all_gd_communications if self.main_window else False
+            if show_all:
+                self.signals.ts_activity.emit(f"[CHANGE] {key} = {value_str}")
+            
+            # Handle StrategyDirection from TradeStation
+            # CURRENT FORMAT: 1=LONG, -1=SHORT, 0=FLAT (TradeStation standard)
+            # FUTURE FORMAT: Will support 0=FLAT, 1=LONG, 2=SHORT (normalized)
+            if key == "StrategyDirection":
+                try:
+                    raw_value = int(value)
+                    
+                    # Convert TradeStation format to normalized format
+                    # Current: 1=LONG, -1=SHORT, 0=FLAT
+                    # Convert to: 0=FLAT, 1=LONG, 2=SHORT (for handler)
+                    if raw_value == 1:
+                        direction = 1  # LONG
+                        direction_str = "LONG"
+                    elif raw_value == -1:
+                        direction = 2  # SHORT (convert -1 to 2)
+                        direction_str = "SHORT"
+                    elif raw_value == 0:
+                        direction = 0  # FLAT
+                        direction_str = "FLAT"
+                    else:
+                        # Future-proof: if TS sends 2, accept it as SHORT
+                        if raw_value == 2:
+                            direction = 2
+                            direction_str = "SHORT"
+                        else:
+                            direction = 0  # Unknown values default to FLAT
+                            direction_str = f"UNKNOWN({raw_value})->FLAT"
+                            logger.warning(f"Unknown StrategyDirection value {raw_value}, defaulting to FLAT")
+                    
+                    # ALWAYS emit signal to support immediate join mode
+                    # BUT only log if value changed to reduce spam
+                    direction_changed = (direction != self.last_strategy_direction)
+                    self.last_strategy_direction = direction
+                    self.signals.strategy_direction_changed.emit(direction)
+                    
+                    if direction_changed:
+                        logger.info(f"[TS→PYTHON] StrategyDirection: {direction_str} (TS={raw_value} → Python={direction})")
+                        self.signals.ts_activity.emit(f"[STRATEGY] Direction: {direction_str}")
+                    else:
+                        # Only log at DEBUG level if no change (reduces spam)
+                        logger.debug(f"[TS→PYTHON] StrategyDirection: {direction_str} (unchanged)")
+                except (ValueError, TypeError):
+                    logger.warning(f"Invalid StrategyDirection value: {value}")
+            
+            if key == "TS_STRATEGY_STATE":
+                self.signals.strategy_state_changed.emit(str(value))
+                logger.info(f"[TS→PYTHON] Strategy state updated to: {value}")
+                self.signals.ts_activity.emit(f"[STATE] Strategy: {value}")  # Always show strategy state changes
+        except Exception as e:
+            logger.error(f"Error processing signal change: {e}", exc_info=True)
+    
+    def on_signal_remove(self, gd, key, size):
+        """Called when a key is removed from GlobalDictionary
+        Based on working Demo.py pattern.
+        
+        Parameters (from GlobalDictionary callback):
+            gd: The GlobalDictionary instance
+            key: The dictionary key that was removed
+            size: Current size of the dictionary after removal
+        """
+        if not self.running:
+            return
+            
+        try:
+            # LOG ALL REMOVALS FROM TRADESTATION
+            logger.info(f"[TS→PYTHON] REMOVED KEY: '{key}' (dict size: {size})")
+            self.signals.ts_message.emit(f"TS REMOVE: {key}")
+            
+            # Show REMOVE events in Activity Log (conditionally based on settings)
+            show_all = self.main_window.show_all_gd_communications if self.main_window else False
+            if show_all:
+                self.signals.ts_activity.emit(f"[REMOVE] Key: {key}")
+        except Exception as e:
+            logger.error(f"Error processing signal remove: {e}", exc_info=True)
+    
+    def on_signal_clear(self, gd):
+        """Called when the GlobalDictionary is cleared
+        Based on working Demo.py pattern.
+        
+        Parameters (from GlobalDictionary callback):
+            gd: The GlobalDictionary instance
+        """
+        if not self.running:
+            return
+            
+        try:
+            # LOG CLEAR EVENT FROM TRADESTATION
+            logger.info(f"[TS→PYTHON] DICTIONARY CLEARED")
+            self.signals.ts_message.emit(f"TS CLEAR: Dictionary cleared")
+            
+            # Show CLEAR events in Activity Log (conditionally based on settings)
+            show_all = self.main_window.show_all_gd_communications if self.main_window else False
+            if show_all:
+                self.signals.ts_activity.emit(f"[CLEAR] GlobalDictionary cleared")
+        except Exception as e:
+            logger.error(f"Error processing clear event: {e}", exc_info=True)
+    
+    def stop(self):
+        """Stop the COM message pump and cleanup"""
+        self.running = False
+        
+        # Stop the timer
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        
+        # Cleanup COM
+        if self.gd:
+            try:
+                self.gd.set("PYTHON_STATUS", "DISCONNECTED")
+            except:
+                pass
+
+
+# ============================================================================
+# OHLCV BAR STORE
+# ============================================================================
+# Historical / live bars for each series live in one preallocated NumPy
+# structured array (epoch-ns time + OHLCV). Appending a bar or replacing the
+# forming bar is O(1); charts take zero-copy views of the live rows, and a
+# bounded series (200/400 bars) trims by moving its start pointer.
+#
+# Rows an outstanding view can see are never overwritten, except the forming
+# bar via replace_last()/tick(). Compaction, growth, prepend and clear() move
+# the series onto a NEW array, so a view handed to a throttled chart update
+# stays valid.
+# ============================================================================
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+BAR_DTYPE = np.dtype([('time', 'i8')] + [(field, 'f8') for field in BAR_FIELDS])  # time: epoch ns (wall clock)
+
+
+def bar_time_ns(date) -> int:
+    """IBKR bar date ("20251112 08:30:00", "20251112", optional time zone suffix) -> epoch ns"""
+    parts = str(date).split()
+    return pd.Timestamp(' '.join(parts[:2])).value
+
+
+def bar_time_zone(date) -> Optional[str]:
+    """Time zone suffix of an IBKR bar date ("20251112 08:30:00 US/Eastern" -> "US/Eastern"), None if absent"""
+    parts = str(date).split()
+    if len(parts) < 3:
+        return None
+    try:
+        pytz.timezone(parts[2])
+    except pytz.UnknownTimeZoneError:
+        return None
+    return parts[2]
+
+
+def ib_end_time_ns(end_time: str, tz) -> int:
+    """
+    IBKR endDateTime -> epoch ns on the bar clock (wall clock in tz, like bar_time_ns)
+    
+    "" is now, "yyyymmdd-hh:mm:ss" is UTC, "yyyymmdd hh:mm:ss [zone]" is in zone (default tz).
+    """
+    if not end_time:
+        stamp = pd.Timestamp.now(tz='UTC')
+    elif '-' in end_time:
+        stamp = pd.Timestamp(end_time.replace('-', ' '), tz='UTC')
+    else:
+        parts = end_time.split()
+        stamp = pd.Timestamp(' '.join(parts[:2])).tz_localize(parts[2] if len(parts) > 2 else tz,
+                                                              ambiguous=False, nonexistent='shift_forward')
+    return stamp.tz_convert(tz).tz_localize(None).value
+
+
+def ib_end_time(time_ns: int, tz) -> str:
+    """Epoch ns on the bar clock (wall clock in tz) -> IBKR UTC endDateTime (yyyymmdd-hh:mm:ss)"""
+    stamp = pd.Timestamp(time_ns).tz_localize(tz, ambiguous=False, nonexistent='shift_forward')
+    return stamp.tz_convert('UTC').strftime("%Y%m%d-%H:%M:%S")
+
+
+def bar_row(bar: dict) -> tuple:
+    """IBKR bar dict ('date') or chart bar dict ('time') -> BAR_DTYPE row"""
+    date = bar['date'] if 'date' in bar else bar['time']
+    return (bar_time_ns(date), float(bar['open']), float(bar['high']), float(bar['low']),
+            float(bar['close']), float(bar['volume'] or 0))
+
+
+def bar_frame(rows: np.ndarray) -> pd.DataFrame:
+    """Chart DataFrame (DatetimeIndex 'time') from bar rows - NaN rows dropped, sorted, last duplicate kept"""
+    df = pd.DataFrame({field: rows[field] for field in BAR_FIELDS},
+                      index=pd.DatetimeIndex(rows['time'].astype('datetime64[ns]'), name='time'))
+    df = df.dropna()
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep='last')]
+    return df
+
+
+class BarSeries:
+    """OHLCV rows for one series - O(1) append / replace-last, zero-copy views"""
+
+    def __init__(self, max_len: Optional[int] = None, capacity: int = 512):
+        self.max_len = max_len  # None = keep every bar (historical_data), else ring of the last max_len bars
+        self.rows = np.zeros(2 * max_len if max_len else capacity, dtype=BAR_DTYPE)
+        self.start = 0
+        self.end = 0
+
+    @classmethod
+    def from_bars(cls, bars: List[dict], max_len: Optional[int] = None) -> 'BarSeries':
+        series = cls(max_len, capacity=max(2 * len(bars), 512))
+        for bar in bars:
+            series.append(bar)
+        return series
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def view(self, last: Optional[int] = None) -> np.ndarray:
+        """Live rows (or only the last N) as a zero-copy slice of the structured array"""
+        start = self.start if last is None else max(self.start, self.end - last)
+        return self.rows[start:self.end]
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return int(self.rows['time'][self.end - 1]) if self.end > self.start else None
+
+    def append(self, bar: dict):
+        self._push(bar_row(bar))
+
+    def replace_last(self, bar: dict):
+        self.rows[self.end - 1] = bar_row(bar)
+
+    def upsert(self, bar: dict) -> bool:
+        """historicalDataUpdate: replace the forming bar (same time) or append a new one - True if appended"""
+        row = bar_row(bar)
+        if self.end > self.start and int(self.rows['time'][self.end - 1]) == row[0]:
+            self.rows[self.end - 1] = row
+            return False
+        self._push(row)
+        return True
+
+    def tick(self, price: float):
+        """Fold a trade price into the forming bar (close / high / low)"""
+        last = self.end - 1
+        self.rows['close'][last] = price
+        self.rows['high'][last] = max(self.rows['high'][last], price)
+        self.rows['low'][last] = min(self.rows['low'][last], price)
+
+    def extend(self, rows: np.ndarray):
+        """Append BAR_DTYPE rows (bar cache) in one copy"""
+        if self.max_len and len(rows) > self.max_len:
+            rows = rows[-self.max_len:]
+        if self.end + len(rows) > len(self.rows):
+            self._relocate(len(self) + len(rows))
+        self.rows[self.end:self.end + len(rows)] = rows
+        self.end += len(rows)
+        if self.max_len and self.end - self.start > self.max_len:
+            self.start = self.end - self.max_len
+
+    def prepend(self, bars):
+        """Backfill: older bars (dicts or BAR_DTYPE rows) go in front of the existing rows (rare - O(n))"""
+        if isinstance(bars, np.ndarray):
+            older = bars
+        else:
+            older = np.array([bar_row(bar) for bar in bars], dtype=BAR_DTYPE)
+        if len(self):
+            older = older[older['time'] < self.rows['time'][self.start]]  # Overlap stays with the newer rows
+        count = len(older) + len(self)
+        rows = np.zeros(max(2 * count, len(self.rows)), dtype=BAR_DTYPE)
+        rows[:len(older)] = older
+        rows[len(older):count] = self.rows[self.start:self.end]
+        self.rows, self.start, self.end = rows, 0, count
+        if self.max_len and count > self.max_len:
+            self.start = count - self.max_len
+
+    def clear(self):
+        self.rows = np.zeros(len(self.rows), dtype=BAR_DTYPE)
+        self.start = self.end = 0
+
+    def _push(self, row: tuple):
+        if self.end == len(self.rows):
+            self._relocate(len(self) + 1)
+        self.rows[self.end] = row
+        self.end += 1
+        if self.max_len and self.end - self.start > self.max_len:
+            self.start += 1  # Trim = pointer move
+
+    def _relocate(self, needed: int):
+        """Copy the live rows to the front of a new array (bounded: same size, unbounded: doubled)"""
+        count = len(self)
+        size = 2 * self.max_len if self.max_len else max(2 * needed, len(self.rows))
+        rows = np.zeros(size, dtype=BAR_DTYPE)
+        rows[:count] = self.rows[self.start:self.end]
+        self.rows, self.start, self.end = rows, 0, count
+
+
+# ============================================================================
+# HISTORICAL BAR CACHE (on-disk, columnar, gap-only fetching)
+# ============================================================================
+# Every launch, interval change and chart zoom-out used to re-download the
+# same bars from IBKR, and historical pacing limits make that slow. Bars are
+# now kept on disk per (contract, barSize, whatToShow, useRTH) as one
+# compressed .npz of columns (time, open, high, low, close, volume) plus the
+# time ranges IBKR has already answered for ("coverage").
+#
+# A request is served from disk for the covered part of its window and only
+# the missing range is asked from IBKR:
+# - live (keepUpToDate) requests must end "now", so they fetch from the first
+#   uncovered point after the cached range to now - after a restart that is
+#   the last few minutes
+# - backfill requests (explicit end time) fetch from the window start to the
+#   last uncovered point, or nothing at all when the window is covered
+#
+# Coverage is only recorded for what IBKR really answered: "N S" durations
+# are exact windows, "D"/"W" durations are trading days, so those record
+# from the first returned bar.
+# ============================================================================
+
+BAR_CACHE_WIRE_BYTES = 64  # Approximate size of one historicalData bar on the IBKR socket
+BAR_CACHE_MAX_AGE_DAYS = 14  # Files untouched this long are pruned at startup (expired options)
+BAR_CACHE_ZONE_FILE = "timezone.txt"  # Zone the cached bar times are wall clock in
+
+
+def ib_duration(seconds: float) -> str:
+    """IBAPI duration string for a span in seconds (valid units: S, D, W - no H)"""
+    if seconds < 86400:  # Less than 1 day
+        return f"{int(math.ceil(seconds))} S"
+    if seconds < 604800:  # Less than 1 week - round up to days
+        return f"{int(seconds / 86400) + 1} D"
+    return f"{int(seconds / 604800) + 1} W"
+
+
+def ib_duration_seconds(duration: str) -> int:
+    """Span of an IBAPI duration string ("14400 S", "1 D", "2 W", "1 M", "1 Y") in seconds"""
+    count, unit = duration.split()
+    return int(count) * {'S': 1, 'D': 86400, 'W': 604800, 'M': 2592000, 'Y': 31536000}[unit.upper()]
+
+
+def ib_bar_seconds(bar_size: str) -> int:
+    """Length of an IBAPI bar size ("15 secs", "1 min", "5 mins", "1 hour", "1 day") in seconds"""
+    count, unit = bar_size.split()
+    for prefix, seconds in (('sec', 1), ('min', 60), ('hour', 3600), ('day', 86400)):
+        if unit.lower().startswith(prefix):
+            return int(count) * seconds
+    return 60
+
+
+def bar_cache_key(contract, bar_size: str, what_to_show: str, use_rth) -> str:
+    """File-name-safe cache key for (contract, barSize, whatToShow, useRTH)"""
+    parts = [contract.symbol, contract.secType, contract.lastTradeDateOrContractMonth, contract.right,
+             f"{contract.strike:g}" if contract.strike else '', contract.exchange,
+             bar_size, what_to_show, 'RTH' if use_rth else 'ALL']
+    return '_'.join(part.replace(' ', '') for part in parts if part)
+
+
+def merge_bar_rows(*arrays: np.ndarray) -> np.ndarray:
+    """BAR_DTYPE rows of all arrays sorted by time - a later array wins a duplicate time"""
+    rows = np.concatenate(arrays) if arrays else np.empty(0, dtype=BAR_DTYPE)
+    order = np.argsort(rows['time'], kind='stable')
+    rows = rows[order]
+    keep = np.ones(len(rows), dtype=bool)
+    keep[:-1] = rows['time'][1:] != rows['time'][:-1]  # Last of each run of equal times
+    return rows[keep]
+
+
+def merge_coverage(coverage: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Union of (k, 2) [start, end] ns intervals with one more interval"""
+    intervals = sorted([tuple(interval) for interval in coverage.tolist()] + [(start, end)])
+    merged = [list(intervals[0])]
+    for lo, hi in intervals[1:]:
+        if lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return np.array(merged, dtype=np.int64).reshape(-1, 2)
+
+
+class HistoricalBarCache:
+    """On-disk bar store per (contract, barSize, whatToShow, useRTH) with answered-range coverage"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._files: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # key -> (rows, coverage) loaded this session
+        self.timezone: Optional[str] = None  # Zone of the bar clock (TWS bar date suffix), None = not seen yet
+        self.stats = {'requests': 0, 'requests_saved': 0, 'requests_shortened': 0,
+                      'bars_from_cache': 0, 'bars_fetched': 0, 'bytes_written': 0}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.prune()
+            zone_path = self.directory / BAR_CACHE_ZONE_FILE
+            if zone_path.exists():
+                self.timezone = zone_path.read_text().strip() or None
+        except OSError as e:
+            logger.warning(f"⚠️ Bar cache directory {self.directory} unavailable: {e}")
+
+    def set_timezone(self, zone: str):
+        """TWS stamps bar dates in zone - bars cached on another zone's clock are dropped"""
+        if zone == self.timezone:
+            return
+        if self.timezone is not None:
+            logger.warning(f"⚠️ Bar cache: TWS time zone changed {self.timezone} → {zone} - clearing cached bars")
+            for path in self.directory.glob('*.npz'):
+                path.unlink(missing_ok=True)
+            self._files.clear()
+        self.timezone = zone
+        try:
+            (self.directory / BAR_CACHE_ZONE_FILE).write_text(zone)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write bar cache time zone: {e}")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def load(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, coverage) for a key - empty when nothing is cached or the file is unreadable"""
+        if key not in self._files:
+            rows, coverage = np.empty(0, dtype=BAR_DTYPE), np.empty((0, 2), dtype=np.int64)
+            path = self._path(key)
+            if path.exists():
+                try:
+                    with np.load(path) as data:
+                        rows = np.empty(len(data['time']), dtype=BAR_DTYPE)
+                        for field in BAR_DTYPE.names:
+                            rows[field] = data[field]
+                        coverage = data['coverage'].astype(np.int64).reshape(-1, 2)
+                except Exception as e:
+                    logger.warning(f"⚠️ Ignoring unreadable bar cache file {path.name}: {e}")
+            self._files[key] = (rows, coverage)
+        return self._files[key]
+
+    def store(self, key: str, rows: np.ndarray, start: int, end: int):
+        """Merge rows answered by IBKR for [start, end] (epoch ns) into the cache file"""
+        if end < start:
+            return
+        cached_rows, coverage = self.load(key)
+        rows = merge_bar_rows(cached_rows, np.asarray(rows, dtype=BAR_DTYPE))
+        coverage = merge_coverage(coverage, start, end)
+        self._files[key] = (rows, coverage)
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp.npz')
+        try:
+            np.savez_compressed(tmp_path, coverage=coverage, **{field: rows[field] for field in BAR_DTYPE.names})
+            tmp_path.replace(path)  # Atomic - a crash mid-write never leaves a torn file
+            self.stats['bytes_written'] += path.stat().st_size
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write bar cache file {path.name}: {e}")
+
+    @staticmethod
+    def first_missing(coverage: np.ndarray, start: int, end: int) -> Optional[int]:
+        """Earliest point of [start, end] not covered (None = fully covered)"""
+        position = start
+        for lo, hi in coverage.tolist():
+            if lo <= position <= hi:
+                position = hi
+            elif lo > position:
+                break
+        return None if position >= end else position
+
+    @staticmethod
+    def last_missing(coverage: np.ndarray, start: int, end: int) -> Optional[int]:
+        """Latest point of [start, end] not covered (None = fully covered)"""
+        position = end
+        for lo, hi in reversed(coverage.tolist()):
+            if lo <= position <= hi:
+                position = lo
+            elif hi < position:
+                break
+        return None if position <= start else position
+
+    def plan(self, key: str, start: int, end: int, live: bool) -> Tuple[np.ndarray, Optional[int], Optional[int]]:
+        """
+        Cached rows to serve and the range still to fetch for a request window [start, end].
+
+        Returns (rows, fetch_start, fetch_end); fetch_start is None when nothing has to
+        be fetched (backfill only - a live request always fetches from the covered end).
+        """
+        rows, coverage = self.load(key)
+        self.stats['requests'] += 1
+        times = rows['time']
+        if live:
+            # Uncovered time before the first cached range is usually a closed market (a "1 D"
+            # window reaches into the previous evening) - start at the cached range, not the window
+            overlapping = coverage[(coverage[:, 1] >= start) & (coverage[:, 0] <= end)]
+            if len(overlapping) == 0:
+                fetch_start = start
+            else:
+                fetch_start = self.first_missing(coverage, max(start, int(overlapping[0, 0])), end)
+            if fetch_start is None:
+                fetch_start = min(int(coverage[np.searchsorted(coverage[:, 0], end, side='right') - 1, 1]), end)
+            served = rows[(times >= start) & (times < fetch_start)]
+            fetch_end = end
+        else:
+            fetch_end = self.last_missing(coverage, start, end)
+            fetch_start = None if fetch_end is None else start
+            served = rows[(times >= (start if fetch_end is None else fetch_end)) & (times < end)]
+        if len(served):
+            self.stats['requests_saved' if fetch_start is None else 'requests_shortened'] += 1
+            self.stats['bars_from_cache'] += len(served)
+        return served, fetch_start, fetch_end
+
+    def prune(self, max_age_days: int = BAR_CACHE_MAX_AGE_DAYS):
+        """Delete cache files not written for max_age_days (expired option contracts)"""
+        cutoff = time.time() - max_age_days * 86400
+        for path in self.directory.glob('*.npz'):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+
+    def report(self) -> str:
+        """Session summary: bar hit ratio, requests saved / shortened, bytes not downloaded"""
+        stats = self.stats
+        total = stats['bars_from_cache'] + stats['bars_fetched']
+        hit_ratio = stats['bars_from_cache'] / total * 100 if total else 0.0
+        saved_kb = stats['bars_from_cache'] * BAR_CACHE_WIRE_BYTES / 1024
+        return (f"Bar cache: {hit_ratio:.0f}% hit ratio ({stats['bars_from_cache']:,} of {total:,} bars from disk), "
+                f"{stats['requests_saved']} of {stats['requests']} requests saved, "
+                f"{stats['requests_shortened']} shortened, ~{saved_kb:,.0f} KB not downloaded")
+
+
+# ============================================================================
+# STREAMING INDICATORS (EMA + rolling Z-Score)
+# ============================================================================
+# The last bar of a series is the forming bar: historicalDataUpdate rewrites
+# it many times per second, then a new bar commits it. The engine keeps the
+# EMA of the last committed bar and a Welford (mean / M2) window over the
+# last z_period - 1 committed closes, so the forming bar's EMA and Z-Score
+# are O(1) per update. Values match pandas ewm(adjust=False) and
+# rolling(z_period).std() (sample std). A full recompute only happens when
+# the EMA length or Z-Score period changes, or the history is replaced.
+# ============================================================================
+
+class IndicatorEngine:
+    """Running EMA + rolling Z-Score for one bar series (last bar = forming bar)"""
+
+    RESYNC_BARS = 64  # Vectorized recompute beats per-bar appends past this many new bars
+
+    def __init__(self, ema_period: int = 9, z_period: int = 30, capacity: int = 512):
+        self.ema_period = ema_period
+        self.z_period = z_period
+        self._alpha = 2.0 / (ema_period + 1)
+        self._closes = np.empty(capacity)
+        self._ema = np.empty(capacity)
+        self._z = np.empty(capacity)
+        self.size = 0
+        # Committed state (every bar before the forming one)
+        self._ema_committed = math.nan
+        self._window = deque()  # Last z_period - 1 committed closes
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._commits_since_resync = 0
+
+    @property
+    def ema(self) -> np.ndarray:
+        return self._ema[:self.size]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._z[:self.size]
+
+    @property
+    def zscore(self) -> float:
+        """Z-Score of the forming bar (NaN until z_period bars)"""
+        return float(self._z[self.size - 1]) if self.size else math.nan
+
+    @property
+    def previous_zscore(self) -> float:
+        """Z-Score of the last completed bar"""
+        return float(self._z[self.size - 2]) if self.size > 1 else math.nan
+
+    def threshold_cross(self, threshold: float) -> int:
+        """+1 when the forming bar crossed above +threshold, -1 below -threshold (vs last completed bar), else 0"""
+        now, before = self.zscore, self.previous_zscore
+        if math.isnan(now) or math.isnan(before):
+            return 0
+        if before < threshold <= now:
+            return 1
+        if before > -threshold >= now:
+            return -1
+        return 0
+
+    def configure(self, ema_period: int, z_period: int) -> bool:
+        """Change EMA length / Z-Score period - recomputes the whole history (True) only if either changed"""
+        if ema_period == self.ema_period and z_period == self.z_period:
+            return False
+        self.ema_period = ema_period
+        self.z_period = z_period
+        self._alpha = 2.0 / (ema_period + 1)
+        self.reset(self._closes[:self.size].copy())
+        return True
+
+    def reset(self, closes: np.ndarray):
+        """Recompute every bar from a close history (vectorized)"""
+        n = len(closes)
+        self._reserve(n)
+        self.size = n
+        self._closes[:n] = closes
+        if n == 0:
+            self._ema_committed = math.nan
+            self._window.clear()
+            self._resync_window()
+            return
+        series = pd.Series(self._closes[:n])
+        self._ema[:n] = series.ewm(span=self.ema_period, adjust=False).mean().to_numpy()
+        rolling = series.rolling(self.z_period)
+        self._z[:n] = ((series - rolling.mean()) / rolling.std()).to_numpy()
+        self._ema_committed = float(self._ema[n - 2]) if n > 1 else math.nan
+        self._window = deque(self._closes[max(0, n - self.z_period):n - 1].tolist())
+        self._resync_window()
+
+    def sync(self, closes: np.ndarray):
+        """
+        Bring the engine in line with a full close history (chart full redraw).
+
+        When only the forming bar changed and/or a few bars were appended, this
+        is O(1) per bar; anything else (backfill, downsampling, new series)
+        falls back to reset().
+        """
+        n, size = len(closes), self.size
+        if (size == 0 or n < size or n - size > self.RESYNC_BARS
+                or not np.array_equal(self._closes[:size - 1], closes[:size - 1])):
+            self.reset(closes)
+            return
+        self.update_last(float(closes[size - 1]))
+        for close in closes[size:]:
+            self.append(float(close))
+
+    def update_last(self, close: float):
+        """Forming bar changed - O(1)"""
+        i = self.size - 1
+        self._closes[i] = close
+        ema_prev = self._ema_committed
+        self._ema[i] = close if math.isnan(ema_prev) else self._alpha * close + (1 - self._alpha) * ema_prev
+        # Welford: combine the committed window with the forming close
+        k = len(self._window)
+        if k + 1 < self.z_period or k == 0:
+            self._z[i] = math.nan
+            return
+        n = k + 1
+        mean = self._mean + (close - self._mean) / n
+        m2 = self._m2 + (close - self._mean) * (close - mean)
+        std = math.sqrt(m2 / (n - 1)) if m2 > 0 else 0.0
+        self._z[i] = (close - mean) / std if std > 0 else math.nan
+
+    def append(self, close: float):
+        """Commit the forming bar and open a new one - O(1) amortized"""
+        if self.size:
+            last = self.size - 1
+            self._ema_committed = float(self._ema[last])
+            self._window_add(float(self._closes[last]))
+        self._reserve(self.size + 1)
+        self.size += 1
+        self.update_last(close)
+
+    def _window_add(self, close: float):
+        self._window.append(close)
+        k = len(self._window)
+        delta = close - self._mean
+        self._mean += delta / k
+        self._m2 += delta * (close - self._mean)
+        if k > self.z_period - 1:
+            oldest = self._window.popleft()
+            k -= 1
+            if k == 0:
+                self._mean, self._m2 = 0.0, 0.0
+            else:
+                delta = oldest - self._mean
+                self._mean -= delta / k
+                self._m2 -= delta * (oldest - self._mean)
+        self._commits_since_resync += 1
+        if self._commits_since_resync >= max(self.z_period, 16):
+            self._resync_window()  # Bound floating-point drift from the rolling add/remove
+
+    def _resync_window(self):
+        """Exact mean / M2 of the committed window (O(z_period), every z_period commits)"""
+        window = np.fromiter(self._window, dtype=float, count=len(self._window))
+        self._mean = float(window.mean()) if len(window) else 0.0
+        self._m2 = float(((window - self._mean) ** 2).sum()) if len(window) else 0.0
+        self._commits_since_resync = 0
+
+    def _reserve(self, needed: int):
+        if needed <= len(self._closes):
+            return
+        size = max(needed, 2 * len(self._closes))
+        for name in ('_closes', '_ema', '_z'):
+            grown = np.empty(size)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+
+
+# ============================================================================
+# CHART DOWNSAMPLING (M4 - first / min / max / last per pixel bucket)
+# ============================================================================
+# Stride slicing (price_data[::step]) drops highs and lows, so a spike that
+# hit a stop can vanish from the chart. M4 keeps, per pixel-wide time bucket,
+# the first, last, lowest-low and highest-high bar: a candle per bucket is
+# the exact OHLC of its bars and a line keeps every extreme.
+#
+# Buckets sit on a fixed time grid per zoom level (bucket width = median bar
+# spacing * 2^level), so scrolling at one zoom level reuses cached buckets.
+# Only the visible range (plus one viewport each side) is computed; the last
+# bucket that is still filling is recomputed on every call, never cached.
+# ============================================================================
+
+def bucket_extrema(x: np.ndarray, high: np.ndarray, low: np.ndarray, x0: float,
+                   bucket_width: float, i0: int, i1: int):
+    """
+    M4 indices of bars [i0, i1) bucketed on the grid x0 + k * bucket_width.
+
+    Returns (first, last, argmin(low), argmax(high)) index arrays, one entry per non-empty bucket.
+    """
+    ids = np.floor((x[i0:i1] - x0) / bucket_width).astype(np.int64)
+    n = len(ids)
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+    ends = np.append(starts[1:], n)
+    imin = np.lexsort((low[i0:i1], ids))[starts]    # lowest low sorts first within its bucket
+    imax = np.lexsort((high[i0:i1], ids))[ends - 1]  # highest high sorts last
+    return i0 + starts, i0 + ends - 1, i0 + imin, i0 + imax
+
+
+class ChartDownsampler:
+    """Viewport-width M4 downsampling for one chart with a per-zoom-level bucket cache"""
+
+    MAX_LEVELS = 8
+
+    def __init__(self):
+        self._levels: Dict[int, Tuple] = {}  # level -> (i0, i1, first, last, imin, imax) for closed buckets
+        self._identity = None  # (first bar x, bar spacing) the cache was built for
+
+    def invalidate(self):
+        self._levels.clear()
+        self._identity = None
+
+    def select(self, x: np.ndarray, high: np.ndarray, low: np.ndarray,
+               x_start: float, x_end: float, pixels: int, count: Optional[int] = None):
+        """
+        Buckets covering [x_start, x_end] (plus one viewport each side) for bars [0, count).
+
+        Returns (first, last, imin, imax, bucket_width); bucket_width is None when
+        the view holds no more bars than pixels (every bar is its own bucket).
+        """
+        count = len(x) if count is None else count
+        span = max(x_end - x_start, 1e-9)
+        j0 = int(np.searchsorted(x, x_start - span, side='left'))
+        j1 = min(int(np.searchsorted(x, x_end + span, side='right')), count)
+        if count < 2 or j1 <= j0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, empty, None
+
+        identity = (float(x[0]), float(np.median(np.diff(x[:min(count, 512)]))))
+        if identity != self._identity:
+            self.invalidate()
+            self._identity = identity
+        spacing = identity[1] if identity[1] > 0 else span / max(count, 1)
+        level = int(math.ceil(math.log2(max(span / max(pixels, 1) / spacing, 1e-9))))
+        if level <= 0:
+            raw = np.arange(j0, j1, dtype=np.int64)
+            return raw, raw, raw, raw, None
+        bucket_width = spacing * (1 << level)
+        x0 = float(x[0])
+        bucket_end = x0 + (math.floor((x[j1 - 1] - x0) / bucket_width) + 1) * bucket_width
+        j1 = min(int(np.searchsorted(x, bucket_end, side='left')), count)  # Whole last bucket
+
+        cached = self._levels.get(level)
+        if (cached is None or j0 < cached[0] or j0 > cached[1]
+                or j1 - cached[1] > pixels * (1 << level)):  # Scrolled off the cached range
+            # Compute the visible range on bucket boundaries; keep only closed buckets
+            i0 = int(np.searchsorted(x, x0 + math.floor((x[j0] - x0) / bucket_width) * bucket_width))
+            first, last, imin, imax = bucket_extrema(x, high, low, x0, bucket_width, i0, j1)
+            closed = len(first) - 1
+            cached = (i0, int(first[closed]), first[:closed], last[:closed], imin[:closed], imax[:closed])
+            self._levels.pop(level, None)
+            if len(self._levels) >= self.MAX_LEVELS:
+                self._levels.pop(next(iter(self._levels)))
+            self._levels[level] = cached
+        i0, i1 = cached[0], cached[1]
+
+        # Cached closed buckets in view + freshly computed buckets past the cached range
+        lo = int(np.searchsorted(cached[2], j0, side='right')) - 1 if len(cached[2]) else 0
+        lo = max(lo, 0)
+        parts = [part[lo:] for part in cached[2:]]
+        if j1 > i1:
+            tail = bucket_extrema(x, high, low, x0, bucket_width, i1, j1)
+            parts = [np.concatenate((part, extra)) for part, extra in zip(parts, tail)]
+        first, last, imin, imax = parts
+        keep = first < j1
+        return first[keep], last[keep], imin[keep], imax[keep], bucket_width
+
+    @staticmethod
+    def line_indices(first, last, imin, imax) -> np.ndarray:
+        """M4 points of a line in time order (first / min / max / last of every bucket)"""
+        return np.unique(np.concatenate((first, imin, imax, last)))
+
+
+# ============================================================================
+# OFF-THREAD CHART RENDERING (Agg rasterization in a render process)
+# ============================================================================
+# A full matplotlib draw of a 2000-candle chart costs ~100 ms, and it ran on
+# the GUI thread that also handles ticks, order status and the position
+# timer. OffThreadFigureCanvas.draw() now only pickles the figure (the
+# snapshot, ~20 ms) and hands it to ChartRenderWorker. The worker thread
+# ships the snapshot to a separate render process, which rebuilds the copy
+# and rasterizes it with a plain Agg canvas. Rendering in a thread of this
+# process does not help - matplotlib's draw is mostly Python and holds the
+# GIL the GUI thread needs - so the thread only waits on the pipe (GIL
+# released) while the process does the work.
+#
+# The finished frame is copied into the canvas's own Agg buffer on the GUI
+# thread and the usual draw_event fires, so the charts' blitting code
+# (restore_region / draw_artist / blit) is unchanged - per-tick updates stay
+# blits on the GUI thread.
+#
+# Stale frames: the worker keeps only the newest snapshot per canvas, so
+# snapshots superseded while a render runs are never rasterized. A frame
+# older than the one already shown, or rendered for a different canvas
+# size / axes layout, is dropped. Every figure change is followed by a
+# draw() / draw_idle() as before, so a newer snapshot is already queued
+# whenever the frame that lands no longer matches the figure.
+#
+# Constrained layout runs inside the render process on the copy; the
+# resulting axes positions travel back with the frame so draw_artist on the
+# GUI thread places the animated artists where the frame has its axes.
+#
+# The process is spawned (safe next to Qt's threads, and the only start
+# method on Windows) when the worker starts. Until it reports ready, or
+# after it dies, canvases draw synchronously on the GUI thread as before.
+# ============================================================================
+
+def render_chart_snapshot(snapshot: bytes, dpi: float):
+    """Unpickle a figure and rasterize it; returns (RGBA frame, [(original, active) axes positions])"""
+    figure = pickle.loads(snapshot)
+    figure.set_dpi(dpi)  # Pickling drops the device-pixel-ratio scaling
+    canvas = FigureCanvasAgg(figure)
+    canvas.draw()
+    frame = np.asarray(canvas.buffer_rgba()).copy()
+    positions = [(ax.get_position(original=True), ax.get_position()) for ax in figure.axes]
+    return frame, positions
+
+
+def chart_render_process(connection):
+    """Render process main loop: (snapshot, dpi) in, (frame, positions, error) out, None ends it"""
+    connection.send('ready')
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, OSError):
+            return  # GUI process gone
+        if job is None:
             return
-            
         try:
-            value_str = str(value)[:200] if value else "None"
-            
-            # Filter out repetitive/noisy messages from logs but allow in Activity Log
-            # Note: StrategyDirection is now processed separately, not filtered
-            repetitive_keys = {
-                'StrategyDirection', 'LAST_UPDATE', 'PYTHON_STATUS', 'CurrentTime', 'MarketState', 'HeartBeat'
-            }
-            
-            # Only log important changes to file/console, not repetitive status updates
-            if key not in repetitive_keys:
-                logger.info(f"[TS→PYTHON] CHANGED KEY: '{key}' = {value_str} (dict size: {size})")
-                self.signals.ts_message.emit(f"TS CHANGE: {key} = {value_str}")
-            
-            # Show CHANGE events in Activity Log (conditionally based on settings)
-            show_all = self.main_window.show_all_gd_communications if self.main_window else False
-            if show_all:
-                self.signals.ts_activity.emit(f"[CHANGE] {key} = {value_str}")
-            
-            # Handle StrategyDirection from TradeStation
-            # CURRENT FORMAT: 1=LONG, -1=SHORT, 0=FLAT (TradeStation standard)
-            # FUTURE FORMAT: Will support 0=FLAT, 1=LONG, 2=SHORT (normalized)
-            if key == "StrategyDirection":
-                try:
-                    raw_value = int(value)
-                    
-                    # Convert TradeStation format to normalized format
-                    # Current: 1=LONG, -1=SHORT, 0=FLAT
-                    # Convert to: 0=FLAT, 1=LONG, 2=SHORT (for handler)
-                    if raw_value == 1:
-                        direction = 1  # LONG
-                        direction_str = "LONG"
-                    elif raw_value == -1:
-                        direction = 2  # SHORT (convert -1 to 2)
-                        direction_str = "SHORT"
-                    elif raw_value == 0:
-                        direction = 0  # FLAT
-                        direction_str = "FLAT"
-                    else:
-                        # Future-proof: if TS sends 2, accept it as SHORT
-                        if raw_value == 2:
-                            direction = 2
-                            direction_str = "SHORT"
-                        else:
-                            direction = 0  # Unknown values default to FLAT
-                            direction_str = f"UNKNOWN({raw_value})->FLAT"
-                            logger.warning(f"Unknown StrategyDirection value {raw_value}, defaulting to FLAT")
-                    
-                    # ALWAYS emit signal to support immediate join mode
-                    # BUT only log if value changed to reduce spam
-                    direction_changed = (direction != self.last_strategy_direction)
-                    self.last_strategy_direction = direction
-                    self.signals.strategy_direction_changed.emit(direction)
-                    
-                    if direction_changed:
-                        logger.info(f"[TS→PYTHON] StrategyDirection: {direction_str} (TS={raw_value} → Python={direction})")
-                        self.signals.ts_activity.emit(f"[STRATEGY] Direction: {direction_str}")
-                    else:
-                        # Only log at DEBUG level if no change (reduces spam)
-                        logger.debug(f"[TS→PYTHON] StrategyDirection: {direction_str} (unchanged)")
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid StrategyDirection value: {value}")
-            
-            if key == "TS_STRATEGY_STATE":
-                self.signals.strategy_state_changed.emit(str(value))
-                logger.info(f"[TS→PYTHON] Strategy state updated to: {value}")
-                self.signals.ts_activity.emit(f"[STATE] Strategy: {value}")  # Always show strategy state changes
+            frame, positions = render_chart_snapshot(*job)
+            connection.send((frame, positions, None))
         except Exception as e:
-            logger.error(f"Error processing signal change: {e}", exc_info=True)
-    
-    def on_signal_remove(self, gd, key, size):
-        """Called when a key is removed from GlobalDictionary
-        Based on working Demo.py pattern.
-        
-        Parameters (from GlobalDictionary callback):
-            gd: The GlobalDictionary instance
-            key: The dictionary key that was removed
-            size: Current size of the dictionary after removal
-        """
-        if not self.running:
+            connection.send((None, None, f"{type(e).__name__}: {e}"))
+
+
+class ChartRenderWorker(QThread):
+    """Feeds pickled chart figures to the render process and emits its frames (newest snapshot per canvas wins)"""
+
+    frame_ready = pyqtSignal(object, int, object, object)  # canvas key, sequence, RGBA frame, axes positions
+
+    def __init__(self):
+        super().__init__()
+        self._jobs: Dict[int, Tuple[int, bytes, float]] = {}  # canvas key -> (sequence, snapshot, dpi)
+        self._condition = threading.Condition()
+        self._running = True
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._connection = None
+        self.ready = False  # Render process up - canvases draw synchronously until then
+        self.stats = {'rendered': 0, 'superseded': 0, 'failed': 0, 'render_ms': 0.0, 'restarts': 0}
+
+    def submit(self, key: int, sequence: int, snapshot: bytes, dpi: float) -> bool:
+        """Queue a snapshot for rendering, replacing any not-yet-started snapshot of the same canvas"""
+        with self._condition:
+            if not self.ready:
+                return False  # Caller draws synchronously
+            if key in self._jobs:
+                self.stats['superseded'] += 1
+            self._jobs[key] = (sequence, snapshot, dpi)
+            self._condition.notify()
+        return True
+
+    def stop(self):
+        """Finish the render in progress (if any), end the thread and the render process"""
+        with self._condition:
+            self._running = False
+            self._jobs.clear()
+            self._condition.notify()
+        if not self.wait(2000) and self._process is not None:
+            self._process.terminate()  # Stuck render - unblocks the thread's recv
+            self.wait(1000)
+        self._close_process()
+
+    def _start_process(self) -> bool:
+        """Spawn the render process and wait for its hello; False if it could not start"""
+        try:
+            parent, child = self._context.Pipe()
+            self._process = self._context.Process(target=chart_render_process, args=(child,),
+                                                  name="ChartRender", daemon=True)
+            self._process.start()
+            child.close()
+            self._connection = parent
+            if parent.recv() != 'ready':
+                raise RuntimeError("unexpected hello")
+        except Exception as e:
+            logger.error(f"❌ Chart render process failed to start: {e} - charts render on the GUI thread")
+            self._close_process()
+            return False
+        self.ready = True
+        logger.info(f"🖼️ Chart render process started (pid {self._process.pid})")
+        return True
+
+    def _close_process(self):
+        with self._condition:
+            self.ready = False
+        if self._connection is not None:
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass
+            self._connection.close()
+            self._connection = None
+        if self._process is not None:
+            if self._process.pid is not None:  # Started
+                self._process.join(1)
+                if self._process.is_alive():
+                    self._process.terminate()
+            self._process = None
+
+    def run(self):
+        if not self._start_process():
+            return
+        while True:
+            with self._condition:
+                while self._running and not self._jobs:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                key = next(iter(self._jobs))  # Oldest canvas first so one busy chart can't starve the rest
+                sequence, snapshot, dpi = self._jobs.pop(key)
+            start = time.perf_counter()
+            try:
+                self._connection.send((snapshot, dpi))
+                frame, positions, error = self._connection.recv()  # Blocks without the GIL
+            except (EOFError, OSError) as e:
+                frame, positions, error = None, None, f"render process exited ({e!r})"
+                self._close_process()
+                if self._running and self.stats['restarts'] < 3:
+                    self.stats['restarts'] += 1
+                    self._start_process()
+            if error is not None:
+                self.stats['failed'] += 1
+                logger.error(f"❌ Chart render failed: {error}")  # The canvas draws this one itself
+            else:
+                self.stats['rendered'] += 1
+                self.stats['render_ms'] += (time.perf_counter() - start) * 1000
+            self.frame_ready.emit(key, sequence, frame, positions)
+            if not self.ready:
+                # Render process gone for good - queued canvases draw their snapshots themselves
+                with self._condition:
+                    abandoned, self._jobs = self._jobs, {}
+                for key, (sequence, _, _) in abandoned.items():
+                    self.frame_ready.emit(key, sequence, None, None)
+                return
+
+
+class OffThreadFigureCanvas(FigureCanvas):
+    """
+    Qt Agg canvas whose full draws are rasterized by a ChartRenderWorker.
+
+    Without a worker (or before its render process is up) it behaves exactly like
+    FigureCanvasQTAgg. With one, draw() returns after taking the snapshot; frame_pending is True until a frame
+    for the latest snapshot is installed, and blitting charts should skip their
+    blit meanwhile (the draw_event after the frame lands redraws the live artists).
+    """
+
+    def __init__(self, figure, render_worker: Optional[ChartRenderWorker] = None):
+        super().__init__(figure)
+        self.render_worker = render_worker
+        self._render_seq = 0  # Last snapshot submitted
+        self._shown_seq = 0   # Last frame installed
+        self.frames_dropped = 0
+        if render_worker is not None:
+            render_worker.frame_ready.connect(self._install_frame)
+
+    @property
+    def frame_pending(self) -> bool:
+        return self._shown_seq < self._render_seq
+
+    def draw(self):
+        if self.render_worker is None or not self.render_worker.ready:
+            self._draw_here()
             return
-            
         try:
-            # LOG ALL REMOVALS FROM TRADESTATION
-            logger.info(f"[TS→PYTHON] REMOVED KEY: '{key}' (dict size: {size})")
-            self.signals.ts_message.emit(f"TS REMOVE: {key}")
-            
-            # Show REMOVE events in Activity Log (conditionally based on settings)
-            show_all = self.main_window.show_all_gd_communications if self.main_window else False
-            if show_all:
-                self.signals.ts_activity.emit(f"[REMOVE] Key: {key}")
+            snapshot = pickle.dumps(self.figure, protocol=pickle.HIGHEST_PROTOCOL)
         except Exception as e:
-            logger.error(f"Error processing signal remove: {e}", exc_info=True)
-    
-    def on_signal_clear(self, gd):
-        """Called when the GlobalDictionary is cleared
-        Based on working Demo.py pattern.
-        
-        Parameters (from GlobalDictionary callback):
-            gd: The GlobalDictionary instance
-        """
-        if not self.running:
+            logger.warning(f"⚠️ Chart figure cannot be snapshotted ({e}) - rendering on the GUI thread")
+            self.render_worker = None
+            self._draw_here()
             return
-            
+        if not self.render_worker.submit(id(self), self._render_seq + 1, snapshot, self.figure.dpi):
+            self._draw_here()  # Render process went away since the ready check
+            return
+        self._render_seq += 1
+
+    def _draw_here(self):
+        """Synchronous GUI-thread draw; frames still in flight are older than it and get dropped"""
+        self._shown_seq = self._render_seq
+        super().draw()
+
+    def _install_frame(self, key, sequence: int, frame, positions):
+        """GUI thread: copy a finished frame into the Agg buffer, sync the layout and fire draw_event"""
+        if key != id(self) or sequence <= self._shown_seq:
+            return
+        if frame is None:  # Render failed - fall back to a synchronous draw
+            self._draw_here()
+            return
+        renderer = self.get_renderer()
+        buffer = np.asarray(renderer.buffer_rgba())
+        if buffer.shape != frame.shape or len(positions) != len(self.figure.axes):
+            # Resized or rebuilt while rendering - a newer snapshot is queued or needed
+            self.frames_dropped += 1
+            if sequence == self._render_seq:
+                self.draw()
+            return
+        self._shown_seq = sequence
+        for ax, (original, active) in zip(self.figure.axes, positions):
+            ax._set_position(original, which='original')  # What the layout engine does during a draw
+            ax._set_position(active, which='active')
+        buffer[...] = frame
+        DrawEvent("draw_event", self, renderer)._process()  # Same event Figure.draw emits
+        self.update()
+
+
+# ============================================================================
+# VISIBILITY-AWARE RENDERING (dirty tracking for hidden tabs / windows)
+# ============================================================================
+# Per-tick repaints of a chain table on another tab, or of the charts while
+# ChartWindow is hidden or minimized, cost GUI time nobody sees. A RenderGate
+# sits in front of a widget's render path: while the widget is hidden the
+# render is skipped and counted, and the widget (plus the keys that changed,
+# e.g. contract keys of a chain table) is marked dirty. When Qt shows the
+# widget again - tab switch, window shown or restored from minimized - one
+# catch-up render repaints only what was missed.
+# ============================================================================
+
+class RenderGate(QObject):
+    """Skips renders of a hidden widget, remembers what went stale and catches up once when shown"""
+
+    def __init__(self, name: str, widget, catch_up):
+        super().__init__(widget)
+        self.name = name
+        self.widget = widget
+        self.catch_up = catch_up  # Called with the set of dirty keys (empty if only whole-widget renders were skipped)
+        self.dirty = False
+        self.dirty_keys: set = set()
+        self.skipped = 0
+        self.catch_ups = 0
+        widget.installEventFilter(self)
+
+    def is_hidden(self) -> bool:
+        """Hidden itself, on a hidden tab / window, or its window is minimized"""
+        return not self.widget.isVisible() or self.widget.window().isMinimized()
+
+    def defer(self, key=None) -> bool:
+        """True if the render should be skipped (the widget is marked dirty instead)"""
+        if not self.is_hidden():
+            return False
+        self.dirty = True
+        if key is not None:
+            self.dirty_keys.add(key)
+        self.skipped += 1
+        return True
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Show and self.dirty:
+            QTimer.singleShot(0, self.flush)  # After the show completes (window state is settled)
+        return False
+
+    def flush(self):
+        """Run the catch-up render if the widget is dirty and visible"""
+        if not self.dirty or self.is_hidden():
+            return
+        keys, self.dirty_keys, self.dirty = self.dirty_keys, set(), False
+        self.catch_ups += 1
         try:
-            # LOG CLEAR EVENT FROM TRADESTATION
-            logger.info(f"[TS→PYTHON] DICTIONARY CLEARED")
-            self.signals.ts_message.emit(f"TS CLEAR: Dictionary cleared")
-            
-            # Show CLEAR events in Activity Log (conditionally based on settings)
-            show_all = self.main_window.show_all_gd_communications if self.main_window else False
-            if show_all:
-                self.signals.ts_activity.emit(f"[CLEAR] GlobalDictionary cleared")
+            self.catch_up(keys)
         except Exception as e:
-            logger.error(f"Error processing clear event: {e}", exc_info=True)
-    
-    def stop(self):
-        """Stop the COM message pump and cleanup"""
-        self.running = False
-        
-        # Stop the timer
-        if self.timer:
-            self.timer.stop()
-            self.timer = None
-        
-        # Cleanup COM
-        if self.gd:
-            try:
-                self.gd.set("PYTHON_STATUS", "DISCONNECTED")
-            except:
-                pass
+            logger.error(f"❌ Catch-up render failed for {self.name}: {e}", exc_info=True)
+
+    def get_stats(self) -> dict:
+        return {'skipped': self.skipped, 'catch_ups': self.catch_ups,
+                'dirty': self.dirty, 'dirty_keys': len(self.dirty_keys)}
 
 
 # ============================================================================
@@ -1377,7 +4031,10 @@ class ProfessionalChart(QWidget):
     - Real-time updates with blitting for high-frequency trading
     """
     
-    def __init__(self, title: str, border_color: str = "#FF8C00", parent=None):
+    MAX_BARS = 2000  # Above this the line is M4-downsampled to the viewport width
+    
+    def __init__(self, title: str, border_color: str = "#FF8C00", parent=None,
+                 render_worker: Optional[ChartRenderWorker] = None):
         super().__init__(parent)
         self.title = title
         self.border_color = border_color
@@ -1392,11 +4049,20 @@ class ProfessionalChart(QWidget):
         self.needs_full_redraw = True  # Flag to force full redraw
         self.is_first_draw = True  # Track first draw for initialization
         
+        # Full-resolution line data; past MAX_BARS only the M4 points of the view are plotted
+        self._line_x = None
+        self._line_y = None
+        self.downsampler = ChartDownsampler()
+        
         # Throttling attributes
         self.last_update_time = 0  # Track last update timestamp
         self.update_interval = 0.25  # Minimum 250ms between updates (4 FPS) for trading
         self.pending_update = None  # QTimer for pending update
         
+        # Updates while the chart is hidden are skipped; the latest one replays when it is shown
+        self._deferred_update = None
+        self.render_gate = RenderGate(title, self, self._catch_up_render)
+        
         # Create layout
         layout = QVBoxLayout(self)
         layout.setContentsMargins(2, 2, 2, 2)
@@ -1475,7 +4141,7 @@ class ProfessionalChart(QWidget):
         
         # Create figure and canvas - use constrained_layout
         self.figure = Figure(figsize=(8, 5), dpi=100, facecolor='#0a0a0a', constrained_layout=True)
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = OffThreadFigureCanvas(self.figure, render_worker)  # Full draws rasterized off the GUI thread
         self.canvas.setStyleSheet(f"border: 2px solid {border_color};")
         self.canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
@@ -1640,10 +4306,24 @@ class ProfessionalChart(QWidget):
         # Apply new limits
         self.ax.set_xlim(new_left, new_right)
         
+        # Downsampled line: re-bucket for the new view (cached per zoom level)
+        if self.line_artist is not None and self._line_x is not None and len(self._line_x) > self.MAX_BARS:
+            self.line_artist.set_data(*self._line_view(new_left, new_right))
+        
         # NOTE: Don't force full redraw for zoom - let matplotlib handle it efficiently
         # The background cache remains valid, only the view changes
         self.canvas.draw_idle()
     
+    def _line_view(self, x_start: float, x_end: float):
+        """Line points for the view: every bar, or M4 buckets (plus the live bar) past MAX_BARS"""
+        x, y = self._line_x, self._line_y
+        if len(x) <= self.MAX_BARS:
+            return x, y
+        first, last, imin, imax, _ = self.downsampler.select(
+            x, y, y, x_start, x_end, max(int(self.ax.bbox.width), 1))
+        idx = np.unique(np.append(ChartDownsampler.line_indices(first, last, imin, imax), len(x) - 1))
+        return x[idx], y[idx]
+    
     def update_chart_throttled(self, price_data, contract_description: str = ""):
         """Throttled chart update - limits update frequency to prevent UI freezing"""
         import time
@@ -1671,49 +4351,38 @@ class ProfessionalChart(QWidget):
         self.last_update_time = time.time()
         self.update_chart(price_data, contract_description)
     
+    def _catch_up_render(self, keys):
+        """Replay the latest update skipped while the chart was hidden"""
+        if self._deferred_update is not None:
+            args, self._deferred_update = self._deferred_update, None
+            self.update_chart(*args)
+    
     def update_chart(self, price_data, contract_description: str = ""):
         """Update chart with price data (line chart for mid-price) - optimized with blitting"""
-        if not price_data or len(price_data) < 2:
+        if self.render_gate.defer():
+            self._deferred_update = (price_data, contract_description)
+            return
+        if price_data is None or len(price_data) < 2:
             self.draw_empty_chart()
             return
         
         try:
-            # PERFORMANCE: Limit maximum bars to prevent UI freezing
-            MAX_BARS = 2000  # Reasonable limit for smooth rendering
-            original_len = len(price_data)
-            if original_len > MAX_BARS:
-                # Downsample: keep every Nth bar to reduce to MAX_BARS
-                step = original_len // MAX_BARS
-                price_data = price_data[::step]
-                logger.info(f"Downsampled chart data from {original_len} to {len(price_data)} bars")
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(price_data)
-            df['time'] = pd.to_datetime(df['time'])
-            df.set_index('time', inplace=True)
-            
-            # Ensure numeric columns
-            for col in ['open', 'high', 'low', 'close']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            df = df.dropna()
-            
-            # Sort by time to ensure proper chronological order
-            df = df.sort_index()
-            
-            # Remove duplicate timestamps (keep last)
-            df = df[~df.index.duplicated(keep='last')]
+            # Convert bar rows to DataFrame (sorted, NaN rows and duplicate timestamps dropped)
+            df = bar_frame(price_data)
             
             if len(df) < 2:
                 self.draw_empty_chart()
                 return
             
             # Convert timestamps to matplotlib date numbers for proper spacing
+            # PERFORMANCE: past MAX_BARS only the M4 points of the view are plotted (see _line_view)
             from matplotlib.dates import date2num
-            import numpy as np
             x_dates = np.asarray(date2num(df.index))
             y_data = np.asarray(df['close'].values)
             current_price = float(y_data[-1])
+            if self._line_x is None or self._line_x[0] != x_dates[0]:
+                self.downsampler.invalidate()  # History replaced - cached buckets are stale
+            self._line_x, self._line_y = x_dates, y_data
             
             # Determine if we need a full redraw or can use blitting
             needs_full_redraw = (self.is_first_draw or 
@@ -1810,16 +4479,14 @@ class ProfessionalChart(QWidget):
                         padding = x_range * 0.02
                         self.ax.set_xlim(x_dates[0], x_dates[-1] + padding)
                     self.ax.autoscale(enable=False, axis='x')
+                if len(x_dates) > self.MAX_BARS:
+                    self.line_artist.set_data(*self._line_view(*self.ax.get_xlim()))
                 
-                # Draw everything (static + animated) to create the background
-                self.canvas.draw()
-                
-                # Cache the background for blitting (excluding animated artists)
-                self.background = self.canvas.copy_from_bbox(self.ax.bbox)
-                
-                # Mark as drawn
-                self.is_first_draw = False
+                # Draw the static content - on_draw caches the background and blits the animated artists
+                self.background = None
+                self.is_first_draw = False  # Lets on_draw handle this draw
                 self.needs_full_redraw = False
+                self.canvas.draw()
                 
                 # Update navigation toolbar
                 if hasattr(self, 'nav_toolbar'):
@@ -1828,6 +4495,14 @@ class ProfessionalChart(QWidget):
             else:
                 # === FAST UPDATE with BLITTING - Only update animated elements ===
                 
+                if self.canvas.frame_pending:
+                    # Full draw still rendering - on_draw blits the live artists when its frame lands
+                    self.line_artist.set_data(*self._line_view(*self.ax.get_xlim()))
+                    self.price_line_artist.set_ydata([current_price, current_price])
+                    self.price_text_artist.set_position((1.01, current_price))
+                    self.price_text_artist.set_text(f'${current_price:.2f}')
+                    return
+                
                 if self.background is None:
                     # Safety: if background was lost, force full redraw
                     self.needs_full_redraw = True
@@ -1846,7 +4521,7 @@ class ProfessionalChart(QWidget):
                 self.canvas.restore_region(self.background)
                 
                 # Update the line data
-                self.line_artist.set_data(x_dates, y_data)
+                self.line_artist.set_data(*self._line_view(*self.ax.get_xlim()))
                 
                 # Update current price line position
                 self.price_line_artist.set_ydata([current_price, current_price])
@@ -1871,22 +4546,82 @@ class ProfessionalChart(QWidget):
             self.draw_empty_chart()
 
 
+CANDLE_UP_RGBA = np.array([0.0, 1.0, 0.0, 1.0])    # '#00ff00'
+CANDLE_DOWN_RGBA = np.array([1.0, 0.0, 0.0, 1.0])  # '#ff0000'
+
+
+def candlestick_geometry(x: np.ndarray, open_: np.ndarray, high: np.ndarray,
+                         low: np.ndarray, close: np.ndarray, width: float):
+    """
+    Vectorized candlestick geometry for LineCollection / PolyCollection.
+
+    Returns (segments (n, 2, 2), body verts (n, 4, 2), RGBA colors (n, 4)).
+    Flat bodies get a 0.01 minimum height so doji bars stay visible.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    open_ = np.asarray(open_, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(x)
+
+    segments = np.empty((n, 2, 2))
+    segments[:, :, 0] = x[:, None]
+    segments[:, 0, 1] = low
+    segments[:, 1, 1] = high
+
+    bottom = np.minimum(open_, close)
+    height = np.abs(close - open_)
+    top = bottom + np.where(height > 0, height, 0.01)
+    left = x - width / 2
+    right = left + width
+    verts = np.empty((n, 4, 2))
+    verts[:, 0, 0] = verts[:, 3, 0] = left
+    verts[:, 1, 0] = verts[:, 2, 0] = right
+    verts[:, 0, 1] = verts[:, 1, 1] = bottom
+    verts[:, 2, 1] = verts[:, 3, 1] = top
+
+    colors = np.where((close >= open_)[:, None], CANDLE_UP_RGBA, CANDLE_DOWN_RGBA)
+    return segments, verts, colors
+
+
 class ProfessionalUnderlyingChart(QWidget):
     """
     Professional candlestick chart for underlying (SPX/XSP) with Z-Score subplot
     Similar to TradeStation multi-panel charts with throttled updates for trading
+    
+    Completed candles and indicator history are static collections; the forming
+    candle, EMA/Z-Score tails and current price marker are animated artists
+    blitted over the cached background on same-bar updates. Past MAX_BARS the
+    static collections hold M4 buckets of the visible range (one candle per
+    pixel bucket with its exact OHLC) instead of every completed bar.
     """
     
-    def __init__(self, title: str, border_color: str = "#FF8C00", parent=None, main_window=None):
+    MAX_BARS = 2000  # PERFORMANCE: Above this completed bars are M4-downsampled to the viewport width
+    
+    def __init__(self, title: str, border_color: str = "#FF8C00", parent=None, main_window=None,
+                 render_worker: Optional[ChartRenderWorker] = None):
         super().__init__(parent)
         self.title = title
         self.border_color = border_color
         self.chart_data = []
         
         # Blitting optimization attributes
-        self.background = None
+        self.background = None  # Cached figure background (static artists only)
         self.needs_full_redraw = True
         self.is_first_draw = True
+        self.animated_artists = []  # Forming candle, indicator tails, price marker
+        
+        # Persistent series behind the artists (incremental updates)
+        self._render_key = None  # (ema_period, z_period, z_threshold, is_es_futures) of last full redraw
+        self._rendered_len = 0
+        self._rendered_first_time = None
+        self._rendered_last_time = None
+        self._x = None  # Bar times (matplotlib date numbers) - None forces a full redraw
+        self._ohlc = None
+        self.indicators = IndicatorEngine()  # Running EMA / Z-Score of the rendered bars
+        self.downsampler = ChartDownsampler()  # M4 buckets of the completed bars past MAX_BARS
+        self._downsampled = False
+        self._line_idx = None  # Completed bars drawn by the static EMA / Z-Score lines when downsampled
+        self.frame_times_ms = {mode: deque(maxlen=100) for mode in ('full', 'bar', 'tick')}
         
         # Throttling attributes
         self.last_update_time = 0  # Throttle updates
@@ -1894,12 +4629,17 @@ class ProfessionalUnderlyingChart(QWidget):
         self.pending_update = None  # QTimer for pending update
         self.main_window = main_window  # Reference to main window for offset access
         
+        # Updates while the chart is hidden are skipped; the latest one replays when it is shown
+        self._deferred_update = None
+        self.render_gate = RenderGate(title, self, self._catch_up_render)
+        
         # Auto-fetch attributes for loading more historical data
         self.contract_key = None  # Will be set when data is first loaded
         self.is_fetching_more_data = False  # Flag to prevent multiple simultaneous requests
         self.earliest_data_timestamp = None  # Track earliest data point
         self.backfill_req_id = None  # Track request ID for backfill requests
         self.backfill_data = []  # Temporary storage for backfill data before prepending
+        self.backfill_cached = np.empty(0, dtype=BAR_DTYPE)  # Bar cache rows newer than the backfill fetch
         self.auto_fetch_timer = None  # Timer for debouncing auto-fetch on scroll
         self.auto_fetch_delay = 500  # Wait 500ms after last scroll before checking
         
@@ -1957,7 +4697,7 @@ class ProfessionalUnderlyingChart(QWidget):
         
         # Create figure with subplots - use constrained_layout instead of tight_layout
         self.figure = Figure(figsize=(10, 7), dpi=100, facecolor='#0a0a0a', constrained_layout=True)
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = OffThreadFigureCanvas(self.figure, render_worker)  # Full draws rasterized off the GUI thread
         self.canvas.setStyleSheet(f"border: 2px solid {border_color};")
         self.canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.canvas.setMinimumSize(400, 300)
@@ -1965,6 +4705,10 @@ class ProfessionalUnderlyingChart(QWidget):
         # Enable mouse wheel zoom
         self.canvas.mpl_connect('scroll_event', self.on_scroll)
         
+        # Blitting: drop the cached background on resize, recapture it after every full draw
+        self.canvas.mpl_connect('resize_event', self.on_resize)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        
         # Add navigation toolbar for pan/zoom
         self.nav_toolbar = NavigationToolbar(self.canvas, self)
         self.nav_toolbar.setStyleSheet(f"""
@@ -2072,14 +4816,38 @@ class ProfessionalUnderlyingChart(QWidget):
         
         # Apply new limits (will affect both subplots due to sharex)
         self.price_ax.set_xlim(new_left, new_right)
+        if self._downsampled and self._x is not None:
+            self._render_static()  # Re-bucket for the new view (cached per zoom level)
         self.canvas.draw_idle()
         
         # Debounced auto-fetch: Reset timer on each scroll, check after 500ms of no scrolling
         if event.button == 'down':  # Only when zooming out
             self.schedule_auto_fetch_check()
     
+    def on_draw(self, event):
+        """After a full draw (update, zoom, pan, resize) recapture the background and blit the animated artists"""
+        try:
+            if self.price_ax is None or not self.animated_artists:
+                return
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+            for artist in self.animated_artists:
+                self.figure.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+        except Exception as e:
+            # Don't let draw callback errors propagate - just log them
+            logger.debug(f"Error in on_draw callback: {e}")
+    
+    def on_resize(self, event):
+        """Handle canvas resize - invalidate background cache for blitting"""
+        self.background = None
+    
     def draw_empty_chart(self):
         """Draw empty chart"""
+        self.price_ax = None
+        self.zscore_ax = None
+        self.animated_artists = []
+        self.background = None
+        self._x = None
         self.figure.clear()
         ax = self.figure.add_subplot(111, facecolor='#0a0a0a')
         ax.text(0.5, 0.5, 'No Data Available',
@@ -2116,7 +4884,6 @@ class ProfessionalUnderlyingChart(QWidget):
         
         try:
             from matplotlib.dates import date2num, num2date
-            import pandas as pd
             
             # Get current visible range
             xlim = self.price_ax.get_xlim()
@@ -2124,13 +4891,9 @@ class ProfessionalUnderlyingChart(QWidget):
             visible_end_num = xlim[1]
             
             # Get data range
-            df = pd.DataFrame(self.chart_data)
-            if df.empty or 'time' not in df.columns:
-                return
-            
-            df['time'] = pd.to_datetime(df['time'])
-            earliest_data_num = date2num(df['time'].min())
-            latest_data_num = date2num(df['time'].max())
+            times = self.chart_data['time']
+            earliest_data_num = date2num(np.datetime64(int(times.min()), 'ns'))
+            latest_data_num = date2num(np.datetime64(int(times.max()), 'ns'))
             
             # Check if view extends significantly beyond our data on the left
             data_range = latest_data_num - earliest_data_num
@@ -2152,17 +4915,14 @@ class ProfessionalUnderlyingChart(QWidget):
         
         try:
             # Get earliest timestamp from current data
-            if not self.chart_data or len(self.chart_data) == 0:
+            if len(self.chart_data) == 0:
                 return
             
             import pandas as pd
             from datetime import timedelta
             from matplotlib.dates import date2num
             
-            df = pd.DataFrame(self.chart_data)
-            df['time'] = pd.to_datetime(df['time'])
-            earliest_time = df['time'].min()
-            latest_time = df['time'].max()
+            earliest_time = pd.Timestamp(int(self.chart_data['time'].min()))
             
             # Calculate how much data we need based on the GAP between visible start and earliest data
             if hasattr(self, 'price_ax') and self.price_ax is not None:
@@ -2185,17 +4945,7 @@ class ProfessionalUnderlyingChart(QWidget):
                 total_seconds = max(total_seconds, min_seconds)
                 
                 # Calculate duration using IBAPI valid units: S, D, W, M, Y (no H for hours!)
-                if total_seconds < 86400:  # Less than 1 day
-                    # Use seconds for intraday ranges
-                    duration = f"{int(total_seconds)} S"
-                elif total_seconds < 604800:  # Less than 1 week
-                    # Use days (round up)
-                    days = int(total_seconds / 86400) + 1
-                    duration = f"{days} D"
-                else:
-                    # Use weeks (round up)
-                    weeks = int(total_seconds / 604800) + 1
-                    duration = f"{weeks} W"
+                duration = ib_duration(total_seconds)
                 
                 logger.info(f"Auto-fetch: Gap is {gap.total_seconds()/3600:.1f} hours, requesting {duration}")
             else:
@@ -2267,18 +5017,18 @@ class ProfessionalUnderlyingChart(QWidget):
             self.main_window.app_state['historical_data_requests'][req_id] = self.contract_key
             self.backfill_req_id = req_id  # Remember this is a backfill request
             
-            # Request historical data ending at our earliest point
-            self.main_window.ibkr_client.reqHistoricalData(
+            # Request historical data ending at our earliest point (cached ranges are served from disk)
+            self.main_window.request_historical_bars(
                 req_id,
+                self.contract_key,
                 contract,
                 end_time_str,  # End at our earliest existing data point
                 duration,  # Get 1 more day
                 bar_size,  # Use current chart interval
                 "TRADES",
                 0,  # Include after-hours
-                1,  # Format date
                 False,  # Don't keep up to date for historical backfill
-                []
+                backfill_chart=self
             )
             
             logger.info(f"Requested more historical data for {self.contract_key} ending at {end_time_str} (req_id={req_id})")
@@ -2314,15 +5064,32 @@ class ProfessionalUnderlyingChart(QWidget):
         self.last_update_time = time.time()
         self.update_chart(price_data, ema_period, z_period, z_threshold, is_es_futures)
     
+    def _catch_up_render(self, keys):
+        """Replay the latest update skipped while the chart was hidden"""
+        if self._deferred_update is not None:
+            args, self._deferred_update = self._deferred_update, None
+            self.update_chart(*args)
+    
     def update_chart(self, price_data, ema_period=9, z_period=30, z_threshold=1.5, is_es_futures=False):
-        """Update chart with price data, EMA, and Z-Score - optimized with downsampling"""
-        if not price_data or len(price_data) < max(ema_period, z_period):
+        """
+        Update chart with price data, EMA, and Z-Score
+        
+        Same-bar updates only mutate the forming candle and the EMA/Z-Score tail
+        (blitted over a cached background); a new bar appends one candle to the
+        static collections. Anything else (first draw, interval change, backfill,
+        indicator settings change) rebuilds the chart.
+        """
+        if self.render_gate.defer():
+            self._deferred_update = (price_data, ema_period, z_period, z_threshold, is_es_futures)
+            return
+        if price_data is None or len(price_data) < max(ema_period, z_period):
             self.draw_empty_chart()
             return
         
+        frame_start = time.perf_counter()
         try:
-            # Store the chart data for auto-fetch feature
-            self.chart_data = price_data.copy() if isinstance(price_data, list) else list(price_data)
+            # Store the chart data for auto-fetch feature (zero-copy BarSeries view)
+            self.chart_data = price_data
             
             # Set contract_key based on chart title if not already set
             if self.contract_key is None:
@@ -2332,246 +5099,429 @@ class ProfessionalUnderlyingChart(QWidget):
                     # Will be set by main window based on selected underlying
                     self.contract_key = "UNDERLYING_SPX_TRADE"  # Default
             
-            # PERFORMANCE: Limit maximum bars to prevent UI freezing
-            MAX_BARS = 2000  # Reasonable limit for smooth candlestick rendering
-            original_len = len(price_data)
-            if original_len > MAX_BARS:
-                # Downsample: keep every Nth bar to reduce to MAX_BARS
-                step = original_len // MAX_BARS
-                price_data = price_data[::step]
-                logger.info(f"Downsampled candlestick chart from {original_len} to {len(price_data)} bars")
-            
-            # Save current view limits BEFORE clearing figure
-            # BUT: Don't save xlim if this is a full redraw after backfill
-            # (the xlim date numbers won't match the new data after prepending)
-            saved_xlim = None
-            if hasattr(self, 'price_ax') and self.price_ax is not None and not self.needs_full_redraw:
-                try:
-                    saved_xlim = self.price_ax.get_xlim()
-                    logger.debug(f"Saved xlim: {saved_xlim}")
-                except:
-                    pass
-            elif self.needs_full_redraw:
-                logger.debug("Skipping xlim save due to full redraw flag")
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(price_data)
-            df['time'] = pd.to_datetime(df['time'])
-            df.set_index('time', inplace=True)
-            
-            for col in ['open', 'high', 'low', 'close']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            df = df.dropna()
-            
-            # Sort by time to ensure proper chronological order
-            df = df.sort_index()
-            
-            # Remove duplicate timestamps (keep last)
-            df = df[~df.index.duplicated(keep='last')]
-            
-            if len(df) < 2:
-                self.draw_empty_chart()
+            render_key = (ema_period, z_period, z_threshold, is_es_futures)
+            mode = self._incremental_mode(price_data, render_key)
+            if mode is not None and self._update_last_bar(price_data, mode, is_es_futures):
+                self._record_frame(mode, frame_start)
                 return
             
-            # Calculate EMA
-            df['ema'] = df['close'].ewm(span=ema_period, adjust=False).mean()
-            
-            # Calculate offset-adjusted price if this is ES futures data
-            if is_es_futures and self.main_window is not None:
-                offset = self.main_window.es_to_cash_offset
-                # For XSP: (ES/10) - offset, For SPX: ES - offset
-                if self.main_window.instrument['underlying_symbol'] == 'XSP':
-                    df['offset_adjusted'] = (df['close'] / 10.0) - offset
-                else:
-                    df['offset_adjusted'] = df['close'] - offset
-            
-            # Calculate Z-Score
-            df['z_score'] = (df['close'] - df['close'].rolling(z_period).mean()) / df['close'].rolling(z_period).std()
-            
-            # Clear figure and create subplots
-            self.figure.clear()
-            gs = self.figure.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.05)
-            
-            # Price chart (top) - optimized candlestick rendering with LineCollection
-            self.price_ax = self.figure.add_subplot(gs[0])
-            
-            # Convert timestamps to matplotlib date numbers for proper spacing
-            from matplotlib.dates import date2num
-            from matplotlib.collections import LineCollection, PatchCollection
-            x_dates = date2num(df.index)
-            
-            # Calculate bar width based on time interval (in days)
-            if len(x_dates) > 1:
-                bar_width = (x_dates[1] - x_dates[0]) * 0.6  # 60% of interval
-            else:
-                bar_width = 0.0003  # ~30 seconds for single bar
-            
-            # OPTIMIZED: Use collections instead of individual plots for better performance
-            wick_segments = []  # High-low lines
-            wick_colors = []
-            body_patches = []  # Open-close rectangles
-            body_colors = []
-            
-            for i, (timestamp, row) in enumerate(df.iterrows()):
-                x = x_dates[i]
-                is_bullish = row['close'] >= row['open']
-                color = '#00ff00' if is_bullish else '#ff0000'
-                
-                # Collect wick data (high-low line)
-                wick_segments.append([(x, row['low']), (x, row['high'])])
-                wick_colors.append(color)
-                
-                # Collect body data (open-close rectangle)
-                body_height = abs(row['close'] - row['open'])
-                body_bottom = min(row['open'], row['close'])
-                rect = Rectangle(
-                    (x - bar_width/2, body_bottom), 
-                    bar_width, 
-                    body_height if body_height > 0 else 0.01,
-                    facecolor=color,
-                    edgecolor=color,
-                    alpha=0.9
-                )
-                body_patches.append(rect)
-                body_colors.append(color)
-            
-            # Draw all wicks as a single LineCollection (much faster than individual plots)
-            if wick_segments:
-                wick_collection = LineCollection(wick_segments, colors=wick_colors, 
-                                                linewidths=1, alpha=0.8)
-                self.price_ax.add_collection(wick_collection)
-            
-            # Draw all bodies as a PatchCollection (faster than individual patches)
-            if body_patches:
-                body_collection = PatchCollection(body_patches, match_original=True)
-                self.price_ax.add_collection(body_collection)
-            
-            # Add EMA overlay using datetime x-axis
-            self.price_ax.plot(x_dates, df['ema'].values.tolist(), color=self.border_color, 
-                             linewidth=1.5, label=f'EMA({ema_period})', alpha=0.8)
-            
-            # Add offset-adjusted line if ES futures data
-            if is_es_futures and 'offset_adjusted' in df.columns:
-                self.price_ax.plot(x_dates, df['offset_adjusted'].values.tolist(), color='#FFFF00', 
-                                 linewidth=1.5, label='Offset', alpha=0.8)
-            
-            # Set axis limits to include all data
-            if len(x_dates) > 0:
-                self.price_ax.set_xlim(x_dates[0] - bar_width, x_dates[-1] + bar_width)
-                y_min = df[['low']].min().min()
-                y_max = df[['high']].max().max()
-                y_range = y_max - y_min
-                self.price_ax.set_ylim(y_min - y_range * 0.05, y_max + y_range * 0.05)
-            
-            # Style price chart
-            self.price_ax.set_facecolor('#0a0a0a')
-            self.price_ax.grid(True, color='#1a1a1a', linestyle='-', linewidth=0.5, alpha=0.5)
-            self.price_ax.tick_params(colors='#e0e0e0', labelsize=9, labelbottom=False)
-            self.price_ax.set_ylabel('Price', color='#e0e0e0', fontsize=9)
-            self.price_ax.yaxis.tick_right()
-            self.price_ax.yaxis.set_label_position("right")
-            self.price_ax.legend(loc='upper left', facecolor='#0a0a0a', 
-                               edgecolor=self.border_color, labelcolor='#e0e0e0', 
-                               fontsize=8, framealpha=0.8)
-            
-            # Add current price horizontal line (green dotted)
-            current_price = float(df['close'].iloc[-1])
-            self.price_ax.axhline(y=current_price, color='#00ff00', 
-                                 linestyle=':', linewidth=2, alpha=0.7)
-            
-            # Add current price text label on right y-axis
-            self.price_ax.text(1.01, current_price, f'${current_price:.2f}', 
-                              transform=self.price_ax.get_yaxis_transform(),
-                              color='#00ff00', fontsize=10, fontweight='bold',
-                              va='center', ha='left',
-                              bbox=dict(boxstyle='round,pad=0.3', facecolor='#0a0a0a', 
-                                       edgecolor='#00ff00', linewidth=1))
-            
-            # Format x-axis as time
-            self.price_ax.xaxis_date()
-            
-            for spine in self.price_ax.spines.values():
-                spine.set_color(self.border_color)
-                spine.set_linewidth(1.5)
-            
-            # Z-Score chart (bottom)
-            self.zscore_ax = self.figure.add_subplot(gs[1], sharex=self.price_ax)
-            
-            # Plot Z-Score line
-            self.zscore_ax.plot(df.index, df['z_score'], color='#4a9eff', linewidth=1.5)
-            
-            # Fill between zero line (convert to numpy arrays for type compatibility)
-            z_values = df['z_score'].values
-            self.zscore_ax.fill_between(df.index, 0, df['z_score'], 
-                                       where=(z_values >= 0),  # type: ignore[arg-type]
-                                       color='#00ff00', alpha=0.2, interpolate=True)
-            self.zscore_ax.fill_between(df.index, 0, df['z_score'], 
-                                       where=(z_values < 0),  # type: ignore[arg-type]
-                                       color='#ff0000', alpha=0.2, interpolate=True)
-            
-            # Z-Score threshold lines
-            self.zscore_ax.axhline(y=0, color='#808080', linestyle='-', linewidth=1, alpha=0.5)
-            self.zscore_ax.axhline(y=z_threshold, color='#00ff00', linestyle='--', linewidth=1, alpha=0.5)
-            self.zscore_ax.axhline(y=-z_threshold, color='#ff0000', linestyle='--', linewidth=1, alpha=0.5)
-            
-            # Style Z-Score chart
-            self.zscore_ax.set_facecolor('#0a0a0a')
-            self.zscore_ax.grid(True, color='#1a1a1a', linestyle='-', linewidth=0.5, alpha=0.5)
-            self.zscore_ax.tick_params(colors='#e0e0e0', labelsize=8)
-            self.zscore_ax.set_ylabel('Z-Score', color='#e0e0e0', fontsize=9)
-            self.zscore_ax.set_ylim(-3, 3)
-            self.zscore_ax.yaxis.tick_right()
-            self.zscore_ax.yaxis.set_label_position("right")
-            self.zscore_ax.set_xlabel('Time', color='#e0e0e0', fontsize=9)
-            
-            for spine in self.zscore_ax.spines.values():
-                spine.set_color(self.border_color)
-                spine.set_linewidth(1.5)
-            
-            # Format x-axis with better time labels
-            self.zscore_ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            self.zscore_ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-            self.zscore_ax.tick_params(axis='x', rotation=0, colors='#e0e0e0', labelsize=9)
-            
-            # Preserve current zoom/pan state if we saved it, otherwise set default view
-            if saved_xlim is not None:
-                # Restore the user's view from before figure was cleared (applies to both subplots due to sharex)
-                self.price_ax.set_xlim(saved_xlim)
-                self.price_ax.autoscale(enable=False, axis='x')
-            else:
-                # First time drawing - set default view to show last 12 hours (720 bars at 1-min intervals)
-                visible_bars = min(720, len(x_dates))  # 12 hours = 720 minutes
-                if len(x_dates) > visible_bars:
-                    x_range = x_dates[-1] - x_dates[-visible_bars]
-                    padding = x_range * 0.02
-                    self.price_ax.set_xlim(x_dates[-visible_bars], x_dates[-1] + padding)
-                else:
-                    # Show all data if less than 12 hours available
-                    x_range = x_dates[-1] - x_dates[0]
-                    padding = x_range * 0.02
-                    self.price_ax.set_xlim(x_dates[0], x_dates[-1] + padding)
-                self.price_ax.autoscale(enable=False, axis='x')
-            
-            # Update title (price shown on chart now)
-            self.title_label.setText(self.title)
-            
-            # No need to call tight_layout - using constrained_layout in Figure constructor
-            # Use draw_idle() to avoid blocking UI thread
-            self.canvas.draw_idle()
-            
-            # Reset the full redraw flag after completing the redraw
-            if self.needs_full_redraw:
-                self.needs_full_redraw = False
-                logger.debug("Reset needs_full_redraw flag after completing full redraw")
-            
-            # Update navigation toolbar to reflect current view
-            if hasattr(self, 'nav_toolbar'):
-                self.nav_toolbar.push_current()
+            self._full_redraw(price_data, ema_period, z_period, z_threshold, is_es_futures)
+            self._render_key = render_key
+            self._record_frame('full', frame_start)
             
         except Exception as e:
             logger.error(f"Error updating underlying chart {self.title}: {e}", exc_info=True)
             self.draw_empty_chart()
+    
+    def _incremental_mode(self, price_data, render_key) -> Optional[str]:
+        """'tick' (same bar changed), 'bar' (one new bar) or None (full redraw needed)"""
+        if (self.needs_full_redraw or self.price_ax is None or self._x is None
+                or render_key != self._render_key):
+            return None
+        times = price_data['time']
+        if times[0] != self._rendered_first_time:
+            return None
+        if len(price_data) == self._rendered_len and times[-1] == self._rendered_last_time:
+            return 'tick'
+        if len(price_data) == self._rendered_len + 1 and times[-2] == self._rendered_last_time:
+            return 'bar'
+        return None
+    
+    def _record_frame(self, mode: str, frame_start: float):
+        self.frame_times_ms[mode].append((time.perf_counter() - frame_start) * 1000)
+    
+    def zscore_signal(self) -> int:
+        """Z-Score threshold crossing on the forming bar: +1 above +threshold, -1 below -threshold, else 0"""
+        if self._render_key is None:
+            return 0
+        return self.indicators.threshold_cross(self._render_key[2])
+    
+    def get_render_stats(self) -> dict:
+        """Average / max frame time (ms) per update kind: full redraw, new bar, same-bar tick"""
+        return {
+            mode: {'count': len(times), 'avg_ms': sum(times) / len(times), 'max_ms': max(times)}
+            for mode, times in self.frame_times_ms.items() if times
+        }
+    
+    def _update_last_bar(self, price_data, mode: str, is_es_futures: bool) -> bool:
+        """Apply a same-bar update or a new bar to the persistent artists (False = needs full redraw)"""
+        bar = price_data[-1]
+        o, h, l, c = float(bar['open']), float(bar['high']), float(bar['low']), float(bar['close'])
+        if any(math.isnan(v) for v in (o, h, l, c)):
+            return False
+        
+        # Y range covers all bars (same as a full redraw) - growing it changes the static axes
+        # While a full draw is still rendering the background is stale: its frame brings a new one
+        frame_pending = self.canvas.frame_pending
+        needs_draw = (self.background is None and not frame_pending) or l < self._y_min or h > self._y_max
+        
+        if mode == 'bar':
+            previous = price_data[-2]
+            prev_ohlc = [float(previous[col]) for col in ('open', 'high', 'low', 'close')]
+            if any(math.isnan(v) for v in prev_ohlc):
+                return False
+            x_new = float(mdates.date2num(np.datetime64(int(bar['time']), 'ns')))
+            
+            # The forming candle is now final - commit its last values into the static collections
+            for column, value in zip(('open', 'high', 'low', 'close'), prev_ohlc):
+                self._ohlc[column][-1] = value
+            self.indicators.update_last(prev_ohlc[3])
+            if self._downsampled or frame_pending:
+                needs_draw = True  # Re-bucketed below / the frame in flight predates this candle
+            if not self._downsampled:
+                self._append_static_candle(len(self._x) - 1)
+            if not needs_draw:
+                # Stamp the completed candle + indicator segments into the cached background
+                self._set_live_artists(is_es_futures)
+                self.canvas.restore_region(self.background)
+                for artist in (self._live_wick, self._live_body, self._ema_tail,
+                               self._zscore_tail, self._zscore_tail_fill):
+                    self.figure.draw_artist(artist)
+                self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+            
+            # Open the new candle
+            self._x = np.append(self._x, x_new)
+            for column, value in zip(('open', 'high', 'low', 'close'), (o, h, l, c)):
+                self._ohlc[column] = np.append(self._ohlc[column], value)
+            self.indicators.append(c)
+            self._rendered_len += 1
+            self._rendered_last_time = int(bar['time'])
+            if self._downsampled:
+                self._render_static()
+            else:
+                self._set_static_lines()  # Static lines/fills now include the completed bar (next full draw)
+        else:
+            for column, value in zip(('open', 'high', 'low', 'close'), (o, h, l, c)):
+                self._ohlc[column][-1] = value
+            self.indicators.update_last(c)
+        
+        if l < self._y_min or h > self._y_max:
+            self._y_min, self._y_max = min(self._y_min, l), max(self._y_max, h)
+            y_range = self._y_max - self._y_min
+            self.price_ax.set_ylim(self._y_min - y_range * 0.05, self._y_max + y_range * 0.05)
+        
+        self._set_live_artists(is_es_futures)
+        if needs_draw:
+            self.canvas.draw()  # on_draw recaptures the background and blits the live artists
+        elif not frame_pending:
+            self.canvas.restore_region(self.background)
+            for artist in self.animated_artists:
+                self.figure.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+        return True
+    
+    def _candle_geometry(self, i: int):
+        """Wick segment, body bounds (x, y, width, height) and color for bar i"""
+        x = self._x[i]
+        o, h, l, c = (self._ohlc[col][i] for col in ('open', 'high', 'low', 'close'))
+        color = '#00ff00' if c >= o else '#ff0000'
+        body_height = abs(c - o)
+        body = (x - self._bar_width / 2, min(o, c), self._bar_width, body_height if body_height > 0 else 0.01)
+        return [(x, l), (x, h)], body, color
+    
+    def _append_static_candle(self, i: int):
+        """Move bar i (just completed) into the static wick/body collections"""
+        segment, verts, color = candlestick_geometry(
+            self._x[i:i + 1], *(self._ohlc[col][i:i + 1] for col in ('open', 'high', 'low', 'close')),
+            self._bar_width)
+        self._wick_segments = np.concatenate([self._wick_segments, segment])
+        self._body_verts = np.concatenate([self._body_verts, verts])
+        self._candle_colors = np.concatenate([self._candle_colors, color])
+        self._set_candle_collections()
+    
+    def _set_candle_collections(self):
+        self._wick_collection.set_segments(self._wick_segments)
+        self._wick_collection.set_color(self._candle_colors)
+        self._body_collection.set_verts(self._body_verts)
+        self._body_collection.set_facecolor(self._candle_colors)
+        self._body_collection.set_edgecolor(self._candle_colors)
+    
+    def _render_static(self):
+        """Downsampled mode: static candles and lines for the visible range, one M4 bucket per pixel"""
+        x_start, x_end = self.price_ax.get_xlim()
+        high, low = self._ohlc['high'], self._ohlc['low']
+        first, last, imin, imax, bucket_width = self.downsampler.select(
+            self._x, high, low, x_start, x_end, max(int(self.price_ax.bbox.width), 1),
+            count=len(self._x) - 1)  # Completed bars only - the forming candle is animated
+        width = self._bar_width if bucket_width is None else bucket_width * 0.6
+        self._wick_segments, self._body_verts, self._candle_colors = candlestick_geometry(
+            (self._x[first] + self._x[last]) / 2, self._ohlc['open'][first], high[imax], low[imin],
+            self._ohlc['close'][last], width)
+        self._set_candle_collections()
+        self._line_idx = last
+        self._set_static_lines()
+    
+    def _set_static_lines(self):
+        """Static EMA / Z-Score lines and fills cover every completed bar (all but the last)"""
+        idx = self._line_idx if self._downsampled else slice(0, len(self._x) - 1)
+        x, z = self._x[idx], self.indicators.z[idx]
+        self._ema_line.set_data(x, self.indicators.ema[idx])
+        self._zscore_line.set_data(x, z)
+        for fill in self._zscore_fills:
+            fill.remove()
+        # One polygon per sign (zero crossings interpolated) - where= splits into a polygon per region
+        x, z = self._with_zero_crossings(x, z)
+        self._zscore_fills = [
+            self.zscore_ax.fill_between(x, 0, np.maximum(z, 0), color='#00ff00', alpha=0.2, linewidth=0),
+            self.zscore_ax.fill_between(x, 0, np.minimum(z, 0), color='#ff0000', alpha=0.2, linewidth=0),
+        ]
+    
+    @staticmethod
+    def _with_zero_crossings(x: np.ndarray, z: np.ndarray):
+        """x / z with the interpolated zero crossing inserted between points that change sign"""
+        cross = np.flatnonzero(z[:-1] * z[1:] < 0)
+        x_cross = x[cross] - z[cross] * (x[cross + 1] - x[cross]) / (z[cross + 1] - z[cross])
+        return np.insert(x, cross + 1, x_cross), np.insert(z, cross + 1, 0.0)
+    
+    def _set_live_artists(self, is_es_futures: bool):
+        """Forming candle, EMA / Z-Score tails, offset line and current price marker"""
+        i = len(self._x) - 1
+        segment, body, color = self._candle_geometry(i)
+        (x, low), (_, high) = segment
+        self._live_wick.set_data([x, x], [low, high])
+        self._live_wick.set_color(color)
+        self._live_body.set_bounds(*body)
+        self._live_body.set_facecolor(color)
+        self._live_body.set_edgecolor(color)
+        
+        tail_x = self._x[-2:]
+        self._ema_tail.set_data(tail_x, self.indicators.ema[-2:])
+        z_tail = self.indicators.z[-2:]
+        self._zscore_tail.set_data(tail_x, z_tail)
+        if np.isnan(z_tail).any():
+            self._zscore_tail_fill.set_visible(False)
+        else:
+            self._zscore_tail_fill.set_xy([(tail_x[0], 0), (tail_x[0], z_tail[0]), (tail_x[1], z_tail[1]), (tail_x[1], 0)])
+            self._zscore_tail_fill.set_facecolor('#00ff00' if z_tail[1] >= 0 else '#ff0000')
+            self._zscore_tail_fill.set_visible(True)
+        
+        if self._offset_line is not None and is_es_futures and self.main_window is not None:
+            # Offset follows the live ES-to-cash offset, so the whole line is animated
+            offset = self.main_window.es_to_cash_offset
+            scale = 10.0 if self.main_window.instrument['underlying_symbol'] == 'XSP' else 1.0
+            idx = np.append(self._line_idx, len(self._x) - 1) if self._downsampled else slice(None)
+            self._offset_line.set_data(self._x[idx], self._ohlc['close'][idx] / scale - offset)
+        
+        current_price = float(self._ohlc['close'][-1])
+        self._price_line.set_ydata([current_price, current_price])
+        self._price_text.set_position((1.01, current_price))
+        self._price_text.set_text(f'${current_price:.2f}')
+    
+    def _full_redraw(self, price_data, ema_period, z_period, z_threshold, is_es_futures):
+        """Rebuild axes and all persistent artists from the full bar history"""
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.lines import Line2D
+        from matplotlib.patches import Polygon
+        
+        original_len = len(price_data)
+        self._rendered_len = original_len
+        self._rendered_first_time = int(price_data['time'][0])
+        self._rendered_last_time = int(price_data['time'][-1])
+        
+        # Save current view limits BEFORE clearing figure
+        # BUT: Don't save xlim if this is a full redraw after backfill
+        # (the xlim date numbers won't match the new data after prepending)
+        saved_xlim = None
+        if hasattr(self, 'price_ax') and self.price_ax is not None and not self.needs_full_redraw:
+            try:
+                saved_xlim = self.price_ax.get_xlim()
+                logger.debug(f"Saved xlim: {saved_xlim}")
+            except:
+                pass
+        elif self.needs_full_redraw:
+            logger.debug("Skipping xlim save due to full redraw flag")
+        
+        # Convert bar rows to DataFrame (sorted, NaN rows and duplicate timestamps dropped)
+        df = bar_frame(price_data)
+        
+        if len(df) < 2:
+            self.draw_empty_chart()
+            return
+        
+        # Persistent series for incremental updates (incremental only when no rows were dropped)
+        x_dates = np.asarray(mdates.date2num(df.index), dtype=float)
+        self._x = x_dates
+        self._ohlc = {col: df[col].to_numpy(dtype=float, copy=True) for col in ('open', 'high', 'low', 'close')}
+        
+        # PERFORMANCE: Past MAX_BARS only M4 buckets of the visible range are drawn (_render_static)
+        self._downsampled = len(x_dates) > self.MAX_BARS
+        self._line_idx = np.empty(0, dtype=np.int64)
+        self.downsampler.invalidate()  # History may have been replaced - cached buckets are stale
+        if self._downsampled:
+            logger.debug(f"M4-downsampling candlestick chart of {len(x_dates)} bars to the viewport")
+        
+        # EMA / Z-Score - full recompute only for new settings or replaced history (backfill)
+        self.indicators.configure(ema_period, z_period)
+        self.indicators.sync(self._ohlc['close'])
+        
+        # Clear figure and create subplots
+        self.figure.clear()
+        self.background = None
+        gs = self.figure.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.05)
+        
+        # Price chart (top) - completed candles as static collections, forming candle animated
+        self.price_ax = self.figure.add_subplot(gs[0])
+        
+        # Calculate bar width based on time interval (in days)
+        if len(x_dates) > 1:
+            self._bar_width = (x_dates[1] - x_dates[0]) * 0.6  # 60% of interval
+        else:
+            self._bar_width = 0.0003  # ~30 seconds for single bar
+        
+        # OPTIMIZED: Wick segments, body vertices and colors for every completed bar in one
+        # vectorized pass (high-low lines, open-close rectangles in data coordinates);
+        # downsampled charts fill these from the visible buckets once the view is known
+        completed = 0 if self._downsampled else len(x_dates) - 1
+        self._wick_segments, self._body_verts, self._candle_colors = candlestick_geometry(
+            x_dates[:completed], *(self._ohlc[col][:completed] for col in ('open', 'high', 'low', 'close')),
+            self._bar_width)
+
+        # Draw all wicks as a single LineCollection (much faster than individual plots)
+        self._wick_collection = LineCollection(self._wick_segments, colors=self._candle_colors,
+                                               linewidths=1, alpha=0.8)
+        self.price_ax.add_collection(self._wick_collection)
+
+        # Draw all bodies as a single PolyCollection (faster than individual patches)
+        self._body_collection = PolyCollection(self._body_verts, facecolors=self._candle_colors,
+                                               edgecolors=self._candle_colors, alpha=0.9)
+        self.price_ax.add_collection(self._body_collection)
+        
+        # Forming candle (ANIMATED - redrawn on every tick via blitting)
+        self._live_wick = Line2D([], [], linewidth=1, alpha=0.8, animated=True)
+        self.price_ax.add_line(self._live_wick)
+        self._live_body = Rectangle((0, 0), 0, 0, alpha=0.9, animated=True)
+        self.price_ax.add_patch(self._live_body)
+        
+        # Add EMA overlay using datetime x-axis (static part + animated tail)
+        self._ema_line, = self.price_ax.plot([], [], color=self.border_color,
+                                             linewidth=1.5, label=f'EMA({ema_period})', alpha=0.8)
+        self._ema_tail, = self.price_ax.plot([], [], color=self.border_color,
+                                             linewidth=1.5, alpha=0.8, animated=True)
+        
+        # Add offset-adjusted line if ES futures data (animated - the offset moves)
+        self._offset_line = None
+        if is_es_futures and self.main_window is not None:
+            self._offset_line, = self.price_ax.plot([], [], color='#FFFF00',
+                                                    linewidth=1.5, label='Offset', alpha=0.8, animated=True)
+        
+        # Set axis limits to include all data
+        self.price_ax.set_xlim(x_dates[0] - self._bar_width, x_dates[-1] + self._bar_width)
+        self._y_min = float(df['low'].min())
+        self._y_max = float(df['high'].max())
+        y_range = self._y_max - self._y_min
+        self.price_ax.set_ylim(self._y_min - y_range * 0.05, self._y_max + y_range * 0.05)
+        
+        # Style price chart
+        self.price_ax.set_facecolor('#0a0a0a')
+        self.price_ax.grid(True, color='#1a1a1a', linestyle='-', linewidth=0.5, alpha=0.5)
+        self.price_ax.tick_params(colors='#e0e0e0', labelsize=9, labelbottom=False)
+        self.price_ax.set_ylabel('Price', color='#e0e0e0', fontsize=9)
+        self.price_ax.yaxis.tick_right()
+        self.price_ax.yaxis.set_label_position("right")
+        self.price_ax.legend(loc='upper left', facecolor='#0a0a0a', 
+                           edgecolor=self.border_color, labelcolor='#e0e0e0', 
+                           fontsize=8, framealpha=0.8)
+        
+        # Add current price horizontal line (green dotted) - ANIMATED
+        self._price_line = self.price_ax.axhline(y=float(df['close'].iloc[-1]), color='#00ff00',
+                                                 linestyle=':', linewidth=2, alpha=0.7, animated=True)
+        
+        # Add current price text label on right y-axis - ANIMATED
+        self._price_text = self.price_ax.text(1.01, 0, '',
+                                              transform=self.price_ax.get_yaxis_transform(),
+                                              color='#00ff00', fontsize=10, fontweight='bold',
+                                              va='center', ha='left',
+                                              bbox=dict(boxstyle='round,pad=0.3', facecolor='#0a0a0a', 
+                                                        edgecolor='#00ff00', linewidth=1),
+                                              animated=True)
+        
+        # Format x-axis as time
+        self.price_ax.xaxis_date()
+        
+        for spine in self.price_ax.spines.values():
+            spine.set_color(self.border_color)
+            spine.set_linewidth(1.5)
+        
+        # Z-Score chart (bottom)
+        self.zscore_ax = self.figure.add_subplot(gs[1], sharex=self.price_ax)
+        
+        # Plot Z-Score line (static part + animated tail) and fills between zero line
+        self._zscore_line, = self.zscore_ax.plot([], [], color='#4a9eff', linewidth=1.5)
+        self._zscore_tail, = self.zscore_ax.plot([], [], color='#4a9eff', linewidth=1.5, animated=True)
+        self._zscore_tail_fill = Polygon([(0, 0)], closed=True, alpha=0.2, linewidth=0, animated=True)
+        self.zscore_ax.add_patch(self._zscore_tail_fill)
+        self._zscore_fills = []
+        self._set_static_lines()
+        
+        # Z-Score threshold lines
+        self.zscore_ax.axhline(y=0, color='#808080', linestyle='-', linewidth=1, alpha=0.5)
+        self.zscore_ax.axhline(y=z_threshold, color='#00ff00', linestyle='--', linewidth=1, alpha=0.5)
+        self.zscore_ax.axhline(y=-z_threshold, color='#ff0000', linestyle='--', linewidth=1, alpha=0.5)
+        
+        # Style Z-Score chart
+        self.zscore_ax.set_facecolor('#0a0a0a')
+        self.zscore_ax.grid(True, color='#1a1a1a', linestyle='-', linewidth=0.5, alpha=0.5)
+        self.zscore_ax.tick_params(colors='#e0e0e0', labelsize=8)
+        self.zscore_ax.set_ylabel('Z-Score', color='#e0e0e0', fontsize=9)
+        self.zscore_ax.set_ylim(-3, 3)
+        self.zscore_ax.yaxis.tick_right()
+        self.zscore_ax.yaxis.set_label_position("right")
+        self.zscore_ax.set_xlabel('Time', color='#e0e0e0', fontsize=9)
+        
+        for spine in self.zscore_ax.spines.values():
+            spine.set_color(self.border_color)
+            spine.set_linewidth(1.5)
+        
+        # Format x-axis with better time labels
+        self.zscore_ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+        self.zscore_ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        self.zscore_ax.tick_params(axis='x', rotation=0, colors='#e0e0e0', labelsize=9)
+        
+        # Preserve current zoom/pan state if we saved it, otherwise set default view
+        if saved_xlim is not None:
+            # Restore the user's view from before figure was cleared (applies to both subplots due to sharex)
+            self.price_ax.set_xlim(saved_xlim)
+            self.price_ax.autoscale(enable=False, axis='x')
+        else:
+            # First time drawing - set default view to show last 12 hours (720 bars at 1-min intervals)
+            visible_bars = min(720, len(x_dates))  # 12 hours = 720 minutes
+            if len(x_dates) > visible_bars:
+                x_range = x_dates[-1] - x_dates[-visible_bars]
+                padding = x_range * 0.02
+                self.price_ax.set_xlim(x_dates[-visible_bars], x_dates[-1] + padding)
+            else:
+                # Show all data if less than 12 hours available
+                x_range = x_dates[-1] - x_dates[0]
+                padding = x_range * 0.02
+                self.price_ax.set_xlim(x_dates[0], x_dates[-1] + padding)
+            self.price_ax.autoscale(enable=False, axis='x')
+        
+        self.animated_artists = [self._live_wick, self._live_body, self._ema_tail, self._price_line,
+                                 self._price_text, self._zscore_tail, self._zscore_tail_fill]
+        if self._offset_line is not None:
+            self.animated_artists.append(self._offset_line)
+        
+        if self._downsampled:
+            self._render_static()
+        self._set_live_artists(is_es_futures)
+        if len(df) != original_len:
+            self._rendered_len = -1  # Rows were dropped or de-duplicated - next update redraws
+        
+        # Update title (price shown on chart now)
+        self.title_label.setText(self.title)
+        
+        # Draw static content now - on_draw caches the background and blits the animated artists
+        self.canvas.draw()
+        self.is_first_draw = False
+        
+        # Reset the full redraw flag after completing the redraw
+        if self.needs_full_redraw:
+            self.needs_full_redraw = False
+            logger.debug("Reset needs_full_redraw flag after completing full redraw")
+        
+        # Update navigation toolbar to reflect current view
+        if hasattr(self, 'nav_toolbar'):
+            self.nav_toolbar.push_current()
 
 
 # ============================================================================
@@ -3150,6 +6100,105 @@ class PnLWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to reset P&L data:\n{str(e)}")
 
 
+# ============================================================================
+# CHAIN LOADING PIPELINE
+# ============================================================================
+# underlying price -> main chain -> TS 0DTE -> TS 1DTE. Each stage starts as
+# soon as the previous one is ready (first bid/ask + greeks round on most of
+# its contracts); the timeouts only cover stages whose data never completes.
+# ============================================================================
+
+CHAIN_PIPELINE_STAGES = ('main', 'ts_0dte', 'ts_1dte')
+CHAIN_READY_FRACTION = 0.9          # Share of chain contracts with quotes + greeks to count as ready
+CHAIN_STAGE_TIMEOUT_MS = 3000       # Move on after this even if a chain never completes (old fixed delay)
+UNDERLYING_WAIT_TIMEOUT_MS = 40000  # Give up waiting for the first underlying price
+
+
+# ============================================================================
+# HOT-STANDBY ENTRY CANDIDATES
+# ============================================================================
+# Strike selection, contract creation, sizing (fixed / % account / Martingale)
+# and the IB Order for the next automated entry are kept ready for LONG and
+# SHORT and re-evaluated as the TS chain ticks. A strategy direction change
+# then only runs the safety checks and sends. Signal-to-wire latency is
+# sampled per entry so the effect is visible in the status bar.
+# ============================================================================
+
+ENTRY_STANDBY_MAX_AGE = 2.0       # Seconds without re-evaluation before a candidate is not trusted
+SIGNAL_LATENCY_WINDOW = 200       # Signal-to-wire samples kept for percentiles
+SIGNAL_LATENCY_PENDING_MAX = 30.0  # Seconds to wait for a queued entry order to reach the wire
+
+
+class EntryCandidate:
+    """Ready-to-send automated entry (contract, priced and sized order) for one direction"""
+    __slots__ = ('direction', 'contract_key', 'strike', 'right', 'expiry', 'contract', 'order',
+                 'mid_price', 'unrounded_mid', 'quantity', 'signature', 'evaluated_at')
+
+    def __init__(self, direction: int, contract_key: str, strike: float, right: str, expiry: str,
+                 contract: Contract, order: Order, mid_price: float, unrounded_mid: float,
+                 quantity: int, signature: tuple):
+        self.direction = direction
+        self.contract_key = contract_key
+        self.strike = strike
+        self.right = right
+        self.expiry = expiry
+        self.contract = contract
+        self.order = order
+        self.mid_price = mid_price
+        self.unrounded_mid = unrounded_mid  # Unrounded mid for slippage tracking
+        self.quantity = quantity
+        self.signature = signature  # Settings the candidate was sized with (expiry, delta, sizing)
+        self.evaluated_at = time.monotonic()
+
+    def __repr__(self):
+        return f"EntryCandidate({self.contract_key} x{self.quantity} @ {self.mid_price:.2f})"
+
+
+class LatencyTracker:
+    """Rolling latency samples (ms) with percentile summary"""
+
+    def __init__(self, window: int = SIGNAL_LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.hot = 0   # Samples served by a hot-standby candidate
+        self.cold = 0  # Samples that ran selection/sizing on the signal
+
+    def add(self, latency_ms: float, hot: bool):
+        self.samples.append(latency_ms)
+        if hot:
+            self.hot += 1
+        else:
+            self.cold += 1
+
+    def get_stats(self) -> dict:
+        if not self.samples:
+            return {'count': 0, 'hot': self.hot, 'cold': self.cold}
+        p50, p95, p99 = np.percentile(np.fromiter(self.samples, dtype=float), (50, 95, 99))
+        return {
+            'count': len(self.samples), 'hot': self.hot, 'cold': self.cold,
+            'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+            'max': max(self.samples), 'last': self.samples[-1],
+        }
+
+
+# ============================================================================
+# NATIVE (IB-SIDE) EXITS
+# ============================================================================
+# The position % target/stop checker runs on the 1 s position timer and then
+# sends a chased close, so an exit can fire a second or more after the level
+# traded. Automated entries can instead get a take-profit LMT and a STP child
+# in one OCA group the moment they fill: IB works both, and the fill of one
+# cancels the other. The local checker stays as a fallback for positions
+# without live children, or when a live child has not filled a few seconds
+# after the local checker saw its level.
+# ============================================================================
+
+NATIVE_EXIT_OCA_PREFIX = "EXIT"        # ocaGroup = EXIT_{contract_key}_{entry order id} (re-adopted on reconnect)
+NATIVE_EXIT_OCA_TYPE = 1               # Cancel remaining group orders with block
+NATIVE_EXIT_STOP_TRIGGER = 8           # Stop trigger method: mid-point (same basis as the local P&L %)
+NATIVE_EXIT_FALLBACK_GRACE = 3.0       # Seconds past a local trigger before the local checker takes over
+NATIVE_EXIT_TRIGGER_RESET = 2.0        # Local trigger streak is broken if not seen again within this
+
+
 # ============================================================================
 # MAIN WINDOW
 # ============================================================================
@@ -3175,7 +6224,10 @@ class MainWindow(QMainWindow):
             'market_data_map': {},  # reqId -> contract_key
             'historical_data_requests': {},  # reqId -> contract_key
             'active_option_req_ids': [],  # Track active option chain request IDs
+            'contract_registry': ContractRegistry(),  # Interned contracts (shared with IBKRWrapper)
         }
+        self.app_state['subscriptions'] = SubscriptionRegistry(self.app_state['market_data_map'])
+        self.contract_registry: ContractRegistry = self.app_state['contract_registry']
         
         # ES to cash offset tracking
         self.es_to_cash_offset = 0.0  # ES futures premium/discount to cash index (persistent)
@@ -3189,10 +6241,11 @@ class MainWindow(QMainWindow):
         self.saved_positions = {}  # Loaded from positions.json for entryTime persistence
         self.positions_confirmed_by_ibkr = set()  # Track which positions IBKR confirmed (for stale detection)
         self._position_source_map = {}  # CRITICAL: contract_key -> is_automated (persists after order deletion)
-        self.market_data = {}  # contract_key -> market_data
-        self.pending_orders = {}  # order_id -> (contract_key, action, quantity)
-        self.chasing_orders = {}  # order_id -> chasing_order_info (for all orders with mid-price chasing enabled)
-        self.historical_data = {}  # contract_key -> bars
+        self.market_data = MarketDataStore(self.contract_registry)  # contract_key -> market data (columnar, dict-style access)
+        self.pending_orders = OrderBook(self.contract_registry)  # order_id -> WorkingOrder (indexed by contract/side/source)
+        self.chasing_orders: Dict[int, WorkingOrder] = {}  # order_id -> WorkingOrder being mid-price chased (same records)
+        self._chase_deadlines: List[Tuple[float, int]] = []  # min-heap of (monotonic wake time, order_id)
+        self.historical_data = {}  # contract_key -> BarSeries (every bar received)
         
         # Expiration tracking for virtual closes
         self.expired_positions_prompt_shown = False  # Track if we've shown the prompt today
@@ -3203,10 +6256,11 @@ class MainWindow(QMainWindow):
         
         # Chart data storage - separate from general historical_data for chart-specific needs
         self.chart_data = {
-            'underlying': [],  # SPX/XSP bars for confirmation chart
-            'underlying_trade': [],  # SPX/XSP bars for trade chart
-            'selected_call': [],  # Currently selected call option bars
-            'selected_put': [],   # Currently selected put option bars
+            'underlying': BarSeries(max_len=400),  # SPX/XSP bars for confirmation chart
+            'underlying_trade': BarSeries(max_len=200),  # SPX/XSP bars for trade chart
+            'es_futures': BarSeries(max_len=400),  # ES futures bars for confirmation chart
+            'selected_call': BarSeries(max_len=200),  # Currently selected call option bars
+            'selected_put': BarSeries(max_len=200),   # Currently selected put option bars
         }
         
         # Chart update tracking
@@ -3224,6 +6278,16 @@ class MainWindow(QMainWindow):
         # Environment Configuration Setup
         self.setup_environment_config()
         
+        # On-disk historical bar cache - requests fetch only ranges not cached yet
+        self.bar_cache = HistoricalBarCache(self.env_config.get('bar_cache_dir', 'bar_cache'))
+        self._bar_zone_seen = False  # Bar date time zone suffix checked this session
+        self._bar_cache_live = {}  # contract_key -> (cache_key, coverage start ns or None, bars served) of the live request
+        self._bar_cache_backfill = {}  # contract_key -> (cache_key, coverage start ns or None, end ns) of a pending backfill
+        
+        # Full chart draws are rasterized in a render process (see OFF-THREAD CHART RENDERING)
+        self.chart_render_worker = ChartRenderWorker()
+        self.chart_render_worker.start()
+        
         # Connection settings (environment-aware)
         self.host = "127.0.0.1"
         self.port = self.env_config.get('ibkr_port', 7497)  # Use environment-specific port
@@ -3321,21 +6385,28 @@ class MainWindow(QMainWindow):
         self.next_main_req_id = 1000
         self.next_ts_0dte_req_id = 2000
         self.next_ts_1dte_req_id = 3000
-        self.active_req_ids = {
-            'main': [],
-            'ts_0dte': [],
-            'ts_1dte': []
+        # CRITICAL: Global subscription registry (shared with IBKRWrapper via app_state)
+        # - reqId <-> contract_key (prevents subscribing to the same contract twice across chains/positions)
+        # - reqId -> chain types (reference counting for lines shared between chains)
+        # - chain type -> reqIds (active request IDs per chain)
+        # - contract_key -> open orders (keeps lines alive while orders are working)
+        self.subscriptions: SubscriptionRegistry = self.app_state['subscriptions']
+        # Line budget: positions > working orders > near-ATM > wings, overflow served by rotating snapshots
+        self.market_data_line_budget = MARKET_DATA_LINE_BUDGET_DEFAULT  # Will be loaded from settings
+        self.line_budget = MarketDataLineBudget(
+            self.subscriptions, self.market_data_line_budget,
+            is_position_key=lambda contract_key: contract_key in self.positions
+        )
+        self.app_state['line_budget'] = self.line_budget
+        # Row lookup for chain tables: {chain_type: {(expiry, strike): row}}
+        # Rebuilt whenever a chain is (re)built so tick handlers never scan table rows
+        self.chain_row_index = {
+            'main': {},
+            'ts_0dte': {},
+            'ts_1dte': {}
         }
-        # CRITICAL: Global subscription tracker to prevent duplicate subscriptions
-        # Format: {contract_key: req_id} where contract_key = "SYMBOL_STRIKE_RIGHT_EXPIRY"
-        # This prevents subscribing to the same contract multiple times across chains or recenters
-        self._subscribed_contracts = {}
-        # CRITICAL: Reference counting for shared subscriptions
-        # Format: {req_id: set(chain_types)} tracks which chains are using each subscription
-        # Prevents canceling a subscription that's still needed by another chain
-        self._subscription_refcount = {}
         logger.info("✓ Request ID tracking initialized (ranges: main=1000-1999, ts_0dte=2000-2999, ts_1dte=3000-3999)")
-        logger.info("✓ Global subscription tracker initialized (_subscribed_contracts + _subscription_refcount)")
+        logger.info("✓ Global subscription registry initialized (reqId <-> contract, chain refs, open orders)")
         
         # Strategy parameters - reduced strikes for efficient auto-load under 100 data line limit
         self.strikes_above = 10  # Reduced from 20 to 10 for streamlined chain loading
@@ -3348,6 +6419,13 @@ class MainWindow(QMainWindow):
         self.last_recenter_time = 0  # Timestamp of last recenter to throttle rapid recenters
         self.delta_calibration_done = False  # Track if we've done initial delta-based recenter after chain load
         self._chains_loading = False  # Track if chains are currently loading (prevents drift checking during load)
+        self._chain_pipeline_stage = None  # None | 'underlying' | 'main' | 'ts_0dte' | 'ts_1dte'
+        self._chain_pipeline_started = 0.0
+        self._chain_stage_started = 0.0
+        self._chain_stage_times = {}  # stage -> seconds to ready (logged at every connect)
+        self._chain_stage_timer = QTimer()
+        self._chain_stage_timer.setSingleShot(True)
+        self._chain_stage_timer.timeout.connect(self._on_chain_stage_timeout)
         
         # TradeStation chain parameters (separate from main chain)
         self.ts_strikes_above = 6  # Fewer strikes for TS chains (default: 6)
@@ -3387,6 +6465,33 @@ class MainWindow(QMainWindow):
         self.chase_give_in_interval = 3.0  # Seconds between give-in adjustments (will be loaded from settings)
         self.min_order_modification_interval = 2.0  # HARD LIMIT: IB compliance - never modify order faster than 2 seconds
         
+        # Chase deadline timer - armed for the earliest give-in / rate-limit deadline in _chase_deadlines
+        self.chase_timer = QTimer()
+        self.chase_timer.setSingleShot(True)
+        self.chase_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.chase_timer.timeout.connect(self.update_orders)
+        
+        # Signal reversal pipeline - wait for cancel confirmations without blocking the GUI thread
+        self.reversal_cancel_timeout = 2.0  # Seconds to wait for Cancelled/Filled before entering anyway
+        self._reversal: Optional[dict] = None  # In-flight cancel→confirm→enter (see _enter_automated_position)
+        self._reversal_stragglers: Dict[int, str] = {}  # Cancels a finished/superseded reversal never saw confirmed
+        self.reversal_timer = QTimer()
+        self.reversal_timer.setSingleShot(True)
+        self.reversal_timer.timeout.connect(self._on_reversal_timeout)
+        
+        # Native (IB-side) exits - contract_key -> OCA group of target/stop child orders
+        self.native_exits: Dict[str, dict] = {}
+        self._native_exit_order_ids: Dict[int, str] = {}  # exit order_id -> contract_key
+        self._native_exit_cancels: Dict[str, dict] = {}  # contract_key -> children cancelled, not yet confirmed
+        self.native_exit_fills = deque(maxlen=SIGNAL_LATENCY_WINDOW)  # (contract_key, kind, est. ms saved)
+        self._local_exit_fill_times = deque(maxlen=SIGNAL_LATENCY_WINDOW)  # Seconds to fill chased SELL exits
+        
+        # Combo (BAG) orders - placements waiting on leg conIds, leg executions of working combos
+        self._combo_queue: List[dict] = []  # Combo placements waiting for reqContractDetails (see place_combo_order)
+        self._con_id_requests: Dict[int, str] = {}  # reqContractDetails reqId -> leg contract_key
+        self._con_id_pending: Dict[str, int] = {}  # leg contract_key -> reqId of its in-flight request
+        self._combo_leg_executions: Dict[int, Dict[str, List[Tuple[float, float]]]] = {}  # order_id -> leg -> [(shares, price)]
+        
         # Master Settings (Strategy Control Panel)
         self.strategy_enabled = False  # Strategy automation OFF by default
         self.vix_threshold = 20.0
@@ -3434,6 +6539,7 @@ class MainWindow(QMainWindow):
         self.ts_position_profit_target_pct = 60.0   # Default: 60% gain on position
         self.ts_use_position_stop_loss = False      # Enable position % stop loss
         self.ts_position_stop_loss_pct = 40.0       # Default: 40% loss on position
+        self.ts_use_native_exits = False            # Attach IB-side OCA target/stop orders to automated entry fills
         
         # Session-level exits (cumulative unrealized + realized)
         self.ts_use_session_account_target = False  # Enable session account % profit target
@@ -3509,8 +6615,31 @@ class MainWindow(QMainWindow):
         self.ibkr_wrapper = IBKRWrapper(self.signals, self.app_state, self)
         self.ibkr_client = IBKRClient(self.ibkr_wrapper)
         self.ibkr_wrapper.set_client(self.ibkr_client)  # Set client reference for market data subscriptions
+        self.line_budget.set_client(self.ibkr_client)
+        self.line_budget_timer = QTimer()
+        self.line_budget_timer.timeout.connect(self.rotate_line_budget)
+        self.line_budget_timer.start(LINE_BUDGET_ROTATION_MS)
         self.ibkr_thread = None
         
+        # Tick conflation: reader thread buffers latest values, GUI drains once per frame
+        self.tick_conflation_interval_ms = TICK_CONFLATION_DEFAULT_MS  # Frame interval (will be loaded from settings)
+        self.tick_conflator = TickConflator()
+        self.ibkr_wrapper.set_tick_conflator(self.tick_conflator)
+        self.tick_flush_timer = QTimer()
+        self.tick_flush_timer.timeout.connect(self.flush_tick_conflator)
+        self.tick_flush_timer.start(self.tick_conflation_interval_ms)
+        self._tick_stats_last = self.tick_conflator.get_stats()
+        self._tick_stats_last_time = time.time()
+        self._pacer_sent_last = 0
+        self._pacer_stats_last_time = time.time()
+        
+        # Hot-standby automated entries (direction -> EntryCandidate) + signal-to-wire latency
+        self.entry_candidates: Dict[int, Optional[EntryCandidate]] = {1: None, 2: None}
+        self._entry_standby_expiry = None  # Active TS expiry (refreshed by the 1s timer)
+        self.signal_latency = LatencyTracker()
+        self._signal_latency_pending = {}  # order_id -> (signal perf_counter, hot)
+        self._ts_signal_received_at = None
+        
         # TradeStation setup
         self.ts_signals = TradeStationSignals()
         self.ts_manager = None
@@ -3543,6 +6672,7 @@ class MainWindow(QMainWindow):
         # Setup UI
         self.setup_ui()
         self.apply_dark_theme()
+        self.setup_render_gates()
         
         # Load settings
         self.load_settings()
@@ -3566,6 +6696,12 @@ class MainWindow(QMainWindow):
         self.position_update_timer = QTimer()
         self.position_update_timer.timeout.connect(self.update_positions_display)
         self.position_update_timer.timeout.connect(self.update_ts_positions_display)
+        self.position_update_timer.timeout.connect(self.update_tick_conflation_stats)
+        self.position_update_timer.timeout.connect(self.update_subscription_stats)
+        self.position_update_timer.timeout.connect(self.update_pacer_stats)
+        self.position_update_timer.timeout.connect(self.update_render_skip_stats)
+        self.position_update_timer.timeout.connect(self.update_native_exit_stats)
+        self.position_update_timer.timeout.connect(self.update_signal_latency_stats)
         self.position_update_timer.start(1000)  # Update every 1000ms (1 second)
         
         # Start position auto-save timer (save every 60 seconds)
@@ -3621,6 +6757,7 @@ class MainWindow(QMainWindow):
                 'window_title_prefix': '[FALLBACK] ',
                 'settings_file': 'settings.json',
                 'positions_file': 'positions.json',
+                'bar_cache_dir': 'bar_cache',
                 'log_dir': 'logs',
                 'log_prefix': '',
                 'log_level': 'DEBUG',
@@ -4179,6 +7316,7 @@ class MainWindow(QMainWindow):
         self.signals.es_price_updated.connect(self.update_es_display)
         self.signals.market_data_tick.connect(self.on_market_data_tick)
         self.signals.greeks_updated.connect(self.on_greeks_updated)
+        self.signals.market_data_batch.connect(self.on_market_data_batch)
         self.signals.next_order_id.connect(self.on_next_order_id)
         self.signals.managed_accounts.connect(self.on_managed_accounts)
         self.signals.position_update.connect(self.on_position_update)
@@ -4323,6 +7461,46 @@ class MainWindow(QMainWindow):
         spacer3.setStyleSheet("color: #666666;")
         self.status_bar.addPermanentWidget(spacer3)
         
+        # Tick conflation throughput (IBKR ticks received vs delivered to GUI)
+        self.tick_stats_label = QLabel("Ticks: 0/s → 0/s")
+        self.tick_stats_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        self.tick_stats_label.setToolTip("Option ticks received from IBKR per second → updates delivered to the GUI per second")
+        self.status_bar.addPermanentWidget(self.tick_stats_label)
+        
+        # Live market data lines (chains + positions + order contracts)
+        self.subscription_lines_label = QLabel("Lines: 0")
+        self.subscription_lines_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        self.subscription_lines_label.setToolTip("IBKR market data lines in use / line budget")
+        self.status_bar.addPermanentWidget(self.subscription_lines_label)
+        
+        # Outbound IBKR message pacing (token bucket throughput / queue depth)
+        self.pacer_stats_label = QLabel("API: 0 msg/s")
+        self.pacer_stats_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        self.pacer_stats_label.setToolTip("Messages sent to IBKR per second (paced)")
+        self.status_bar.addPermanentWidget(self.pacer_stats_label)
+        
+        # Renders skipped because their tab / window was hidden (see RenderGate)
+        self.render_skip_label = QLabel("Skipped: 0")
+        self.render_skip_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        self.render_skip_label.setToolTip("Chart / chain table renders skipped while hidden")
+        self.status_bar.addPermanentWidget(self.render_skip_label)
+        
+        # IB-side exits (live OCA groups, estimated latency saved per exit)
+        self.native_exit_label = QLabel("Native exits: 0")
+        self.native_exit_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        self.native_exit_label.setToolTip("IB-side take-profit / stop orders attached to automated entries")
+        self.status_bar.addPermanentWidget(self.native_exit_label)
+        
+        # Automated entry latency (TS signal -> order on the wire)
+        self.signal_latency_label = QLabel("Signal→wire: --")
+        self.signal_latency_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        self.signal_latency_label.setToolTip("TS strategy signal → entry order sent to IBKR")
+        self.status_bar.addPermanentWidget(self.signal_latency_label)
+        
+        spacer4 = QLabel("  |  ")
+        spacer4.setStyleSheet("color: #666666;")
+        self.status_bar.addPermanentWidget(spacer4)
+        
         # Automation status indicator
         self.automation_status_label = QLabel("Automation: OFF")
         self.automation_status_label.setStyleSheet(
@@ -4608,16 +7786,14 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error updating option chart: {e}")
     
-    def update_spx_chart(self, chart_widget, price_data: List[Dict], trade_markers: Optional[List[Dict]] = None):
-        """Update SPX chart with price data, EMA, Z-Score, and trade markers"""
-        if not price_data:
+    def update_spx_chart(self, chart_widget, price_data: np.ndarray, trade_markers: Optional[List[Dict]] = None):
+        """Update SPX chart with price data (BarSeries view), EMA, Z-Score, and trade markers"""
+        if price_data is None or len(price_data) == 0:
             return
             
         try:
             # Convert to DataFrame for easier processing
-            df = pd.DataFrame(price_data)
-            df['time'] = pd.to_datetime(df['time'])
-            df = df.sort_values('time')
+            df = bar_frame(price_data).reset_index()
             
             # Calculate EMA
             ema_length = chart_widget.ema_spinbox.value()
@@ -5050,26 +8226,25 @@ class MainWindow(QMainWindow):
             
             # Clear existing data for this chart (both historical and chart data)
             if contract_key in self.historical_data:
-                self.historical_data[contract_key] = []
+                self.historical_data[contract_key].clear()
             
             # Also clear chart_data to prevent rendering stale data
             if is_trade_chart:
-                self.chart_data['underlying_trade'] = []
+                self.chart_data['underlying_trade'].clear()
             else:
-                self.chart_data['es_futures'] = []  # Clear ES futures data for confirmation chart
+                self.chart_data['es_futures'].clear()  # Clear ES futures data for confirmation chart
             
             # Request new data with updated settings
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id,
+                contract_key,
                 contract,
                 "",  # End time (empty = now)
                 duration,
                 bar_size,
                 "TRADES",
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date
-                []
             )
             
             chart_name = "Trade" if is_trade_chart else "Confirmation"
@@ -5150,26 +8325,25 @@ class MainWindow(QMainWindow):
             
             # Clear existing data for this chart (both historical and chart data)
             if chart_key in self.historical_data:
-                self.historical_data[chart_key] = []
+                self.historical_data[chart_key].clear()
             
             # Also clear chart_data to prevent rendering stale data
             if is_call:
-                self.chart_data['selected_call'] = []
+                self.chart_data['selected_call'].clear()
             else:
-                self.chart_data['selected_put'] = []
+                self.chart_data['selected_put'].clear()
             
             # Request historical data with new settings
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id,
+                chart_key,
                 contract,
                 "",  # End time (empty = now)
                 duration,
                 bar_size,
                 "MIDPOINT",  # Use mid price (bid+ask)/2 for option charts
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date
-                []
             )
             
             chart_name = "Call" if is_call else "Put"
@@ -5198,6 +8372,153 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error requesting chart data: {e}")
     
+    # ========================================================================
+    # HISTORICAL BAR CACHE - serve cached bars, fetch only missing ranges
+    # ========================================================================
+    
+    def request_historical_bars(self, req_id: int, contract_key: str, contract, end_time: str, duration: str,
+                                bar_size: str, what_to_show: str, use_rth: int, keep_up_to_date: bool,
+                                backfill_chart=None):
+        """
+        reqHistoricalData through the on-disk bar cache.
+        
+        Live (keepUpToDate) requests seed historical_data with the cached bars and
+        ask IBKR only from the first uncovered bar to now. Backfill requests hand
+        the cached bars to the chart and ask only for the older uncovered part -
+        or nothing when the whole window is cached.
+        """
+        cache_key = bar_cache_key(contract, bar_size, what_to_show, use_rth)
+        # Cached bar times are TWS wall clock - plan the window on the same clock
+        tz = self.bar_cache.timezone or datetime.now().astimezone().tzinfo
+        end = ib_end_time_ns(end_time, tz)
+        start = end - ib_duration_seconds(duration) * 1_000_000_000
+        served, fetch_start, fetch_end = self.bar_cache.plan(cache_key, start, end, live=backfill_chart is None)
+        
+        if fetch_start is not None and len(served):
+            # Gap-only request: one bar of overlap, exact seconds while under a day
+            gap_seconds = max((fetch_end - fetch_start) / 1e9 + ib_bar_seconds(bar_size), 60)
+            if gap_seconds < ib_duration_seconds(duration):
+                duration = ib_duration(gap_seconds)
+            if backfill_chart is not None:
+                end_time = ib_end_time(fetch_end, tz)
+        request_end = end if fetch_end is None else fetch_end
+        # "N S" windows are exact; D / W are trading days (and the clock is a guess until a bar has shown
+        # TWS's time zone), so coverage starts at the first bar returned
+        exact = duration.endswith(' S') and self.bar_cache.timezone is not None
+        coverage_start = request_end - ib_duration_seconds(duration) * 1_000_000_000 if exact else None
+        
+        if backfill_chart is not None:
+            backfill_chart.backfill_cached = served
+            if fetch_start is None:
+                # Whole window is cached - complete the backfill without asking IBKR
+                logger.info(f"💾 Backfill for {contract_key} served from bar cache ({len(served)} bars, no request)")
+                if len(served):
+                    backfill_chart.backfill_data = served
+                    QTimer.singleShot(0, lambda: self.on_historical_complete(contract_key))
+                else:
+                    backfill_chart.backfill_req_id = None
+                    backfill_chart.is_fetching_more_data = False
+                return
+            self._bar_cache_backfill[contract_key] = (cache_key, coverage_start, request_end)
+        else:
+            self._bar_cache_live[contract_key] = (cache_key, coverage_start, len(served))
+            if len(served):
+                self._seed_from_bar_cache(contract_key, served)
+        
+        if len(served):
+            logger.info(f"💾 {contract_key}: {len(served)} bars from bar cache, requesting only {duration} from IBKR")
+        self.ibkr_client.reqHistoricalData(req_id, contract, end_time, duration, bar_size, what_to_show,
+                                           use_rth, 1, keep_up_to_date, [])
+    
+    def _chart_ring(self, contract_key: str) -> Optional[BarSeries]:
+        """chart_data ring a historical series also feeds (same routing as update_*_chart_data)"""
+        if contract_key.startswith("UNDERLYING_") or contract_key == "ES_FUTURES_CONFIRM":
+            if "TRADE" in contract_key:
+                return self.chart_data['underlying_trade']
+            return self.chart_data['es_futures' if contract_key == "ES_FUTURES_CONFIRM" else 'underlying']
+        if contract_key.startswith("CHART_call_"):
+            return self.chart_data['selected_call']
+        if contract_key.startswith("CHART_put_"):
+            return self.chart_data['selected_put']
+        if contract_key.startswith("CHART_"):
+            actual_contract_key = contract_key.replace("CHART_", "")
+            if actual_contract_key == self.current_call_contract:
+                return self.chart_data['selected_call']
+            if actual_contract_key == self.current_put_contract:
+                return self.chart_data['selected_put']
+        return None
+    
+    def _seed_from_bar_cache(self, contract_key: str, rows: np.ndarray):
+        """Load cached bars into historical_data (and its chart ring) and draw them right away"""
+        series = self.historical_data.setdefault(contract_key, BarSeries())
+        if series.last_time is not None:
+            rows = rows[rows['time'] > series.last_time]
+        series.extend(rows)
+        ring = self._chart_ring(contract_key)
+        if ring is not None:
+            ring.extend(rows)
+        if contract_key.startswith("UNDERLYING_") or contract_key == "ES_FUTURES_CONFIRM":
+            self.update_underlying_charts_complete(contract_key)
+        elif contract_key.startswith("CHART_"):
+            self.update_option_charts_complete(contract_key)
+    
+    def _backfill_chart(self, contract_key: str):
+        """Chart widget that owns backfill requests for a series (None for option charts)"""
+        if contract_key == "ES_FUTURES_CONFIRM":
+            return getattr(self, 'confirm_chart_widget', None)
+        if contract_key.startswith("UNDERLYING_"):
+            return getattr(self, 'trade_chart_widget', None)
+        return None
+    
+    def store_completed_bars(self, contract_key: str):
+        """historicalDataEnd: write the bars IBKR answered for the request window to the bar cache"""
+        try:
+            chart = self._backfill_chart(contract_key)
+            if chart is not None and chart.backfill_req_id is not None:
+                pending = self._bar_cache_backfill.pop(contract_key, None)
+                if pending is None:
+                    return  # Served entirely from the cache
+                cache_key, coverage_start, request_end = pending
+                fetched = merge_bar_rows(np.array([bar_row(bar) for bar in chart.backfill_data], dtype=BAR_DTYPE))
+                self.bar_cache.stats['bars_fetched'] += len(fetched)
+                if coverage_start is None and len(fetched):
+                    coverage_start = int(fetched['time'][0])
+                if coverage_start is not None:
+                    self.bar_cache.store(cache_key, fetched, coverage_start, request_end)
+                chart.backfill_data = merge_bar_rows(fetched, chart.backfill_cached)
+                chart.backfill_cached = np.empty(0, dtype=BAR_DTYPE)
+                return
+            
+            live = self._bar_cache_live.get(contract_key)
+            series = self.historical_data.get(contract_key)
+            if live is None or not series:
+                return
+            cache_key, coverage_start, served = live
+            rows = series.view()
+            self.bar_cache.stats['bars_fetched'] += max(len(rows) - served, 0)
+            if coverage_start is None:
+                if len(rows) <= served:
+                    return
+                coverage_start = int(rows['time'][served])  # First bar IBKR returned
+                self._bar_cache_live[contract_key] = (cache_key, coverage_start, served)
+            self.bar_cache.store(cache_key, rows[rows['time'] >= coverage_start], coverage_start, int(rows['time'][-1]))
+            logger.debug(self.bar_cache.report())
+        except Exception as e:
+            logger.error(f"Error writing bar cache for {contract_key}: {e}", exc_info=True)
+    
+    def flush_bar_cache(self):
+        """Write live series (bars since their request completed) to the bar cache and log the session report"""
+        for contract_key, (cache_key, coverage_start, _) in self._bar_cache_live.items():
+            series = self.historical_data.get(contract_key)
+            if coverage_start is None or not series:
+                continue
+            try:
+                rows = series.view()
+                self.bar_cache.store(cache_key, rows[rows['time'] >= coverage_start], coverage_start, int(rows['time'][-1]))
+            except Exception as e:
+                logger.error(f"Error flushing bar cache for {contract_key}: {e}")
+        logger.info(f"💾 {self.bar_cache.report()}")
+    
     def request_underlying_historical_data(self):
         """Request historical data for ES futures (confirmation chart) and underlying (trade chart)"""
         try:
@@ -5219,17 +8540,16 @@ class MainWindow(QMainWindow):
             self.request_id_map[req_id] = contract_key
             
             # Request 1 day of 1-minute data for confirmation chart with real-time updates
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id,
+                contract_key,
                 es_contract,
                 "",  # End time (empty = now)
                 "1 D",  # Duration
                 "1 min",  # Bar size
                 "TRADES",
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date - enables real-time bar updates via historicalDataUpdate
-                []
             )
             
             logger.info(f"Requested ES futures historical data for confirmation chart")
@@ -5248,17 +8568,16 @@ class MainWindow(QMainWindow):
             self.request_id_map[req_id_trade] = contract_key_trade
             
             # Request 4 hours of 30-second data for trade chart with real-time updates
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id_trade,
+                contract_key_trade,
                 underlying_contract,
                 "",  # End time (empty = now)
                 "14400 S",  # 4 hours in seconds
                 "30 secs",  # Bar size
                 "TRADES",
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date - enables real-time bar updates via historicalDataUpdate
-                []
             )
             
             logger.info(f"Requested trade chart historical data for {contract_key_trade}")
@@ -5337,17 +8656,16 @@ class MainWindow(QMainWindow):
             self.app_state['historical_data_requests'][req_id] = contract_key
             
             # Request 1 day of 1-minute data for option charts using MIDPOINT with real-time updates
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id,
+                f"CHART_{contract_key}",
                 contract,
                 "",  # End time (empty = now)
                 "1 D",  # Duration  
                 "1 min",  # Bar size
                 "MIDPOINT",  # Use mid price (bid+ask)/2 for option charts
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date - enables real-time bar updates via historicalDataUpdate
-                []
             )
             
             logger.info(f"Requested option historical data for {contract_key}")
@@ -5393,17 +8711,16 @@ class MainWindow(QMainWindow):
             self.request_id_map[req_id] = chart_key
             
             # Request historical data for charts using MIDPOINT with real-time updates
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id,
+                chart_key,
                 contract,
                 "",  # End time (empty = now)
                 "1 D",  # Duration  
                 "1 min",  # Bar size
                 "MIDPOINT",  # Use mid price (bid+ask)/2 for option charts
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date - enables real-time bar updates via historicalDataUpdate
-                []
             )
             
             logger.info(f"Requested chart data for {option_type} option: {contract_key}")
@@ -5533,7 +8850,7 @@ class MainWindow(QMainWindow):
 
         # Charts are now in popup window - create professional chart widgets
         # Call Chart (Top Left) - Light blue for calls
-        self.call_chart_widget = ProfessionalChart("Call Chart", "#4EC9FF")
+        self.call_chart_widget = ProfessionalChart("Call Chart", "#4EC9FF", render_worker=self.chart_render_worker)
         self.call_chart_widget.interval_combo.currentTextChanged.connect(
             lambda: self.on_option_settings_changed(self.call_chart_widget, is_call=True)
         )
@@ -5542,7 +8859,7 @@ class MainWindow(QMainWindow):
         )
         
         # Put Chart (Top Right) - Pink for puts
-        self.put_chart_widget = ProfessionalChart("Put Chart", "#FF69B4")
+        self.put_chart_widget = ProfessionalChart("Put Chart", "#FF69B4", render_worker=self.chart_render_worker)
         self.put_chart_widget.interval_combo.currentTextChanged.connect(
             lambda: self.on_option_settings_changed(self.put_chart_widget, is_call=False)
         )
@@ -5551,7 +8868,7 @@ class MainWindow(QMainWindow):
         )
         
         # Confirmation Chart (Bottom Left) - Professional underlying with Z-Score
-        self.confirm_chart_widget = ProfessionalUnderlyingChart("Confirmation Chart", "#FFA726", main_window=self)
+        self.confirm_chart_widget = ProfessionalUnderlyingChart("Confirmation Chart", "#FFA726", main_window=self, render_worker=self.chart_render_worker)
         self.confirm_chart_widget.interval_combo.currentTextChanged.connect(
             lambda: self.on_underlying_settings_changed(self.confirm_chart_widget, is_trade_chart=False)
         )
@@ -5560,7 +8877,7 @@ class MainWindow(QMainWindow):
         )
         
         # Trade Chart (Bottom Right) - Professional underlying with Z-Score
-        self.trade_chart_widget = ProfessionalUnderlyingChart("Trade Chart", "#66BB6A", main_window=self)
+        self.trade_chart_widget = ProfessionalUnderlyingChart("Trade Chart", "#66BB6A", main_window=self, render_worker=self.chart_render_worker)
         self.trade_chart_widget.interval_combo.currentTextChanged.connect(
             lambda: self.on_underlying_settings_changed(self.trade_chart_widget, is_trade_chart=True)
         )
@@ -6277,6 +9594,30 @@ class MainWindow(QMainWindow):
         self.chain_drift_settings_spin.setToolTip("How many strikes ATM can drift before auto-recentering")
         chain_layout.addRow("Drift Threshold (strikes):", self.chain_drift_settings_spin)
         
+        self.tick_conflation_spin = QSpinBox()
+        self.tick_conflation_spin.setRange(TICK_CONFLATION_MIN_MS, TICK_CONFLATION_MAX_MS)
+        self.tick_conflation_spin.setSingleStep(10)
+        self.tick_conflation_spin.setValue(self.tick_conflation_interval_ms)
+        self.tick_conflation_spin.setSuffix(" ms")
+        self.tick_conflation_spin.setToolTip(
+            "How often buffered market data ticks are applied to the chain tables.\n"
+            "Only the latest value per contract/field is kept between frames."
+        )
+        self.tick_conflation_spin.valueChanged.connect(self.on_tick_conflation_interval_changed)
+        chain_layout.addRow("Tick Update Interval:", self.tick_conflation_spin)
+        
+        self.line_budget_spin = QSpinBox()
+        self.line_budget_spin.setRange(MARKET_DATA_LINE_BUDGET_MIN, MARKET_DATA_LINE_BUDGET_MAX)
+        self.line_budget_spin.setSingleStep(10)
+        self.line_budget_spin.setValue(self.market_data_line_budget)
+        self.line_budget_spin.setToolTip(
+            "Simultaneous market data lines allowed by your IBKR account (100 by default).\n"
+            "When full, far wing strikes fall back to rotating snapshots so positions,\n"
+            "working orders and near-ATM strikes keep streaming."
+        )
+        self.line_budget_spin.valueChanged.connect(self.on_line_budget_changed)
+        chain_layout.addRow("Market Data Lines:", self.line_budget_spin)
+        
         layout.addWidget(chain_group)
         
         # TradeStation Chain Settings
@@ -6373,6 +9714,22 @@ class MainWindow(QMainWindow):
         # Save settings immediately
         self.save_settings()
     
+    def on_tick_conflation_interval_changed(self):
+        """Handle tick conflation interval spinbox value changes"""
+        self.tick_conflation_interval_ms = self.tick_conflation_spin.value()
+        self.tick_flush_timer.setInterval(self.tick_conflation_interval_ms)
+        logger.info(f"Tick conflation interval updated to: {self.tick_conflation_interval_ms} ms")
+        # Save settings immediately
+        self.save_settings()
+    
+    def on_line_budget_changed(self):
+        """Handle market data line budget spinbox value changes"""
+        self.market_data_line_budget = self.line_budget_spin.value()
+        self.line_budget.set_budget(self.market_data_line_budget)
+        logger.info(f"Market data line budget updated to: {self.market_data_line_budget} lines")
+        # Save settings immediately
+        self.save_settings()
+    
     def apply_dark_theme(self):
         """Apply IBKR TWS dark color scheme with minimal Bloomberg-style orange accents"""
         stylesheet = """
@@ -6521,7 +9878,7 @@ class MainWindow(QMainWindow):
         """Disconnect from Interactive Brokers"""
         logger.info("Disconnecting from IBKR...")
         try:
-            self.ibkr_client.disconnect()
+            self._forget_unsent_orders(self.ibkr_client.disconnect())
             if self.ibkr_thread:
                 self.ibkr_thread.wait(2000)
             
@@ -6535,6 +9892,28 @@ class MainWindow(QMainWindow):
             logger.error(f"Disconnect error: {e}", exc_info=True)
             self.log_message(f"Disconnect error: {e}", "ERROR")
     
+    def _forget_unsent_orders(self, order_ids: List[int]):
+        """Stop tracking orders whose queued placeOrder / cancelOrder was dropped on disconnect
+        
+        Left in pending_orders they would block automated entries (safety check #5) and
+        keep the chaser modifying an order IB never received.
+        """
+        if not order_ids:
+            return
+        for order_id in order_ids:
+            self._stop_chasing(order_id, 'Disconnected')
+            working = self.pending_orders.pop(order_id, None)
+            self.subscriptions.remove_order(order_id)
+            if working is not None:
+                for key in combo_leg_keys(working.contract_key) or (working.contract_key,):
+                    self.cleanup_orphaned_subscription(key)
+            self._combo_leg_executions.pop(order_id, None)
+        ids = ", ".join(f"#{order_id}" for order_id in order_ids)
+        logger.warning(f"🔌 Disconnected with unsent order messages - no longer tracking {ids}")
+        self.log_message(f"⚠️ Order message(s) for {ids} were still queued at disconnect and were dropped "
+                         f"- verify in TWS", "WARNING")
+        self.update_orders_display()
+    
     def retry_connection_with_new_client_id(self):
         """
         Retry connection with new client ID after error 326.
@@ -6623,6 +10002,10 @@ class MainWindow(QMainWindow):
         elif status == "DISCONNECTED":
             self.connect_btn.setText("Connect")
             self.connect_btn.setEnabled(True)
+            self.tick_conflator.clear()  # Drop buffered ticks from the dead session
+            self.line_budget.clear()  # IBKR dropped every line with the session
+            self._chain_stage_timer.stop()  # Abort any chain loading pipeline in progress
+            self._chain_pipeline_stage = None
     
     @pyqtSlot(int)
     def on_next_order_id(self, order_id: int):
@@ -6675,6 +10058,10 @@ class MainWindow(QMainWindow):
         # Update ES-to-cash offset if conditions are met
         self.update_es_to_cash_offset(price, None)
         
+        # Chain loading pipeline waiting on the first underlying price
+        if self._chain_pipeline_stage == 'underlying' and self.calculate_atm_strike() > 0:
+            self._on_underlying_ready()
+        
         # Update charts with live data
         self.update_charts_with_live_data()
     
@@ -6868,21 +10255,14 @@ class MainWindow(QMainWindow):
         Returns:
             tuple: (symbol, strike, right, expiry) or (None, None, None, None) if parsing fails
         """
-        try:
-            if contract_key.startswith('ATM_SCAN_'):
-                return (None, None, None, None)  # Skip ATM scan keys
-            
-            parts = contract_key.split('_')
-            if len(parts) >= 4:
-                symbol = parts[0]
-                strike = float(parts[1])
-                right = parts[2]
-                expiry = parts[3]
-                return (symbol, strike, right, expiry)
-        except Exception as e:
-            logger.debug(f"Failed to parse contract key '{contract_key}': {e}")
-        
-        return (None, None, None, None)
+        # Interned lookup - the key string is only split the first time it is seen
+        # (ATM_SCAN_ keys and malformed keys resolve to None)
+        record = self.contract_registry.intern_key(contract_key)
+        if record is None:
+            logger.debug(f"Failed to parse contract key '{contract_key}'")
+            return (None, None, None, None)
+        
+        return (record.symbol, record.strike, record.right, record.expiry)
 
     # ============================================================================
     # SIMPLIFIED CHAIN LOADING SYSTEM - November 10, 2025
@@ -6925,66 +10305,23 @@ class MainWindow(QMainWindow):
 
     def cancel_chain_subscriptions(self, chain_type: str):
         """Cancel all active subscriptions for a chain type"""
-        if chain_type not in self.active_req_ids:
-            return
-        
-        req_ids = self.active_req_ids[chain_type]
+        req_ids = self.subscriptions.chain_req_ids(chain_type)
         if req_ids:
             logger.info(f"Canceling subscriptions for {chain_type} chain ({len(req_ids)} req_ids)")
             actually_canceled = 0
             kept_for_orders = 0
             for req_id in req_ids:
                 try:
-                    # CRITICAL: Check if other chains are still using this subscription
-                    if req_id in self._subscription_refcount:
-                        # Remove this chain from the ref count
-                        self._subscription_refcount[req_id].discard(chain_type)
-                        
-                        # Get contract key for this req_id
-                        contract_key = self.app_state.get('market_data_map', {}).get(req_id)
-                        
-                        # Check if there are active orders for this contract
-                        has_active_orders = False
-                        if contract_key and self.pending_orders:
-                            for order_id, order in self.pending_orders.items():
-                                if order.get('contract_key') == contract_key:
-                                    has_active_orders = True
-                                    logger.info(f"⚠️ Keeping subscription for {contract_key} (reqId={req_id}) - active order #{order_id}")
-                                    break
-                        
-                        # Only cancel if:
-                        # 1. No chains are using it anymore AND
-                        # 2. No active orders exist for this contract
-                        if len(self._subscription_refcount[req_id]) == 0 and not has_active_orders:
-                            self.ibkr_client.cancelMktData(req_id)
-                            del self._subscription_refcount[req_id]
-                            actually_canceled += 1
-                            
-                            # Remove from market_data_map and subscription tracker
-                            if req_id in self.app_state.get('market_data_map', {}):
-                                contract_key = self.app_state['market_data_map'][req_id]
-                                del self.app_state['market_data_map'][req_id]
-                                if contract_key in self._subscribed_contracts:
-                                    del self._subscribed_contracts[contract_key]
-                                    logger.debug(f"Removed {contract_key} (reqId={req_id}) - no longer used")
-                        elif has_active_orders:
-                            # Keep subscription for active orders
-                            kept_for_orders += 1
-                            logger.debug(f"Keeping reqId={req_id} for {contract_key} - has active order(s)")
-                        else:
-                            # Still used by other chains
-                            remaining_chains = ', '.join(self._subscription_refcount[req_id])
-                            logger.debug(f"Keeping reqId={req_id} - still used by: {remaining_chains}")
-                    else:
-                        # No ref count entry - shouldn't happen but cancel anyway
-                        logger.warning(f"reqId={req_id} has no ref count entry - canceling anyway")
-                        self.ibkr_client.cancelMktData(req_id)
+                    result = self._release_chain_line(req_id, chain_type)
+                    if result == 'canceled':
                         actually_canceled += 1
+                    elif result == 'orders':
+                        kept_for_orders += 1
                 except Exception as e:
                     logger.debug(f"Error canceling reqId {req_id}: {e}")
             
             logger.info(f"  Actually canceled: {actually_canceled}, kept (shared): {len(req_ids) - actually_canceled - kept_for_orders}, kept (orders): {kept_for_orders}")
-            self.active_req_ids[chain_type] = []
+            self.subscriptions.set_chain_req_ids(chain_type, [])
 
     def calculate_atm_strike(self) -> float:
         """
@@ -6999,37 +10336,38 @@ class MainWindow(QMainWindow):
 
     def load_all_chains_sequential(self):
         """
-        Load all chains sequentially to prevent race conditions.
+        Load all chains through the readiness pipeline (one stage at a time).
         
         Flow:
-        1. Wait for underlying price (with timeout)
-        2. Load main chain
-        3. Wait for main chain to populate
-        4. Load TS 0DTE chain
-        5. Wait for TS 0DTE to populate
-        6. Load TS 1DTE chain
+        1. Wait for the first underlying price (event-driven, with timeout)
+        2. Load main chain, wait until its first bid/ask + greeks round is in
+        3. Load TS 0DTE chain, wait until ready
+        4. Load TS 1DTE chain, wait until ready
         
+        Each stage starts as soon as the previous one is ready; the outbound
+        pacer keeps the subscription bursts under IBKR's message limit.
         This is called once on connection and again when recentering.
         """
-        if not hasattr(self, '_chain_load_retry_count'):
-            self._chain_load_retry_count = 0
+        self._chain_stage_timer.stop()
+        self._chain_pipeline_started = time.time()
+        self._chain_stage_started = self._chain_pipeline_started
+        self._chain_stage_times = {}
+        self._chain_pipeline_stage = 'underlying'
         
         # Step 1: Check for underlying price
-        atm_strike = self.calculate_atm_strike()
-        
-        if atm_strike <= 0:
-            self._chain_load_retry_count += 1
-            if self._chain_load_retry_count < 20:  # 40 seconds max wait
-                self.log_message(f"Waiting for underlying price... (attempt {self._chain_load_retry_count})", "INFO")
-                QTimer.singleShot(2000, self.load_all_chains_sequential)
-                return
-            else:
-                self.log_message("⚠️ Timeout waiting for underlying price", "ERROR")
-                logger.error("Chain loading aborted - no underlying price after 40 seconds")
-                return
+        if self.calculate_atm_strike() > 0:
+            self._on_underlying_ready()
+            return
         
-        # Reset retry counter
-        self._chain_load_retry_count = 0
+        self.log_message("Waiting for underlying price...", "INFO")
+        self._chain_stage_timer.start(UNDERLYING_WAIT_TIMEOUT_MS)
+    
+    def _on_underlying_ready(self):
+        """Underlying price arrived - start loading chains at its ATM strike"""
+        atm_strike = self.calculate_atm_strike()
+        self._chain_stage_timer.stop()
+        self._chain_stage_times['underlying'] = time.time() - self._chain_stage_started
+        logger.info(f"⏱️ Underlying price ready in {self._chain_stage_times['underlying']:.2f}s")
         
         # CRITICAL: Disable drift checking during initial sequential load
         # This prevents auto-recentering from interrupting the load process
@@ -7042,39 +10380,100 @@ class MainWindow(QMainWindow):
         self._cached_atm_strike = atm_strike
         logger.info(f"🔒 Cached ATM strike: {atm_strike:.0f} (will be used for all 3 chains)")
         
-        # Step 2: Load main chain
         logger.info(f"═══ SEQUENTIAL CHAIN LOADING START ═══")
-        logger.info(f"Step 1/3: Loading MAIN chain at ATM strike {atm_strike:.0f}")
         self.log_message(f"Loading option chains at strike {atm_strike:.0f}...", "INFO")
+        self._start_chain_stage('main')
+    
+    def _start_chain_stage(self, chain_type: str):
+        """Build one chain of the pipeline and arm its readiness timeout"""
+        atm_strike = self._cached_atm_strike
+        step = CHAIN_PIPELINE_STAGES.index(chain_type) + 1
+        self._chain_pipeline_stage = chain_type
+        self._chain_stage_started = time.time()
+        logger.info(f"Step {step}/3: Loading {chain_type} chain at ATM strike {atm_strike:.0f}")
         
-        self.build_single_chain('main', atm_strike, self.strikes_above, self.strikes_below)
+        if chain_type == 'main':
+            self.build_single_chain('main', atm_strike, self.strikes_above, self.strikes_below)
+        else:
+            self.build_single_chain(chain_type, atm_strike, self.ts_strikes_above, self.ts_strikes_below)
+        
+        self._chain_stage_timer.start(CHAIN_STAGE_TIMEOUT_MS)
+        # Lines reused from other chains/positions may already have complete data
+        self.check_chain_pipeline()
+    
+    def chain_readiness(self, chain_type: str) -> Tuple[int, int]:
+        """(contracts with bid/ask + greeks, contracts subscribed) for a chain"""
+        contract_keys = [self.subscriptions.contract_for(req_id) for req_id in self.subscriptions.chain_req_ids(chain_type)]
+        contract_keys = [contract_key for contract_key in contract_keys if contract_key]
+        if not contract_keys:
+            return 0, 0
+        bids = self.market_data.gather(contract_keys, 'bid')
+        asks = self.market_data.gather(contract_keys, 'ask')
+        deltas = self.market_data.gather(contract_keys, 'delta')
+        ready = ((bids > 0) | (asks > 0)) & (deltas != 0)
+        return int(ready.sum()), len(contract_keys)
+    
+    def check_chain_pipeline(self, timed_out: bool = False):
+        """Advance the pipeline when the current chain stage is ready (called per tick batch)"""
+        stage = self._chain_pipeline_stage
+        if stage not in CHAIN_PIPELINE_STAGES:
+            return
         
-        # Step 3: Schedule TS chains after a delay
-        QTimer.singleShot(3000, lambda: self._load_ts_0dte_chain(atm_strike))
-
-    def _load_ts_0dte_chain(self, atm_strike: float):
-        """Step 2 of sequential loading: Load TS 0DTE chain"""
-        logger.info(f"Step 2/3: Loading TS 0DTE chain at ATM strike {atm_strike:.0f}")
-        self.build_single_chain('ts_0dte', atm_strike, self.ts_strikes_above, self.ts_strikes_below)
+        ready, total = self.chain_readiness(stage)
+        if not timed_out and total and ready < total * CHAIN_READY_FRACTION:
+            return
         
-        # Schedule TS 1DTE chain
-        QTimer.singleShot(3000, lambda: self._load_ts_1dte_chain(atm_strike))
-    
-    def _load_ts_1dte_chain(self, atm_strike: float):
-        """Step 3 of sequential loading: Load TS 1DTE chain"""
-        logger.info(f"Step 3/3: Loading TS 1DTE chain at ATM strike {atm_strike:.0f}")
-        self.build_single_chain('ts_1dte', atm_strike, self.ts_strikes_above, self.ts_strikes_below)
+        self._chain_stage_timer.stop()
+        elapsed = time.time() - self._chain_stage_started
+        self._chain_stage_times[stage] = elapsed
+        if not total:
+            logger.info(f"⏱️ {stage} chain skipped (no subscriptions)")
+        elif timed_out:
+            logger.warning(f"⏱️ {stage} chain not ready after {elapsed:.2f}s ({ready}/{total} contracts with quotes + greeks) - continuing")
+        else:
+            logger.info(f"⏱️ {stage} chain ready in {elapsed:.2f}s ({ready}/{total} contracts with quotes + greeks)")
         
-        # Re-enable drift checking after all chains loaded
-        # Give it a bit more time for data to settle before allowing recentering
-        QTimer.singleShot(5000, self._complete_sequential_load)
+        next_index = CHAIN_PIPELINE_STAGES.index(stage) + 1
+        if next_index < len(CHAIN_PIPELINE_STAGES):
+            self._start_chain_stage(CHAIN_PIPELINE_STAGES[next_index])
+        else:
+            self._complete_sequential_load()
+    
+    def _on_chain_stage_timeout(self):
+        """Readiness timeout for the current pipeline stage"""
+        if self._chain_pipeline_stage == 'underlying':
+            self._chain_pipeline_stage = None
+            self.log_message("⚠️ Timeout waiting for underlying price", "ERROR")
+            logger.error(f"Chain loading aborted - no underlying price after {UNDERLYING_WAIT_TIMEOUT_MS // 1000} seconds")
+            return
+        self.check_chain_pipeline(timed_out=True)
     
     def _complete_sequential_load(self):
         """Complete the sequential loading process and re-enable drift checking"""
+        self._chain_pipeline_stage = None
         self._chains_loading = False
+        total = time.time() - self._chain_pipeline_started
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self._chain_stage_times.items())
+        logger.info(f"⏱️ Time to ready: {stages} | total {total:.2f}s")
+        self.log_message(f"Option chains ready in {total:.1f}s", "SUCCESS")
         logger.info(f"✅ Sequential chain loading complete - drift checking re-enabled")
         logger.info(f"═══ SEQUENTIAL CHAIN LOADING END ═══")
 
+    @staticmethod
+    def _strike_index_key(strike: float) -> float:
+        """Normalize a strike for row-index lookups (absorbs float rounding noise)"""
+        return round(float(strike), 2)
+    
+    def rebuild_chain_row_index(self, chain_type: str, expiry: str, strikes: List[float]):
+        """Rebuild the (expiry, strike) -> row index for a chain table (row N = strikes[N])"""
+        self.chain_row_index[chain_type] = {
+            (expiry, self._strike_index_key(strike)): row for row, strike in enumerate(strikes)
+        }
+    
+    def get_chain_row(self, chain_type: str, expiry: str, strike: float) -> Optional[int]:
+        """O(1) lookup of the table row showing a strike, or None if not in the chain"""
+        return self.chain_row_index[chain_type].get((expiry, self._strike_index_key(strike)))
+    
     def build_single_chain(self, chain_type: str, atm_strike: float, 
                            strikes_above: int, strikes_below: int):
         """
@@ -7093,9 +10492,6 @@ class MainWindow(QMainWindow):
             logger.warning(f"Cannot build {chain_type} chain - not connected")
             return
         
-        # Cancel existing subscriptions for this chain
-        self.cancel_chain_subscriptions(chain_type)
-        
         # Determine expiry and instrument details based on chain type
         if chain_type == 'main':
             expiry = self.current_expiry
@@ -7163,12 +10559,22 @@ class MainWindow(QMainWindow):
             strikes.append(current_strike)
             current_strike += strike_increment
         
+        # Recenter of a live chain (same expiry, overlapping strikes): only diff the strikes
+        if self.can_recenter_incrementally(chain_type, table, expiry, strikes):
+            self.recenter_chain_incremental(chain_type, table, strike_col, symbol, expiry, strikes, center_strike)
+            self._finish_chain_build(chain_type)
+            return
+        
         logger.info(f"Building {chain_type} chain: {len(strikes)} strikes from {min(strikes):.0f} to {max(strikes):.0f}")
         logger.info(f"  Expiry: {expiry}, Symbol: {symbol}, TradingClass: {trading_class}, Center: {center_strike:.0f}")
         
+        # Cancel existing subscriptions for this chain
+        self.cancel_chain_subscriptions(chain_type)
+        
         # Clear and setup table
         table.setRowCount(0)
         table.setRowCount(len(strikes))
+        self.rebuild_chain_row_index(chain_type, expiry, strikes)
         
         # Request live market data
         self.ibkr_client.reqMarketDataType(1)
@@ -7176,105 +10582,117 @@ class MainWindow(QMainWindow):
         # Subscribe to each strike
         new_req_ids = []
         skipped_count = 0
+        near_atm_distance = LINE_BUDGET_NEAR_ATM_STRIKES * strike_increment + 1e-9
         
         for row, strike in enumerate(strikes):
+            line_priority = LINE_PRIORITY_NEAR_ATM if abs(strike - center_strike) <= near_atm_distance else LINE_PRIORITY_WING
+            
             # CRITICAL: IB API CONVENTION - Strikes MUST be FLOAT type
             # Contract keys use FLOAT strikes (e.g., "XSP_686.0_C_20251112") to match IBKR's data format
             # Never convert to int - this causes contract key mismatches and data overwriting
             # IBKR sends strikes as floats (684.0, 685.0, etc.), so our keys must match exactly
             
             # Call option - CHECK IF ALREADY SUBSCRIBED
-            call_key = f"{symbol}_{strike}_C_{expiry}"  # Keep strike as FLOAT
+            call_record = self.contract_registry.intern(symbol, strike, 'C', expiry)
+            call_key = call_record.key  # Canonical key (strike kept as FLOAT)
             
-            if call_key in self._subscribed_contracts:
-                # Already subscribed - reuse existing req_id
-                existing_req_id = self._subscribed_contracts[call_key]
+            existing_req_id = self.subscriptions.req_id_for(call_key)
+            if existing_req_id is not None:
+                # Already subscribed (other chain or position) - reuse existing req_id
                 new_req_ids.append(existing_req_id)
                 skipped_count += 1
                 
                 # CRITICAL: Add this chain to the reference count for shared subscription
-                if existing_req_id not in self._subscription_refcount:
-                    self._subscription_refcount[existing_req_id] = set()
-                self._subscription_refcount[existing_req_id].add(chain_type)
+                self.subscriptions.add_chain_ref(existing_req_id, chain_type)
+                self.line_budget.raise_priority(existing_req_id, line_priority)
                 
-                logger.debug(f"Reusing {call_key} - reqId={existing_req_id} (used by: {', '.join(self._subscription_refcount[existing_req_id])})")
+                logger.debug(f"Reusing {call_key} - reqId={existing_req_id} (used by: {', '.join(self.subscriptions.chain_refs(existing_req_id))})")
             else:
-                # New subscription needed
-                call_contract = self.create_instrument_option_contract(
-                    strike=strike,
-                    right='C',
-                    expiry=expiry
-                )
+                # New subscription needed - IB Contract is built once per interned contract
+                if call_record.contract is None:
+                    call_record.contract = self.create_instrument_option_contract(
+                        strike=strike,
+                        right='C',
+                        expiry=expiry
+                    )
+                call_contract = call_record.contract
                 
                 call_req_id = self.get_next_request_id(chain_type)
                 
-                self.app_state['market_data_map'][call_req_id] = call_key
-                self._subscribed_contracts[call_key] = call_req_id
+                # CRITICAL: Register line with this chain as its first reference
+                self.subscriptions.add(call_req_id, call_key, chain_type)
                 
-                # CRITICAL: Initialize reference count for new subscription
-                self._subscription_refcount[call_req_id] = {chain_type}
-                
-                self.ibkr_client.reqMktData(call_req_id, call_contract, "", False, False, [])
+                self.line_budget.subscribe(call_req_id, call_contract, line_priority)
                 new_req_ids.append(call_req_id)
                 logger.debug(f"New subscription: {call_key} with reqId={call_req_id}")
             
             # Put option - CHECK IF ALREADY SUBSCRIBED
-            put_key = f"{symbol}_{strike}_P_{expiry}"  # Keep strike as FLOAT
+            put_record = self.contract_registry.intern(symbol, strike, 'P', expiry)
+            put_key = put_record.key  # Canonical key (strike kept as FLOAT)
             
-            if put_key in self._subscribed_contracts:
-                # Already subscribed - reuse existing req_id
-                existing_req_id = self._subscribed_contracts[put_key]
+            existing_req_id = self.subscriptions.req_id_for(put_key)
+            if existing_req_id is not None:
+                # Already subscribed (other chain or position) - reuse existing req_id
                 new_req_ids.append(existing_req_id)
                 skipped_count += 1
                 
                 # CRITICAL: Add this chain to the reference count for shared subscription
-                if existing_req_id not in self._subscription_refcount:
-                    self._subscription_refcount[existing_req_id] = set()
-                self._subscription_refcount[existing_req_id].add(chain_type)
+                self.subscriptions.add_chain_ref(existing_req_id, chain_type)
+                self.line_budget.raise_priority(existing_req_id, line_priority)
                 
-                logger.debug(f"Reusing {put_key} - reqId={existing_req_id} (used by: {', '.join(self._subscription_refcount[existing_req_id])})")
+                logger.debug(f"Reusing {put_key} - reqId={existing_req_id} (used by: {', '.join(self.subscriptions.chain_refs(existing_req_id))})")
             else:
-                # New subscription needed
-                put_contract = self.create_instrument_option_contract(
-                    strike=strike,
-                    right='P',
-                    expiry=expiry
-                )
+                # New subscription needed - IB Contract is built once per interned contract
+                if put_record.contract is None:
+                    put_record.contract = self.create_instrument_option_contract(
+                        strike=strike,
+                        right='P',
+                        expiry=expiry
+                    )
+                put_contract = put_record.contract
                 
                 put_req_id = self.get_next_request_id(chain_type)
                 
-                self.app_state['market_data_map'][put_req_id] = put_key
-                self._subscribed_contracts[put_key] = put_req_id
-                
-                # CRITICAL: Initialize reference count for new subscription
-                self._subscription_refcount[put_req_id] = {chain_type}
+                # CRITICAL: Register line with this chain as its first reference
+                self.subscriptions.add(put_req_id, put_key, chain_type)
                 
-                self.ibkr_client.reqMktData(put_req_id, put_contract, "", False, False, [])
+                self.line_budget.subscribe(put_req_id, put_contract, line_priority)
                 new_req_ids.append(put_req_id)
                 logger.debug(f"New subscription: {put_key} with reqId={put_req_id}")
             
             # Set strike in table
-            strike_item = QTableWidgetItem(f"{strike:.0f}")
-            strike_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            strike_item.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-            
-            # Color based on ATM
-            if abs(strike - center_strike) < 0.01:  # This IS the ATM strike
-                strike_item.setBackground(QColor("#FFD700"))  # Gold for ATM
-                strike_item.setForeground(QColor("#000000"))  # Black text for ATM
-            elif strike > center_strike:
-                strike_item.setBackground(QColor("#2a4a6a"))  # Above ATM: lighter blue
-                strike_item.setForeground(QColor("#FFFFFF"))  # White text
-            else:
-                strike_item.setBackground(QColor("#1a2a3a"))  # Below ATM: darker blue
-                strike_item.setForeground(QColor("#FFFFFF"))  # White text
-            
-            table.setItem(row, strike_col, strike_item)
+            table.setItem(row, strike_col, self._create_strike_item(strike, center_strike))
         
         # Store active request IDs
-        self.active_req_ids[chain_type] = new_req_ids
+        self.subscriptions.set_chain_req_ids(chain_type, new_req_ids)
         
         # Reset recentering flags after chain is built
+        self._finish_chain_build(chain_type)
+        
+        new_subscriptions = len(new_req_ids) - skipped_count
+        logger.info(f"✓ {chain_type} chain: {new_subscriptions} new subscriptions, {skipped_count} reused ({len(strikes)} strikes × 2)")
+        logger.info(f"  Total subscriptions tracked: {self.subscriptions.line_count()}")
+
+    def _create_strike_item(self, strike: float, center_strike: float) -> QTableWidgetItem:
+        """Strike column cell colored relative to the chain center (gold = ATM)"""
+        strike_item = QTableWidgetItem(f"{strike:.0f}")
+        strike_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        strike_item.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        
+        # Color based on ATM
+        if abs(strike - center_strike) < 0.01:  # This IS the ATM strike
+            strike_item.setBackground(QColor("#FFD700"))  # Gold for ATM
+            strike_item.setForeground(QColor("#000000"))  # Black text for ATM
+        elif strike > center_strike:
+            strike_item.setBackground(QColor("#2a4a6a"))  # Above ATM: lighter blue
+            strike_item.setForeground(QColor("#FFFFFF"))  # White text
+        else:
+            strike_item.setBackground(QColor("#1a2a3a"))  # Below ATM: darker blue
+            strike_item.setForeground(QColor("#FFFFFF"))  # White text
+        return strike_item
+    
+    def _finish_chain_build(self, chain_type: str):
+        """Reset recentering flags after a chain build or incremental recenter"""
         if chain_type == 'main':
             self.is_recentering_chain = False
         elif chain_type == 'ts_0dte':
@@ -7283,11 +10701,152 @@ class MainWindow(QMainWindow):
         elif chain_type == 'ts_1dte':
             self.ts_1dte_is_recentering = False
             self.ts_1dte_delta_calibration_done = False  # Allow initial calibration check
+    
+    def _release_chain_line(self, req_id: int, chain_type: str) -> str:
+        """
+        Drop chain_type's reference to a market data line and cancel it if nothing else needs it.
         
-        new_subscriptions = len(new_req_ids) - skipped_count
-        logger.info(f"✓ {chain_type} chain: {new_subscriptions} new subscriptions, {skipped_count} reused ({len(strikes)} strikes × 2)")
-        logger.info(f"  Total subscriptions tracked: {len(self._subscribed_contracts)}")
-
+        Returns:
+            'canceled', 'shared' (another chain still uses it) or 'orders' (kept for orders/position)
+        """
+        # CRITICAL: Check if other chains are still using this subscription
+        remaining_chains = self.subscriptions.release_chain(req_id, chain_type)
+        if remaining_chains is None:
+            # No ref count entry - shouldn't happen but cancel anyway
+            logger.warning(f"reqId={req_id} has no ref count entry - canceling anyway")
+            self.line_budget.cancel(req_id)
+            self.subscriptions.remove(req_id)
+            return 'canceled'
+        
+        # Get contract key for this req_id
+        contract_key = self.subscriptions.contract_for(req_id)
+        
+        # Check if there are active orders or an open position for this contract (O(1) lookups)
+        if contract_key and (self.subscriptions.has_open_orders(contract_key) or contract_key in self.positions):
+            order_ids = sorted(self.subscriptions.open_orders_for(contract_key))
+            logger.info(f"⚠️ Keeping subscription for {contract_key} (reqId={req_id}) - active order(s) {order_ids} / position")
+            return 'orders'
+        
+        if remaining_chains:
+            # Still used by other chains
+            logger.debug(f"Keeping reqId={req_id} - still used by: {', '.join(remaining_chains)}")
+            return 'shared'
+        
+        # No chains and no active orders - cancel and remove from registry
+        self.line_budget.cancel(req_id)
+        self.subscriptions.remove(req_id)
+        logger.debug(f"Removed {contract_key} (reqId={req_id}) - no longer used")
+        return 'canceled'
+    
+    def can_recenter_incrementally(self, chain_type: str, table: QTableWidget, expiry: str,
+                                   strikes: List[float]) -> bool:
+        """True if the displayed chain has the same expiry and overlaps the new strike range"""
+        row_index = self.chain_row_index.get(chain_type)
+        if not row_index or table.rowCount() != len(row_index):
+            return False
+        if any(row_expiry != expiry for row_expiry, _ in row_index):
+            return False
+        if len(self.subscriptions.chain_req_ids(chain_type)) != 2 * len(row_index):
+            return False  # Chain was partially cancelled - rebuild from scratch
+        return any((expiry, self._strike_index_key(strike)) in row_index for strike in strikes)
+    
+    def recenter_chain_incremental(self, chain_type: str, table: QTableWidget, strike_col: int,
+                                   symbol: str, expiry: str, strikes: List[float], center_strike: float):
+        """
+        Recenter a live chain by diffing old vs new strikes.
+        
+        Only strikes that fell off are cancelled and only new strikes are subscribed.
+        Surviving rows are shifted in place (removeRow/insertRow), so their cells keep
+        showing market data while the chain moves.
+        """
+        row_index = self.chain_row_index[chain_type]
+        old_strikes = sorted(strike for _, strike in row_index)
+        new_keys = {self._strike_index_key(strike) for strike in strikes}
+        removed = [strike for strike in old_strikes if strike not in new_keys]
+        added = [strike for strike in strikes if (expiry, self._strike_index_key(strike)) not in row_index]
+        
+        logger.info(f"♻️ Recentering {chain_type} chain incrementally on {center_strike:.0f}: "
+                    f"-{len(removed)} / +{len(added)} strikes ({len(strikes) - len(added)} kept)")
+        
+        cancel_msgs = 0
+        kept_shared = 0
+        kept_orders = 0
+        
+        # 1. Release lines for strikes that fell off the chain
+        for strike in removed:
+            for right in ('C', 'P'):
+                record = self.contract_registry.intern(symbol, strike, right, expiry)
+                req_id = self.subscriptions.req_id_for(record.key)
+                if req_id is None:
+                    continue
+                result = self._release_chain_line(req_id, chain_type)
+                if result == 'canceled':
+                    cancel_msgs += 1
+                elif result == 'shared':
+                    kept_shared += 1
+                else:
+                    kept_orders += 1
+        
+        # 2. Shift rows in place: drop rows that fell off (bottom-up), insert new rows at sorted positions
+        table.setUpdatesEnabled(False)
+        try:
+            for strike in reversed(removed):
+                table.removeRow(row_index[(expiry, strike)])
+            new_key_set = {self._strike_index_key(strike) for strike in added}
+            for row, strike in enumerate(strikes):
+                if self._strike_index_key(strike) in new_key_set:
+                    table.insertRow(row)
+            for row, strike in enumerate(strikes):
+                table.setItem(row, strike_col, self._create_strike_item(strike, center_strike))
+        finally:
+            table.setUpdatesEnabled(True)
+        self.rebuild_chain_row_index(chain_type, expiry, strikes)
+        
+        # 3. Subscribe new strikes (reusing lines other chains/positions already hold)
+        subscribe_msgs = 0
+        reused = 0
+        strike_increment = self.instrument['strike_increment']
+        near_atm_distance = LINE_BUDGET_NEAR_ATM_STRIKES * strike_increment + 1e-9
+        new_req_ids = []
+        for strike in strikes:
+            line_priority = LINE_PRIORITY_NEAR_ATM if abs(strike - center_strike) <= near_atm_distance else LINE_PRIORITY_WING
+            is_new_strike = self._strike_index_key(strike) in new_key_set
+            for right in ('C', 'P'):
+                record = self.contract_registry.intern(symbol, strike, right, expiry)
+                req_id = self.subscriptions.req_id_for(record.key)
+                if req_id is not None:
+                    if is_new_strike:
+                        # Line held by another chain or a position - share it and paint current values
+                        self.subscriptions.add_chain_ref(req_id, chain_type)
+                        self._refresh_chain_cells(record.key)
+                        reused += 1
+                    if (self.subscriptions.chain_refs(req_id) <= {chain_type}
+                            and not self.subscriptions.has_open_orders(record.key)
+                            and record.key not in self.positions):
+                        # This chain is the only holder - its distance from the money decides
+                        self.line_budget.set_priority(req_id, line_priority)
+                    else:
+                        # Shared with the other chain, a working order or a position - never demote their claim
+                        self.line_budget.raise_priority(req_id, line_priority)
+                else:
+                    if record.contract is None:
+                        record.contract = self.create_instrument_option_contract(
+                            strike=strike,
+                            right=right,
+                            expiry=expiry
+                        )
+                    req_id = self.get_next_request_id(chain_type)
+                    self.subscriptions.add(req_id, record.key, chain_type)
+                    self.line_budget.subscribe(req_id, record.contract, line_priority)
+                    subscribe_msgs += 1
+                new_req_ids.append(req_id)
+        self.subscriptions.set_chain_req_ids(chain_type, new_req_ids)
+        
+        logger.info(f"✓ {chain_type} recenter: {cancel_msgs} cancel msgs, {subscribe_msgs} subscribe msgs "
+                    f"(kept shared: {kept_shared}, kept for orders: {kept_orders}, reused: {reused}, "
+                    f"full rebuild would send {len(strikes) * 4})")
+        logger.info(f"  Total subscriptions tracked: {self.subscriptions.line_count()}")
+    
     def monitor_chain_drift(self):
         """
         Monitor for drift between current ATM and chain center.
@@ -7378,35 +10937,24 @@ class MainWindow(QMainWindow):
         atm_call_strike = 0
         atm_put_strike = 0
         
-        # Search through all option market data for deltas
-        for contract_key, data in self.market_data.items():
-            if '_C_' not in contract_key and '_P_' not in contract_key:
-                continue
-            
-            delta = data.get('delta', None)
-            if delta is None or delta == 0:
+        # Bisect search per (expiry, right) chain |delta| index:
+        # calls need 0 < delta < 1, puts -1 < delta < 0, both target |delta| = 0.5
+        for chain in self.market_data.chains():
+            if chain.right not in ('C', 'P'):
                 continue
-            
-            # Parse strike from contract_key using helper function
-            symbol, strike, right_parsed, expiry = self.parse_contract_key(contract_key)
-            if strike is None:
+            best = chain.closest_delta_slot(0.5)
+            if best is None:
                 continue
+            slot, diff = best
+            strike = float(chain.rows['strike'][slot])
             
-            if '_C_' in contract_key:
-                # Call delta should be between 0 and 1, target 0.5
-                if 0 < delta < 1:
-                    diff = abs(delta - 0.5)
-                    if diff < min_call_diff:
-                        min_call_diff = diff
-                        atm_call_strike = strike
-            
-            elif '_P_' in contract_key:
-                # Put delta should be between -1 and 0, target -0.5
-                if -1 < delta < 0:
-                    diff = abs(abs(delta) - 0.5)
-                    if diff < min_put_diff:
-                        min_put_diff = diff
-                        atm_put_strike = strike
+            if chain.right == 'C':
+                if diff < min_call_diff:
+                    min_call_diff = diff
+                    atm_call_strike = strike
+            elif diff < min_put_diff:
+                min_put_diff = diff
+                atm_put_strike = strike
         
         # Return best delta-based ATM, or fallback to price-based ATM
         if atm_call_strike > 0:
@@ -7432,38 +10980,17 @@ class MainWindow(QMainWindow):
         min_diff = float('inf')
         best_strike = 0
         
-        # Search through all option market data for the specified expiry and type
-        for contract_key, data in self.market_data.items():
-            # Filter by expiry and option type
-            if expiry not in contract_key:
-                continue
-            if f'_{right}_' not in contract_key:
-                continue
-            
-            delta = data.get('delta', None)
-            if delta is None or delta == 0:
-                continue
-            
-            # Parse strike from contract_key
-            symbol, strike, right_parsed, expiry_parsed = self.parse_contract_key(contract_key)
-            if strike is None or strike <= 0:
-                continue
-            
-            # For calls: delta should be positive (0 to 1)
-            # For puts: delta should be negative (-1 to 0), use absolute value
-            if right == 'C':
-                if 0 < delta < 1:
-                    diff = abs(delta - target_delta)
-                    if diff < min_diff:
-                        min_diff = diff
-                        best_strike = strike
-            else:  # right == 'P'
-                if -1 < delta < 0:
-                    # Use absolute value of put delta
-                    diff = abs(abs(delta) - target_delta)
-                    if diff < min_diff:
-                        min_diff = diff
-                        best_strike = strike
+        # Bisect search over the (expiry, right) chain's |delta| index
+        # For calls: delta should be positive (0 to 1)
+        # For puts: delta should be negative (-1 to 0), use absolute value
+        chain = self.market_data.chain(expiry, right)
+        best = chain.closest_delta_slot(target_delta) if chain is not None else None
+        if best is not None:
+            slot, diff = best
+            strike = float(chain.rows['strike'][slot])
+            if strike > 0:
+                min_diff = diff
+                best_strike = strike
         
         if best_strike > 0:
             logger.info(f"✅ Found strike {best_strike} with delta closest to {target_delta:.2f} (diff={min_diff:.4f}) for {right} {expiry}")
@@ -7614,15 +11141,17 @@ class MainWindow(QMainWindow):
         # Update ES-to-cash offset if conditions are met
         self.update_es_to_cash_offset(None, price)
     
-    @pyqtSlot(str, str, float)
-    def on_market_data_tick(self, contract_key: str, tick_type: str, value: float):
-        """Handle market data tick updates"""
+    def _apply_market_data_tick(self, contract_key: str, tick_type: str, value: float) -> bool:
+        """Store a price/size tick in market_data. Returns False if the value was rejected."""
         # CRITICAL: Filter out invalid IBKR placeholder values (-1)
         # IBKR API returns -1 when data is not available, pending, or during brief disconnections
         # Displaying -1 causes flickering and confuses users
         if value == -1:
             logger.debug(f"Ignoring invalid tick value -1 for {contract_key} {tick_type}")
-            return
+            return False
+        
+        if self.market_data.set_value(contract_key, tick_type, value):
+            return True
         
         if contract_key not in self.market_data:
             self.market_data[contract_key] = {
@@ -7631,24 +11160,54 @@ class MainWindow(QMainWindow):
             }
         
         self.market_data[contract_key][tick_type] = value
-        
-        # Update option chain display immediately
-        self.update_option_chain_cell(contract_key)
-        
-        # Also update TS chain tables if this contract belongs to a TS expiry
-        self.update_ts_chain_cell(contract_key)
+        return True
     
-    @pyqtSlot(str, dict)
-    def on_greeks_updated(self, contract_key: str, greeks: dict):
-        """Handle greeks updates"""
+    def _apply_greeks(self, contract_key: str, greeks: dict):
+        """Store a greeks update in market_data"""
         if contract_key not in self.market_data:
             self.market_data[contract_key] = {
                 'bid': 0, 'ask': 0, 'last': 0, 'prev_close': 0, 'volume': 0,
                 'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'iv': 0
             }
         
-        self.market_data[contract_key].update(greeks)
+        # IBKR "not computed" placeholders must not wipe locally computed greeks (real zeros are kept)
+        valid = {field: value for field, value in greeks.items() if ib_greek_computed(field, value)}
+        if not valid:
+            return
+        entry = self.market_data[contract_key]
+        entry.update(valid)
+        if 'delta' in valid and contract_key in self.market_data.locations():
+            entry['greeks_local'] = False  # IBKR greeks arrived - local engine stops touching this contract
+    
+    def update_local_greeks(self) -> List[str]:
+        """
+        Fill IV/greeks locally for displayed chain contracts that have quotes but no IBKR greeks yet.
         
+        Returns:
+            Contract keys whose greeks were updated
+        """
+        underlying = self.app_state.get('underlying_price', 0) or self.get_adjusted_es_price()
+        if underlying <= 0:
+            return []
+        expiries = {getattr(self, 'current_expiry', None), getattr(self, 'ts_0dte_expiry', None),
+                    getattr(self, 'ts_1dte_expiry', None)}
+        updated = []
+        for expiry in expiries:
+            if not expiry:
+                continue
+            t = None
+            for right in ('C', 'P'):
+                chain = self.market_data.chain(expiry, right)
+                if chain is None:
+                    continue
+                if t is None:
+                    t = time_to_expiry_years(expiry)
+                for slot in compute_chain_greeks(chain, underlying, t):
+                    updated.append(chain.keys[slot])
+        return updated
+    
+    def _refresh_chain_cells(self, contract_key: str):
+        """Repaint the main and TS chain rows for a contract"""
         # Update option chain display
         self.update_option_chain_cell(contract_key)
         
@@ -7658,10 +11217,211 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.debug(f"Error updating TS chain cell for {contract_key}: {e}")
             # Don't let TS errors block the main chain ATM calculation
+    
+    @pyqtSlot(str, str, float)
+    def on_market_data_tick(self, contract_key: str, tick_type: str, value: float):
+        """Handle market data tick updates"""
+        if not self._apply_market_data_tick(contract_key, tick_type, value):
+            return
+        
+        # Update option chain display immediately
+        self.update_option_chain_cell(contract_key)
+        
+        # Also update TS chain tables if this contract belongs to a TS expiry
+        self.update_ts_chain_cell(contract_key)
+        
+        if tick_type in ('bid', 'ask'):
+            self.chase_contracts((contract_key,))
+    
+    @pyqtSlot(str, dict)
+    def on_greeks_updated(self, contract_key: str, greeks: dict):
+        """Handle greeks updates"""
+        self._apply_greeks(contract_key, greeks)
+        self._refresh_chain_cells(contract_key)
+        self._update_atm_backgrounds_throttled()
+    
+    def flush_tick_conflator(self):
+        """Drain the tick conflator once per frame and deliver a single batch to the GUI"""
+        batch = self.tick_conflator.drain()
+        if batch is None:
+            return
+        ticks, greeks = batch
+        self.signals.market_data_batch.emit(ticks, greeks)
+    
+    @pyqtSlot(dict, dict)
+    def on_market_data_batch(self, ticks: dict, greeks: dict):
+        """Apply a conflated batch of ticks/greeks (keyed by contract id) - each row is repainted once"""
+        get_record = self.contract_registry.get
+        dirty_ids = set()
+        
+        for (contract_id, tick_type), value in ticks.items():
+            if self._apply_market_data_tick(get_record(contract_id).key, tick_type, value):
+                dirty_ids.add(contract_id)
+        
+        for contract_id, contract_greeks in greeks.items():
+            self._apply_greeks(get_record(contract_id).key, contract_greeks)
+            dirty_ids.add(contract_id)
+        
+        dirty_keys = {get_record(contract_id).key for contract_id in dirty_ids}
+        
+        # Local IV/greeks for contracts still waiting on IBKR's tickOptionComputation
+        local_greeks_keys = self.update_local_greeks() if ticks else []
+        dirty_keys.update(local_greeks_keys)
         
-        # Update strike backgrounds based on delta-identified ATM
+        for contract_key in dirty_keys:
+            self._refresh_chain_cells(contract_key)
+        
+        # Reprice working orders whose quotes just moved
+        if ticks:
+            self.chase_contracts(dirty_keys)
+        
+        if greeks or local_greeks_keys:
+            self._update_atm_backgrounds_throttled()
+        
+        # Keep hot-standby entries current when the active TS expiry ticked
+        standby_expiry = self._entry_standby_expiry
+        if standby_expiry and self.ts_auto_trading_enabled and any(
+                get_record(contract_id).expiry == standby_expiry for contract_id in dirty_ids):
+            self.refresh_entry_candidates(standby_expiry)
+        
+        if self._chain_pipeline_stage in CHAIN_PIPELINE_STAGES:
+            self.check_chain_pipeline()
+    
+    def update_tick_conflation_stats(self):
+        """Refresh tick throughput label (received from IBKR vs delivered to GUI)"""
+        if not hasattr(self, 'tick_stats_label'):
+            return
+        stats = self.tick_conflator.get_stats()
+        now = time.time()
+        elapsed = max(now - self._tick_stats_last_time, 1e-6)
+        last = self._tick_stats_last
+        received = (stats['ticks_received'] + stats['greeks_received']
+                    - last['ticks_received'] - last['greeks_received'])
+        delivered = (stats['ticks_delivered'] + stats['greeks_delivered']
+                     - last['ticks_delivered'] - last['greeks_delivered'])
+        self._tick_stats_last = stats
+        self._tick_stats_last_time = now
+        
+        self.tick_stats_label.setText(f"Ticks: {received / elapsed:.0f}/s → {delivered / elapsed:.0f}/s")
+        self.tick_stats_label.setToolTip(
+            f"Option ticks received from IBKR per second → updates delivered to the GUI per second\n"
+            f"Total received: {stats['ticks_received']:,} ticks, {stats['greeks_received']:,} greeks\n"
+            f"Total delivered: {stats['ticks_delivered']:,} ticks, {stats['greeks_delivered']:,} greeks\n"
+            f"Frames: {stats['flushes']:,} @ {self.tick_conflation_interval_ms} ms | "
+            f"Conflation ratio: {stats['conflation_ratio']:.1f}x"
+        )
+    
+    def rotate_line_budget(self):
+        """Apply line priority changes and refresh downgraded lines with snapshots"""
+        if self.connection_state != ConnectionState.CONNECTED:
+            return
+        promoted, downgraded = self.line_budget.rebalance()
+        if promoted or downgraded:
+            logger.info(f"Line budget rebalanced: {promoted} promoted to streaming, {downgraded} downgraded to snapshots")
+        self.line_budget.rotate_snapshots()
+    
+    def update_pacer_stats(self):
+        """Refresh outbound message pacing label (rate, queue depth, wait times)"""
+        if not hasattr(self, 'pacer_stats_label'):
+            return
+        stats = self.ibkr_client.get_pacer_stats()
+        now = time.time()
+        elapsed = max(now - self._pacer_stats_last_time, 1e-6)
+        rate = (stats['sent'] - self._pacer_sent_last) / elapsed
+        self._pacer_sent_last = stats['sent']
+        self._pacer_stats_last_time = now
+        
+        if stats['queue_depth']:
+            self.pacer_stats_label.setText(f"API: {rate:.0f} msg/s | Q {stats['queue_depth']} ({stats['oldest_wait_ms']:.0f} ms)")
+            self.pacer_stats_label.setStyleSheet("color: #FFA726; padding: 2px 12px;")
+        else:
+            self.pacer_stats_label.setText(f"API: {rate:.0f} msg/s")
+            self.pacer_stats_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        depth = ", ".join(f"{name} {count}" for name, count in stats['depth'].items())
+        self.pacer_stats_label.setToolTip(
+            f"Messages sent to IBKR per second (limit {IBKR_MSG_RATE_PER_SEC:.0f}/s, burst {IBKR_MSG_BURST})\n"
+            f"Queued now: {stats['queue_depth']} ({depth})\n"
+            f"Total sent: {stats['sent']:,} | Queued: {stats['queued']:,} | Coalesced: {stats['coalesced']:,}\n"
+            f"Queue wait: avg {stats['avg_wait_ms']:.0f} ms, max {stats['wait_max_ms']:.0f} ms | "
+            f"Peak depth: {stats['max_depth']}"
+        )
+    
+    def setup_render_gates(self):
+        """Dirty tracking for chain tables and charts - hidden ones skip per-tick renders and catch up when shown"""
+        self.render_gates = {
+            'main': RenderGate("Option chain", self.option_table, self._catch_up_option_chain),
+        }
+        if hasattr(self, 'ts_0dte_table'):
+            self.render_gates['ts_0dte'] = RenderGate("TS 0DTE chain", self.ts_0dte_table, self._catch_up_ts_chain)
+            self.render_gates['ts_1dte'] = RenderGate("TS 1DTE chain", self.ts_1dte_table, self._catch_up_ts_chain)
+        for name, chart in (('call_chart', self.call_chart_widget), ('put_chart', self.put_chart_widget),
+                            ('confirm_chart', self.confirm_chart_widget), ('trade_chart', self.trade_chart_widget)):
+            self.render_gates[name] = chart.render_gate
+    
+    def _catch_up_option_chain(self, contract_keys: set):
+        """Repaint the main chain cells that ticked while the table was hidden"""
+        for contract_key in contract_keys:
+            self.update_option_chain_cell(contract_key)
+    
+    def _catch_up_ts_chain(self, contract_keys: set):
+        """Repaint the TS chain cells that ticked while the TradeStation tab was hidden"""
+        for contract_key in contract_keys:
+            self.update_ts_chain_cell(contract_key)
+    
+    def update_render_skip_stats(self):
+        """Refresh skipped-render label (per widget breakdown in tooltip)"""
+        if not hasattr(self, 'render_skip_label') or not hasattr(self, 'render_gates'):
+            return
+        stats = {gate.name: gate.get_stats() for gate in self.render_gates.values()}
+        total = sum(entry['skipped'] for entry in stats.values())
+        self.render_skip_label.setText(f"Skipped: {total:,}")
+        self.render_skip_label.setToolTip(
+            "Renders skipped while hidden (caught up once when shown)\n" + "\n".join(
+                f"  {name}: {entry['skipped']:,} skipped, {entry['catch_ups']} catch-ups"
+                + (f" - dirty ({entry['dirty_keys']} cells)" if entry['dirty_keys']
+                   else " - dirty" if entry['dirty'] else "")
+                for name, entry in stats.items()
+            )
+        )
+    
+    def update_subscription_stats(self):
+        """Refresh market data line usage label (breakdown in tooltip)"""
+        if not hasattr(self, 'subscription_lines_label'):
+            return
+        stats = self.subscriptions.get_stats()
+        budget = self.line_budget.get_stats()
+        per_chain = stats['per_chain']
+        self.subscription_lines_label.setText(
+            f"Lines: {budget['used_lines']}/{budget['budget']}"
+            + (f" (+{budget['snapshot']} snap)" if budget['snapshot'] else "")
+        )
+        if budget['snapshot'] or budget['observed_limit'] is not None:
+            self.subscription_lines_label.setStyleSheet("color: #FFA726; padding: 2px 12px;")
+        else:
+            self.subscription_lines_label.setStyleSheet("color: #aaaaaa; padding: 2px 12px;")
+        priority_lines = "\n".join(
+            f"  {name}: {streaming} streaming, {snapshot} snapshot"
+            for name, (streaming, snapshot) in budget['by_priority'].items()
+        )
+        limit_note = (f"\nIBKR rejected lines (error 101) - capped at {budget['observed_limit']} option lines"
+                      if budget['observed_limit'] is not None else "")
+        self.subscription_lines_label.setToolTip(
+            f"Market data lines in use: {budget['used_lines']} of {budget['budget']} "
+            f"({MARKET_DATA_CORE_LINES} core, {budget['streaming']} options, {budget['inflight']} snapshots in flight)\n"
+            f"{priority_lines}\n"
+            f"Chains: {stats['chain_lines']} (main {per_chain.get('main', 0)}, "
+            f"0DTE {per_chain.get('ts_0dte', 0)}, 1DTE {per_chain.get('ts_1dte', 0)}, "
+            f"shared {stats['shared_lines']})\n"
+            f"Positions/orders only: {stats['non_chain_lines']} | "
+            f"Contracts with working orders: {stats['contracts_with_orders']}\n"
+            f"Downgrades: {budget['downgrades']} | Promotions: {budget['promotions']} | "
+            f"Snapshots sent: {budget['snapshots_sent']}"
+            f"{limit_note}"
+        )
+    
+    def _update_atm_backgrounds_throttled(self):
+        """Update strike backgrounds based on delta-identified ATM (at most once per second)"""
         # Throttle this to run at most once per second to avoid excessive recentering checks
-        import time
         current_time = time.time()
         if not hasattr(self, '_last_atm_update_time'):
             self._last_atm_update_time = 0
@@ -7751,10 +11511,8 @@ class MainWindow(QMainWindow):
                 logger.warning(f"Cannot subscribe to market data for {contract_key} - no contract available")
                 return
         
-        # Check if already subscribed
-        is_subscribed = any(contract_key == v for v in self.app_state.get('market_data_map', {}).values())
-        
-        if is_subscribed:
+        # Check if already subscribed (O(1) reverse lookup)
+        if self.subscriptions.is_subscribed(contract_key):
             logger.debug(f"Position {contract_key} already has active market data subscription")
             return
         
@@ -7774,7 +11532,7 @@ class MainWindow(QMainWindow):
             contract.currency = "USD"
         
         # Map request ID to contract key
-        self.app_state['market_data_map'][req_id] = contract_key
+        self.subscriptions.add(req_id, contract_key)
         
         # Create market_data entry if it doesn't exist
         if contract_key not in self.market_data:
@@ -7787,15 +11545,16 @@ class MainWindow(QMainWindow):
             }
             logger.debug(f"Created market_data entry for {contract_key}")
         
-        # Subscribe to market data
-        self.ibkr_client.reqMktData(req_id, contract, "", False, False, [])
+        # Subscribe to market data (positions have top priority in the line budget)
+        self.line_budget.subscribe(req_id, contract, LINE_PRIORITY_POSITION)
         logger.info(f"Requested market data (reqId={req_id}) for {contract_key}")
     
     @pyqtSlot(int, dict)
     def on_order_status(self, order_id: int, status_data: dict):
         """Handle order status updates"""
         # Update pending order status
-        if order_id in self.pending_orders:
+        working = self.pending_orders.get(order_id)
+        if working is not None:
             self.pending_orders[order_id]['status'] = status_data.get('status', 'Unknown')
             self.pending_orders[order_id]['filled'] = status_data.get('filled', 0)
             
@@ -7824,93 +11583,12 @@ class MainWindow(QMainWindow):
                     
                     logger.info(f"💵 FILL DATA: order_id={order_id}, avg_fill={avg_fill_price:.4f}, mid_price={mid_price:.4f}, action={action}")
                     
-                    # CRITICAL: Store is_automated flag in persistent mapping BEFORE removing order
-                    # This allows position() callback (which fires AFTER this) to read the flag
-                    if action == 'BUY':
-                        if not hasattr(self, '_position_source_map'):
-                            self._position_source_map = {}
-                        self._position_source_map[contract_key] = is_automated
-                        logger.info(f"🔵 STORED is_automated={is_automated} for {contract_key} (Order #{order_id})")
-                    
-                    # Log trade to CSV with mid price for slippage calculation
-                    self.log_trade_to_csv(order_id, contract_key, action, qty, avg_fill_price, is_automated, mid_price)
-                    
-                    # Track entry orders for P&L calculation
-                    if action == 'BUY':
-                        # This is an entry order - add to list of entries for this contract
-                        ct_tz = pytz.timezone('America/Chicago')
-                        now_ct = datetime.now(ct_tz)
-                        entry_data = {
-                            'datetime': now_ct.strftime('%Y-%m-%d %H:%M:%S'),
-                            'order_id': order_id,
-                            'action': action,
-                            'quantity': qty,
-                            'avg_price': avg_fill_price,
-                            'is_automated': is_automated
-                        }
-                        if contract_key not in self.trade_entries:
-                            self.trade_entries[contract_key] = []
-                        self.trade_entries[contract_key].append(entry_data)
-                        logger.info(f"🟢 P&L TRACKING - BUY: Added entry for {contract_key}, Order #{order_id}, Qty={qty}, Price={avg_fill_price}, Source={'Strategy' if is_automated else 'Manual'}")
-                        logger.info(f"   Total entries for {contract_key}: {len(self.trade_entries[contract_key])}")
-                    elif action == 'SELL':
-                        # Debug logging for SELL
-                        logger.info(f"🔴 P&L TRACKING - SELL: Order #{order_id}, {contract_key}, Qty={qty}, Price={avg_fill_price}")
-                        logger.info(f"   contract_key in trade_entries? {contract_key in self.trade_entries}")
-                        if contract_key in self.trade_entries:
-                            logger.info(f"   Number of BUY entries: {len(self.trade_entries[contract_key])}")
-                            logger.info(f"   Entries: {self.trade_entries[contract_key]}")
-                        else:
-                            logger.warning(f"   ⚠️ No BUY entries found for {contract_key}! Cannot log P&L.")
-                        
-                        if contract_key in self.trade_entries and len(self.trade_entries[contract_key]) > 0:
-                            # This is an exit order - match with entries and log P&L
-                            logger.info(f"   ✅ Proceeding with FIFO matching for {contract_key}")
-                            ct_tz = pytz.timezone('America/Chicago')
-                            now_ct = datetime.now(ct_tz)
-                            
-                            # Process SELL quantity - may need to match multiple BUY entries
-                            remaining_qty = qty
-                            entries_to_remove = []
-                            
-                            for idx, entry_data in enumerate(self.trade_entries[contract_key]):
-                                if remaining_qty <= 0:
-                                    break
-                                
-                                entry_qty = entry_data['quantity']
-                                exit_qty = min(remaining_qty, entry_qty)
-                                
-                                # Create exit data for this portion
-                                exit_data = {
-                                    'datetime': now_ct.strftime('%Y-%m-%d %H:%M:%S'),
-                                    'order_id': order_id,
-                                    'action': action,
-                                    'quantity': exit_qty,
-                                    'avg_price': avg_fill_price,
-                                    'is_automated': is_automated  # Track if exit was automated or manual
-                                }
-                                
-                                # Log P&L for this matched pair
-                                self.log_pnl_to_csv(contract_key, entry_data, exit_data)
-                                logger.info(f"   📊 Logged P&L: Entry Order #{entry_data['order_id']} → Exit Order #{order_id}, Qty={exit_qty}")
-                                
-                                # Track which entries to remove or update
-                                if exit_qty >= entry_qty:
-                                    # Fully closed this entry
-                                    entries_to_remove.append(idx)
-                                    remaining_qty -= entry_qty
-                                else:
-                                    # Partially closed - update the entry quantity
-                                    self.trade_entries[contract_key][idx]['quantity'] -= exit_qty
-                                    remaining_qty = 0
-                            
-                            # Remove fully closed entries (in reverse order to maintain indices)
-                            for idx in reversed(entries_to_remove):
-                                del self.trade_entries[contract_key][idx]
-                            
-                            # Clean up if no entries left
-                            if len(self.trade_entries[contract_key]) == 0:
-                                del self.trade_entries[contract_key]
+                    # Combo: book every leg as its own fill (leg prices from execDetails)
+                    if working.legs:
+                        for leg_key, leg_price, leg_mid in self._combo_leg_fills(working, avg_fill_price):
+                            self._book_fill(order_id, leg_key, action, qty, leg_price, is_automated, leg_mid)
+                    else:
+                        self._book_fill(order_id, contract_key, action, qty, avg_fill_price, is_automated, mid_price)
                 elif status == 'Cancelled':
                     self.ts_signals.ts_activity.emit(f"🚫 ORDER CANCELLED: #{order_id} | {contract_key}")
                 elif status == 'PartiallyFilled':
@@ -7926,30 +11604,138 @@ class MainWindow(QMainWindow):
                 # CRITICAL: Remove from chasing_orders to stop chasing
                 if order_id in self.chasing_orders:
                     logger.info(f"Removing order #{order_id} from chasing_orders (status: {status})")
-                    del self.chasing_orders[order_id]
+                    self._stop_chasing(order_id, status)
                 
                 # CRITICAL: Remove from pending_orders to prevent blocking new automated entries
                 if order_id in self.pending_orders:
                     contract_key = self.pending_orders[order_id].get('contract_key')
                     logger.info(f"Removing order #{order_id} from pending_orders (status: {status})")
                     del self.pending_orders[order_id]
+                    self.subscriptions.remove_order(order_id)
                     
-                    # Clean up market data subscription if no longer needed
+                    # Clean up market data subscription if no longer needed (every leg of a combo)
                     if contract_key:
-                        self.cleanup_orphaned_subscription(contract_key)
+                        for key in combo_leg_keys(contract_key) or (contract_key,):
+                            self.cleanup_orphaned_subscription(key)
+                self._combo_leg_executions.pop(order_id, None)
             
             # Update orders table
             self.update_orders_display()
             self.update_ts_orders_display()
+            
+            if status in ['Filled', 'Cancelled', 'Inactive']:
+                # Signal reversal waiting on this cancel?
+                self._on_reversal_order_done(order_id, status, int(status_data.get('filled', 0) or 0),
+                                             status_data.get('avgFillPrice', 0) or 0)
+                
+                # IB-side exit child done? / Automated entry filled -> attach IB-side exits
+                self._on_native_exit_status(order_id, status, status_data)
+                if (status == 'Filled' and self.ts_use_native_exits and working.is_automated
+                        and working.action == 'BUY' and not working.cancel_requested and not working.legs):
+                    self.attach_native_exits(
+                        working.contract_key, int(status_data.get('filled', 0) or working.quantity),
+                        status_data.get('avgFillPrice', 0), order_id
+                    )
         else:
             self.log_message(f"Received status for unknown order #{order_id}: {status_data.get('status')}", "INFO")
     
+    def _book_fill(self, order_id: int, contract_key: str, action: str, qty: int,
+                   avg_fill_price: float, is_automated: bool, mid_price: float):
+        """Record a filled order (or one leg of a filled combo) in the trade log and FIFO P&L matching"""
+        # CRITICAL: Store is_automated flag in persistent mapping BEFORE removing order
+        # This allows position() callback (which fires AFTER this) to read the flag
+        if action == 'BUY':
+            if not hasattr(self, '_position_source_map'):
+                self._position_source_map = {}
+            self._position_source_map[contract_key] = is_automated
+            logger.info(f"🔵 STORED is_automated={is_automated} for {contract_key} (Order #{order_id})")
+        
+        # Log trade to CSV with mid price for slippage calculation
+        self.log_trade_to_csv(order_id, contract_key, action, qty, avg_fill_price, is_automated, mid_price)
+        
+        # Track entry orders for P&L calculation
+        if action == 'BUY':
+            # This is an entry order - add to list of entries for this contract
+            ct_tz = pytz.timezone('America/Chicago')
+            now_ct = datetime.now(ct_tz)
+            entry_data = {
+                'datetime': now_ct.strftime('%Y-%m-%d %H:%M:%S'),
+                'order_id': order_id,
+                'action': action,
+                'quantity': qty,
+                'avg_price': avg_fill_price,
+                'is_automated': is_automated
+            }
+            if contract_key not in self.trade_entries:
+                self.trade_entries[contract_key] = []
+            self.trade_entries[contract_key].append(entry_data)
+            logger.info(f"🟢 P&L TRACKING - BUY: Added entry for {contract_key}, Order #{order_id}, Qty={qty}, Price={avg_fill_price}, Source={'Strategy' if is_automated else 'Manual'}")
+            logger.info(f"   Total entries for {contract_key}: {len(self.trade_entries[contract_key])}")
+        elif action == 'SELL':
+            # Debug logging for SELL
+            logger.info(f"🔴 P&L TRACKING - SELL: Order #{order_id}, {contract_key}, Qty={qty}, Price={avg_fill_price}")
+            logger.info(f"   contract_key in trade_entries? {contract_key in self.trade_entries}")
+            if contract_key in self.trade_entries:
+                logger.info(f"   Number of BUY entries: {len(self.trade_entries[contract_key])}")
+                logger.info(f"   Entries: {self.trade_entries[contract_key]}")
+            else:
+                logger.warning(f"   ⚠️ No BUY entries found for {contract_key}! Cannot log P&L.")
+            
+            if contract_key in self.trade_entries and len(self.trade_entries[contract_key]) > 0:
+                # This is an exit order - match with entries and log P&L
+                logger.info(f"   ✅ Proceeding with FIFO matching for {contract_key}")
+                ct_tz = pytz.timezone('America/Chicago')
+                now_ct = datetime.now(ct_tz)
+                
+                # Process SELL quantity - may need to match multiple BUY entries
+                remaining_qty = qty
+                entries_to_remove = []
+                
+                for idx, entry_data in enumerate(self.trade_entries[contract_key]):
+                    if remaining_qty <= 0:
+                        break
+                    
+                    entry_qty = entry_data['quantity']
+                    exit_qty = min(remaining_qty, entry_qty)
+                    
+                    # Create exit data for this portion
+                    exit_data = {
+                        'datetime': now_ct.strftime('%Y-%m-%d %H:%M:%S'),
+                        'order_id': order_id,
+                        'action': action,
+                        'quantity': exit_qty,
+                        'avg_price': avg_fill_price,
+                        'is_automated': is_automated  # Track if exit was automated or manual
+                    }
+                    
+                    # Log P&L for this matched pair
+                    self.log_pnl_to_csv(contract_key, entry_data, exit_data)
+                    logger.info(f"   📊 Logged P&L: Entry Order #{entry_data['order_id']} → Exit Order #{order_id}, Qty={exit_qty}")
+                    
+                    # Track which entries to remove or update
+                    if exit_qty >= entry_qty:
+                        # Fully closed this entry
+                        entries_to_remove.append(idx)
+                        remaining_qty -= entry_qty
+                    else:
+                        # Partially closed - update the entry quantity
+                        self.trade_entries[contract_key][idx]['quantity'] -= exit_qty
+                        remaining_qty = 0
+                
+                # Remove fully closed entries (in reverse order to maintain indices)
+                for idx in reversed(entries_to_remove):
+                    del self.trade_entries[contract_key][idx]
+                
+                # Clean up if no entries left
+                if len(self.trade_entries[contract_key]) == 0:
+                    del self.trade_entries[contract_key]
+    
     @pyqtSlot(int)
     def remove_from_chasing_orders(self, order_id: int):
         """Remove order from chasing tracking (called when order is filled/cancelled)"""
         if order_id in self.chasing_orders:
             logger.info(f"Force-removing order #{order_id} from chasing_orders (order filled/cancelled)")
-            del self.chasing_orders[order_id]
+            self._stop_chasing(order_id, "Rejected modify")
             self.update_orders_display()
             self.update_ts_orders_display()
     
@@ -7989,8 +11775,7 @@ class MainWindow(QMainWindow):
         # Remove from market_data dict ONLY if not actively subscribed in a chain
         if contract_key in self.market_data:
             # Check if this contract has an active market data subscription
-            still_subscribed = contract_key in self.app_state.get('market_data_map', {}).values()
-            if still_subscribed:
+            if self.subscriptions.is_subscribed(contract_key):
                 logger.debug(f"NOT removing market_data for {contract_key} - still has active subscription")
             else:
                 del self.market_data[contract_key]
@@ -8005,30 +11790,29 @@ class MainWindow(QMainWindow):
         Cleans up resources by canceling the market data subscription.
         IMPORTANT: Don't unsubscribe if contract is still in the displayed option chain!
         """
-        # Check if this contract still has an active market data subscription (in any chain)
-        still_subscribed = contract_key in self.app_state.get('market_data_map', {}).values()
-        if still_subscribed:
-            logger.debug(f"NOT unsubscribing from market data for {contract_key} - still has active subscription")
+        req_id_to_cancel = self.subscriptions.req_id_for(contract_key)
+        if req_id_to_cancel is None:
+            logger.debug(f"No active market data subscription found for {contract_key}")
             return
         
-        # Find the req_id for this contract_key
-        req_id_to_cancel = None
-        for req_id, mapped_key in list(self.app_state.get('market_data_map', {}).items()):
-            if mapped_key == contract_key:
-                req_id_to_cancel = req_id
-                break
+        # Check if this contract's line is still used by a displayed chain
+        if self.subscriptions.chain_refs(req_id_to_cancel):
+            logger.debug(f"NOT unsubscribing from market data for {contract_key} - still displayed in a chain")
+            return
         
-        if req_id_to_cancel is not None:
-            logger.info(f"Unsubscribing from market data for {contract_key} (reqId={req_id_to_cancel})")
-            try:
-                self.ibkr_client.cancelMktData(req_id_to_cancel)
-                # Remove from map
-                del self.app_state['market_data_map'][req_id_to_cancel]
-                logger.info(f"Successfully unsubscribed market data (reqId={req_id_to_cancel})")
-            except Exception as e:
-                logger.error(f"Error unsubscribing market data for {contract_key}: {e}", exc_info=True)
-        else:
-            logger.debug(f"No active market data subscription found for {contract_key}")
+        # Keep the line while orders are working on this contract
+        if self.subscriptions.has_open_orders(contract_key):
+            logger.debug(f"NOT unsubscribing from market data for {contract_key} - has active orders")
+            return
+        
+        logger.info(f"Unsubscribing from market data for {contract_key} (reqId={req_id_to_cancel})")
+        try:
+            self.line_budget.cancel(req_id_to_cancel)
+            # Remove from registry
+            self.subscriptions.remove(req_id_to_cancel)
+            logger.info(f"Successfully unsubscribed market data (reqId={req_id_to_cancel})")
+        except Exception as e:
+            logger.error(f"Error unsubscribing market data for {contract_key}: {e}", exc_info=True)
     
     def cleanup_orphaned_subscription(self, contract_key: str):
         """
@@ -8040,12 +11824,8 @@ class MainWindow(QMainWindow):
         - No active orders exist for this contract
         - No open position exists for this contract
         """
-        # Check if there are other active orders for this contract
-        has_other_orders = any(
-            order.get('contract_key') == contract_key 
-            for order in self.pending_orders.values()
-        )
-        if has_other_orders:
+        # Check if there are other active orders for this contract (O(1) reverse index)
+        if self.subscriptions.has_open_orders(contract_key):
             logger.debug(f"NOT cleaning up subscription for {contract_key} - has other active orders")
             return
         
@@ -8057,8 +11837,7 @@ class MainWindow(QMainWindow):
         
         # CRITICAL: Check if contract is back in a chain (could have drifted back)
         # This check MUST be done last, after order removal, to get accurate state
-        in_chain = contract_key in self.app_state.get('market_data_map', {}).values()
-        if in_chain:
+        if self.subscriptions.in_chain(contract_key):
             logger.debug(f"NOT cleaning up subscription for {contract_key} - back in displayed chain")
             return
         
@@ -8066,16 +11845,12 @@ class MainWindow(QMainWindow):
         logger.info(f"🧹 Cleaning up orphaned subscription for {contract_key} (order completed, not in chain)")
         
         # Find and cancel the subscription
-        req_id_to_cancel = None
-        for req_id, mapped_key in list(self.app_state.get('market_data_map', {}).items()):
-            if mapped_key == contract_key:
-                req_id_to_cancel = req_id
-                break
+        req_id_to_cancel = self.subscriptions.req_id_for(contract_key)
         
         if req_id_to_cancel is not None:
             try:
-                self.ibkr_client.cancelMktData(req_id_to_cancel)
-                del self.app_state['market_data_map'][req_id_to_cancel]
+                self.line_budget.cancel(req_id_to_cancel)
+                self.subscriptions.remove(req_id_to_cancel)
                 logger.info(f"✅ Successfully cleaned up orphaned subscription (reqId={req_id_to_cancel})")
             except Exception as e:
                 logger.error(f"Error cleaning up subscription for {contract_key}: {e}", exc_info=True)
@@ -8083,6 +11858,12 @@ class MainWindow(QMainWindow):
     @pyqtSlot(str, dict)
     def on_historical_bar(self, contract_key: str, bar_data: dict):
         """Handle historical bar data"""
+        if not self._bar_zone_seen:
+            zone = bar_time_zone(bar_data.get('date'))
+            if zone is not None:
+                self.bar_cache.set_timezone(zone)
+                self._bar_zone_seen = True
+        
         # Check if this is for offset calculation from historical close
         if hasattr(self, 'historical_close_data') and self.historical_close_data:
             # This might be offset calculation data, handle separately
@@ -8112,9 +11893,19 @@ class MainWindow(QMainWindow):
         
         if not is_backfill:
             if contract_key not in self.historical_data:
-                self.historical_data[contract_key] = []
-            
-            self.historical_data[contract_key].append(bar_data)
+                self.historical_data[contract_key] = BarSeries()
+            
+            series = self.historical_data[contract_key]
+            last_time = series.last_time
+            if last_time is not None and bar_time_ns(bar_data['date']) <= last_time:
+                # Overlaps bars already served from the bar cache - IBKR's copy of the boundary bar wins
+                if bar_time_ns(bar_data['date']) == last_time:
+                    series.replace_last(bar_data)
+                    ring = self._chart_ring(contract_key)
+                    if ring is not None and ring.last_time == last_time:
+                        ring.replace_last(bar_data)
+                return
+            series.append(bar_data)
             
             # Update charts based on contract type
             if contract_key.startswith("UNDERLYING_") or contract_key == "ES_FUTURES_CONFIRM":
@@ -8133,14 +11924,17 @@ class MainWindow(QMainWindow):
                     self.on_historical_close_data_complete(req_id)
                 return
         
+        # Persist what IBKR answered; a backfill gets its cached rows merged in
+        self.store_completed_bars(contract_key)
+        
         # Check if this is a backfill completion
         is_backfill = False
         if contract_key == "ES_FUTURES_CONFIRM" and hasattr(self, 'confirm_chart_widget'):
             if self.confirm_chart_widget.backfill_req_id is not None and len(self.confirm_chart_widget.backfill_data) > 0:
                 # Prepend backfill data to existing data
                 if contract_key not in self.historical_data:
-                    self.historical_data[contract_key] = []
-                self.historical_data[contract_key] = self.confirm_chart_widget.backfill_data + self.historical_data[contract_key]
+                    self.historical_data[contract_key] = BarSeries()
+                self.historical_data[contract_key].prepend(self.confirm_chart_widget.backfill_data)
                 logger.info(f"Prepended {len(self.confirm_chart_widget.backfill_data)} backfill bars to {contract_key}")
                 logger.info(f"Total bars after prepend: {len(self.historical_data[contract_key])}")
                 # Clear backfill state
@@ -8157,8 +11951,8 @@ class MainWindow(QMainWindow):
             if self.trade_chart_widget.backfill_req_id is not None and len(self.trade_chart_widget.backfill_data) > 0:
                 # Prepend backfill data to existing data
                 if contract_key not in self.historical_data:
-                    self.historical_data[contract_key] = []
-                self.historical_data[contract_key] = self.trade_chart_widget.backfill_data + self.historical_data[contract_key]
+                    self.historical_data[contract_key] = BarSeries()
+                self.historical_data[contract_key].prepend(self.trade_chart_widget.backfill_data)
                 logger.info(f"Prepended {len(self.trade_chart_widget.backfill_data)} backfill bars to {contract_key}")
                 logger.info(f"Total bars after prepend: {len(self.historical_data[contract_key])}")
                 # Clear backfill state
@@ -8194,18 +11988,10 @@ class MainWindow(QMainWindow):
         try:
             # Add or update the bar in historical_data
             if contract_key not in self.historical_data:
-                self.historical_data[contract_key] = []
-            
-            # Check if this is an update to the last bar or a new bar
-            bars = self.historical_data[contract_key]
-            bar_time = str(bar_data['date']).strip()
+                self.historical_data[contract_key] = BarSeries()
             
-            if bars and str(bars[-1]['date']).strip() == bar_time:
-                # Update existing bar (price changed within same time period)
-                bars[-1] = bar_data
-            else:
-                # New bar
-                bars.append(bar_data)
+            # Same bar time replaces the forming bar in place, otherwise a new bar is appended (both O(1))
+            self.historical_data[contract_key].upsert(bar_data)
             
             # Update charts immediately - draw_idle() in chart code handles event coalescing
             # This provides real-time updates for trading while Qt event loop prevents blocking
@@ -8221,40 +12007,15 @@ class MainWindow(QMainWindow):
     def update_underlying_chart_data(self, contract_key: str, bar_data: dict):
         """Update underlying chart data storage and trigger real-time chart updates"""
         try:
-            # Convert bar data to chart format
-            # Fix date format - IBKR sometimes has extra spaces
-            date_str = str(bar_data['date']).strip().replace('  ', ' ')
-            chart_bar = {
-                'time': date_str,  # IBKR provides 'date' field
-                'open': bar_data['open'],
-                'high': bar_data['high'], 
-                'low': bar_data['low'],
-                'close': bar_data['close'],
-                'volume': bar_data['volume']
-            }
-            
             if "TRADE" in contract_key:
-                # This is for the trade chart - store separately or limit size
-                if 'underlying_trade' not in self.chart_data:
-                    self.chart_data['underlying_trade'] = []
-                self.chart_data['underlying_trade'].append(chart_bar)
-                # Keep only last 200 bars for trade chart
-                if len(self.chart_data['underlying_trade']) > 200:
-                    self.chart_data['underlying_trade'] = self.chart_data['underlying_trade'][-200:]
+                # This is for the trade chart - ring keeps only the last 200 bars
+                self.chart_data['underlying_trade'].append(bar_data)
             elif contract_key == "ES_FUTURES_CONFIRM":
-                # This is ES futures data for the confirmation chart
-                if 'es_futures' not in self.chart_data:
-                    self.chart_data['es_futures'] = []
-                self.chart_data['es_futures'].append(chart_bar)
-                # Keep only last 400 bars for confirmation chart
-                if len(self.chart_data['es_futures']) > 400:
-                    self.chart_data['es_futures'] = self.chart_data['es_futures'][-400:]
+                # This is ES futures data for the confirmation chart - last 400 bars
+                self.chart_data['es_futures'].append(bar_data)
             else:
-                # This is for the confirmation chart (legacy underlying data)
-                self.chart_data['underlying'].append(chart_bar)
-                # Keep only last 400 bars for confirmation chart
-                if len(self.chart_data['underlying']) > 400:
-                    self.chart_data['underlying'] = self.chart_data['underlying'][-400:]
+                # This is for the confirmation chart (legacy underlying data) - last 400 bars
+                self.chart_data['underlying'].append(bar_data)
                     
         except Exception as e:
             logger.error(f"Error updating underlying chart data: {e}")
@@ -8269,32 +12030,14 @@ class MainWindow(QMainWindow):
                 option_type = parts[1]  # "call" or "put"
                 actual_contract_key = parts[2]  # "XSP_680_C_20251029"
                 
-                # Convert bar data to chart format
-                # Fix date format - IBKR sometimes has extra spaces
-                date_str = str(bar_data['date']).strip().replace('  ', ' ')
-                chart_bar = {
-                    'time': date_str,
-                    'open': bar_data['open'],
-                    'high': bar_data['high'],
-                    'low': bar_data['low'], 
-                    'close': bar_data['close'],
-                    'volume': bar_data['volume']
-                }
-                
-                # Update the appropriate chart data and trigger real-time chart refresh
+                # Update the appropriate chart data (rings keep only the last 200 bars)
                 if option_type == "call":
-                    self.chart_data['selected_call'].append(chart_bar)
-                    # Keep only last 200 bars
-                    if len(self.chart_data['selected_call']) > 200:
-                        self.chart_data['selected_call'] = self.chart_data['selected_call'][-200:]
+                    self.chart_data['selected_call'].append(bar_data)
                     # Update current call contract tracking
                     self.current_call_contract = actual_contract_key
                     
                 elif option_type == "put":
-                    self.chart_data['selected_put'].append(chart_bar)
-                    # Keep only last 200 bars
-                    if len(self.chart_data['selected_put']) > 200:
-                        self.chart_data['selected_put'] = self.chart_data['selected_put'][-200:]
+                    self.chart_data['selected_put'].append(bar_data)
                     # Update current put contract tracking
                     self.current_put_contract = actual_contract_key
                 
@@ -8302,27 +12045,11 @@ class MainWindow(QMainWindow):
                 # Legacy format handling
                 actual_contract_key = contract_key.replace("CHART_", "")
                 
-                # Convert bar data to chart format
-                # Fix date format - IBKR sometimes has extra spaces
-                date_str = str(bar_data['date']).strip().replace('  ', ' ')
-                chart_bar = {
-                    'time': date_str,
-                    'open': bar_data['open'],
-                    'high': bar_data['high'],
-                    'low': bar_data['low'], 
-                    'close': bar_data['close'],
-                    'volume': bar_data['volume']
-                }
-                
                 if hasattr(self, 'current_call_contract') and actual_contract_key == self.current_call_contract:
-                    self.chart_data['selected_call'].append(chart_bar)
-                    if len(self.chart_data['selected_call']) > 200:
-                        self.chart_data['selected_call'] = self.chart_data['selected_call'][-200:]
+                    self.chart_data['selected_call'].append(bar_data)
                         
                 elif hasattr(self, 'current_put_contract') and actual_contract_key == self.current_put_contract:
-                    self.chart_data['selected_put'].append(chart_bar)
-                    if len(self.chart_data['selected_put']) > 200:
-                        self.chart_data['selected_put'] = self.chart_data['selected_put'][-200:]
+                    self.chart_data['selected_put'].append(bar_data)
                     
         except Exception as e:
             logger.error(f"Error updating option chart data: {e}")
@@ -8337,37 +12064,31 @@ class MainWindow(QMainWindow):
         try:
             # Use ALL historical data, not the truncated chart_data
             if contract_key in self.historical_data and self.historical_data[contract_key]:
-                # Convert historical_data format to chart format
-                chart_bars = []
-                for bar in self.historical_data[contract_key]:
-                    date_str = str(bar['date']).strip().replace('  ', ' ')
-                    chart_bars.append({
-                        'time': date_str,
-                        'open': bar['open'],
-                        'high': bar['high'],
-                        'low': bar['low'],
-                        'close': bar['close'],
-                        'volume': bar['volume']
-                    })
+                # Zero-copy view of every bar (charts only read the rows)
+                chart_bars = self.historical_data[contract_key].view()
+                
+                # Indicator settings from the Settings tab (trade_* / confirm_*)
+                trade_settings = (self.trade_ema_length, self.trade_z_period, self.trade_z_threshold)
+                confirm_settings = (self.confirm_ema_length, self.confirm_z_period, self.confirm_z_threshold)
                 
                 if "TRADE" in contract_key:
                     # Update trade chart with ALL data
                     if immediate:
-                        self.trade_chart_widget.update_chart(chart_bars)
+                        self.trade_chart_widget.update_chart(chart_bars, *trade_settings)
                     else:
-                        self.trade_chart_widget.update_chart_throttled(chart_bars)
+                        self.trade_chart_widget.update_chart_throttled(chart_bars, *trade_settings)
                 elif contract_key == "ES_FUTURES_CONFIRM":
                     # Update confirmation chart with ES futures data
                     if immediate:
-                        self.confirm_chart_widget.update_chart(chart_bars, is_es_futures=True)
+                        self.confirm_chart_widget.update_chart(chart_bars, *confirm_settings, is_es_futures=True)
                     else:
-                        self.confirm_chart_widget.update_chart_throttled(chart_bars, is_es_futures=True)
+                        self.confirm_chart_widget.update_chart_throttled(chart_bars, *confirm_settings, is_es_futures=True)
                 else:
                     # Update confirmation chart with ALL data
                     if immediate:
-                        self.confirm_chart_widget.update_chart(chart_bars)
+                        self.confirm_chart_widget.update_chart(chart_bars, *confirm_settings)
                     else:
-                        self.confirm_chart_widget.update_chart_throttled(chart_bars)
+                        self.confirm_chart_widget.update_chart_throttled(chart_bars, *confirm_settings)
                     
         except Exception as e:
             logger.error(f"Error updating underlying charts: {e}")
@@ -8377,18 +12098,8 @@ class MainWindow(QMainWindow):
         try:
             # Use ALL historical data, not the truncated chart_data
             if contract_key in self.historical_data and self.historical_data[contract_key]:
-                # Convert historical_data format to chart format
-                chart_bars = []
-                for bar in self.historical_data[contract_key]:
-                    date_str = str(bar['date']).strip().replace('  ', ' ')
-                    chart_bars.append({
-                        'time': date_str,
-                        'open': bar['open'],
-                        'high': bar['high'],
-                        'low': bar['low'],
-                        'close': bar['close'],
-                        'volume': bar['volume']
-                    })
+                # Zero-copy view of every bar (charts only read the rows)
+                chart_bars = self.historical_data[contract_key].view()
                 
                 # Handle new format: CHART_call_XSP_680_C_20251029 or CHART_put_XSP_680_P_20251029
                 if contract_key.startswith("CHART_call_") or contract_key.startswith("CHART_put_"):
@@ -8471,8 +12182,9 @@ class MainWindow(QMainWindow):
             # Update charts if we have new data
             if self.underlying_price > 0:
                 # Create current price bar for real-time updates
+                current_time_dt = datetime.now()
                 current_bar = {
-                    'time': datetime.now().isoformat(),
+                    'date': current_time_dt.isoformat(),
                     'open': self.underlying_price,
                     'high': self.underlying_price,
                     'low': self.underlying_price,
@@ -8481,31 +12193,25 @@ class MainWindow(QMainWindow):
                 }
                 
                 # Add to underlying data if we have historical data
-                if self.chart_data['underlying']:
+                underlying = self.chart_data['underlying']
+                if len(underlying):
                     # Replace the last bar if it's from the same minute, otherwise append
-                    last_bar_time = datetime.fromisoformat(self.chart_data['underlying'][-1]['time'])
-                    current_time_dt = datetime.now()
+                    last_bar_time = pd.Timestamp(underlying.last_time)
                     
                     if (last_bar_time.hour == current_time_dt.hour and 
                         last_bar_time.minute == current_time_dt.minute):
-                        # Update the last bar's close price
-                        self.chart_data['underlying'][-1]['close'] = self.underlying_price
-                        self.chart_data['underlying'][-1]['high'] = max(
-                            self.chart_data['underlying'][-1]['high'], self.underlying_price
-                        )
-                        self.chart_data['underlying'][-1]['low'] = min(
-                            self.chart_data['underlying'][-1]['low'], self.underlying_price
-                        )
+                        # Update the last bar's close / high / low in place
+                        underlying.tick(self.underlying_price)
                     else:
                         # Add new bar
-                        self.chart_data['underlying'].append(current_bar)
+                        underlying.append(current_bar)
                         
                     # Update both SPX charts
-                    self.update_spx_chart(self.confirm_chart_widget, self.chart_data['underlying'])
+                    self.update_spx_chart(self.confirm_chart_widget, underlying.view())
                     
                     # Update trade chart if we have separate data
-                    if 'underlying_trade' in self.chart_data and self.chart_data['underlying_trade']:
-                        self.update_spx_chart(self.trade_chart_widget, self.chart_data['underlying_trade'])
+                    if len(self.chart_data['underlying_trade']):
+                        self.update_spx_chart(self.trade_chart_widget, self.chart_data['underlying_trade'].view())
                     
         except Exception as e:
             logger.error(f"Error updating charts with live data: {e}")
@@ -8921,6 +12627,16 @@ class MainWindow(QMainWindow):
         self.ts_session_account_stop_dollar_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         risk_mgmt_layout.addWidget(self.ts_session_account_stop_dollar_label, 3, 2, 1, 2)
         
+        # Row 4: Work Pos Tgt / Pos Stp at IB (OCA child orders attached on entry fill)
+        self.ts_native_exits_checkbox = QCheckBox("IB-side exits (OCA)")
+        self.ts_native_exits_checkbox.setToolTip(
+            "Attach Pos Tgt % (LMT) and Pos Stp % (STP) as IB orders when an automated entry fills\n"
+            "• One OCA group: the fill of one cancels the other at IB\n"
+            "• Exits without waiting for the 1 s P&L check + chased close\n"
+            "• Local P&L check stays as fallback"
+        )
+        risk_mgmt_layout.addWidget(self.ts_native_exits_checkbox, 4, 0, 1, 4, Qt.AlignmentFlag.AlignLeft)
+        
         top_settings_row.addWidget(risk_mgmt_group)
         
         # 8. Position Sizing
@@ -9115,6 +12831,7 @@ class MainWindow(QMainWindow):
         self.ts_position_profit_target_spin.valueChanged.connect(self.on_ts_position_profit_changed)
         self.ts_use_position_stop_checkbox.toggled.connect(self.on_ts_position_stop_toggled)
         self.ts_position_stop_loss_spin.valueChanged.connect(self.on_ts_position_stop_changed)
+        self.ts_native_exits_checkbox.toggled.connect(self.on_ts_native_exits_toggled)
         
         # Session-level
         self.ts_use_session_account_target_checkbox.toggled.connect(self.on_ts_session_account_target_toggled)
@@ -9653,11 +13370,16 @@ class MainWindow(QMainWindow):
         # Clear table
         self.option_table.setRowCount(0)
         self.option_table.setRowCount(len(strikes))
+        self.rebuild_chain_row_index('main', self.current_expiry, strikes)
         
         # Subscribe to market data for each strike using centralized request ID system
         new_req_ids = []  # Track new request IDs
         
+        near_atm_distance = LINE_BUDGET_NEAR_ATM_STRIKES * strike_increment + 1e-9
+        
         for row, strike in enumerate(strikes):
+            line_priority = LINE_PRIORITY_NEAR_ATM if abs(strike - center_strike) <= near_atm_distance else LINE_PRIORITY_WING
+            
             # Create call contract using instrument-aware helper function
             call_contract = self.create_instrument_option_contract(strike, "C")
             
@@ -9672,8 +13394,8 @@ class MainWindow(QMainWindow):
             
             call_key = f"{self.instrument['options_symbol']}_{strike}_C_{self.current_expiry}"
             req_id = self.get_next_request_id('main')
-            self.app_state['market_data_map'][req_id] = call_key
-            self.ibkr_client.reqMktData(req_id, call_contract, "", False, False, [])
+            self.subscriptions.add(req_id, call_key, 'main')
+            self.line_budget.subscribe(req_id, call_contract, line_priority)
             logger.info(f"Requested market data for {call_key} with reqId={req_id}")
             new_req_ids.append(req_id)
             
@@ -9691,8 +13413,8 @@ class MainWindow(QMainWindow):
             
             put_key = f"{self.instrument['options_symbol']}_{strike}_P_{self.current_expiry}"
             req_id = self.get_next_request_id('main')
-            self.app_state['market_data_map'][req_id] = put_key
-            self.ibkr_client.reqMktData(req_id, put_contract, "", False, False, [])
+            self.subscriptions.add(req_id, put_key, 'main')
+            self.line_budget.subscribe(req_id, put_contract, line_priority)
             logger.info(f"Requested market data for {put_key} with reqId={req_id}")
             new_req_ids.append(req_id)
             
@@ -9712,7 +13434,7 @@ class MainWindow(QMainWindow):
             self.option_table.setItem(row, 10, strike_item)
         
         # Store active request IDs using centralized tracking system
-        self.active_req_ids['main'] = new_req_ids
+        self.subscriptions.set_chain_req_ids('main', new_req_ids)
         self.log_message(f"✓ main chain: subscribed to {len(new_req_ids)} contracts ({len(strikes)} strikes × 2)", "SUCCESS")
         
         # Clear recentering flags now that chain is loaded
@@ -9732,134 +13454,133 @@ class MainWindow(QMainWindow):
     def update_option_chain_cell(self, contract_key: str):
         """Update a single option chain row with market data"""
         try:
-            # Parse contract_key format: "{SYMBOL}_{STRIKE}_{RIGHT}_{EXPIRY}" (e.g., "SPX_6740_C_20251024" or "XSP_673_P_20251024")
-            parts = contract_key.split('_')
-            if len(parts) != 4:
+            # Resolve contract_key "{SYMBOL}_{STRIKE}_{RIGHT}_{EXPIRY}" via the contract registry (no re-parsing per tick)
+            record = self.contract_registry.intern_key(contract_key)
+            if record is None:
                 return
             
-            symbol, strike, right, expiry = parts
-            strike = float(strike)
+            strike, right, expiry = record.strike, record.right, record.expiry
             
             # CRITICAL: Only update main chain if expiry matches current_expiry
             # This prevents duplicate subscriptions or old expiry data from updating the table
             if not hasattr(self, 'current_expiry') or expiry != self.current_expiry:
                 return  # This contract doesn't match main chain's expiry
             
-            # Find the row for this strike using FLOAT comparison with tolerance
-            for row in range(self.option_table.rowCount()):
-                strike_item = self.option_table.item(row, 10)  # Strike column
-                if strike_item:
-                    row_strike = float(strike_item.text())
-                    # Compare floats with small tolerance for rounding
-                    if abs(row_strike - strike) < 0.01:
-                        # Get market data
-                        data = self.market_data.get(contract_key, {})
-                        
-                        if right == 'C':  # Call options (left side)
-                            # Columns: Imp Vol, Delta, Theta, Vega, Gamma, Volume, CHANGE %, Last, Ask, Bid
-                            # CRITICAL: Update existing items in-place to prevent flickering
-                            values = [
-                                (0, f"{(data.get('iv') or 0):.2f}"),
-                                (1, f"{(data.get('delta') or 0):.3f}"),
-                                (2, f"{(data.get('theta') or 0):.2f}"),
-                                (3, f"{(data.get('vega') or 0):.2f}"),
-                                (4, f"{(data.get('gamma') or 0):.4f}"),
-                                (5, f"{int(data.get('volume') or 0)}")
-                            ]
-                            for col, text in values:
-                                item = self.option_table.item(row, col)
-                                if item:
-                                    item.setText(text)
-                                else:
-                                    item = QTableWidgetItem(text)
-                                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                                    self.option_table.setItem(row, col, item)
-                            
-                            # Calculate change %
-                            last = data.get('last') or 0
-                            prev = data.get('prev_close') or 0
-                            change_pct = ((last - prev) / prev * 100) if prev > 0 else 0
-                            change_item = self.option_table.item(row, 6)
-                            if change_item:
-                                change_item.setText(f"{change_pct:.1f}%")
-                                change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
-                            else:
-                                change_item = QTableWidgetItem(f"{change_pct:.1f}%")
-                                change_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                                change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
-                                self.option_table.setItem(row, 6, change_item)
-                            
-                            price_items = [
-                                (7, f"{(last):.2f}"),
-                                (8, f"{(data.get('bid') or 0):.2f}"),
-                                (9, f"{(data.get('ask') or 0):.2f}")
-                            ]
-                            for col, text in price_items:
-                                item = self.option_table.item(row, col)
-                                if item:
-                                    item.setText(text)
-                                else:
-                                    item = QTableWidgetItem(text)
-                                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                                    self.option_table.setItem(row, col, item)
-                        
-                        elif right == 'P':  # Put options (right side)
-                            # Columns: Bid, Ask, Last, CHANGE %, Volume, Gamma, Vega, Theta, Delta, Imp Vol
-                            # CRITICAL: Update existing items in-place to prevent flickering
-                            price_items = [
-                                (11, f"{(data.get('bid') or 0):.2f}"),
-                                (12, f"{(data.get('ask') or 0):.2f}"),
-                                (13, f"{(data.get('last') or 0):.2f}")
-                            ]
-                            for col, text in price_items:
-                                item = self.option_table.item(row, col)
-                                if item:
-                                    item.setText(text)
-                                else:
-                                    item = QTableWidgetItem(text)
-                                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                                    self.option_table.setItem(row, col, item)
-                            
-                            # Calculate change %
-                            last = data.get('last') or 0
-                            prev = data.get('prev_close') or 0
-                            change_pct = ((last - prev) / prev * 100) if prev > 0 else 0
-                            change_item = self.option_table.item(row, 14)
-                            if change_item:
-                                change_item.setText(f"{change_pct:.1f}%")
-                                change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
-                            else:
-                                change_item = QTableWidgetItem(f"{change_pct:.1f}%")
-                                change_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                                change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
-                                self.option_table.setItem(row, 14, change_item)
-                            
-                            # Handle None values gracefully
-                            volume = data.get('volume') or 0
-                            gamma = data.get('gamma') or 0
-                            vega = data.get('vega') or 0
-                            theta = data.get('theta') or 0
-                            delta = data.get('delta') or 0
-                            iv = data.get('iv') or 0
-                            
-                            greeks_items = [
-                                (15, f"{int(volume)}"),
-                                (16, f"{gamma:.4f}"),
-                                (17, f"{vega:.2f}"),
-                                (18, f"{theta:.2f}"),
-                                (19, f"{delta:.3f}"),
-                                (20, f"{iv:.2f}")
-                            ]
-                            for col, text in greeks_items:
-                                item = self.option_table.item(row, col)
-                                if item:
-                                    item.setText(text)
-                                else:
-                                    item = QTableWidgetItem(text)
-                                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                                    self.option_table.setItem(row, col, item)
-                        
-                        break
+            # O(1) row lookup via chain row index (rebuilt on every chain build/recenter)
+            row = self.get_chain_row('main', expiry, strike)
+            if row is None:
+                return  # Strike not displayed in main chain
+            
+            # Trading tab hidden - remember the cell, repaint it when the tab is shown
+            if self.render_gates['main'].defer(contract_key):
+                return
+            
+            # Get market data
+            data = self.market_data.get(contract_key, {})
+            
+            if right == 'C':  # Call options (left side)
+                # Columns: Imp Vol, Delta, Theta, Vega, Gamma, Volume, CHANGE %, Last, Ask, Bid
+                # CRITICAL: Update existing items in-place to prevent flickering
+                values = [
+                    (0, f"{(data.get('iv') or 0):.2f}"),
+                    (1, f"{(data.get('delta') or 0):.3f}"),
+                    (2, f"{(data.get('theta') or 0):.2f}"),
+                    (3, f"{(data.get('vega') or 0):.2f}"),
+                    (4, f"{(data.get('gamma') or 0):.4f}"),
+                    (5, f"{int(data.get('volume') or 0)}")
+                ]
+                for col, text in values:
+                    item = self.option_table.item(row, col)
+                    if item:
+                        item.setText(text)
+                    else:
+                        item = QTableWidgetItem(text)
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                        self.option_table.setItem(row, col, item)
+                
+                # Calculate change %
+                last = data.get('last') or 0
+                prev = data.get('prev_close') or 0
+                change_pct = ((last - prev) / prev * 100) if prev > 0 else 0
+                change_item = self.option_table.item(row, 6)
+                if change_item:
+                    change_item.setText(f"{change_pct:.1f}%")
+                    change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
+                else:
+                    change_item = QTableWidgetItem(f"{change_pct:.1f}%")
+                    change_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                    change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
+                    self.option_table.setItem(row, 6, change_item)
+                
+                price_items = [
+                    (7, f"{(last):.2f}"),
+                    (8, f"{(data.get('bid') or 0):.2f}"),
+                    (9, f"{(data.get('ask') or 0):.2f}")
+                ]
+                for col, text in price_items:
+                    item = self.option_table.item(row, col)
+                    if item:
+                        item.setText(text)
+                    else:
+                        item = QTableWidgetItem(text)
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                        self.option_table.setItem(row, col, item)
+            
+            elif right == 'P':  # Put options (right side)
+                # Columns: Bid, Ask, Last, CHANGE %, Volume, Gamma, Vega, Theta, Delta, Imp Vol
+                # CRITICAL: Update existing items in-place to prevent flickering
+                price_items = [
+                    (11, f"{(data.get('bid') or 0):.2f}"),
+                    (12, f"{(data.get('ask') or 0):.2f}"),
+                    (13, f"{(data.get('last') or 0):.2f}")
+                ]
+                for col, text in price_items:
+                    item = self.option_table.item(row, col)
+                    if item:
+                        item.setText(text)
+                    else:
+                        item = QTableWidgetItem(text)
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                        self.option_table.setItem(row, col, item)
+                
+                # Calculate change %
+                last = data.get('last') or 0
+                prev = data.get('prev_close') or 0
+                change_pct = ((last - prev) / prev * 100) if prev > 0 else 0
+                change_item = self.option_table.item(row, 14)
+                if change_item:
+                    change_item.setText(f"{change_pct:.1f}%")
+                    change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
+                else:
+                    change_item = QTableWidgetItem(f"{change_pct:.1f}%")
+                    change_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                    change_item.setForeground(QColor("#00ff00" if change_pct >= 0 else "#ff0000"))
+                    self.option_table.setItem(row, 14, change_item)
+                
+                # Handle None values gracefully
+                volume = data.get('volume') or 0
+                gamma = data.get('gamma') or 0
+                vega = data.get('vega') or 0
+                theta = data.get('theta') or 0
+                delta = data.get('delta') or 0
+                iv = data.get('iv') or 0
+                
+                greeks_items = [
+                    (15, f"{int(volume)}"),
+                    (16, f"{gamma:.4f}"),
+                    (17, f"{vega:.2f}"),
+                    (18, f"{theta:.2f}"),
+                    (19, f"{delta:.3f}"),
+                    (20, f"{iv:.2f}")
+                ]
+                for col, text in greeks_items:
+                    item = self.option_table.item(row, col)
+                    if item:
+                        item.setText(text)
+                    else:
+                        item = QTableWidgetItem(text)
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                        self.option_table.setItem(row, col, item)
         
         except Exception as e:
             logger.debug(f"Error updating option chain cell for {contract_key}: {e}")
@@ -9893,14 +13614,13 @@ class MainWindow(QMainWindow):
         self.check_chain_drift_and_recenter(atm_strike)
         
         # Update all strike backgrounds based on delta-identified ATM
-        for row in range(self.option_table.rowCount()):
+        # Strikes come from the chain row index - no need to parse strike cell text
+        for (_, strike), row in self.chain_row_index['main'].items():
             strike_item = self.option_table.item(row, 10)  # Strike column
             if not strike_item:
                 continue
             
             try:
-                strike = float(strike_item.text())
-                
                 if abs(strike - atm_strike) < 0.01:  # ATM strike (within rounding)
                     # Highlight ATM strike with gold/yellow
                     strike_item.setBackground(QColor("#FFD700"))  # Gold
@@ -10031,37 +13751,16 @@ class MainWindow(QMainWindow):
             float: The ATM strike price, or 0 if no deltas available
         """
         expiry = self.ts_0dte_expiry if contract_type == "0DTE" else self.ts_1dte_expiry
-        if not expiry:
-            return 0
-        
-        min_call_diff = float('inf')
-        atm_call_strike = 0
-        
-        # Search through market data for this expiry
-        for contract_key, data in self.market_data.items():
-            if f"_{expiry}" not in contract_key:
-                continue
-            if '_C_' not in contract_key:  # Only use calls for ATM detection
-                continue
-            
-            delta = data.get('delta', None)
-            if delta is None or delta == 0:
-                continue
-            
-            try:
-                parts = contract_key.split('_')
-                if len(parts) != 4:
-                    continue
-                strike = float(parts[1])
-                
-                if 0 < delta < 1:
-                    diff = abs(delta - 0.5)
-                    if diff < min_call_diff:
-                        min_call_diff = diff
-                        atm_call_strike = strike
-            
-            except (ValueError, IndexError):
-                continue
+        if not expiry:
+            return 0
+        
+        atm_call_strike = 0
+        
+        # Vectorized search over this expiry's call chain array (calls only for ATM detection)
+        chain = self.market_data.chain(expiry, 'C')
+        best = chain.closest_delta_slot(0.5) if chain is not None else None
+        if best is not None:
+            atm_call_strike = float(chain.rows['strike'][best[0]])
         
         if atm_call_strike > 0:
             return atm_call_strike
@@ -10108,15 +13807,14 @@ class MainWindow(QMainWindow):
         # Check for drift and auto-recenter
         self.check_ts_chain_drift_and_recenter(contract_type, atm_strike)
         
-        # Update strike column backgrounds
-        for row in range(table.rowCount()):
+        # Update strike column backgrounds (strikes come from the chain row index)
+        chain_type = 'ts_0dte' if contract_type == "0DTE" else 'ts_1dte'
+        for (_, strike), row in self.chain_row_index[chain_type].items():
             strike_item = table.item(row, 4)  # Strike is column 4 in TS tables
             if not strike_item:
                 continue
             
             try:
-                strike = float(strike_item.text())
-                
                 if abs(strike - atm_strike) < 0.01:  # ATM strike
                     strike_item.setBackground(QColor("#FFD700"))  # Gold
                     strike_item.setForeground(QColor("#000000"))  # Black text
@@ -10393,8 +14091,35 @@ class MainWindow(QMainWindow):
     # HELPER METHODS - Historical Data & Orders
     # ========================================================================
     
+    def build_order(self, action: str, quantity: int, limit_price: float = 0, is_automated: bool = False) -> Order:
+        """Create an IB Order with this app's defaults (LMT when limit_price > 0, otherwise MKT)"""
+        order = Order()
+        order.action = action
+        order.totalQuantity = quantity
+        order.orderType = "MKT" if limit_price == 0 else "LMT"
+        
+        if limit_price > 0:
+            order.lmtPrice = limit_price
+            order.auxPrice = 0  # CRITICAL: Clear auxPrice for LMT orders to prevent silent rejections
+        
+        order.tif = "DAY"
+        order.transmit = True
+        order.outsideRth = True  # CRITICAL: Enable "Fill outside RTH" for after-hours trading
+        order.eTradeOnly = False  # CRITICAL: Disable eTradeOnly to prevent TWS rejection (error 10268)
+        order.firmQuoteOnly = False  # CRITICAL: Disable firmQuoteOnly for better fill rates
+        
+        # CRITICAL: Tag order with source (Strategy vs Manual) using orderRef
+        order.orderRef = "STRATEGY" if is_automated else "MANUAL"
+        
+        # Set account if available
+        if self.app_state.get('account'):
+            order.account = self.app_state['account']
+        return order
+    
     def place_order(self, contract_key: str, action: str, quantity: int, 
-                   limit_price: float = 0, enable_chasing: bool = False, is_automated: bool = False, mid_price: float = 0) -> Optional[int]:
+                   limit_price: float = 0, enable_chasing: bool = False, is_automated: bool = False, mid_price: float = 0,
+                   contract: Optional[Contract] = None, order: Optional[Order] = None,
+                   watch_send: bool = False) -> Optional[int]:
         """
         Universal order placement function with comprehensive validation and debugging
         
@@ -10406,6 +14131,9 @@ class MainWindow(QMainWindow):
             enable_chasing: Enable mid-price chasing for manual orders
             is_automated: Whether this order is from automated trading (vs manual)
             mid_price: Mid price at order placement time (for slippage calculation)
+            contract: Prebuilt IB Contract for contract_key (hot-standby entries)
+            order: Prebuilt IB Order from build_order() matching action/quantity/limit_price
+            watch_send: Record when the order reaches the wire (signal-to-wire latency)
         
         Returns:
             order_id or None if failed
@@ -10422,24 +14150,25 @@ class MainWindow(QMainWindow):
                 logger.error("Order rejected - data server not ready")
                 return None
             
-            # STEP 2: Parse contract key and create contract
-            parts = contract_key.split('_')
-            if len(parts) != 4:
+            # STEP 2: Resolve contract key and create contract
+            record = self.contract_registry.intern_key(contract_key)
+            if record is None:
                 self.log_message(f"✗ Invalid contract key: {contract_key}", "ERROR")
                 logger.error(f"Order rejected - invalid contract key: {contract_key}")
                 return None
             
-            symbol, strike_str, right, expiry = parts
+            symbol, strike, right, expiry = record.symbol, record.strike, record.right, record.expiry
             
-            logger.info(f"Parsing contract_key: {contract_key}")
-            logger.info(f"  Symbol: {symbol}, Strike: {strike_str}, Right: {right}, Expiry: {expiry}")
+            logger.info(f"Resolved contract_key: {contract_key} (contract id {record.id})")
+            logger.info(f"  Symbol: {symbol}, Strike: {strike}, Right: {right}, Expiry: {expiry}")
             
             # Create contract using instrument-aware function (handles both OPT and FOP)
-            contract = self.create_instrument_option_contract(
-                strike=float(strike_str),
-                right=right,
-                expiry=expiry
-            )
+            if contract is None:
+                contract = self.create_instrument_option_contract(
+                    strike=strike,
+                    right=right,
+                    expiry=expiry
+                )
             
             # STEP 3: Contract validation
             if not contract or not contract.symbol or not contract.secType:
@@ -10463,27 +14192,8 @@ class MainWindow(QMainWindow):
                 return None
             
             # STEP 4: Create order with proper defaults
-            order = Order()
-            order.action = action
-            order.totalQuantity = quantity
-            order.orderType = "MKT" if limit_price == 0 else "LMT"
-            
-            if limit_price > 0:
-                order.lmtPrice = limit_price
-                order.auxPrice = 0  # CRITICAL: Clear auxPrice for LMT orders to prevent silent rejections
-            
-            order.tif = "DAY"
-            order.transmit = True
-            order.outsideRth = True  # CRITICAL: Enable "Fill outside RTH" for after-hours trading
-            order.eTradeOnly = False  # CRITICAL: Disable eTradeOnly to prevent TWS rejection (error 10268)
-            order.firmQuoteOnly = False  # CRITICAL: Disable firmQuoteOnly for better fill rates
-            
-            # CRITICAL: Tag order with source (Strategy vs Manual) using orderRef
-            order.orderRef = "STRATEGY" if is_automated else "MANUAL"
-            
-            # Set account if available
-            if self.app_state.get('account'):
-                order.account = self.app_state['account']
+            if order is None:
+                order = self.build_order(action, quantity, limit_price, is_automated)
             
             # CRITICAL: Validate order before submitting
             if order.totalQuantity <= 0:
@@ -10496,6 +14206,23 @@ class MainWindow(QMainWindow):
                 logger.error(f"Order rejected - invalid limit price: {order.lmtPrice}")
                 return None
             
+            stop_price = order.auxPrice if order.orderType == "STP" else 0.0
+            if stop_price:
+                price_text = f"STP ${stop_price:.2f}"
+            else:
+                price_text = 'MKT' if limit_price == 0 else f'${limit_price:.2f}'
+            
+            # A separate SELL against a position with IB-side exits waits until IB confirms
+            # every exit child cancelled - a child filling meanwhile would otherwise double-exit
+            if (action == "SELL" and not order.ocaGroup.startswith(NATIVE_EXIT_OCA_PREFIX)
+                    and self._hold_for_native_exits(
+                        [contract_key], f"SELL {quantity} placed",
+                        lambda: self.place_order(contract_key, action, quantity, limit_price, enable_chasing,
+                                                 is_automated, mid_price, contract, order, watch_send))):
+                self.log_message(f"⏳ SELL {quantity} {contract_key} held until IB confirms its IB-side exits "
+                                 f"are cancelled", "INFO")
+                return None
+            
             # Get order ID
             order_id = self.app_state.get('next_order_id', 1)
             self.app_state['next_order_id'] = order_id + 1
@@ -10518,7 +14245,9 @@ class MainWindow(QMainWindow):
             logger.info(f"  Action: {order.action}")
             logger.info(f"  Quantity: {order.totalQuantity}")
             logger.info(f"  Order Type: {order.orderType}")
-            if limit_price > 0:
+            if stop_price:
+                logger.info(f"  Stop Price: ${stop_price:.2f} (auxPrice, trigger method {order.triggerMethod})")
+            elif limit_price > 0:
                 logger.info(f"  Limit Price: ${order.lmtPrice:.2f}")
                 logger.info(f"  AuxPrice: {order.auxPrice} (must be 0 for LMT)")
             logger.info(f"  TIF: {order.tif}")
@@ -10529,8 +14258,8 @@ class MainWindow(QMainWindow):
             
             self.log_message(
                 f"=== PLACING ORDER #{order_id} ===\n"
-                f"Contract: {symbol} {strike_str}{right} {expiry}\n"
-                f"Order: {action} {quantity} @ {'MKT' if limit_price == 0 else f'${limit_price:.2f}'}\n"
+                f"Contract: {symbol} {strike}{right} {expiry}\n"
+                f"Order: {action} {quantity} @ {price_text}\n"
                 f"TradingClass: {contract.tradingClass}",
                 "INFO"
             )
@@ -10541,6 +14270,8 @@ class MainWindow(QMainWindow):
                 logger.info(f"🚀 ibkr_client type: {type(self.ibkr_client)}")
                 logger.info(f"🚀 ibkr_client connected: {self.ibkr_client.isConnected() if hasattr(self.ibkr_client, 'isConnected') else 'N/A'}")
                 
+                if watch_send:
+                    self.ibkr_client.watch_order_send(order_id)
                 self.ibkr_client.placeOrder(order_id, contract, order)
                 
                 logger.info(f"✅ placeOrder() API call COMPLETED for order #{order_id}")
@@ -10549,7 +14280,10 @@ class MainWindow(QMainWindow):
                 
                 # ACTIVITY LOG: Order placed
                 if hasattr(self, 'ts_signals'):
-                    order_type_str = "MKT" if limit_price == 0 else f"LMT@${limit_price:.2f}"
+                    if stop_price:
+                        order_type_str = f"STP@${stop_price:.2f}"
+                    else:
+                        order_type_str = "MKT" if limit_price == 0 else f"LMT@${limit_price:.2f}"
                     self.ts_signals.ts_activity.emit(
                         f"📤 ORDER PLACED: #{order_id} | {action} {quantity}x {contract_key} | {order_type_str}"
                     )
@@ -10558,54 +14292,17 @@ class MainWindow(QMainWindow):
                 self.log_message(f"❌ EXCEPTION during placeOrder(): {e}", "ERROR")
                 logger.error(f"❌ placeOrder() exception: {e}", exc_info=True)
                 logger.error(f"❌ Order #{order_id} was NOT sent to TWS")
+                if watch_send:
+                    self.ibkr_client.forget_order_send(order_id)
                 
                 # ACTIVITY LOG: Order failed
                 if hasattr(self, 'ts_signals'):
                     self.ts_signals.ts_activity.emit(f"❌ ORDER FAILED: {e}")
                 return None
             
-            # STEP 7: Track order ONLY AFTER successful placeOrder() call
-            self.pending_orders[order_id] = {
-                'contract_key': contract_key,
-                'action': action,
-                'quantity': quantity,
-                'price': limit_price,
-                'status': 'Submitted',
-                'filled': 0,
-                'is_automated': is_automated,  # Track if order is from automation
-                'mid_price': mid_price  # Store mid price for slippage calculation
-            }
-            
-            logger.info(f"📋 PENDING ORDER STORED: order_id={order_id}, mid_price={mid_price:.4f}, limit_price={limit_price:.4f}")
-            
-            # Track for chasing if enabled
-            if enable_chasing:
-                now = datetime.now()
-                self.chasing_orders[order_id] = {
-                    'contract_key': contract_key,
-                    'contract': contract,
-                    'action': action,
-                    'quantity': quantity,
-                    'initial_mid': limit_price,
-                    'last_mid': limit_price,
-                    'last_price': limit_price,  # Track actual order price (different from mid during "give in")
-                    'give_in_count': 0,  # Number of times we've given in (accumulates)
-                    'last_give_in_time': now,  # Track when we last gave in a tick (for time-based chasing)
-                    'attempts': 1,
-                    'timestamp': now,  # When order was placed/last updated
-                    'order': order
-                }
-            
-            # STEP 8: Update UI
-            self.update_orders_display()
-            self.update_ts_orders_display()
-            
-            # STEP 9: Start mid-price chasing if enabled
-            if enable_chasing:
-                # Start timer if not already running
-                if not hasattr(self, '_chasing_timer_running') or not self._chasing_timer_running:
-                    self._chasing_timer_running = True
-                    QTimer.singleShot(1000, self.update_orders)
+            # STEPS 7-9: Track order ONLY AFTER successful placeOrder() call, then start chasing
+            self._track_order(order_id, contract_key, action, quantity, limit_price, is_automated,
+                              mid_price, contract, order, enable_chasing, stop_price=stop_price)
             
             return order_id
             
@@ -10614,6 +14311,45 @@ class MainWindow(QMainWindow):
             logger.error(f"place_order() error: {e}", exc_info=True)
             return None
     
+    def _track_order(self, order_id: int, contract_key: str, action: str, quantity: int,
+                     limit_price: float, is_automated: bool, mid_price: float, contract: Contract,
+                     order: Order, enable_chasing: bool, legs: Optional[Dict[str, float]] = None,
+                     stop_price: float = 0.0):
+        """Book an order that reached placeOrder() and start chasing it (single contracts and combos)"""
+        # STEP 7: Track order
+        self.pending_orders[order_id] = WorkingOrder(
+            order_id, contract_key, action, quantity,
+            price=0.0 if stop_price else limit_price,
+            is_automated=is_automated,  # Track if order is from automation
+            mid_price=mid_price,  # Store mid price for slippage calculation
+            legs=legs,
+            stop_price=stop_price
+        )
+        self.subscriptions.add_order(order_id, contract_key)
+        
+        logger.info(f"📋 PENDING ORDER STORED: order_id={order_id}, mid_price={mid_price:.4f}, "
+                    + (f"stop_price={stop_price:.4f}" if stop_price else f"limit_price={limit_price:.4f}"))
+        
+        # Track for chasing if enabled
+        if enable_chasing:
+            working = self.pending_orders[order_id]
+            working.contract = contract
+            working.order = order
+            working.initial_mid = limit_price
+            working.last_mid = limit_price
+            working.last_price = limit_price  # Track actual order price (different from mid during "give in")
+            working.give_in_due = working.placed_at + self.chase_give_in_interval
+            self.chasing_orders[order_id] = working
+        
+        # STEP 8: Update UI
+        self.update_orders_display()
+        self.update_ts_orders_display()
+        
+        # STEP 9: Start mid-price chasing if enabled (first deadline = first give-in)
+        if enable_chasing:
+            self._schedule_chase(order_id, self.chasing_orders[order_id]['give_in_due'])
+            self._arm_chase_timer()
+    
     def place_manual_order(self, contract_key: str, action: str, quantity: int, price: float = 0):
         """Place a manual order - wrapper for backward compatibility"""
         # Get market data to calculate mid price for slippage tracking
@@ -10624,6 +14360,277 @@ class MainWindow(QMainWindow):
         # Use new place_order method with chasing enabled for manual orders
         self.place_order(contract_key, action, quantity, price, enable_chasing=True, mid_price=unrounded_mid)
     
+    # ========================================================================
+    # COMBO (BAG) ORDERS
+    # ========================================================================
+    
+    def get_bid_ask(self, contract_key: str) -> Tuple[float, float]:
+        """(bid, ask) of a contract - for a combo key the sum over its legs, (0, 0) if any leg lacks a quote"""
+        legs = combo_leg_keys(contract_key)
+        if not legs:
+            data = self.market_data.get(contract_key, {})
+            return data.get('bid', 0) or 0, data.get('ask', 0) or 0
+        bid = ask = 0.0
+        for leg_key in legs:
+            data = self.market_data.get(leg_key, {})
+            leg_bid, leg_ask = data.get('bid', 0) or 0, data.get('ask', 0) or 0
+            if leg_bid <= 0 or leg_ask <= 0:
+                return 0.0, 0.0
+            bid += leg_bid
+            ask += leg_ask
+        return bid, ask
+    
+    def place_combo_order(self, leg_keys: List[str], action: str, quantity: int, limit_price: float = 0,
+                          enable_chasing: bool = False, is_automated: bool = False,
+                          mid_price: float = 0,
+                          on_placed: Optional[Callable[[str, int], None]] = None) -> Optional[int]:
+        """
+        Place a multi-leg position (straddle/strangle) as ONE BAG order, every leg 1:1
+        
+        Args:
+            leg_keys: Leg contract keys, e.g. [call_key, put_key]
+            action: "BUY" buys every leg, "SELL" sells every leg
+            quantity: Number of combos (= contracts per leg)
+            limit_price: Combined limit price (sum of leg prices, 0 = market order)
+            enable_chasing: Chase the combined mid - reprices on ticks of any leg
+            is_automated: Whether this order is from automated trading (vs manual)
+            mid_price: Combined unrounded mid at placement (slippage tracking)
+            on_placed: Called with (contract_key, order_id) for every order actually sent - the combo,
+                       or each leg if the combo falls back to separate orders
+        
+        Returns:
+            order_id, or None if it failed or is waiting for leg conIds. A waiting combo is sent
+            from on_contract_details_end, or as one order per leg after COMBO_CON_ID_TIMEOUT_MS.
+        """
+        if self.connection_state != ConnectionState.CONNECTED:
+            self.log_message("✗ Cannot place combo order: Not connected to IBKR", "ERROR")
+            return None
+        
+        if not self.app_state.get('data_server_ok'):
+            self.log_message("✗ Cannot place combo order: Data server not ready", "ERROR")
+            return None
+        
+        records = [self.contract_registry.intern_key(leg_key) for leg_key in leg_keys]
+        if len(records) < 2 or any(record is None for record in records):
+            self.log_message(f"✗ Invalid combo legs: {leg_keys}", "ERROR")
+            logger.error(f"Combo order rejected - invalid legs: {leg_keys}")
+            return None
+        
+        leg_mids = {}
+        for record in records:
+            bid, ask = self.get_bid_ask(record.key)
+            leg_mids[record.key] = (bid + ask) / 2 if bid > 0 and ask > 0 else 0.0
+        request = {
+            'leg_keys': [record.key for record in records],
+            'action': action,
+            'quantity': quantity,
+            'limit_price': limit_price,
+            'enable_chasing': enable_chasing,
+            'is_automated': is_automated,
+            'mid_price': mid_price,
+            'leg_mids': leg_mids,
+            'on_placed': on_placed,
+            'queued_at': time.monotonic(),
+        }
+        
+        if not self.request_con_ids(request['leg_keys']):
+            self._combo_queue.append(request)
+            QTimer.singleShot(COMBO_CON_ID_TIMEOUT_MS, lambda: self._expire_combo_request(request))
+            self.log_message(
+                f"⏳ Combo {action} {quantity}x {make_combo_key(request['leg_keys'])}: resolving leg contract IDs...",
+                "INFO"
+            )
+            return None
+        return self._send_combo_order(request)
+    
+    def request_con_ids(self, leg_keys: List[str]) -> bool:
+        """True if every leg's conId is known - otherwise request the missing ones (reqContractDetails)"""
+        resolved = True
+        for leg_key in leg_keys:
+            record = self.contract_registry.lookup(leg_key)
+            if record.con_id:
+                continue
+            resolved = False
+            if leg_key in self._con_id_pending:
+                continue  # Already in flight
+            req_id = self.app_state['next_req_id']
+            self.app_state['next_req_id'] += 1
+            self._con_id_requests[req_id] = leg_key
+            self._con_id_pending[leg_key] = req_id
+            contract = record.contract or self.create_instrument_option_contract(
+                strike=record.strike, right=record.right, expiry=record.expiry
+            )
+            logger.info(f"Requesting contract details for combo leg {leg_key} (reqId={req_id})")
+            self.ibkr_client.reqContractDetails(req_id, contract)
+        return resolved
+    
+    @pyqtSlot(int, int)
+    def on_contract_details(self, req_id: int, con_id: int):
+        """conId for a requested combo leg (the first match wins)"""
+        leg_key = self._con_id_requests.get(req_id)
+        if leg_key is not None:
+            record = self.contract_registry.lookup(leg_key)
+            if not record.con_id:
+                record.con_id = con_id
+    
+    @pyqtSlot(int)
+    def on_contract_details_end(self, req_id: int):
+        """A leg conId request finished - send every queued combo whose legs are now all resolved"""
+        leg_key = self._pop_con_id_request(req_id)
+        if leg_key is None:
+            return
+        record = self.contract_registry.lookup(leg_key)
+        if not record.con_id:
+            logger.warning(f"Contract details for {leg_key} returned no conId")
+        
+        ready, waiting = [], []
+        for request in self._combo_queue:
+            resolved = all(self.contract_registry.lookup(key).con_id for key in request['leg_keys'])
+            (ready if resolved else waiting).append(request)
+        self._combo_queue = waiting
+        for request in ready:
+            wait_ms = (time.monotonic() - request['queued_at']) * 1000
+            logger.info(f"Combo legs resolved in {wait_ms:.0f} ms: {make_combo_key(request['leg_keys'])}")
+            self._send_combo_order(request)
+    
+    @pyqtSlot(int, int)
+    def on_contract_details_error(self, req_id: int, error_code: int):
+        """A leg conId request failed (e.g. error 200) - no contractDetailsEnd follows, so fall back now"""
+        leg_key = self._pop_con_id_request(req_id)
+        if leg_key is None:
+            return
+        logger.warning(f"Contract details for combo leg {leg_key} failed (reqId={req_id}, error {error_code})")
+        for request in [queued for queued in self._combo_queue if leg_key in queued['leg_keys']]:
+            self._expire_combo_request(request)
+    
+    def _pop_con_id_request(self, req_id: int) -> Optional[str]:
+        """Forget a leg conId request - returns its leg key (None if unknown or already finished)"""
+        leg_key = self._con_id_requests.pop(req_id, None)
+        if leg_key is not None and self._con_id_pending.get(leg_key) == req_id:
+            del self._con_id_pending[leg_key]
+        return leg_key
+    
+    def _expire_combo_request(self, request: dict):
+        """Leg conIds did not arrive in time (or their request failed) - place the legs as separate orders instead"""
+        if not any(queued is request for queued in self._combo_queue):
+            return  # Already sent as a combo
+        self._combo_queue = [queued for queued in self._combo_queue if queued is not request]
+        
+        # Stop waiting on this combo's lookups, so a later combo with the same legs asks again
+        still_needed = {key for queued in self._combo_queue for key in queued['leg_keys']}
+        for leg_key in request['leg_keys']:
+            if leg_key not in still_needed and leg_key in self._con_id_pending:
+                self._pop_con_id_request(self._con_id_pending[leg_key])
+        
+        action, quantity = request['action'], request['quantity']
+        self.log_message(
+            f"⚠️ Combo legs unresolved after {time.monotonic() - request['queued_at']:.1f}s - "
+            f"placing {len(request['leg_keys'])} separate {action} orders",
+            "WARNING"
+        )
+        for leg_key in request['leg_keys']:
+            leg_price = 0.0
+            if request['limit_price'] > 0:
+                leg_price = self.calculate_mid_price(leg_key)
+                if leg_price == 0:
+                    self.log_message(f"✗ No mid price for {leg_key} - leg not placed", "ERROR")
+                    continue
+            order_id = self.place_order(leg_key, action, quantity, leg_price,
+                                        enable_chasing=request['enable_chasing'],
+                                        is_automated=request['is_automated'],
+                                        mid_price=request['leg_mids'].get(leg_key, 0))
+            if order_id and request['on_placed']:
+                request['on_placed'](leg_key, order_id)
+    
+    def _send_combo_order(self, request: dict) -> Optional[int]:
+        """Build the BAG contract for a combo request with resolved legs and place it"""
+        leg_keys, action, quantity = request['leg_keys'], request['action'], request['quantity']
+        limit_price, is_automated = request['limit_price'], request['is_automated']
+        
+        # Closing legs that have IB-side exits working: send once IB confirms them cancelled (see place_order)
+        if action == "SELL" and self._hold_for_native_exits(
+                leg_keys, f"combo SELL {quantity} placed", lambda: self._send_combo_order(request)):
+            self.log_message(f"⏳ Combo SELL {quantity}x {make_combo_key(leg_keys)} held until IB confirms "
+                             f"the legs' IB-side exits are cancelled", "INFO")
+            return None
+        records = [self.contract_registry.lookup(leg_key) for leg_key in leg_keys]
+        
+        first = records[0]
+        leg_contract = first.contract or self.create_instrument_option_contract(
+            strike=first.strike, right=first.right, expiry=first.expiry
+        )
+        contract = Contract()
+        contract.symbol = leg_contract.symbol
+        contract.secType = "BAG"
+        contract.currency = "USD"
+        contract.exchange = leg_contract.exchange
+        contract.comboLegs = []
+        for record in records:
+            leg = ComboLeg()
+            leg.conId = record.con_id
+            leg.ratio = 1
+            leg.action = "BUY"  # Order action BUY buys every leg, SELL sells every leg
+            leg.exchange = leg_contract.exchange
+            contract.comboLegs.append(leg)
+        
+        order = self.build_order(action, quantity, limit_price, is_automated)
+        combo_key = make_combo_key(leg_keys)
+        order_id = self.app_state.get('next_order_id', 1)
+        self.app_state['next_order_id'] = order_id + 1
+        
+        logger.info(
+            f"PLACING COMBO ORDER #{order_id}: {action} {quantity}x {combo_key} | "
+            f"legs {[record.con_id for record in records]} | "
+            f"{'MKT' if limit_price == 0 else f'LMT ${limit_price:.2f}'} | chasing={request['enable_chasing']}"
+        )
+        
+        try:
+            self.ibkr_client.placeOrder(order_id, contract, order)
+        except Exception as e:
+            self.log_message(f"❌ EXCEPTION during combo placeOrder(): {e}", "ERROR")
+            logger.error(f"❌ Combo order #{order_id} was NOT sent to TWS: {e}", exc_info=True)
+            return None
+        
+        self.log_message(
+            f"✅ Combo order #{order_id} sent: {action} {quantity}x {combo_key} @ "
+            f"{'MKT' if limit_price == 0 else f'${limit_price:.2f}'}",
+            "SUCCESS"
+        )
+        if hasattr(self, 'ts_signals'):
+            self.ts_signals.ts_activity.emit(
+                f"📤 COMBO ORDER PLACED: #{order_id} | {action} {quantity}x {combo_key}"
+            )
+        
+        self._track_order(order_id, combo_key, action, quantity, limit_price, is_automated,
+                          request['mid_price'], contract, order, request['enable_chasing'],
+                          legs=dict(request['leg_mids']))
+        if request['on_placed']:
+            request['on_placed'](combo_key, order_id)
+        return order_id
+    
+    @pyqtSlot(int, str, float, float)
+    def on_combo_leg_execution(self, order_id: int, leg_key: str, shares: float, price: float):
+        """Leg execution of a working combo (from execDetails) - kept until the combo's fill is booked"""
+        self._combo_leg_executions.setdefault(order_id, {}).setdefault(leg_key, []).append((shares, price))
+    
+    def _combo_leg_fills(self, working: WorkingOrder, avg_fill_price: float) -> List[Tuple[str, float, float]]:
+        """(leg_key, leg fill price, leg mid at placement) for a filled combo"""
+        executions = self._combo_leg_executions.pop(working.order_id, {})
+        total_mid = sum(working.legs.values())
+        fills = []
+        for leg_key, leg_mid in working.legs.items():
+            leg_executions = executions.get(leg_key)
+            if leg_executions:
+                shares = sum(leg_shares for leg_shares, _ in leg_executions)
+                price = sum(leg_shares * leg_price for leg_shares, leg_price in leg_executions) / shares
+            elif total_mid > 0:
+                # Leg executions not seen yet - split the combo price in proportion to the placement mids
+                price = avg_fill_price * leg_mid / total_mid
+            else:
+                price = avg_fill_price / len(working.legs)
+            fills.append((leg_key, price, leg_mid))
+        return fills
+    
     # ========================================================================
     # MID-PRICE CHASING SYSTEM (Item 3)
     # ========================================================================
@@ -10649,15 +14656,10 @@ class MainWindow(QMainWindow):
     
     def calculate_mid_price(self, contract_key: str) -> float:
         """
-        Calculate mid-price from current bid/ask with proper rounding
+        Calculate mid-price from current bid/ask with proper rounding (combo keys: summed leg quotes)
         Returns 0 if no valid market data available
         """
-        if contract_key not in self.market_data:
-            return 0.0
-        
-        data = self.market_data[contract_key]
-        bid = data.get('bid', 0)
-        ask = data.get('ask', 0)
+        bid, ask = self.get_bid_ask(contract_key)
         
         if bid <= 0 or ask <= 0:
             return 0.0
@@ -10680,30 +14682,18 @@ class MainWindow(QMainWindow):
             # Convert max risk to per-contract price ($500 = $5.00)
             max_price = max_risk_dollars / 100.0
             
-            best_option = None
             best_price = 0.0
             best_contract_key = None
             
             logger.info(f"Scanning for {option_type} option with ask ≤ ${max_price:.2f}...")
             
-            for contract_key, data in self.market_data.items():
-                # Check if this is the right option type and expiry
-                if f'_{option_type}_' not in contract_key:
-                    continue
-                
-                if self.current_expiry not in contract_key:
-                    continue
-                
-                ask = data.get('ask', 0)
-                
-                # Must have valid ask price
-                if ask <= 0 or ask > max_price:
-                    continue
-                
-                # Find the option closest to max price (maximum value without exceeding)
-                if ask > best_price:
-                    best_price = ask
-                    best_contract_key = contract_key
+            # Bisect the current expiry's ask index:
+            # option closest to max price (maximum valid ask without exceeding it)
+            chain = self.market_data.chain(self.current_expiry, option_type)
+            slot = chain.max_ask_slot(max_price) if chain is not None else None
+            if slot is not None:
+                best_price = float(chain.rows['ask'][slot])
+                best_contract_key = chain.keys[slot]
             
             if best_contract_key:
                 multiplier = int(self.instrument['multiplier'])
@@ -10739,40 +14729,20 @@ class MainWindow(QMainWindow):
             # Convert target delta to decimal (30 -> 0.30)
             target_delta_decimal = abs(target_delta / 100.0)
             
-            best_delta_diff = float('inf')
-            best_option = None
             best_contract_key = None
             best_price = 0
             best_delta = 0
             
-            # Scan all options in market_data for current expiry
-            for contract_key, data in self.market_data.items():
-                # Skip if wrong option type
-                if f'_{option_type}_' not in contract_key:
-                    continue
-                
-                # Skip if wrong expiry
-                if self.current_expiry not in contract_key:
-                    continue
-                
-                # Must have valid greeks
-                delta = data.get('delta')
-                if delta is None or delta == 0:
-                    continue
-                
-                # For puts, delta is negative - use absolute value
-                abs_delta = abs(delta)
-                
-                # Find closest to target delta
-                delta_diff = abs(abs_delta - target_delta_decimal)
-                
-                if delta_diff < best_delta_diff:
-                    ask = data.get('ask', 0)
-                    if ask > 0:  # Must have valid ask price
-                        best_delta_diff = delta_diff
-                        best_contract_key = contract_key
-                        best_price = ask
-                        best_delta = abs_delta * 100  # Convert back to 0-100 scale
+            # Bisect the current expiry's |delta| index
+            # Must have valid greeks (delta != 0) and a valid ask price
+            # For puts, delta is negative - |delta| is compared to the target
+            chain = self.market_data.chain(self.current_expiry, option_type)
+            best = chain.closest_delta_slot(target_delta_decimal, strict=False, require_ask=True) if chain is not None else None
+            if best is not None:
+                slot = best[0]
+                best_contract_key = chain.keys[slot]
+                best_price = float(chain.rows['ask'][slot])
+                best_delta = abs(float(chain.rows['delta'][slot])) * 100  # Convert back to 0-100 scale
             
             if best_contract_key:
                 logger.info(
@@ -10791,12 +14761,73 @@ class MainWindow(QMainWindow):
     
     def update_orders(self):
         """
-        Monitor all orders with intelligent mid-price chasing and time-based "give in" logic
+        Chase-deadline timer slot: reprice every chasing order whose deadline has come due
         
-        Runs every 1 second to check if:
-        1. Order is still open (not filled/cancelled)
-        2. Every N seconds without fill → increment X_ticks by 1, recalculate: current_mid ± X_ticks
-        3. Mid-price updates always use current market mid (not sticky to initial mid)
+        The chaser is event-driven (no polling loop):
+        1. Quote ticks - chase_contracts() reprices working orders the moment their mid moves
+        2. Deadlines - _chase_deadlines is a min-heap of (monotonic wake time, order_id); one
+           precise single-shot timer is armed for the earliest entry
+        
+        An order's deadline is its next give-in (every chase_give_in_interval seconds), or the
+        end of the IB rate-limit window when a reprice was due but blocked by it. Rescheduling
+        pushes a new entry and leaves the old one in the heap - entries whose time no longer
+        matches the order's 'wake_at' are stale and skipped when popped.
+        """
+        now = time.monotonic()
+        heap = self._chase_deadlines
+        while heap and heap[0][0] <= now:
+            wake_at, order_id = heapq.heappop(heap)
+            order_info = self.chasing_orders.get(order_id)
+            if order_info is None or order_info.wake_at != wake_at:
+                continue  # Stale entry (order gone or rescheduled)
+            order_info.wake_at = None
+            self._chase_order(order_id, now)
+        self._arm_chase_timer()
+    
+    def chase_contracts(self, contract_keys):
+        """Reprice chasing orders on the given contracts (called with every batch of quote ticks)"""
+        if not self.chasing_orders:
+            return
+        now = None
+        for contract_key in contract_keys:
+            if not self.pending_orders.has_contract(contract_key) and not self.pending_orders.has_leg(contract_key):
+                continue
+            if now is None:
+                now = time.monotonic()
+            # Orders on the contract itself, plus combos that have it as a leg
+            for working in self.pending_orders.select(contract_key=contract_key) + self.pending_orders.combos_on(contract_key):
+                if working.order_id in self.chasing_orders:
+                    self._chase_order(working.order_id, now)
+        if now is not None:
+            self._arm_chase_timer()
+    
+    def _schedule_chase(self, order_id: int, wake_at: Optional[float]):
+        """Set an order's next chase deadline (None = wait for the next quote tick)"""
+        order_info = self.chasing_orders[order_id]
+        if order_info.wake_at == wake_at:
+            return
+        order_info.wake_at = wake_at
+        if wake_at is not None:
+            heapq.heappush(self._chase_deadlines, (wake_at, order_id))
+    
+    def _arm_chase_timer(self):
+        """Point chase_timer at the earliest live deadline (drops stale heap heads)"""
+        heap = self._chase_deadlines
+        while heap:
+            wake_at, order_id = heap[0]
+            order_info = self.chasing_orders.get(order_id)
+            if order_info is not None and order_info.wake_at == wake_at:
+                break
+            heapq.heappop(heap)
+        if not heap:
+            self.chase_timer.stop()
+            return
+        delay_ms = max(0, math.ceil((heap[0][0] - time.monotonic()) * 1000))
+        self.chase_timer.start(delay_ms)
+    
+    def _chase_order(self, order_id: int, now: float):
+        """
+        Reprice one chasing order with mid-price tracking and time-based "give in" logic
         
         "Give in" logic: Price is ALWAYS current_mid ± X_ticks
         - X_ticks starts at 0 (initial order at pure mid)
@@ -10807,161 +14838,154 @@ class MainWindow(QMainWindow):
         - For SELL: price = mid - X_ticks (creeping toward bid)
         - Uses SPX tick size rules (≥$3.00→$0.10, <$3.00→$0.05)
         - Interval is configurable in Settings (default 3.0 seconds)
+        - Mid-price updates always use current market mid (not sticky to initial mid)
         
         IB COMPLIANCE:
         - Hard minimum 2.0 seconds between ANY order modifications (enforced by min_order_modification_interval)
-        - This overrides all other logic to ensure we never violate IB rate limits
+        - A reprice blocked by it is not dropped - the order is re-evaluated when the window opens
         """
-        if not self.chasing_orders:
-            # No orders to monitor - stop timer
-            if hasattr(self, '_chasing_timer_running'):
-                self._chasing_timer_running = False
+        order_info = self.chasing_orders.get(order_id)
+        if order_info is None:
             return
         
-        logger.debug(f"update_orders: Monitoring {len(self.chasing_orders)} chasing orders")
-        orders_to_remove = []
+        # Check if order is still pending
+        if order_id not in self.pending_orders:
+            # Order was filled or cancelled - stop monitoring
+            logger.info(f"Order #{order_id} no longer pending, stopping chase")
+            self._stop_chasing(order_id, "No longer pending")
+            return
         
-        for order_id, order_info in list(self.chasing_orders.items()):
-            # Check if order is still pending
-            if order_id not in self.pending_orders:
-                # Order was filled or cancelled - stop monitoring
-                logger.info(f"Order #{order_id} no longer pending, stopping chase")
-                orders_to_remove.append(order_id)
-                continue
-            
-            contract_key = order_info['contract_key']
-            current_mid = self.calculate_mid_price(contract_key)
-            
-            if current_mid == 0:
-                logger.warning(f"Order #{order_id}: No valid mid-price for {contract_key} - skipping update")
-                continue  # No valid market data
-            
-            last_price = order_info.get('last_price', order_info['last_mid'])
-            action = order_info['action']
-            
-            # Get market data for ask/bid
-            market_data = self.market_data.get(contract_key, {})
-            ask_price = market_data.get('ask', 0)
-            bid_price = market_data.get('bid', 0)
-            
-            # Determine tick size based on current mid price (from instrument configuration)
-            if current_mid >= 3.0:
-                tick_size = self.instrument['tick_size_above_3']
-            else:
-                tick_size = self.instrument['tick_size_below_3']
-            
-            should_update = False
-            update_reason = ""
-            
-            # IB COMPLIANCE CHECK: Hard minimum 2.0 seconds between ANY order modifications
-            # This is the overriding rule that ensures we never violate IB rate limits
-            last_modification_time = order_info.get('timestamp', order_info.get('last_give_in_time', datetime.now()))
-            time_since_last_modification = (datetime.now() - last_modification_time).total_seconds()
-            
-            if time_since_last_modification < self.min_order_modification_interval:
-                # Too soon since last modification - skip this order
-                continue
-            
-            # TIME-BASED GIVE-IN LOGIC
-            # Calculate how much time has elapsed since last give-in adjustment
-            last_give_in_time = order_info.get('last_give_in_time', order_info['timestamp'])
-            time_since_last_give_in = (datetime.now() - last_give_in_time).total_seconds()
-            
-            # Get current give-in tick count
-            give_in_ticks = order_info.get('give_in_count', 0)
-            
-            # Check if we should add another tick based on elapsed time
-            # Using chase_give_in_interval (configurable, default 3.0 seconds)
-            if time_since_last_give_in >= self.chase_give_in_interval:
-                # Time to give in another tick
-                give_in_ticks += 1
-                order_info['give_in_count'] = give_in_ticks
-                order_info['last_give_in_time'] = datetime.now()  # Update last give-in time
-                should_update = True
-                update_reason = f"Time-based give-in (every {self.chase_give_in_interval:.1f}s) → X_ticks={give_in_ticks}"
-            
-            # MID-PRICE TRACKING: Recalculate price with current mid (not sticky to old mid)
-            # This ensures we track the market even without giving in more ticks
-            # Check if mid-price has moved significantly (use minimum tick size as threshold)
-            min_tick = min(self.instrument['tick_size_above_3'], self.instrument['tick_size_below_3'])
-            if abs(current_mid - order_info['last_mid']) >= min_tick:
-                should_update = True
-                if update_reason:
-                    update_reason += f" + Mid moved ${order_info['last_mid']:.2f}→${current_mid:.2f}"
-                else:
-                    update_reason = f"Mid moved ${order_info['last_mid']:.2f}→${current_mid:.2f}"
+        contract_key = order_info.contract_key
+        current_mid = self.calculate_mid_price(contract_key)
+        
+        if current_mid == 0:
+            # No valid market data - the next quote tick re-evaluates the order
+            logger.debug(f"Order #{order_id}: No valid mid-price for {contract_key} - waiting for quotes")
+            self._schedule_chase(order_id, None)
+            return
+        
+        # Anything to do? Give-in deadline reached and/or mid moved by at least one tick
+        give_in_due = now >= order_info.give_in_due
+        min_tick = min(self.instrument['tick_size_above_3'], self.instrument['tick_size_below_3'])
+        mid_moved = abs(current_mid - order_info.last_mid) >= min_tick - 1e-9  # 1.50 - 1.4500000000000002 < 0.05
+        if not give_in_due and not mid_moved:
+            self._schedule_chase(order_id, order_info.give_in_due)
+            return
+        
+        # IB COMPLIANCE CHECK: Hard minimum 2.0 seconds between ANY order modifications
+        # This is the overriding rule - wake up exactly when the window opens instead of skipping
+        modify_allowed_at = order_info.modified_at + self.min_order_modification_interval
+        if now < modify_allowed_at:
+            self._schedule_chase(order_id, modify_allowed_at)
+            return
+        
+        last_price = order_info.last_price
+        action = order_info.action
+        
+        # Get market data for ask/bid (combos: summed leg quotes)
+        bid_price, ask_price = self.get_bid_ask(contract_key)
+        
+        # Determine tick size based on current mid price (from instrument configuration)
+        if current_mid >= 3.0:
+            tick_size = self.instrument['tick_size_above_3']
+        else:
+            tick_size = self.instrument['tick_size_below_3']
+        
+        # TIME-BASED GIVE-IN LOGIC (chase_give_in_interval, configurable, default 3.0 seconds)
+        give_in_ticks = order_info.give_in_count
+        update_reason = ""
+        if give_in_due:
+            give_in_ticks += 1
+            order_info.give_in_count = give_in_ticks
+            order_info.give_in_due = now + self.chase_give_in_interval
+            update_reason = f"Time-based give-in (every {self.chase_give_in_interval:.1f}s) → X_ticks={give_in_ticks}"
+        
+        # MID-PRICE TRACKING: Recalculate price with current mid (not sticky to old mid)
+        if mid_moved:
+            mid_reason = f"Mid moved ${order_info.last_mid:.2f}→${current_mid:.2f}"
+            update_reason = f"{update_reason} + {mid_reason}" if update_reason else mid_reason
+        
+        # Calculate new price: ALWAYS current_mid ± (give_in_ticks * tick_size)
+        if action == "BUY":
+            # Buy: mid + X_ticks (creep toward ask)
+            new_price = self.round_to_option_tick(
+                current_mid + (give_in_ticks * tick_size)
+            )
+            # Don't exceed ask price
+            if ask_price > 0 and new_price > ask_price:
+                new_price = ask_price
+            price_formula = f"${current_mid:.2f} + ({give_in_ticks} × ${tick_size:.2f}) = ${new_price:.2f}"
+        else:  # SELL
+            # Sell: mid - X_ticks (creep toward bid)
+            new_price = self.round_to_option_tick(
+                current_mid - (give_in_ticks * tick_size)
+            )
+            # Don't go below bid price
+            if bid_price > 0 and new_price < bid_price:
+                new_price = bid_price
+            price_formula = f"${current_mid:.2f} - ({give_in_ticks} × ${tick_size:.2f}) = ${new_price:.2f}"
+        
+        # Update the order if the price actually changed
+        if new_price != last_price:
+            logger.info(f"Order #{order_id}: {update_reason} | {price_formula}")
             
-            # Calculate new price: ALWAYS current_mid ± (give_in_ticks * tick_size)
-            if action == "BUY":
-                # Buy: mid + X_ticks (creep toward ask)
-                new_price = self.round_to_option_tick(
-                    current_mid + (give_in_ticks * tick_size)
-                )
-                # Don't exceed ask price
-                if ask_price > 0 and new_price > ask_price:
-                    new_price = ask_price
-                price_formula = f"${current_mid:.2f} + ({give_in_ticks} × ${tick_size:.2f}) = ${new_price:.2f}"
-            else:  # SELL
-                # Sell: mid - X_ticks (creep toward bid)
-                new_price = self.round_to_option_tick(
-                    current_mid - (give_in_ticks * tick_size)
+            try:
+                # Use the stored contract and order fields (don't recreate - causes "Error 105: order mismatch").
+                # Reprice a copy: the previous placeOrder may still be queued in the pacer holding the
+                # stored object, and must go out with the price it was sent with
+                contract = order_info.contract
+                order = copy.copy(order_info.order)
+                old_price = order.lmtPrice
+                order.lmtPrice = new_price
+                
+                # Modify order (same order_id, same order fields, new limit price)
+                self.ibkr_client.placeOrder(order_id, contract, order)
+                order_info.order = order
+                
+                # Update tracking
+                order_info.last_mid = current_mid  # Track current mid
+                order_info.last_price = new_price  # Track actual order price
+                order_info.modified_at = now  # Reset window for IB rate limit compliance
+                order_info.attempts += 1
+                
+                # Update orders display
+                self.update_orders_display()
+                self.update_ts_orders_display()
+                
+                logger.info(f"✓ Order #{order_id} updated ${old_price:.2f} → ${new_price:.2f} (X_ticks={give_in_ticks})")
+                self.log_message(
+                    f"Order #{order_id}: ${new_price:.2f} | X_ticks={give_in_ticks} | {update_reason}",
+                    "INFO"
                 )
-                # Don't go below bid price
-                if bid_price > 0 and new_price < bid_price:
-                    new_price = bid_price
-                price_formula = f"${current_mid:.2f} - ({give_in_ticks} × ${tick_size:.2f}) = ${new_price:.2f}"
-            
-            # Update the order if needed (price changed OR timer triggered OR mid moved)
-            if should_update and new_price != last_price:
-                logger.info(f"Order #{order_id}: {update_reason} | {price_formula}")
                 
-                try:
-                    # Use the stored contract and order objects (don't recreate - causes "Error 105: order mismatch")
-                    contract = order_info['contract']
-                    order = order_info['order']
-                    
-                    # CRITICAL: Modify the order's limit price IN THE ORDER OBJECT
-                    old_price = order.lmtPrice
-                    order.lmtPrice = new_price
-                    logger.info(f"Order #{order_id}: Updating order object lmtPrice: ${old_price:.2f} → ${new_price:.2f}")
-                    
-                    # Modify order (use same order_id with original order object)
-                    self.ibkr_client.placeOrder(order_id, contract, order)
-                    logger.info(f"Order #{order_id}: placeOrder() called successfully with new price ${new_price:.2f}")
-                    
-                    # Update tracking (CRITICAL: Store updated order object back)
-                    order_info['order'] = order  # Store the modified order object
-                    order_info['last_mid'] = current_mid  # Track current mid
-                    order_info['last_price'] = new_price  # Track actual order price
-                    order_info['timestamp'] = datetime.now()  # Reset timer for IB rate limit compliance
-                    order_info['attempts'] += 1
-                    
-                    # Update orders display
-                    self.update_orders_display()
-                    self.update_ts_orders_display()
-                    
-                    logger.info(f"✓ Order #{order_id} updated to ${new_price:.2f} (X_ticks={give_in_ticks})")
-                    self.log_message(
-                        f"Order #{order_id}: ${new_price:.2f} | X_ticks={give_in_ticks} | {update_reason}",
-                        "INFO"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Error updating order #{order_id}: {e}", exc_info=True)
-                    self.log_message(f"⚠️ Order #{order_id} update failed: {e}", "WARNING")
-        
-        # Remove filled/cancelled orders from monitoring
-        for order_id in orders_to_remove:
-            if order_id in self.chasing_orders:
-                del self.chasing_orders[order_id]
+            except Exception as e:
+                logger.error(f"Error updating order #{order_id}: {e}", exc_info=True)
+                self.log_message(f"⚠️ Order #{order_id} update failed: {e}", "WARNING")
         
-        # Continue monitoring if orders remain
-        if self.chasing_orders:
-            QTimer.singleShot(1000, self.update_orders)
+        self._schedule_chase(order_id, order_info.give_in_due)
+    
+    def _stop_chasing(self, order_id: int, reason: str):
+        """Stop chasing an order and report its time-to-fill / modification count"""
+        order_info = self.chasing_orders.pop(order_id, None)
+        if order_info is None:
+            return
+        order_info.wake_at = None  # Its heap entries are now stale and get dropped when they reach the top
+        
+        elapsed = time.monotonic() - order_info.placed_at
+        modifications = order_info.attempts - 1
+        if reason == 'Filled':
+            if order_info.action == 'SELL':
+                self._local_exit_fill_times.append(elapsed)  # Baseline for native exit latency savings
+            summary = (f"Order #{order_id} filled in {elapsed:.1f}s | {modifications} modification(s), "
+                       f"X_ticks={order_info.give_in_count}, ${order_info.initial_mid:.2f} → ${order_info.last_price:.2f}")
+            logger.info(f"🏁 {summary}")
+            self.log_message(summary, "SUCCESS")
         else:
-            # No more orders - stop timer
-            if hasattr(self, '_chasing_timer_running'):
-                self._chasing_timer_running = False
+            logger.info(f"Order #{order_id} chase stopped ({reason}) after {elapsed:.1f}s | {modifications} modification(s)")
+        
+        if not self.chasing_orders:
+            self._chase_deadlines.clear()
+            self.chase_timer.stop()
     
     # ========================================================================
     # HISTORICAL DATA
@@ -11006,17 +15030,16 @@ class MainWindow(QMainWindow):
             # Use empty string for end_time to get most recent data
             end_time = ""  # Empty string means current time
             
-            self.ibkr_client.reqHistoricalData(
+            self.request_historical_bars(
                 req_id,
+                contract_key,
                 contract,
                 end_time,
                 "2 D",  # Duration
                 "5 mins",  # Bar size
                 "TRADES",  # What to show
                 0,  # Include after-hours data
-                1,  # Format date
                 True,  # Keep up to date - enables real-time bar updates via historicalDataUpdate
-                []
             )
             
             self.log_message(f"Requesting historical data for {contract_key}", "INFO")
@@ -11046,6 +15069,8 @@ class MainWindow(QMainWindow):
             if chasing_info:
                 current_price = chasing_info.get('last_price', chasing_info.get('last_mid', 0))
                 price_str = f"${current_price:.2f}"
+            elif order_info.get('stop_price', 0):
+                price_str = f"STP ${order_info['stop_price']:.2f}"
             elif order_info.get('price', 0) == 0:
                 price_str = "MKT"
             else:
@@ -11076,6 +15101,12 @@ class MainWindow(QMainWindow):
                 QTableWidgetItem("Cancel")
             ]
             
+            if chasing_info:
+                items[5].setToolTip(
+                    f"Working {time.monotonic() - chasing_info['placed_at']:.1f}s | "
+                    f"{chasing_info['attempts'] - 1} modification(s)"
+                )
+            
             for col, item in enumerate(items):
                 item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 
@@ -11857,6 +15888,10 @@ class MainWindow(QMainWindow):
                         f"${pnl:,.2f} / ${cost:,.2f}"
                     )
                     if pnl_pct >= self.ts_position_profit_target_pct:
+                        # IB-side take-profit is working this level - local close only as fallback
+                        if self._defer_to_native_exit(contract_key, 'TP'):
+                            continue
+                        
                         # Mark position as closing to prevent re-triggers
                         pos['is_closing'] = True
                         
@@ -11914,6 +15949,10 @@ class MainWindow(QMainWindow):
                     )
                     # Check for loss (negative P&L percentage)
                     if pnl_pct <= -self.ts_position_stop_loss_pct:
+                        # IB-side stop is working this level - local close only as fallback
+                        if self._defer_to_native_exit(contract_key, 'SL'):
+                            continue
+                        
                         # Mark position as closing to prevent re-triggers
                         pos['is_closing'] = True
                         
@@ -12073,6 +16112,326 @@ class MainWindow(QMainWindow):
         else:
             logger.debug("📊 SESSION STOP: Disabled")
     
+    # ========================================================================
+    # NATIVE (IB-SIDE) EXITS
+    # ========================================================================
+    
+    def attach_native_exits(self, contract_key: str, quantity: int, fill_price: float, entry_order_id: int):
+        """
+        Attach IB-side exits to a filled automated entry
+        
+        Take-profit LMT and/or STP (mid-point trigger) SELL orders, priced from the fill with
+        ts_position_profit_target_pct / ts_position_stop_loss_pct, in one OCA group so the
+        fill of one cancels the other at IB. A further entry fill on the same contract resizes
+        the existing group instead (_resize_native_exits).
+        """
+        if not (self.ts_use_position_profit_target or self.ts_use_position_stop_loss):
+            return
+        if quantity <= 0 or fill_price <= 0:
+            logger.warning(f"⚠️ NATIVE EXITS: no fill price/quantity for {contract_key} - local checker only")
+            return
+        if contract_key in self.native_exits:
+            self._resize_native_exits(contract_key, quantity, fill_price)
+            return
+        
+        legs = self._native_exit_levels(contract_key, fill_price)
+        group_name = f"{NATIVE_EXIT_OCA_PREFIX}_{contract_key}_{entry_order_id}"
+        orders = {}
+        for kind, price in legs:
+            order = self._build_native_exit_order(kind, quantity, price, group_name)
+            # Exit level doubles as the slippage reference for the fill
+            order_id = self.place_order(contract_key, "SELL", quantity, price, is_automated=True,
+                                        mid_price=price, order=order)
+            if order_id:
+                orders[order_id] = kind
+        
+        if not orders:
+            self.log_message(f"⚠️ IB-side exits for {contract_key} failed - local checker stays in charge", "WARNING")
+            return
+        self._register_native_exits(contract_key, group_name, orders, dict(legs), fill_price, quantity)
+        levels = " / ".join(f"{'Target' if kind == 'TP' else 'Stop'} ${price:.2f}" for kind, price in legs)
+        logger.info(f"🎯 NATIVE EXITS attached to #{entry_order_id} ({contract_key} x{quantity} @ ${fill_price:.2f}): "
+                    f"{levels} | OCA {group_name} orders {sorted(orders)}")
+        self.log_message(f"🎯 IB-side exits for {contract_key}: {levels} (OCA)", "SUCCESS")
+    
+    def _native_exit_levels(self, contract_key: str, fill_price: float) -> List[Tuple[str, float]]:
+        """('TP' / 'SL', exit level) for the enabled exits, priced from an entry fill"""
+        legs = []
+        if self.ts_use_position_profit_target:
+            legs.append(('TP', self.round_to_option_tick(fill_price * (1 + self.ts_position_profit_target_pct / 100.0))))
+        if self.ts_use_position_stop_loss:
+            stop_price = self.round_to_option_tick(fill_price * (1 - self.ts_position_stop_loss_pct / 100.0))
+            if stop_price > 0:
+                legs.append(('SL', stop_price))
+            else:
+                logger.info(f"NATIVE EXITS: stop for {contract_key} rounds to $0.00 - left to the local checker")
+        return legs
+    
+    def _build_native_exit_order(self, kind: str, quantity: int, price: float, group_name: str) -> Order:
+        """SELL child of an exit OCA group: LMT at the target, or STP (mid-point trigger) at the stop"""
+        order = self.build_order("SELL", quantity, price if kind == 'TP' else 0, is_automated=True)
+        if kind == 'SL':
+            order.orderType = "STP"
+            order.auxPrice = price
+            order.triggerMethod = NATIVE_EXIT_STOP_TRIGGER
+        order.ocaGroup = group_name
+        order.ocaType = NATIVE_EXIT_OCA_TYPE
+        return order
+    
+    def _resize_native_exits(self, contract_key: str, quantity: int, fill_price: float):
+        """
+        Another entry filled on a contract with live IB-side exits (scale-in, or an entry filled
+        over several orders): modify every child (same orderId) to the full position, priced from
+        the blended entry
+        """
+        group = self.native_exits[contract_key]
+        total = group['quantity'] + quantity
+        if group['entry_price'] > 0:
+            entry_price = (group['entry_price'] * group['quantity'] + fill_price * quantity) / total
+            prices = dict(self._native_exit_levels(contract_key, entry_price))
+        else:
+            # Adopted group (entry unknown) - keep its levels
+            entry_price, prices = 0.0, {}
+        
+        record = self.contract_registry.intern_key(contract_key)
+        contract = self.create_instrument_option_contract(strike=record.strike, right=record.right,
+                                                          expiry=record.expiry)
+        for order_id, kind in group['orders'].items():
+            price = prices.get(kind) or group['prices'][kind]
+            order = self._build_native_exit_order(kind, total, price, group['group'])
+            try:
+                self.ibkr_client.placeOrder(order_id, contract, order)
+            except Exception as e:
+                logger.error(f"Error resizing IB-side exit #{order_id}: {e}")
+                continue
+            group['prices'][kind] = price
+            working = self.pending_orders.get(order_id)
+            if working is not None:
+                working.quantity = total
+                if kind == 'SL':
+                    working.stop_price = price
+                else:
+                    working.price = price
+                working.mid_price = price
+        group['quantity'] = total
+        group['entry_price'] = entry_price
+        levels = " / ".join(f"{'Target' if kind == 'TP' else 'Stop'} ${group['prices'][kind]:.2f}"
+                            for kind in group['orders'].values())
+        logger.info(f"🎯 NATIVE EXITS resized for {contract_key}: x{total}"
+                    + (f" @ ${entry_price:.2f}" if entry_price else "")
+                    + f" | {levels} | orders {sorted(group['orders'])}")
+        self.log_message(f"🎯 IB-side exits for {contract_key} resized to {total}: {levels}", "SUCCESS")
+        self.update_orders_display()
+    
+    def _register_native_exits(self, contract_key: str, group_name: str, orders: Dict[int, str],
+                               prices: Dict[str, float], entry_price: float, quantity: int):
+        """Track a live OCA exit group (order_id -> 'TP'/'SL')"""
+        group = self.native_exits.get(contract_key)
+        if group is None:
+            group = self.native_exits[contract_key] = {
+                'group': group_name,
+                'orders': {},  # order_id -> 'TP' / 'SL' (live children only)
+                'prices': {},  # 'TP' / 'SL' -> exit level
+                'entry_price': entry_price,
+                'quantity': quantity,
+                'local_trigger_at': None,  # First local-checker trigger of the current streak
+                'local_trigger_seen': 0.0,
+            }
+        group['orders'].update(orders)
+        group['prices'].update(prices)
+        for order_id in orders:
+            self._native_exit_order_ids[order_id] = contract_key
+    
+    @pyqtSlot(int, str, str, str, float, int)
+    def adopt_native_exit(self, order_id: int, contract_key: str, group_name: str, order_type: str,
+                          price: float, quantity: int):
+        """Re-adopt an IB-side exit child reported by openOrder (e.g. after a restart)"""
+        if order_id in self._native_exit_order_ids:
+            return
+        kind = 'TP' if order_type == "LMT" else 'SL'
+        if order_id not in self.pending_orders:
+            self.pending_orders[order_id] = WorkingOrder(order_id, contract_key, "SELL", quantity,
+                                                         price=price if kind == 'TP' else 0.0,
+                                                         is_automated=True, mid_price=price,
+                                                         stop_price=price if kind == 'SL' else 0.0)
+            self.subscriptions.add_order(order_id, contract_key)
+        self._register_native_exits(contract_key, group_name, {order_id: kind}, {kind: price}, 0.0, quantity)
+        logger.info(f"🎯 NATIVE EXITS: adopted working {kind} #{order_id} for {contract_key} @ ${price:.2f} ({group_name})")
+        self.update_orders_display()
+    
+    def cancel_native_exits(self, contract_key: str, reason: str,
+                            then: Optional[Callable[[], object]] = None) -> bool:
+        """
+        Cancel a position's IB-side exit children (local exits take over)
+        
+        The children stay tracked until IB reports each one Cancelled (or Filled). `then` runs
+        once every cancel is confirmed - and is dropped if a child filled first.
+        
+        Returns:
+            True while cancels for contract_key are waiting on confirmation
+        """
+        group = self.native_exits.pop(contract_key, None)
+        pending = self._native_exit_cancels.get(contract_key)
+        if group is None and pending is None:
+            return False
+        if pending is None:
+            pending = self._native_exit_cancels[contract_key] = {
+                'awaiting': {},  # order_id -> 'TP' / 'SL', cancel sent, not yet confirmed
+                'then': [],  # Local exits held back until every cancel is confirmed
+                'filled': 0,  # Contracts a child sold before its cancel landed
+                'started_at': time.monotonic()
+            }
+        if group is not None:
+            for order_id, kind in group['orders'].items():
+                pending['awaiting'][order_id] = kind
+                try:
+                    self.ibkr_client.cancelOrder(order_id)
+                    working = self.pending_orders.get(order_id)
+                    if working is not None:
+                        working.cancel_requested = True
+                except Exception as e:
+                    logger.error(f"Error cancelling IB-side exit #{order_id}: {e}")
+            logger.info(f"🎯 NATIVE EXITS cancelling for {contract_key} ({reason}): orders {sorted(group['orders'])}")
+        if then is not None:
+            pending['then'].append(then)
+        return True
+    
+    def _hold_for_native_exits(self, contract_keys: List[str], reason: str, send: Callable[[], object]) -> bool:
+        """
+        Hold a SELL on contracts with IB-side exits until IB confirms every child cancelled
+        
+        Returns:
+            True if the SELL was held (`send` runs on confirmation), False if it can go out now
+        """
+        held = [key for key in contract_keys if key in self.native_exits or key in self._native_exit_cancels]
+        if not held:
+            return False
+        waiting = set(held)
+        
+        def release(key):
+            waiting.discard(key)
+            if not waiting:
+                send()
+        
+        for key in held:
+            self.cancel_native_exits(key, reason, then=lambda key=key: release(key))
+        return True
+    
+    def _defer_to_native_exit(self, contract_key: str, kind: str) -> bool:
+        """
+        Local checker hit a level that a live IB-side child is working.
+        
+        Returns True while IB should get the exit. After NATIVE_EXIT_FALLBACK_GRACE seconds of
+        continuous local triggers the children are cancelled; the local close goes ahead at the
+        first check after IB confirms them cancelled (never while a child could still fill).
+        """
+        if contract_key in self._native_exit_cancels:
+            return True
+        group = self.native_exits.get(contract_key)
+        if group is None or kind not in group['orders'].values():
+            return False
+        now = time.monotonic()
+        if group['local_trigger_at'] is None or now - group['local_trigger_seen'] > NATIVE_EXIT_TRIGGER_RESET:
+            group['local_trigger_at'] = now
+        group['local_trigger_seen'] = now
+        if now - group['local_trigger_at'] < NATIVE_EXIT_FALLBACK_GRACE:
+            return True
+        logger.warning(f"⚠️ NATIVE EXITS: {kind} for {contract_key} not filled {NATIVE_EXIT_FALLBACK_GRACE:.0f}s "
+                       f"after the local trigger - cancelling, local close once IB confirms")
+        self.cancel_native_exits(contract_key, "local fallback")
+        return True
+    
+    def _on_native_exit_cancel_done(self, contract_key: str, order_id: int, status: str, filled: int):
+        """Final orderStatus for a child being cancelled - release or drop the held local exits"""
+        pending = self._native_exit_cancels[contract_key]
+        kind = pending['awaiting'].pop(order_id)
+        waited_ms = (time.monotonic() - pending['started_at']) * 1000
+        if filled > 0:
+            pending['filled'] += filled
+            logger.warning(f"⚠️ NATIVE EXITS: {kind} #{order_id} for {contract_key} {status} x{filled} "
+                           f"before its cancel landed ({waited_ms:.0f} ms)")
+        else:
+            logger.info(f"NATIVE EXITS: {kind} #{order_id} for {contract_key} {status} ({waited_ms:.0f} ms after cancel)")
+        if pending['awaiting']:
+            return
+        del self._native_exit_cancels[contract_key]
+        
+        if pending['filled']:
+            # IB already sold (part of) the position - the held SELLs would sell it again.
+            # The next position update clears is_closing and the local checker re-evaluates what is left
+            logger.warning(f"⚠️ NATIVE EXITS: IB-side exit sold {pending['filled']} {contract_key} before the cancel - "
+                           f"{len(pending['then'])} held local exit(s) dropped")
+            self.log_message(f"⚠️ IB-side exit on {contract_key} filled before its cancel - local close dropped", "WARNING")
+            pos = self.positions.get(contract_key)
+            if pos is not None:
+                pos['is_closing'] = True
+            return
+        for then in pending['then']:
+            then()
+    
+    def _on_native_exit_status(self, order_id: int, status: str, status_data: dict):
+        """Final orderStatus for an IB-side exit child (a fill records the latency saved)"""
+        contract_key = self._native_exit_order_ids.pop(order_id, None)
+        if contract_key is None:
+            return
+        pending = self._native_exit_cancels.get(contract_key)
+        if pending is not None and order_id in pending['awaiting']:
+            self._on_native_exit_cancel_done(contract_key, order_id, status, int(status_data.get('filled', 0) or 0))
+            return
+        group = self.native_exits.get(contract_key)
+        if group is None:
+            return
+        kind = group['orders'].pop(order_id, None)
+        if not group['orders']:
+            del self.native_exits[contract_key]
+        if status != 'Filled':
+            logger.info(f"NATIVE EXITS: {kind} #{order_id} for {contract_key} {status}")
+            return
+        
+        # The local path would have noticed at the next 1 s checker run, then worked a chased close
+        detect_ms = max(self.position_update_timer.remainingTime(), 0)
+        work_ms = float(np.median(self._local_exit_fill_times)) * 1000 if self._local_exit_fill_times else 0.0
+        saved_ms = detect_ms + work_ms
+        self.native_exit_fills.append((contract_key, kind, saved_ms))
+        
+        fill_price = status_data.get('avgFillPrice', 0)
+        level = group['prices'].get(kind, 0)
+        label = "TAKE-PROFIT" if kind == 'TP' else "STOP"
+        logger.info(f"🎯 NATIVE {label} FILLED: {contract_key} @ ${fill_price:.2f} (level ${level:.2f}) | "
+                    f"est. {saved_ms:.0f} ms saved (detect {detect_ms:.0f} ms + chased close {work_ms:.0f} ms)")
+        self.log_message(f"🎯 IB-side {label.lower()} filled: {contract_key} @ ${fill_price:.2f} "
+                         f"(~{saved_ms:.0f} ms ahead of the local checker)", "SUCCESS")
+        
+        # Martingale win/loss is booked by log_pnl_to_csv when this fill is matched
+        pos = self.positions.get(contract_key)
+        if pos is not None:
+            pos['is_closing'] = True
+    
+    def update_native_exit_stats(self):
+        """Refresh IB-side exit label (live groups, latency saved per exit in tooltip)"""
+        if not hasattr(self, 'native_exit_label'):
+            return
+        fills = self.native_exit_fills
+        text = f"Native exits: {len(self.native_exits)}"
+        if fills:
+            text += f" | ~{sum(saved for _, _, saved in fills) / len(fills):.0f} ms saved"
+        self.native_exit_label.setText(text)
+        live = "\n".join(
+            f"  {key.replace('_', ' ')}: " + ", ".join(
+                f"{'Target' if kind == 'TP' else 'Stop'} ${group['prices'].get(kind, 0):.2f} (#{order_id})"
+                for order_id, kind in group['orders'].items())
+            for key, group in self.native_exits.items()
+        ) or "  none"
+        recent = "\n".join(
+            f"  {key.replace('_', ' ')} {'target' if kind == 'TP' else 'stop'}: ~{saved:.0f} ms"
+            for key, kind, saved in list(fills)[-10:]
+        ) or "  none yet"
+        self.native_exit_label.setToolTip(
+            f"IB-side OCA exits ({'ON' if self.ts_use_native_exits else 'OFF'})\n"
+            f"Live groups:\n{live}\n"
+            f"Latency saved per exit (next 1 s check + chased close, est.):\n{recent}"
+        )
+    
     def close_single_position(self, contract_key: str, reason: str):
         """Close a single position due to target/stop hit, but keep automation running for re-entry."""
         try:
@@ -12327,14 +16686,12 @@ class MainWindow(QMainWindow):
             return
         
         # PROTECTION: Check for pending exit orders for this contract
-        pending_exit_orders = []
-        for order_id, order_info in self.chasing_orders.items():
-            if order_info['contract_key'] == contract_key:
-                # Check if this is an exit order (opposite direction of position)
-                is_exit_order = (position_size > 0 and order_info['action'] == "SELL") or \
-                               (position_size < 0 and order_info['action'] == "BUY")
-                if is_exit_order:
-                    pending_exit_orders.append(order_id)
+        # Exit order = opposite direction of position
+        exit_action = "SELL" if position_size > 0 else "BUY"
+        pending_exit_orders = [
+            order.order_id for order in self.pending_orders.select(contract_key=contract_key, action=exit_action)
+            if order.order_id in self.chasing_orders
+        ]
         
         if pending_exit_orders:
             action_type = "SELL" if position_size > 0 else "BUY"
@@ -12622,16 +16979,52 @@ class MainWindow(QMainWindow):
             "INFO"
         )
         
-        # Enter CALL leg (uses Master Settings automatically)
-        self.log_message("Entering CALL leg...", "INFO")
-        self.manual_buy_call_automated()  # Call without user confirmation
+        # Select both legs like manual_buy_call_automated / manual_buy_put_automated
+        target_delta = self.target_delta_spin.value()
+        max_risk = self.max_risk_spin.value()
+        legs = []
+        for option_type in ("C", "P"):
+            result = self.find_option_by_delta(option_type, target_delta)
+            if not result:
+                self.log_message(f"No suitable {'call' if option_type == 'C' else 'put'} options found for straddle entry", "WARNING")
+                return
+            contract_key, ask_price, actual_delta = result
+            mid_price = self.calculate_mid_price(contract_key)
+            if mid_price == 0:
+                self.log_message(f"Cannot calculate mid price for {contract_key} - using ask price", "WARNING")
+                mid_price = ask_price
+            legs.append((contract_key, mid_price, actual_delta))
+        
+        # Both legs of a combo have the same size - by risk, the dearer leg sets it (each leg within max risk)
+        if self.position_size_mode == "fixed":
+            quantity = self.trade_qty_spin.value()
+        else:
+            quantity = max(1, int(max_risk / (max(mid for _, mid, _ in legs) * 100)))
         
-        # Small delay before PUT leg (500ms)
-        QTimer.singleShot(500, lambda: self.log_message("Entering PUT leg...", "INFO"))
-        QTimer.singleShot(1000, self.manual_buy_put_automated)  # 1 second delay
+        # Enter CALL + PUT as one combo order (no leg risk between the two fills)
+        leg_keys = [contract_key for contract_key, _, _ in legs]
+        combo_price = self.round_to_option_tick(sum(mid for _, mid, _ in legs))
+        # Tracked once an order id exists (the combo may wait on leg contract IDs, or fall back to legs)
+        self.place_combo_order(leg_keys, "BUY", quantity, combo_price, on_placed=self._track_straddle_order)
+        for (contract_key, mid_price, actual_delta), leg in zip(legs, ('CALL', 'PUT')):
+            self.log_message(f"  {leg}: {contract_key} Δ={actual_delta:.1f} (Mid: ${mid_price:.2f})", "INFO")
+        self.log_message(f"Straddle combo: {quantity} × ${combo_price:.2f}", "SUCCESS")
         
         self.log_message("=" * 60, "INFO")
     
+    def _track_straddle_order(self, contract_key: str, order_id: int):
+        """Record a placed straddle order - the combo, or one leg if it went out as separate orders"""
+        if combo_leg_keys(contract_key):
+            leg = 'STRADDLE'
+        else:
+            leg = 'CALL' if self.parse_contract_key(contract_key)[2] == 'C' else 'PUT'
+        self.active_straddles.append({
+            'contract_key': contract_key,
+            'order_id': order_id,
+            'leg': leg,
+            'timestamp': datetime.now()
+        })
+    
     def is_market_open(self) -> bool:
         """
         Check if market is currently open.
@@ -13028,12 +17421,13 @@ class MainWindow(QMainWindow):
     def refresh_confirm_chart(self):
         """Refresh the confirmation chart with current settings"""
         self.log_message(f"Refreshing confirmation chart (EMA={self.confirm_ema_length}, Z={self.confirm_z_period}±{self.confirm_z_threshold})", "INFO")
-        # TODO: Implement chart refresh logic when charts are integrated
+        # New EMA length / Z period recomputes the indicator engine once, then updates stay O(1)
+        self.update_underlying_charts_complete("ES_FUTURES_CONFIRM", immediate=True)
     
     def refresh_trade_chart(self):
         """Refresh the trade chart with current settings"""
         self.log_message(f"Refreshing trade chart (EMA={self.trade_ema_length}, Z={self.trade_z_period}±{self.trade_z_threshold})", "INFO")
-        # TODO: Implement chart refresh logic when charts are integrated
+        self.update_underlying_charts_complete(f"UNDERLYING_{self.instrument['underlying_symbol']}_TRADE", immediate=True)
     
     # ========================================================================
     # SETTINGS MANAGEMENT
@@ -13047,6 +17441,8 @@ class MainWindow(QMainWindow):
             self.strikes_below = self.strikes_below_settings_spin.value()
             self.chain_refresh_interval = self.chain_refresh_settings_spin.value()
             self.chain_drift_threshold = self.chain_drift_settings_spin.value()
+            self.tick_conflation_interval_ms = self.tick_conflation_spin.value()
+            self.market_data_line_budget = self.line_budget_spin.value()
             
             # Sync expired options settings
             self.expired_options_check_delay_minutes = self.expired_check_delay_spin.value()
@@ -13134,6 +17530,7 @@ class MainWindow(QMainWindow):
                 'ts_position_profit_target_pct': self.ts_position_profit_target_pct,
                 'ts_use_position_stop_loss': self.ts_use_position_stop_loss,
                 'ts_position_stop_loss_pct': self.ts_position_stop_loss_pct,
+                'ts_use_native_exits': self.ts_use_native_exits,
                 
                 # Session-level
                 'ts_use_session_account_target': self.ts_use_session_account_target,
@@ -13164,6 +17561,10 @@ class MainWindow(QMainWindow):
                 # Order Chasing Settings
                 'chase_give_in_interval': self.chase_give_in_interval,
                 
+                # Market Data Settings
+                'tick_conflation_interval_ms': self.tick_conflation_interval_ms,
+                'market_data_line_budget': self.market_data_line_budget,
+                
                 # Expired Options Settings
                 'expired_options_check_delay_minutes': self.expired_options_check_delay_minutes,
             }
@@ -13397,6 +17798,7 @@ class MainWindow(QMainWindow):
         Args:
             direction: 0=FLAT, 1=LONG, 2=SHORT (per user specification)
         """
+        signal_received_at = time.perf_counter()
         if not hasattr(self, 'ts_auto_trading_checkbox'):
             logger.debug("Auto-trading checkbox not initialized yet")
             return
@@ -13429,6 +17831,7 @@ class MainWindow(QMainWindow):
         
         # Store current strategy direction
         self.ts_strategy_direction = direction
+        self._ts_signal_received_at = signal_received_at
         
         # ALWAYS update UI to show current strategy state (even when automation is OFF)
         # Update strategy state display to show direction
@@ -13828,6 +18231,228 @@ class MainWindow(QMainWindow):
         
         return strategy_positions
     
+    # ========================================================================
+    # HOT-STANDBY ENTRY CANDIDATES
+    # ========================================================================
+    
+    def calculate_entry_quantity(self, mid_price: float, verbose: bool = True) -> int:
+        """
+        Automated entry size: base quantity (Fixed Qty or % Account) x Martingale multiplier
+        
+        Returns:
+            Number of contracts, or 0 if Martingale is stopped after max losses
+        """
+        # Step 1: Calculate initial/base quantity
+        if self.ts_use_fixed_quantity:
+            # Use fixed quantity setting
+            initial_quantity = self.ts_fixed_quantity
+            if verbose:
+                logger.info(f"📊 Base quantity (Fixed): {initial_quantity} contracts")
+        else:
+            # Calculate quantity based on % of account
+            account_value = self.ts_account_current_balance
+            if account_value > 0 and mid_price > 0:
+                # Calculate position value: % of account
+                target_dollar_amount = account_value * (self.ts_percent_of_account / 100.0)
+                # Calculate contracts: target $ / (option price * multiplier)
+                # Option price is per point, multiplier converts to total contract value
+                # Example: XSP option at $3.00 with multiplier 100 = $300 per contract
+                option_value_per_contract = mid_price * float(self.instrument['multiplier'])
+                calculated_qty = target_dollar_amount / option_value_per_contract
+                # Round to whole contracts, minimum 1
+                initial_quantity = max(1, int(calculated_qty))
+                if verbose:
+                    logger.info(f"📊 Base quantity (% Account): Account=${account_value:.2f}, Target={self.ts_percent_of_account}% (${target_dollar_amount:.2f}), "
+                                f"Option=${mid_price:.2f}/point, Multiplier={self.instrument['multiplier']}, "
+                                f"Value/Contract=${option_value_per_contract:.2f}, Calculated={calculated_qty:.2f}, Rounded={initial_quantity}")
+            else:
+                # Fallback to 1 contract if can't calculate
+                initial_quantity = 1
+                if verbose:
+                    logger.warning(f"⚠️ Cannot calculate position size (account={account_value}, price={mid_price}), using 1 contract")
+        
+        # Step 2: Apply Martingale if enabled
+        if not self.ts_use_martingale:
+            if verbose:
+                logger.info(f"📊 Final quantity (No Martingale): {initial_quantity} contracts")
+            return initial_quantity
+        
+        # Check if stopped due to max losses
+        if self.ts_martingale_stopped:
+            if verbose:
+                logger.warning(f"⛔ Martingale STOPPED: Reached max consecutive losses ({self.ts_martingale_max_losses})")
+                self.log_message(f"⛔ Martingale stopped after {self.ts_martingale_max_losses} consecutive losses", "WARNING")
+            return 0
+        
+        # Calculate Martingale quantity: initial * (2 ^ losses)
+        # This allows retroactive application if checkbox enabled mid-sequence
+        martingale_multiplier = 2 ** self.ts_martingale_consecutive_losses
+        quantity = initial_quantity * martingale_multiplier
+        if verbose:
+            logger.info(f"📊 Martingale ACTIVE: Base={initial_quantity}, Losses={self.ts_martingale_consecutive_losses}, "
+                        f"Multiplier={martingale_multiplier}x, Final Quantity={quantity} contracts")
+        return quantity
+    
+    def _entry_candidate_signature(self, expiry: str) -> tuple:
+        """Settings an entry candidate depends on besides market data (stale if any changes)"""
+        return (
+            expiry, self.ts_entry_delta, self.instrument['options_symbol'], self.app_state.get('account'),
+            self.ts_use_fixed_quantity, self.ts_fixed_quantity if self.ts_use_fixed_quantity else self.ts_percent_of_account,
+            None if self.ts_use_fixed_quantity else self.ts_account_current_balance,
+            self.ts_use_martingale, self.ts_martingale_consecutive_losses, self.ts_martingale_stopped,
+        )
+    
+    def _build_entry_candidate(self, direction: int, expiry: str, verbose: bool = False) -> Optional[EntryCandidate]:
+        """
+        Select (target delta), price (mid), size and build the entry order for one direction
+        
+        Hot-standby refreshes run quietly; the signal path builds verbosely (with the
+        user-facing error messages) when no fresh candidate is ready.
+        """
+        right = 'C' if direction == 1 else 'P'
+        direction_str = "LONG (Call)" if direction == 1 else "SHORT (Put)"
+        target_delta = self.ts_entry_delta / 100.0  # Convert to decimal (e.g., 30 -> 0.30)
+        
+        # Find strike closest to target delta
+        if verbose:
+            strike = self.find_strike_by_target_delta(expiry, right, target_delta)
+        else:
+            chain = self.market_data.chain(expiry, right)
+            best = chain.closest_delta_slot(target_delta) if chain is not None else None
+            strike = float(chain.rows['strike'][best[0]]) if best is not None else 0
+        if strike <= 0:
+            if verbose:
+                logger.error(f"Could not find strike with target delta {self.ts_entry_delta}")
+                self.log_message(f"❌ Cannot find {direction_str} at {self.ts_entry_delta}Δ", "ERROR")
+            return None
+        
+        # Build contract key with FLOAT strike (matches market data keys)
+        contract_key = f"{self.instrument['options_symbol']}_{strike}_{right}_{expiry}"
+        if verbose:
+            logger.info(f"🎯 Target contract: {contract_key}")
+        
+        # Mid price from current bid/ask (last price fallback)
+        market_data = self.market_data.get(contract_key, {})
+        bid = market_data.get('bid', 0)
+        ask = market_data.get('ask', 0)
+        if bid > 0 and ask > 0:
+            unrounded_mid = (bid + ask) / 2  # Store unrounded mid for slippage calculation
+            mid_price = self.round_to_option_tick(unrounded_mid)  # Rounded for order
+            if verbose:
+                logger.info(f"💰 MID PRICE CALC: bid={bid:.4f}, ask={ask:.4f}, unrounded_mid={unrounded_mid:.4f}, rounded_mid={mid_price:.4f}")
+        else:
+            last_price = market_data.get('last', 0)
+            unrounded_mid = last_price if last_price > 0 else 0
+            mid_price = self.round_to_option_tick(last_price) if last_price > 0 else 0
+            if verbose:
+                logger.warning(f"No bid/ask for {contract_key}, using last price")
+                logger.info(f"💰 MID PRICE FALLBACK: last={last_price:.4f}, unrounded_mid={unrounded_mid:.4f}, rounded_mid={mid_price:.4f}")
+        
+        if mid_price <= 0:
+            if verbose:
+                logger.error(f"No valid price for {contract_key}")
+                logger.error(f"Expiry values: 0DTE={self.ts_0dte_expiry}, 1DTE={self.ts_1dte_expiry}")
+                self.log_message(f"❌ Cannot enter {direction_str} - no market data for {contract_key}", "ERROR")
+            return None
+        
+        quantity = self.calculate_entry_quantity(mid_price, verbose=verbose)
+        if quantity <= 0:
+            return None
+        
+        # Reuse the interned contract (same object the chain subscribed with)
+        record = self.contract_registry.intern_key(contract_key)
+        if record is None:
+            return None
+        if record.contract is None:
+            record.contract = self.create_instrument_option_contract(strike=record.strike, right=right, expiry=expiry)
+        
+        order = self.build_order("BUY", quantity, mid_price, is_automated=True)
+        return EntryCandidate(direction, contract_key, strike, right, expiry, record.contract, order,
+                              mid_price, unrounded_mid, quantity, self._entry_candidate_signature(expiry))
+    
+    def refresh_entry_candidates(self, expiry: Optional[str] = None):
+        """
+        Re-evaluate the LONG/SHORT entry candidates for the active TS expiry
+        
+        Args:
+            expiry: Only refresh if this is the active TS expiry (tick-driven refresh)
+        """
+        if not self.ts_auto_trading_enabled or self.connection_state != ConnectionState.CONNECTED:
+            self.entry_candidates = {1: None, 2: None}
+            return
+        active_expiry = self._entry_standby_expiry
+        if not active_expiry or (expiry is not None and expiry != active_expiry):
+            return
+        for direction, enabled in ((1, self.ts_auto_long_enabled), (2, self.ts_auto_short_enabled)):
+            self.entry_candidates[direction] = (self._build_entry_candidate(direction, active_expiry)
+                                                if enabled else None)
+    
+    def take_entry_candidate(self, direction: int, expiry: str) -> Optional[EntryCandidate]:
+        """Hand out the direction's candidate if it is fresh and was built with current settings"""
+        candidate = self.entry_candidates.get(direction)
+        self.entry_candidates[direction] = None  # The Order object is owned by the chaser once sent
+        if candidate is None or candidate.expiry != expiry:
+            return None
+        if time.monotonic() - candidate.evaluated_at > ENTRY_STANDBY_MAX_AGE:
+            logger.info(f"Hot-standby {candidate.contract_key} is stale - rebuilding on signal")
+            return None
+        if candidate.signature != self._entry_candidate_signature(expiry):
+            logger.info(f"Hot-standby {candidate.contract_key} built with old settings - rebuilding on signal")
+            return None
+        return candidate
+    
+    def record_signal_latency(self, order_id: int, signal_time: float, hot: bool):
+        """Track signal-to-wire time for an entry order (completed once the pacer sends it)"""
+        self._signal_latency_pending[order_id] = (signal_time, hot)
+        self.collect_signal_latency()
+    
+    def collect_signal_latency(self):
+        """Move entry orders that reached the wire from pending into the latency tracker"""
+        now = time.perf_counter()
+        for order_id, (signal_time, hot) in list(self._signal_latency_pending.items()):
+            sent_at = self.ibkr_client.pop_order_sent_at(order_id)
+            if sent_at is not None:
+                latency_ms = (sent_at - signal_time) * 1000
+                self.signal_latency.add(latency_ms, hot)
+                del self._signal_latency_pending[order_id]
+                logger.info(f"⏱️ Signal-to-wire: order #{order_id} {latency_ms:.2f} ms ({'hot-standby' if hot else 'cold'})")
+            elif now - signal_time > SIGNAL_LATENCY_PENDING_MAX:
+                self.ibkr_client.forget_order_send(order_id)
+                del self._signal_latency_pending[order_id]
+    
+    def update_signal_latency_stats(self):
+        """Refresh hot-standby candidates (timer) and the signal-to-wire latency label"""
+        contract_type = self.get_ts_active_contract_type(log=False)
+        self._entry_standby_expiry = self.ts_0dte_expiry if contract_type == "0DTE" else self.ts_1dte_expiry
+        self.refresh_entry_candidates()
+        self.collect_signal_latency()
+        if not hasattr(self, 'signal_latency_label'):
+            return
+        stats = self.signal_latency.get_stats()
+        if stats['count']:
+            self.signal_latency_label.setText(
+                f"Signal→wire: p50 {stats['p50']:.1f} / p99 {stats['p99']:.1f} ms"
+            )
+        else:
+            self.signal_latency_label.setText("Signal→wire: --")
+        standby = "\n".join(
+            f"  {'LONG' if direction == 1 else 'SHORT'}: "
+            + (f"{candidate.contract_key.replace('_', ' ')} x{candidate.quantity} @ ${candidate.mid_price:.2f}"
+               if candidate is not None else "not ready")
+            for direction, candidate in self.entry_candidates.items()
+        )
+        latency = (
+            f"Last {stats['count']} entries: p50 {stats['p50']:.2f} ms, p95 {stats['p95']:.2f} ms, "
+            f"p99 {stats['p99']:.2f} ms, max {stats['max']:.2f} ms\n"
+            if stats['count'] else "No automated entries yet\n"
+        )
+        self.signal_latency_label.setToolTip(
+            "TS strategy signal → entry order sent to IBKR\n"
+            + latency
+            + f"Hot-standby entries: {stats['hot']} | Built on signal: {stats['cold']}\n"
+            + f"Hot-standby candidates ({self._entry_standby_expiry or 'no expiry'}):\n{standby}"
+        )
+    
     def _enter_automated_position(self, direction: int):
         """
         Enter a new automated position based on direction
@@ -13837,18 +18462,31 @@ class MainWindow(QMainWindow):
         
         CRASH RECOVERY: Checks for existing Strategy positions to prevent duplicates after restart
         
+        SIGNAL REVERSAL: Pending opposite-type entry orders are cancelled first. The entry then
+        continues asynchronously in _continue_reversal() once IBKR confirms every cancel
+        (orderStatus Cancelled/Filled) or reversal_cancel_timeout expires - the GUI thread never waits.
+        
         Args:
             direction: 1=LONG (buy call), 2=SHORT (buy put)
         """
+        # A reversal already waiting on cancels: same direction is a duplicate signal,
+        # a new direction supersedes it (its continuation is dropped)
+        if self._reversal is not None:
+            if self._reversal['direction'] == direction:
+                logger.info(f"⏳ SIGNAL REVERSAL: direction={direction} already waiting on cancel confirmation - skipping")
+                return
+            logger.warning(f"⚠️ SIGNAL REVERSAL superseded: direction {self._reversal['direction']} → {direction}")
+            self._reversal_stragglers.update(self._reversal['awaiting'])
+            self._reversal = None
+            self.reversal_timer.stop()
+        
         try:
             # Determine which type we're entering (CALL or PUT)
             if direction == 1:  # LONG: Buy CALL
-                right = 'C'
                 position_type = "CALL"
                 opposite_right = 'P'
                 opposite_type = "PUT"
             else:  # direction == 2, SHORT: Buy PUT
-                right = 'P'
                 position_type = "PUT"
                 opposite_right = 'C'
                 opposite_type = "CALL"
@@ -13868,46 +18506,65 @@ class MainWindow(QMainWindow):
             # ⚠️ CRITICAL SAFETY: Cancel any pending AUTOMATED orders of OPPOSITE type
             # If signal switches before fill (LONG->SHORT or SHORT->LONG), cancel the old order first
             if self.pending_orders:
-                opposite_orders_to_cancel = []
-                for order_id, order in list(self.pending_orders.items()):
-                    # Only check automated orders
-                    if not order.get('is_automated', False):
-                        continue
-                    # Only check BUY orders (entry orders)
-                    if order.get('action') != 'BUY':
-                        continue
-                    order_contract = order.get('contract_key', '')
-                    if order_contract:
-                        try:
-                            symbol, strike, order_right, expiry = self.parse_contract_key(order_contract)
-                            if order_right == opposite_right:  # Opposite type
-                                opposite_orders_to_cancel.append(order_id)
-                        except:
-                            pass
+                # Automated BUY (entry) orders of the opposite type, skipping ones an earlier reversal is cancelling
+                opposite_orders_to_cancel = [
+                    order.order_id for order in self.pending_orders.select(right=opposite_right, action='BUY', automated=True)
+                    if not order.cancel_requested
+                ]
                 
                 if opposite_orders_to_cancel:
                     logger.warning(f"⚠️ SIGNAL REVERSAL: Cancelling {len(opposite_orders_to_cancel)} pending {opposite_type} order(s) before entering {position_type}")
                     self.log_message(f"⚠️ Signal reversed - cancelling pending {opposite_type} order(s)", "WARNING")
+                    awaiting = {}
                     for order_id in opposite_orders_to_cancel:
                         try:
                             self.ibkr_client.cancelOrder(order_id)
-                            logger.info(f"   Cancelled order #{order_id}")
-                            # Remove from pending_orders immediately
-                            if order_id in self.pending_orders:
-                                contract_key = self.pending_orders[order_id].get('contract_key')
-                                del self.pending_orders[order_id]
-                                # Clean up market data subscription if no longer needed
-                                if contract_key:
-                                    self.cleanup_orphaned_subscription(contract_key)
-                            # Remove from chasing_orders if present
-                            if hasattr(self, 'chasing_orders') and order_id in self.chasing_orders:
-                                del self.chasing_orders[order_id]
+                            logger.info(f"   Cancel requested for order #{order_id}")
+                            # Stays in pending_orders until IBKR confirms - a fill racing the cancel
+                            # is then booked by on_order_status like any other fill
+                            self.pending_orders[order_id]['cancel_requested'] = True
+                            awaiting[order_id] = self.pending_orders[order_id].get('contract_key')
+                            # Stop repricing an order that is being cancelled
+                            if order_id in self.chasing_orders:
+                                self._stop_chasing(order_id, "Cancelled (reversal)")
                         except Exception as e:
                             logger.error(f"Error cancelling order #{order_id}: {e}")
                     
-                    # Give cancellation a moment to process
-                    import time
-                    time.sleep(0.5)
+                    if awaiting:
+                        # Continue the entry from the orderStatus callbacks (or the timeout)
+                        self._reversal = {
+                            'direction': direction,
+                            'awaiting': awaiting,  # order_id -> contract_key, not yet confirmed
+                            'filled': [],  # (contract_key, qty, avg_fill_price) filled before the cancel landed
+                            'started_at': time.monotonic()
+                        }
+                        self.reversal_timer.start(int(self.reversal_cancel_timeout * 1000))
+                        return
+        
+        except Exception as e:
+            logger.error(f"Error entering automated position: {e}", exc_info=True)
+            self.log_message(f"❌ Error entering position: {e}", "ERROR")
+            return
+        
+        self._place_automated_entry(direction)
+    
+    def _place_automated_entry(self, direction: int) -> Optional[int]:
+        """
+        Run the duplicate-entry safety checks and place the automated entry order
+        
+        Args:
+            direction: 1=LONG (buy call), 2=SHORT (buy put)
+        
+        Returns:
+            order_id of the entry order, or None if no order was placed
+        """
+        try:
+            if direction == 1:  # LONG: Buy CALL
+                right = 'C'
+                position_type = "CALL"
+            else:  # direction == 2, SHORT: Buy PUT
+                right = 'P'
+                position_type = "PUT"
             
             # ⚠️ CRASH RECOVERY CHECK #2: Check for existing Strategy positions of SAME type
             # This prevents duplicate entries after app restart when TS is still LONG/SHORT
@@ -13951,18 +18608,11 @@ class MainWindow(QMainWindow):
             # CRITICAL: Only block on automated orders, not manual orders
             if self.pending_orders:
                 # Count pending AUTOMATED entry orders (BUY orders) of the same type
-                same_type_orders = []
-                for order_id, order in self.pending_orders.items():
-                    # Only check automated orders
-                    if not order.get('is_automated', False):
-                        continue
-                    if order.get('action') == 'BUY':
-                        order_contract = order.get('contract_key', '')
-                        # Parse to check type
-                        if order_contract:
-                            symbol, strike, order_right, expiry = self.parse_contract_key(order_contract)
-                            if order_right == right:  # Same type
-                                same_type_orders.append(order_id)
+                # (orders being cancelled by a reversal don't count)
+                same_type_orders = [
+                    order.order_id for order in self.pending_orders.select(right=right, action='BUY', automated=True)
+                    if not order.cancel_requested
+                ]
                 
                 if same_type_orders:
                     logger.warning(f"⚠️ SAFETY: Already have {len(same_type_orders)} pending automated {position_type} entry order(s) - skipping entry")
@@ -13990,140 +18640,53 @@ class MainWindow(QMainWindow):
                 self.log_message("❌ Cannot enter trade - no ATM strike", "ERROR")
                 return
             
-            # Determine strike and right based on direction and target delta
-            if direction == 1:  # LONG: Buy CALL at target delta
-                right = 'C'
-                direction_str = "LONG (Call)"
-                target_delta = self.ts_entry_delta / 100.0  # Convert to decimal (e.g., 30 -> 0.30)
-            else:  # direction == 2, SHORT: Buy PUT at target delta
-                right = 'P'
-                direction_str = "SHORT (Put)"
-                target_delta = self.ts_entry_delta / 100.0  # Convert to decimal (e.g., 30 -> 0.30)
-            
-            # Find strike closest to target delta
-            strike = self.find_strike_by_target_delta(expiry, right, target_delta)
-            if strike <= 0:
-                logger.error(f"Could not find strike with target delta {self.ts_entry_delta}")
-                self.log_message(f"❌ Cannot find {direction_str} at {self.ts_entry_delta}Δ", "ERROR")
-                return
+            # Hot-standby candidate prepared on the last relevant tick; otherwise select/price/size now
+            direction_str = "LONG (Call)" if direction == 1 else "SHORT (Put)"
+            signal_time, self._ts_signal_received_at = self._ts_signal_received_at, None
+            candidate = self.take_entry_candidate(direction, expiry)
+            hot = candidate is not None
+            if hot:
+                logger.info(f"⚡ HOT-STANDBY entry: {candidate.contract_key} x{candidate.quantity} @ ${candidate.mid_price:.2f} "
+                            f"(evaluated {(time.monotonic() - candidate.evaluated_at) * 1000:.0f} ms ago)")
+            else:
+                candidate = self._build_entry_candidate(direction, expiry, verbose=True)
+                if candidate is None:
+                    return
             
             # CRITICAL: IB API CONVENTION - Strikes MUST remain as FLOAT type
             # Market data keys use FLOAT strikes (e.g., "XSP_686.0_C_20251111")
             # Never convert to int - this causes contract key mismatches
+            contract_key = candidate.contract_key
+            strike, right = candidate.strike, candidate.right
+            mid_price, unrounded_mid, quantity = candidate.mid_price, candidate.unrounded_mid, candidate.quantity
             
-            # Build contract key with FLOAT strike
-            contract_key = f"{self.instrument['options_symbol']}_{strike}_{right}_{expiry}"
-            
-            logger.info(f"🎯 Target contract: {contract_key}")
-            
-            # Log to signal history
-            contract_desc = contract_key.replace('_', ' ')
-            self.add_ts_signal_to_log(
-                signal_type=direction_str,
+            order_id = self.place_order(
+                contract_key=contract_key,
                 action="BUY",
-                contract=contract_desc,
-                status="Preparing",
-                fill_price=0.0,
-                details=f"Entry: {direction_str} at {self.ts_entry_delta}Δ"
+                quantity=quantity,
+                limit_price=mid_price,
+                enable_chasing=True,  # Enable mid-price chasing for automated entries
+                is_automated=True,  # Mark as automated order
+                mid_price=unrounded_mid,  # Store UNROUNDED mid price for accurate slippage calculation
+                contract=candidate.contract,
+                order=candidate.order,
+                watch_send=signal_time is not None
             )
+            if order_id and signal_time is not None:
+                self.record_signal_latency(order_id, signal_time, hot)
             
-            # Get market data for mid-price
-            market_data = self.market_data.get(contract_key, {})
-            bid = market_data.get('bid', 0)
-            ask = market_data.get('ask', 0)
-            
-            logger.info(f"📊 Market data for {contract_key}: bid={bid}, ask={ask}, has_data={contract_key in self.market_data}")
-            
-            if bid > 0 and ask > 0:
-                unrounded_mid = (bid + ask) / 2  # Store unrounded mid for slippage calculation
-                mid_price = self.round_to_option_tick(unrounded_mid)  # Rounded for order
-                logger.info(f"💰 MID PRICE CALC: bid={bid:.4f}, ask={ask:.4f}, unrounded_mid={unrounded_mid:.4f}, rounded_mid={mid_price:.4f}")
-            else:
-                logger.warning(f"No bid/ask for {contract_key}, using last price")
-                last_price = market_data.get('last', 0)
-                unrounded_mid = last_price if last_price > 0 else 0
-                mid_price = self.round_to_option_tick(last_price) if last_price > 0 else 0
-                logger.info(f"💰 MID PRICE FALLBACK: last={last_price:.4f}, unrounded_mid={unrounded_mid:.4f}, rounded_mid={mid_price:.4f}")
-            
-            if mid_price <= 0:
-                logger.error(f"No valid price for {contract_key}")
-                logger.error(f"Total contracts in market_data: {len(self.market_data)}")
-                logger.error(f"All 0DTE contracts: {[k for k in self.market_data.keys() if self.ts_0dte_expiry and self.ts_0dte_expiry in k]}")
-                logger.error(f"All 1DTE contracts: {[k for k in self.market_data.keys() if self.ts_1dte_expiry and self.ts_1dte_expiry in k]}")
-                logger.error(f"Expiry values: 0DTE={self.ts_0dte_expiry}, 1DTE={self.ts_1dte_expiry}")
-                self.log_message(f"❌ Cannot enter {direction_str} - no market data for {contract_key}", "ERROR")
-                return
-            
-            # Calculate position size based on user settings
-            # First calculate base quantity (from Fixed Qty or % Account)
-            # Then apply Martingale multiplier if enabled
-            
-            # Step 1: Calculate initial/base quantity
-            if self.ts_use_fixed_quantity:
-                # Use fixed quantity setting
-                initial_quantity = self.ts_fixed_quantity
-                logger.info(f"📊 Base quantity (Fixed): {initial_quantity} contracts")
-            else:
-                # Calculate quantity based on % of account
-                account_value = self.ts_account_current_balance
-                if account_value > 0 and mid_price > 0:
-                    # Calculate position value: % of account
-                    target_dollar_amount = account_value * (self.ts_percent_of_account / 100.0)
-                    # Calculate contracts: target $ / (option price * multiplier)
-                    # Option price is per point, multiplier converts to total contract value
-                    # Example: XSP option at $3.00 with multiplier 100 = $300 per contract
-                    option_value_per_contract = mid_price * float(self.instrument['multiplier'])
-                    calculated_qty = target_dollar_amount / option_value_per_contract
-                    # Round to whole contracts, minimum 1
-                    initial_quantity = max(1, int(calculated_qty))
-                    logger.info(f"📊 Base quantity (% Account): Account=${account_value:.2f}, Target={self.ts_percent_of_account}% (${target_dollar_amount:.2f}), "
-                                f"Option=${mid_price:.2f}/point, Multiplier={self.instrument['multiplier']}, "
-                                f"Value/Contract=${option_value_per_contract:.2f}, Calculated={calculated_qty:.2f}, Rounded={initial_quantity}")
-                else:
-                    # Fallback to 1 contract if can't calculate
-                    initial_quantity = 1
-                    logger.warning(f"⚠️ Cannot calculate position size (account={account_value}, price={mid_price}), using 1 contract")
-            
-            # Step 2: Apply Martingale if enabled
-            if self.ts_use_martingale:
-                # Check if stopped due to max losses
-                if self.ts_martingale_stopped:
-                    logger.warning(f"⛔ Martingale STOPPED: Reached max consecutive losses ({self.ts_martingale_max_losses})")
-                    self.log_message(f"⛔ Martingale stopped after {self.ts_martingale_max_losses} consecutive losses", "WARNING")
-                    return
-                
-                # Calculate Martingale quantity: initial * (2 ^ losses)
-                # This allows retroactive application if checkbox enabled mid-sequence
-                martingale_multiplier = 2 ** self.ts_martingale_consecutive_losses
-                quantity = initial_quantity * martingale_multiplier
-                
-                logger.info(f"📊 Martingale ACTIVE: Base={initial_quantity}, Losses={self.ts_martingale_consecutive_losses}, "
-                            f"Multiplier={martingale_multiplier}x, Final Quantity={quantity} contracts")
-                self.log_message(f"📊 Martingale: {quantity} contracts (base={initial_quantity}, {self.ts_martingale_consecutive_losses} losses)", "INFO")
-            else:
-                # No Martingale - use base quantity directly
-                quantity = initial_quantity
-                logger.info(f"📊 Final quantity (No Martingale): {quantity} contracts")
-            
-            # Log order placement to signal history
+            # Log order placement to signal history (after the order is on its way)
             contract_desc = contract_key.replace('_', ' ')
+            if self.ts_use_martingale:
+                self.log_message(f"📊 Martingale: {quantity} contracts ({self.ts_martingale_consecutive_losses} losses)", "INFO")
             self.add_ts_signal_to_log(
                 signal_type=direction_str,
                 action="BUY",
                 contract=contract_desc,
                 status="Placing Order",
                 fill_price=mid_price,
-                details=f"Qty: {quantity} @ ${mid_price:.2f}"
-            )
-            
-            order_id = self.place_order(
-                contract_key=contract_key,
-                action="BUY",
-                quantity=quantity,
-                limit_price=mid_price,
-                enable_chasing=True,  # Enable mid-price chasing for automated entries
-                is_automated=True,  # Mark as automated order
-                mid_price=unrounded_mid  # Store UNROUNDED mid price for accurate slippage calculation
+                details=f"Qty: {quantity} @ ${mid_price:.2f}" + (" (hot-standby)" if hot else "")
+                        + f" | Entry: {direction_str} at {self.ts_entry_delta}Δ"
             )
             
             if order_id:
@@ -14175,9 +18738,74 @@ class MainWindow(QMainWindow):
             else:
                 self.log_message(f"❌ Failed to place entry order", "ERROR")
             
+            return order_id
+            
         except Exception as e:
             logger.error(f"Error entering automated position: {e}", exc_info=True)
             self.log_message(f"❌ Error entering position: {e}", "ERROR")
+            return None
+    
+    def _on_reversal_order_done(self, order_id: int, status: str, filled: int = 0, avg_fill_price: float = 0):
+        """orderStatus reached a final state - continue the reversal once every cancel is confirmed"""
+        straggler = self._reversal_stragglers.pop(order_id, None)
+        if straggler is not None:
+            if filled > 0:
+                # The reversal moved on without this confirmation - the fill is an unwanted position
+                logger.warning(f"⚠️ SIGNAL REVERSAL: cancelled order #{order_id} on {straggler} {status} x{filled} "
+                               f"after the reversal moved on (TS direction now {self.ts_strategy_direction})")
+                self._close_reversal_fill(straggler, filled, avg_fill_price)
+            return
+        reversal = self._reversal
+        if reversal is None or order_id not in reversal['awaiting']:
+            return
+        contract_key = reversal['awaiting'].pop(order_id)
+        logger.info(f"   Reversal: order #{order_id} {status} "
+                    f"({(time.monotonic() - reversal['started_at']) * 1000:.0f} ms after cancel)")
+        if filled > 0:
+            # Filled (or partially filled, then cancelled) before the cancel landed
+            reversal['filled'].append((contract_key, filled, avg_fill_price))
+        if not reversal['awaiting']:
+            self._continue_reversal()
+    
+    def _on_reversal_timeout(self):
+        """Cancel confirmation did not arrive in time - enter anyway (a late fill is closed when it arrives)"""
+        if self._reversal is None:
+            return
+        logger.warning(f"⚠️ SIGNAL REVERSAL: no cancel confirmation after {self.reversal_cancel_timeout:.1f}s for "
+                       f"order(s) {sorted(self._reversal['awaiting'])} - entering anyway")
+        self._continue_reversal()
+    
+    def _continue_reversal(self):
+        """Second half of a signal reversal: flatten racing fills, then place the new entry"""
+        reversal, self._reversal = self._reversal, None
+        self.reversal_timer.stop()
+        confirm_ms = (time.monotonic() - reversal['started_at']) * 1000
+        # Cancels still unconfirmed (timeout): a late fill is closed by _on_reversal_order_done
+        self._reversal_stragglers.update(reversal['awaiting'])
+        
+        for contract_key, qty, avg_fill_price in reversal['filled']:
+            self._close_reversal_fill(contract_key, qty, avg_fill_price)
+        
+        order_id = self._place_automated_entry(reversal['direction'])
+        total_ms = (time.monotonic() - reversal['started_at']) * 1000
+        logger.info(f"⏱️ REVERSAL LATENCY: cancel wait {confirm_ms:.0f} ms | cancel→new order {total_ms:.0f} ms"
+                    + (f" (order #{order_id})" if order_id else " (no entry placed)"))
+    
+    def _close_reversal_fill(self, contract_key: str, qty: int, avg_fill_price: float):
+        """
+        An opposite order that filled before its cancel landed is now a position - close it.
+        orderStatus arrives ahead of the position callback, so sell the filled quantity directly
+        instead of waiting for self.positions
+        """
+        exit_price = self.calculate_mid_price(contract_key) or self.round_to_option_tick(avg_fill_price)
+        if exit_price <= 0:
+            logger.error(f"SIGNAL REVERSAL: no exit price for {contract_key} - {qty} contract(s) left open")
+            self.log_message(f"❌ Reversed order on {contract_key} filled - close {qty} manually (no price)", "ERROR")
+            return
+        logger.warning(f"⚠️ SIGNAL REVERSAL: {contract_key} filled x{qty} before cancel - "
+                       f"closing it (SELL {qty} @ ${exit_price:.2f})")
+        self.log_message(f"⚠️ Reversed order on {contract_key} filled - closing {qty} @ ${exit_price:.2f}", "WARNING")
+        self.place_manual_order(contract_key, "SELL", qty, exit_price)
     
     def sync_with_ts_strategy(self):
         """Manually sync strategy state with TradeStation"""
@@ -14501,12 +19129,13 @@ class MainWindow(QMainWindow):
     # Replaced by: load_all_chains_sequential() unified loading system
     # ═══════════════════════════════════════════════════════════════════════════
     
-    def get_ts_active_contract_type(self) -> str:
+    def get_ts_active_contract_type(self, log: bool = True) -> str:
         """Determine which contract type (0DTE or 1DTE) to use based on strategy setting and current time"""
         try:
             # Check if Pure 0DTE strategy is selected
             if hasattr(self, 'ts_pure_0dte_radio') and self.ts_pure_0dte_radio.isChecked():
-                logger.info(f"📌 Pure 0DTE Strategy: Always using 0DTE contracts")
+                if log:
+                    logger.info(f"📌 Pure 0DTE Strategy: Always using 0DTE contracts")
                 return "0DTE"
             
             # Hybrid strategy: time-based selection
@@ -14522,10 +19151,12 @@ class MainWindow(QMainWindow):
             time_4pm = dt_time(16, 0)
             
             if time_11am <= current_time < time_4pm:
-                logger.info(f"⏰ Hybrid Strategy: {current_time.strftime('%H:%M:%S')} CT → Using 1DTE (11AM-4PM window)")
+                if log:
+                    logger.info(f"⏰ Hybrid Strategy: {current_time.strftime('%H:%M:%S')} CT → Using 1DTE (11AM-4PM window)")
                 return "1DTE"
             else:
-                logger.info(f"⏰ Hybrid Strategy: {current_time.strftime('%H:%M:%S')} CT → Using 0DTE (outside 11AM-4PM window)")
+                if log:
+                    logger.info(f"⏰ Hybrid Strategy: {current_time.strftime('%H:%M:%S')} CT → Using 0DTE (outside 11AM-4PM window)")
                 return "0DTE"
                 
         except Exception as e:
@@ -14880,6 +19511,17 @@ class MainWindow(QMainWindow):
         self.update_session_pnl_labels()
         self.save_settings()
     
+    def on_ts_native_exits_toggled(self, checked: bool):
+        """Handle IB-side (OCA) exits checkbox toggle - applies to entries filled from now on"""
+        self.ts_use_native_exits = checked
+        if checked:
+            self.log_message("🎯 IB-side exits enabled: Pos Tgt/Stp attached as OCA orders on entry fill", "INFO")
+            logger.info("IB-side native exits enabled")
+        else:
+            self.log_message("🎯 IB-side exits disabled (already attached exits stay working)", "INFO")
+            logger.info("IB-side native exits disabled")
+        self.save_settings()
+    
     def on_ts_session_account_target_toggled(self, checked: bool):
         """Handle session account profit target checkbox toggle"""
         self.ts_use_session_account_target = checked
@@ -15327,6 +19969,7 @@ class MainWindow(QMainWindow):
             self.ts_position_profit_target_spin.blockSignals(True)
             self.ts_use_position_stop_checkbox.blockSignals(True)
             self.ts_position_stop_loss_spin.blockSignals(True)
+            self.ts_native_exits_checkbox.blockSignals(True)
             
             # Session-level
             self.ts_use_session_account_target_checkbox.blockSignals(True)
@@ -15370,6 +20013,7 @@ class MainWindow(QMainWindow):
             self.ts_position_profit_target_spin.setValue(self.ts_position_profit_target_pct)
             self.ts_use_position_stop_checkbox.setChecked(self.ts_use_position_stop_loss)
             self.ts_position_stop_loss_spin.setValue(self.ts_position_stop_loss_pct)
+            self.ts_native_exits_checkbox.setChecked(self.ts_use_native_exits)
             
             # Session-level
             self.ts_use_session_account_target_checkbox.setChecked(self.ts_use_session_account_target)
@@ -15426,6 +20070,7 @@ class MainWindow(QMainWindow):
             self.ts_position_profit_target_spin.blockSignals(False)
             self.ts_use_position_stop_checkbox.blockSignals(False)
             self.ts_position_stop_loss_spin.blockSignals(False)
+            self.ts_native_exits_checkbox.blockSignals(False)
             
             # Session-level
             self.ts_use_session_account_target_checkbox.blockSignals(False)
@@ -15472,15 +20117,18 @@ class MainWindow(QMainWindow):
             # We must NOT update both tables - only the one matching this expiry
             table_to_update = None
             contract_type = None
+            chain_type = None
             
             if (hasattr(self, 'ts_0dte_expiry') and hasattr(self, 'ts_0dte_table') and 
                 self.ts_0dte_expiry and expiry == self.ts_0dte_expiry):
                 table_to_update = self.ts_0dte_table
                 contract_type = "0DTE"
+                chain_type = 'ts_0dte'
             elif (hasattr(self, 'ts_1dte_expiry') and hasattr(self, 'ts_1dte_table') and 
                   self.ts_1dte_expiry and expiry == self.ts_1dte_expiry):
                 table_to_update = self.ts_1dte_table
                 contract_type = "1DTE"
+                chain_type = 'ts_1dte'
             else:
                 # This contract doesn't match any TS expiry - not an error, just not a TS chain
                 return
@@ -15495,26 +20143,19 @@ class MainWindow(QMainWindow):
                 logger.debug(f"No market data yet for {contract_key} in {contract_type} chain")
                 return
             
-            # CRITICAL: Find the EXACT row for this strike using FLOAT comparison
-            # Must use precise strike matching (float comparison with tolerance)
-            row_to_update = None
-            for row in range(table_to_update.rowCount()):
-                strike_item = table_to_update.item(row, 4)  # Strike is column 4
-                if strike_item:
-                    try:
-                        row_strike = float(strike_item.text())
-                        # Compare floats with small tolerance for rounding
-                        if abs(row_strike - float(strike)) < 0.01:
-                            row_to_update = row
-                            break
-                    except (ValueError, AttributeError):
-                        continue
+            # CRITICAL: Find the EXACT row for this strike
+            # O(1) lookup via chain row index (rebuilt on every chain build/recenter)
+            row_to_update = self.get_chain_row(chain_type, expiry, strike)
             
             if row_to_update is None:
                 # Debug only - this is expected for strikes outside TS chain range
                 logger.debug(f"Strike {strike:.1f} not found in {contract_type} table for {contract_key}")
                 return
             
+            # TradeStation tab hidden - remember the cell, repaint it when the tab is shown
+            if self.render_gates[chain_type].defer(contract_key):
+                return
+            
             # CRITICAL: Update ONLY the columns for this option type (call OR put, not both)
             # Column layout: Call Δ(0), Call Γ(1), Call Bid(2), Call Ask(3), Strike(4), Put Bid(5), Put Ask(6), Put Γ(7), Put Δ(8)
             
@@ -15696,11 +20337,44 @@ class MainWindow(QMainWindow):
             logger.error(f"Error executing TS buy put: {e}", exc_info=True)
     
     def execute_ts_buy_straddle(self, symbol: str, quantity: int, contract_type: str, signal_id: str):
-        """Execute buy straddle (call + put) from TradeStation signal"""
+        """Execute buy straddle (call + put) from TradeStation signal as one combo order"""
         try:
-            # Execute both call and put
-            self.execute_ts_buy_call(symbol, quantity, contract_type, f"{signal_id}_CALL")
-            self.execute_ts_buy_put(symbol, quantity, contract_type, f"{signal_id}_PUT")
+            # Determine expiry based on contract type
+            expiry = self.ts_0dte_expiry if contract_type == "0DTE" else self.ts_1dte_expiry
+            
+            if not expiry:
+                self.log_message(f"No expiry set for {contract_type}", "ERROR")
+                return
+            
+            # Find ATM strike
+            atm_strike = self.find_atm_strike_by_delta()
+            if not atm_strike:
+                self.log_message("Could not determine ATM strike", "ERROR")
+                return
+            
+            # Same legs as execute_ts_buy_call / execute_ts_buy_put: 1 strike OTM each side
+            leg_keys = [
+                f"{symbol}_{atm_strike + self.strike_interval}_C_{expiry}",
+                f"{symbol}_{atm_strike - self.strike_interval}_P_{expiry}",
+            ]
+            combo_mid = 0.0
+            for contract_key in leg_keys:
+                option_data = self.app_state.get('option_chain', {}).get(contract_key, {})
+                bid = option_data.get('bid', 0)
+                ask = option_data.get('ask', 0)
+                mid_price = round((bid + ask) / 2, 2) if bid and ask else 0
+                if mid_price == 0:
+                    self.log_message(f"No market data for {contract_key}", "ERROR")
+                    return
+                combo_mid += mid_price
+            
+            # Place combo order with chasing enabled
+            combo_price = self.round_to_option_tick(combo_mid)
+            self.place_combo_order(leg_keys, "BUY", quantity, combo_price, enable_chasing=True, mid_price=combo_mid)
+            
+            # Add to signal log
+            self.add_ts_signal_to_log("ENTRY", "BUY_STRADDLE", make_combo_key(leg_keys), "SUBMITTED", combo_price,
+                                      f"Signal: {signal_id}")
             
         except Exception as e:
             self.log_message(f"Error executing TS buy straddle: {e}", "ERROR")
@@ -15977,14 +20651,12 @@ class MainWindow(QMainWindow):
             return
         
         # PROTECTION: Check for pending exit orders for this contract
-        pending_exit_orders = []
-        for order_id, order_info in self.chasing_orders.items():
-            if order_info['contract_key'] == contract_key:
-                # Check if this is an exit order (opposite direction of position)
-                is_exit_order = (position_size > 0 and order_info['action'] == "SELL") or \
-                               (position_size < 0 and order_info['action'] == "BUY")
-                if is_exit_order:
-                    pending_exit_orders.append(order_id)
+        # Exit order = opposite direction of position
+        exit_action = "SELL" if position_size > 0 else "BUY"
+        pending_exit_orders = [
+            order.order_id for order in self.pending_orders.select(contract_key=contract_key, action=exit_action)
+            if order.order_id in self.chasing_orders
+        ]
         
         if pending_exit_orders:
             action_type = "SELL" if position_size > 0 else "BUY"
@@ -16183,6 +20855,8 @@ class MainWindow(QMainWindow):
             if chasing_info:
                 current_price = chasing_info.get('last_price', chasing_info.get('last_mid', 0))
                 price_str = f"${current_price:.2f}"
+            elif order_info.get('stop_price', 0):
+                price_str = f"STP ${order_info['stop_price']:.2f}"
             elif order_info.get('price', 0) == 0:
                 price_str = "MKT"
             else:
@@ -16213,6 +20887,12 @@ class MainWindow(QMainWindow):
                 QTableWidgetItem("Cancel")
             ]
             
+            if chasing_info:
+                items[5].setToolTip(
+                    f"Working {time.monotonic() - chasing_info['placed_at']:.1f}s | "
+                    f"{chasing_info['attempts'] - 1} modification(s)"
+                )
+            
             for col, item in enumerate(items):
                 item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 
@@ -16373,6 +21053,7 @@ class MainWindow(QMainWindow):
                 self.ts_position_profit_target_pct = settings.get('ts_position_profit_target_pct', 50.0)
                 self.ts_use_position_stop_loss = settings.get('ts_use_position_stop_loss', False)
                 self.ts_position_stop_loss_pct = settings.get('ts_position_stop_loss_pct', 50.0)
+                self.ts_use_native_exits = settings.get('ts_use_native_exits', False)
                 
                 # Session-level
                 self.ts_use_session_account_target = settings.get('ts_use_session_account_target', False)
@@ -16407,6 +21088,20 @@ class MainWindow(QMainWindow):
                 self.chase_give_in_interval = settings.get('chase_give_in_interval', 3.0)
                 self.chase_give_in_spin.setValue(self.chase_give_in_interval)
                 
+                # Market Data Settings (clamped to a sane frame interval)
+                self.tick_conflation_interval_ms = max(TICK_CONFLATION_MIN_MS, min(TICK_CONFLATION_MAX_MS, int(
+                    settings.get('tick_conflation_interval_ms', TICK_CONFLATION_DEFAULT_MS))))
+                self.tick_conflation_spin.blockSignals(True)
+                self.tick_conflation_spin.setValue(self.tick_conflation_interval_ms)
+                self.tick_conflation_spin.blockSignals(False)
+                self.tick_flush_timer.setInterval(self.tick_conflation_interval_ms)
+                self.market_data_line_budget = max(MARKET_DATA_LINE_BUDGET_MIN, min(MARKET_DATA_LINE_BUDGET_MAX, int(
+                    settings.get('market_data_line_budget', MARKET_DATA_LINE_BUDGET_DEFAULT))))
+                self.line_budget_spin.blockSignals(True)
+                self.line_budget_spin.setValue(self.market_data_line_budget)
+                self.line_budget_spin.blockSignals(False)
+                self.line_budget.set_budget(self.market_data_line_budget)
+                
                 # Expired Options Settings
                 self.expired_options_check_delay_minutes = settings.get('expired_options_check_delay_minutes', 1)
                 self.expired_check_delay_spin.setValue(self.expired_options_check_delay_minutes)
@@ -16442,6 +21137,7 @@ class MainWindow(QMainWindow):
                     self.ts_position_profit_target_spin.setValue(self.ts_position_profit_target_pct)
                     self.ts_use_position_stop_checkbox.setChecked(self.ts_use_position_stop_loss)
                     self.ts_position_stop_loss_spin.setValue(self.ts_position_stop_loss_pct)
+                    self.ts_native_exits_checkbox.setChecked(self.ts_use_native_exits)
                     
                     # Session-level
                     self.ts_use_session_account_target_checkbox.setChecked(self.ts_use_session_account_target)
@@ -16629,7 +21325,8 @@ class MainWindow(QMainWindow):
                         logger.debug(f"Cancelled market data reqId: {req_id}")
                     except Exception as e:
                         logger.debug(f"Error cancelling reqId {req_id}: {e}")
-                self.app_state['market_data_map'].clear()
+                self.subscriptions.clear()
+                self.line_budget.clear()
                 
                 # Cancel all chain subscriptions using centralized system
                 self.cancel_chain_subscriptions('main')
@@ -16665,11 +21362,12 @@ class MainWindow(QMainWindow):
                     except Exception as e:
                         logger.debug(f"Error cancelling order {order_id}: {e}")
                 self.pending_orders.clear()
+                self.subscriptions.clear_orders()
             
             # Disconnect from IBKR
             try:
                 self.log_message("Disconnecting from IBKR...", "INFO")
-                self.ibkr_client.disconnect()
+                self._forget_unsent_orders(self.ibkr_client.disconnect())
             except Exception as e:
                 logger.debug(f"Error during disconnect: {e}")
             
@@ -16860,28 +21558,25 @@ class MainWindow(QMainWindow):
             # Place orders for both legs (long strangle)
             quantity = 1  # Start with 1 contract each
             
-            # Buy Put
             put_data = self.market_data.get(result['put_key'], {})
             put_mid = (put_data.get('bid', 0) + put_data.get('ask', 0)) / 2 if put_data.get('bid') and put_data.get('ask') else 0
-            
-            if put_mid > 0:
-                self.place_order(result['put_key'], "BUY", quantity, put_mid, enable_chasing=True)
-                self.log_message(f"  ✓ BUY {quantity} PUT @ {result['put_strike']}", "SUCCESS")
-            else:
+            if put_mid <= 0:
                 self.log_message("Cannot enter: No put price", "ERROR")
                 return
             
-            # Buy Call
             call_data = self.market_data.get(result['call_key'], {})
             call_mid = (call_data.get('bid', 0) + call_data.get('ask', 0)) / 2 if call_data.get('bid') and call_data.get('ask') else 0
-            
-            if call_mid > 0:
-                self.place_order(result['call_key'], "BUY", quantity, call_mid, enable_chasing=True)
-                self.log_message(f"  ✓ BUY {quantity} CALL @ {result['call_strike']}", "SUCCESS")
-            else:
+            if call_mid <= 0:
                 self.log_message("Cannot enter: No call price", "ERROR")
                 return
             
+            # Buy Put + Call as one combo order (chased at the combined mid, no leg risk)
+            self.place_combo_order([result['put_key'], result['call_key']], "BUY", quantity,
+                                   self.round_to_option_tick(put_mid + call_mid),
+                                   enable_chasing=True, mid_price=put_mid + call_mid)
+            self.log_message(f"  ✓ BUY {quantity} PUT @ {result['put_strike']}", "SUCCESS")
+            self.log_message(f"  ✓ BUY {quantity} CALL @ {result['call_strike']}", "SUCCESS")
+            
             # Store vega position
             self.vega_positions[trade_id] = {
                 'entry_time': datetime.now().strftime('%H:%M:%S'),
@@ -17115,16 +21810,13 @@ class MainWindow(QMainWindow):
                 # Stop monitoring if auto-hedge disabled or no positions
                 return
             
-            # Calculate current portfolio delta
-            total_delta = 0
-            for trade_id, position in self.vega_positions.items():
-                put_data = self.market_data.get(position['put_key'], {})
-                call_data = self.market_data.get(position['call_key'], {})
-                
-                put_delta = put_data.get('delta', 0) * position['put_qty']
-                call_delta = call_data.get('delta', 0) * position['call_qty']
-                
-                total_delta += (put_delta + call_delta) * self.instrument['multiplier']
+            # Calculate current portfolio delta (vectorized: gather leg deltas, dot with quantities)
+            positions = list(self.vega_positions.values())
+            put_deltas = self.market_data.gather([p['put_key'] for p in positions], 'delta')
+            call_deltas = self.market_data.gather([p['call_key'] for p in positions], 'delta')
+            put_qtys = np.array([p['put_qty'] for p in positions], dtype=float)
+            call_qtys = np.array([p['call_qty'] for p in positions], dtype=float)
+            total_delta = float(put_deltas @ put_qtys + call_deltas @ call_qtys) * int(self.instrument['multiplier'])
             
             self.portfolio_greeks['delta'] = total_delta
             self.update_portfolio_greeks_display()
@@ -17254,21 +21946,28 @@ class MainWindow(QMainWindow):
             
             self.log_message(f"🔴 Closing vega position: {trade_id}", "INFO")
             
-            # Sell Put
             put_data = self.market_data.get(position['put_key'], {})
             put_mid = (put_data.get('bid', 0) + put_data.get('ask', 0)) / 2 if put_data.get('bid') and put_data.get('ask') else 0
-            
-            if put_mid > 0:
-                self.place_order(position['put_key'], "SELL", position['put_qty'], put_mid, enable_chasing=True)
-                self.log_message(f"  ✓ SELL {position['put_qty']} PUT @ {position['put_strike']}", "SUCCESS")
-            
-            # Sell Call
             call_data = self.market_data.get(position['call_key'], {})
             call_mid = (call_data.get('bid', 0) + call_data.get('ask', 0)) / 2 if call_data.get('bid') and call_data.get('ask') else 0
             
-            if call_mid > 0:
-                self.place_order(position['call_key'], "SELL", position['call_qty'], call_mid, enable_chasing=True)
+            if put_mid > 0 and call_mid > 0 and position['put_qty'] == position['call_qty']:
+                # Sell Put + Call as one combo order
+                self.place_combo_order([position['put_key'], position['call_key']], "SELL", position['put_qty'],
+                                       self.round_to_option_tick(put_mid + call_mid),
+                                       enable_chasing=True, mid_price=put_mid + call_mid)
+                self.log_message(f"  ✓ SELL {position['put_qty']} PUT @ {position['put_strike']}", "SUCCESS")
                 self.log_message(f"  ✓ SELL {position['call_qty']} CALL @ {position['call_strike']}", "SUCCESS")
+            else:
+                # Sell Put
+                if put_mid > 0:
+                    self.place_order(position['put_key'], "SELL", position['put_qty'], put_mid, enable_chasing=True)
+                    self.log_message(f"  ✓ SELL {position['put_qty']} PUT @ {position['put_strike']}", "SUCCESS")
+                
+                # Sell Call
+                if call_mid > 0:
+                    self.place_order(position['call_key'], "SELL", position['call_qty'], call_mid, enable_chasing=True)
+                    self.log_message(f"  ✓ SELL {position['call_qty']} CALL @ {position['call_strike']}", "SUCCESS")
             
             # Close MES hedge position automatically
             hedge_contracts = position.get('hedge_contracts', 0)
@@ -17478,12 +22177,10 @@ class MainWindow(QMainWindow):
             self.log_message(f"🎯 Entering Long Straddle: {trade_id}", "INFO")
             self.log_message(f"  ATM: {atm_strike:.0f}, Call: {call_strike:.0f}, Put: {put_strike:.0f}", "INFO")
             
-            # Buy Call
-            self.place_order(call_key, "BUY", qty, call_mid, enable_chasing=True)
+            # Buy Call + Put as one combo order (chased at the combined mid, no leg risk)
+            self.place_combo_order([call_key, put_key], "BUY", qty, self.round_to_option_tick(call_mid + put_mid),
+                                   enable_chasing=True, mid_price=call_mid + put_mid)
             self.log_message(f"  ✓ BUY {qty} CALL @ {call_strike:.0f} (Mid: ${call_mid:.2f})", "SUCCESS")
-            
-            # Buy Put
-            self.place_order(put_key, "BUY", qty, put_mid, enable_chasing=True)
             self.log_message(f"  ✓ BUY {qty} PUT @ {put_strike:.0f} (Mid: ${put_mid:.2f})", "SUCCESS")
             
             # Calculate entry cost
@@ -17618,21 +22315,28 @@ class MainWindow(QMainWindow):
             
             self.log_message(f"🔴 Closing straddle position: {trade_id}", "INFO")
             
-            # Sell Call
             call_data = self.market_data.get(position['call_key'], {})
             call_mid = (call_data.get('bid', 0) + call_data.get('ask', 0)) / 2 if call_data.get('bid') and call_data.get('ask') else 0
-            
-            if call_mid > 0:
-                self.place_order(position['call_key'], "SELL", position['call_qty'], call_mid, enable_chasing=True)
-                self.log_message(f"  ✓ SELL {position['call_qty']} CALL @ {position['call_strike']:.0f}", "SUCCESS")
-            
-            # Sell Put
             put_data = self.market_data.get(position['put_key'], {})
             put_mid = (put_data.get('bid', 0) + put_data.get('ask', 0)) / 2 if put_data.get('bid') and put_data.get('ask') else 0
             
-            if put_mid > 0:
-                self.place_order(position['put_key'], "SELL", position['put_qty'], put_mid, enable_chasing=True)
+            if call_mid > 0 and put_mid > 0 and position['call_qty'] == position['put_qty']:
+                # Sell Call + Put as one combo order
+                self.place_combo_order([position['call_key'], position['put_key']], "SELL", position['call_qty'],
+                                       self.round_to_option_tick(call_mid + put_mid),
+                                       enable_chasing=True, mid_price=call_mid + put_mid)
+                self.log_message(f"  ✓ SELL {position['call_qty']} CALL @ {position['call_strike']:.0f}", "SUCCESS")
                 self.log_message(f"  ✓ SELL {position['put_qty']} PUT @ {position['put_strike']:.0f}", "SUCCESS")
+            else:
+                # Sell Call
+                if call_mid > 0:
+                    self.place_order(position['call_key'], "SELL", position['call_qty'], call_mid, enable_chasing=True)
+                    self.log_message(f"  ✓ SELL {position['call_qty']} CALL @ {position['call_strike']:.0f}", "SUCCESS")
+                
+                # Sell Put
+                if put_mid > 0:
+                    self.place_order(position['put_key'], "SELL", position['put_qty'], put_mid, enable_chasing=True)
+                    self.log_message(f"  ✓ SELL {position['put_qty']} PUT @ {position['put_strike']:.0f}", "SUCCESS")
             
             # Remove from active positions
             del self.straddle_positions[trade_id]
@@ -17665,6 +22369,11 @@ class MainWindow(QMainWindow):
             self.save_positions()
             logger.info("Positions saved on app close")
             
+            # Persist live bars received since the historical requests completed
+            self.flush_bar_cache()
+            
+            self.chart_render_worker.stop()
+            
             # Comprehensive cleanup
             if self.connection_state == ConnectionState.CONNECTED:
                 self.cleanup_all_connections()
@@ -17703,6 +22412,7 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Chart render process in a frozen Windows build
     try:
         main()
     except KeyboardInterrupt: